@@ -8,22 +8,29 @@ Features:
 """
 
 import asyncio
-from typing import Any, Callable, Dict, Optional
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional
 
 import structlog
 from telegram import BotCommand, Update
 from telegram.ext import (
     Application,
+    ApplicationHandlerStop,
     CallbackQueryHandler,
     CommandHandler,
     ContextTypes,
     MessageHandler,
+    TypeHandler,
     filters,
 )
 
 from ..config.settings import Settings
 from ..exceptions import ClaudeCodeTelegramError
 from .features.registry import FeatureRegistry
+from .middleware.pipeline import MiddlewarePipeline
+from .update_processor import ChatOrderedUpdateProcessor
+from .update_types import UpdateTypeStats, allowed_update_types
+from .webhook import WebhookServer
 
 logger = structlog.get_logger()
 
@@ -35,9 +42,15 @@ class ClaudeCodeBot:
         """Initialize bot with settings and dependencies."""
         self.settings = settings
         self.deps = dependencies
+        # Frozen view of deps plus settings, published once at start-up
+        self.dependencies: Mapping[str, Any] = MappingProxyType({})
         self.app: Optional[Application] = None
         self.is_running = False
         self.feature_registry: Optional[FeatureRegistry] = None
+        self.middleware: Optional[MiddlewarePipeline] = None
+        self.webhook_server: Optional[WebhookServer] = None
+        self.allowed_updates: List[str] = list(Update.ALL_TYPES)
+        self.update_stats = UpdateTypeStats(self.allowed_updates)
 
     async def initialize(self) -> None:
         """Initialize bot application."""
@@ -53,6 +66,12 @@ class ClaudeCodeBot:
         builder.write_timeout(30)
         builder.pool_timeout(30)
 
+        # Different chats in parallel, each chat's messages in order
+        if self.settings.concurrent_updates > 1:
+            builder.concurrent_updates(
+                ChatOrderedUpdateProcessor(self.settings.concurrent_updates)
+            )
+
         self.app = builder.build()
 
         # Initialize feature registry
@@ -65,9 +84,18 @@ class ClaudeCodeBot:
         # Add feature registry to dependencies
         self.deps["features"] = self.feature_registry
 
+        # Let Claude prepend prefetched project digests to new sessions
+        project_context = self.feature_registry.get_project_context()
+        claude_integration = self.deps.get("claude_integration")
+        if project_context and claude_integration:
+            claude_integration.context_provider = project_context.get_digest
+
         # Set bot commands for menu
         await self._set_bot_commands()
 
+        # Make dependencies available to every handler
+        self._publish_dependencies()
+
         # Register handlers
         self._register_handlers()
 
@@ -97,13 +125,23 @@ class ClaudeCodeBot:
             BotCommand("git", "Git repository commands"),
         ]
 
-        await self.app.bot.set_my_commands(commands)
+        app = self.app
+        assert app is not None
+        await app.bot.set_my_commands(commands)
         logger.info("Bot commands set", commands=[cmd.command for cmd in commands])
 
     def _register_handlers(self) -> None:
-        """Register all command and message handlers."""
+        """Register all command and message handlers.
+
+        Commands and messages are handled when first sent, not when
+        edited. Telegram is asked for only the update types these
+        handlers consume.
+        """
         from .handlers import callback, command, message
 
+        app = self.app
+        assert app is not None
+        new_message = filters.UpdateType.MESSAGE
         # Command handlers
         handlers = [
             ("start", command.start_command),
@@ -123,103 +161,104 @@ class ClaudeCodeBot:
         ]
 
         for cmd, handler in handlers:
-            self.app.add_handler(CommandHandler(cmd, self._inject_deps(handler)))
+            app.add_handler(CommandHandler(cmd, handler, filters=new_message))
 
         # Message handlers with priority groups
-        self.app.add_handler(
+        app.add_handler(
             MessageHandler(
-                filters.TEXT & ~filters.COMMAND,
-                self._inject_deps(message.handle_text_message),
+                new_message & filters.TEXT & ~filters.COMMAND,
+                message.handle_text_message,
             ),
             group=10,
         )
 
-        self.app.add_handler(
-            MessageHandler(
-                filters.Document.ALL, self._inject_deps(message.handle_document)
-            ),
+        app.add_handler(
+            MessageHandler(new_message & filters.Document.ALL, message.handle_document),
             group=10,
         )
 
-        self.app.add_handler(
-            MessageHandler(filters.PHOTO, self._inject_deps(message.handle_photo)),
+        app.add_handler(
+            MessageHandler(new_message & filters.PHOTO, message.handle_photo),
             group=10,
         )
 
         # Callback query handler
-        self.app.add_handler(
-            CallbackQueryHandler(self._inject_deps(callback.handle_callback_query))
-        )
+        app.add_handler(CallbackQueryHandler(callback.handle_callback_query))
 
-        logger.info("Bot handlers registered")
-
-    def _inject_deps(self, handler: Callable) -> Callable:
-        """Inject dependencies into handlers."""
-
-        async def wrapped(update: Update, context: ContextTypes.DEFAULT_TYPE):
-            # Add dependencies to context
-            for key, value in self.deps.items():
-                context.bot_data[key] = value
+        self.allowed_updates = allowed_update_types(
+            handler for group in app.handlers.values() for handler in group
+        )
+        self.update_stats = UpdateTypeStats(self.allowed_updates)
+        app.bot_data["update_stats"] = self.update_stats
 
-            # Add settings
-            context.bot_data["settings"] = self.settings
+        logger.info("Bot handlers registered", allowed_updates=self.allowed_updates)
 
-            return await handler(update, context)
+    def _publish_dependencies(self) -> None:
+        """Put dependencies and settings into bot_data, once.
 
-        return wrapped
+        Handlers read them from ``context.bot_data``; nothing re-injects
+        them per update, so they must be complete before polling starts.
+        """
+        app = self.app
+        assert app is not None
+        self.dependencies = MappingProxyType({**self.deps, "settings": self.settings})
+        app.bot_data.update(self.dependencies)
+        app.bot_data["dependencies"] = self.dependencies
 
     def _add_middleware(self) -> None:
-        """Add middleware to application."""
+        """Add the middleware pipeline to application.
+
+        Security, authentication and rate limiting run as one chain, in
+        that order, ahead of every other handler group and for every
+        kind of update (messages, commands and callback queries alike).
+        An update rejected by any stage goes no further.
+        """
         from .middleware.auth import auth_middleware
         from .middleware.rate_limit import rate_limit_middleware
         from .middleware.security import security_middleware
 
-        # Middleware runs in order of group numbers (lower = earlier)
-        # Security middleware first (validate inputs)
-        self.app.add_handler(
-            MessageHandler(
-                filters.ALL, self._create_middleware_handler(security_middleware)
-            ),
-            group=-3,
+        app = self.app
+        assert app is not None
+        middleware = MiddlewarePipeline(
+            [
+                ("security", security_middleware),
+                ("auth", auth_middleware),
+                ("rate_limit", rate_limit_middleware),
+            ]
         )
+        self.middleware = middleware
 
-        # Authentication second
-        self.app.add_handler(
-            MessageHandler(
-                filters.ALL, self._create_middleware_handler(auth_middleware)
-            ),
-            group=-2,
-        )
+        app.bot_data["middleware"] = middleware
 
-        # Rate limiting third
-        self.app.add_handler(
-            MessageHandler(
-                filters.ALL, self._create_middleware_handler(rate_limit_middleware)
-            ),
-            group=-1,
-        )
+        app.add_handler(TypeHandler(Update, self._run_middleware), group=-1)
 
-        logger.info("Middleware added to bot")
+        logger.info("Middleware added to bot", stages=middleware.stage_names)
 
-    def _create_middleware_handler(self, middleware_func: Callable) -> Callable:
-        """Create middleware handler that injects dependencies."""
+    async def _run_middleware(
+        self, update: Update, context: ContextTypes.DEFAULT_TYPE
+    ) -> None:
+        """Run the middleware pipeline; stop the update if it is rejected."""
+        # Types no handler consumes are not worth a security check
+        if not self.update_stats.accept(update):
+            raise ApplicationHandlerStop
 
-        async def middleware_wrapper(
-            update: Update, context: ContextTypes.DEFAULT_TYPE
-        ):
-            # Inject dependencies into context
-            for key, value in self.deps.items():
-                context.bot_data[key] = value
-            context.bot_data["settings"] = self.settings
+        middleware = self.middleware
+        assert middleware is not None
 
-            # Create a dummy handler that does nothing (middleware will handle everything)
-            async def dummy_handler(event, data):
-                return None
+        # Per-update view: shared dependencies plus this update's context,
+        # so middleware can pass state on to the handlers
+        data = dict(self.dependencies)
+        data["context"] = context
 
-            # Call middleware with Telegram-style parameters
-            return await middleware_func(dummy_handler, update, context.bot_data)
+        try:
+            passed = await middleware.run(update, data)
+        except Exception as e:
+            # Fail closed: a broken check must not let the update through
+            logger.exception("Middleware error", error=str(e))
+            passed = False
 
-        return middleware_wrapper
+        if not passed:
+            raise ApplicationHandlerStop
 
     async def start(self) -> None:
         """Start the bot."""
@@ -228,6 +267,8 @@ class ClaudeCodeBot:
             return
 
         await self.initialize()
+        app = self.app
+        assert app is not None
 
         logger.info(
             "Starting bot", mode="webhook" if self.settings.webhook_url else "polling"
@@ -236,28 +277,31 @@ class ClaudeCodeBot:
         try:
             self.is_running = True
 
+            await app.initialize()
+            await app.start()
+
             if self.settings.webhook_url:
-                # Webhook mode
-                await self.app.run_webhook(
-                    listen="0.0.0.0",
-                    port=self.settings.webhook_port,
-                    url_path=self.settings.webhook_path,
-                    webhook_url=self.settings.webhook_url,
-                    drop_pending_updates=True,
-                    allowed_updates=Update.ALL_TYPES,
+                # Webhook mode - listen before telling Telegram where to deliver
+                self.webhook_server = WebhookServer.from_settings(app, self.settings)
+                await self.webhook_server.start()
+                await app.bot.set_webhook(
+                    url=self.settings.webhook_url,
+                    secret_token=self.webhook_server.secret,
+                    max_connections=self.settings.webhook_max_connections,
+                    allowed_updates=self.allowed_updates,
+                    drop_pending_updates=self.settings.drop_pending_updates,
                 )
             else:
-                # Polling mode - initialize and start polling manually
-                await self.app.initialize()
-                await self.app.start()
-                await self.app.updater.start_polling(
-                    allowed_updates=Update.ALL_TYPES,
-                    drop_pending_updates=True,
+                # Polling mode
+                assert app.updater is not None
+                await app.updater.start_polling(
+                    allowed_updates=self.allowed_updates,
+                    drop_pending_updates=self.settings.drop_pending_updates,
                 )
 
-                # Keep running until manually stopped
-                while self.is_running:
-                    await asyncio.sleep(1)
+            # Keep running until manually stopped
+            while self.is_running:
+                await asyncio.sleep(1)
         except Exception as e:
             logger.error("Error running bot", error=str(e))
             raise ClaudeCodeTelegramError(f"Failed to start bot: {str(e)}") from e
@@ -275,13 +319,21 @@ class ClaudeCodeBot:
         try:
             self.is_running = False  # Stop the main loop first
 
+            logger.info("Update statistics", **self.update_stats.get_stats())
+
             # Shutdown feature registry
             if self.feature_registry:
                 self.feature_registry.shutdown()
 
+            # Stop taking deliveries; the webhook stays registered so
+            # Telegram holds new updates until the bot is back
+            if self.webhook_server:
+                await self.webhook_server.stop()
+                self.webhook_server = None
+
             if self.app:
                 # Stop the updater if it's running
-                if self.app.updater.running:
+                if self.app.updater and self.app.updater.running:
                     await self.app.updater.stop()
 
                 # Stop the application
@@ -372,6 +372,18 @@ class FileHandler:
 
     async def analyze_codebase(self, directory: Path) -> CodebaseAnalysis:
         """Analyze entire codebase"""
+        analysis = self.analyze_structure(directory)
+
+        # Find TODOs and FIXMEs
+        analysis.todo_count = await self._find_todos(directory)
+
+        return analysis
+
+    def analyze_structure(self, directory: Path) -> CodebaseAnalysis:
+        """Languages, entry points, frameworks and tests; no TODO scan
+
+        Blocking; run it in a worker thread from async code.
+        """
 
         analysis = CodebaseAnalysis(
             languages={},
@@ -404,9 +416,6 @@ class FileHandler:
         # Detect frameworks
         analysis.frameworks = self._detect_frameworks(directory)
 
-        # Find TODOs and FIXMEs
-        analysis.todo_count = await self._find_todos(directory)
-
         # Check for tests
         test_files = self._find_test_files(directory)
         analysis.test_coverage = len(test_files) > 0
@@ -0,0 +1,284 @@
+"""
+Project context prefetch
+
+Features:
+- Background digest build when a user changes project
+- Tree, languages, frameworks and entry points via FileHandler
+- Git branch and working tree summary
+- Cache keyed by path; rebuilt when the directory or git index mtime
+  changes, or once max_age has passed (nested edits don't touch either)
+- Tree walks run on one worker thread, so timed-out builds queue up
+  instead of piling up
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import structlog
+
+from src.config.settings import Settings
+
+from .file_handler import FileHandler
+from .git_integration import GitIntegration
+
+logger = structlog.get_logger(__name__)
+
+# Directories never shown in the digest tree
+SKIP_DIRS = {
+    ".git",
+    ".hg",
+    ".svn",
+    ".venv",
+    "venv",
+    "node_modules",
+    "__pycache__",
+    ".mypy_cache",
+    ".pytest_cache",
+    "dist",
+    "build",
+    "target",
+}
+
+
+@dataclass
+class ProjectDigest:
+    """Cached project digest"""
+
+    path: Path
+    fingerprint: Tuple[float, float]
+    text: str
+    build_seconds: float
+    created_at: float
+
+
+class ProjectContextPrefetcher:
+    """Build and cache compact project digests in the background"""
+
+    def __init__(
+        self,
+        config: Settings,
+        file_handler: Optional[FileHandler] = None,
+        git: Optional[GitIntegration] = None,
+        max_entries: int = 64,
+        max_tree_entries: int = 60,
+        max_chars: int = 2000,
+        build_timeout: float = 30.0,
+        max_age: float = 300.0,
+    ):
+        self.config = config
+        self.file_handler = file_handler
+        self.git = git
+        self.max_entries = max_entries
+        self.max_tree_entries = max_tree_entries
+        self.max_chars = max_chars
+        self.build_timeout = build_timeout
+        self.max_age = max_age
+
+        # A timed-out build can't stop its thread; one worker keeps
+        # abandoned walks from running side by side
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="project-digest"
+        )
+        self._cache: "OrderedDict[Path, ProjectDigest]" = OrderedDict()
+        self._tasks: Dict[Path, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def prefetch(self, path: Path) -> Optional[asyncio.Task]:
+        """Schedule a background digest build unless one is fresh or running"""
+        path = Path(path)
+        if path in self._tasks:
+            return self._tasks[path]
+
+        cached = self._cache.get(path)
+        if cached and self._is_fresh(cached):
+            return None
+
+        task = asyncio.create_task(self._build_and_store(path))
+        self._tasks[path] = task
+        task.add_done_callback(lambda _: self._tasks.pop(path, None))
+        return task
+
+    def get_digest(self, path: Path) -> Optional[str]:
+        """Return a fresh cached digest without blocking on a build"""
+        path = Path(path)
+        cached = self._cache.get(path)
+        if cached is None or not self._is_fresh(cached):
+            self.misses += 1
+            return None
+
+        self._cache.move_to_end(path)
+        self.hits += 1
+        return cached.text
+
+    async def build_digest(self, path: Path) -> str:
+        """Build the digest text for a project directory"""
+        lines = [
+            "Project context (snapshot taken when the user switched to this "
+            "directory; verify before relying on it):",
+        ]
+
+        try:
+            relative = path.relative_to(self.config.approved_directory)
+            lines.append(f"Directory: {relative}/")
+        except ValueError:
+            lines.append(f"Directory: {path.name}/")
+
+        loop = asyncio.get_running_loop()
+        file_handler = self.file_handler
+        if file_handler:
+            # Walks the whole tree; keep it off the event loop
+            analysis = await loop.run_in_executor(
+                self._executor, file_handler.analyze_structure, path
+            )
+            if analysis.languages:
+                languages = sorted(
+                    analysis.languages.items(), key=lambda item: -item[1]
+                )
+                lines.append(
+                    "Languages: "
+                    + ", ".join(f"{name} ({count})" for name, count in languages[:6])
+                )
+            if analysis.frameworks:
+                lines.append(f"Frameworks: {', '.join(analysis.frameworks)}")
+            if analysis.entry_points:
+                lines.append(
+                    f"Entry points: {', '.join(sorted(analysis.entry_points)[:8])}"
+                )
+            lines.append(f"Tests present: {'yes' if analysis.test_coverage else 'no'}")
+
+        if self.git and (path / ".git").exists():
+            try:
+                status = await self.git.get_status(path)
+                if status.is_clean:
+                    changes = "clean"
+                else:
+                    changes = (
+                        f"{len(status.modified)} modified, {len(status.added)} added, "
+                        f"{len(status.deleted)} deleted, "
+                        f"{len(status.untracked)} untracked"
+                    )
+                lines.append(f"Git: branch {status.branch}, {changes}")
+            except Exception as e:
+                logger.debug("Git status unavailable for digest", error=str(e))
+
+        tree = await loop.run_in_executor(self._executor, self._build_tree, path)
+        if tree:
+            lines.append("Tree:")
+            lines.extend(tree)
+
+        text = "\n".join(lines)
+        if len(text) > self.max_chars:
+            text = text[: self.max_chars].rsplit("\n", 1)[0] + "\n..."
+        return text
+
+    async def _build_and_store(self, path: Path) -> None:
+        """Build a digest and store it in the cache"""
+        fingerprint = self._fingerprint(path)
+        start = time.monotonic()
+        try:
+            text = await asyncio.wait_for(
+                self.build_digest(path), timeout=self.build_timeout
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("Project digest build failed", path=str(path), error=str(e))
+            return
+
+        elapsed = time.monotonic() - start
+        self._cache[path] = ProjectDigest(
+            path=path,
+            fingerprint=fingerprint,
+            text=text,
+            build_seconds=elapsed,
+            created_at=time.time(),
+        )
+        self._cache.move_to_end(path)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+        logger.info(
+            "Project digest prefetched",
+            path=str(path),
+            chars=len(text),
+            build_seconds=round(elapsed, 3),
+        )
+
+    def _build_tree(self, path: Path) -> List[str]:
+        """Two-level tree, capped to max_tree_entries lines"""
+        lines: List[str] = []
+
+        def entries(directory: Path) -> List[Path]:
+            try:
+                items = [
+                    item
+                    for item in directory.iterdir()
+                    if not (item.is_dir() and item.name in SKIP_DIRS)
+                    and not item.name.startswith(".")
+                ]
+            except OSError:
+                return []
+            return sorted(items, key=lambda x: (x.is_file(), x.name))
+
+        for item in entries(path):
+            if len(lines) >= self.max_tree_entries:
+                lines.append("  ...")
+                break
+            if item.is_dir():
+                children = entries(item)
+                lines.append(f"  {item.name}/ ({len(children)} entries)")
+                for child in children[:5]:
+                    if len(lines) >= self.max_tree_entries:
+                        break
+                    suffix = "/" if child.is_dir() else ""
+                    lines.append(f"    {child.name}{suffix}")
+            else:
+                lines.append(f"  {item.name}")
+
+        return lines
+
+    def _is_fresh(self, cached: ProjectDigest) -> bool:
+        """Younger than max_age and the fingerprint still matches"""
+        if time.time() - cached.created_at >= self.max_age:
+            return False
+        return cached.fingerprint == self._fingerprint(cached.path)
+
+    @staticmethod
+    def _fingerprint(path: Path) -> Tuple[float, float]:
+        """Directory mtime plus git index mtime (0.0 when missing)
+
+        Only catches entries added or removed at the top level and changes
+        to git's index; edits further down are left to max_age.
+        """
+        try:
+            dir_mtime = path.stat().st_mtime
+        except OSError:
+            return (0.0, 0.0)
+        try:
+            index_mtime = (path / ".git" / "index").stat().st_mtime
+        except OSError:
+            index_mtime = 0.0
+        return (dir_mtime, index_mtime)
+
+    def get_stats(self) -> Dict[str, float]:
+        """Cache statistics"""
+        return {
+            "cached": len(self._cache),
+            "in_flight": len(self._tasks),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def shutdown(self) -> None:
+        """Cancel pending builds and clear the cache"""
+        for task in list(self._tasks.values()):
+            task.cancel()
+        self._tasks.clear()
+        self._cache.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
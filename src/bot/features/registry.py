@@ -14,6 +14,7 @@ from .conversation_mode import ConversationEnhancer
 from .file_handler import FileHandler
 from .git_integration import GitIntegration
 from .image_handler import ImageHandler
+from .project_context import ProjectContextPrefetcher
 from .quick_actions import QuickActionManager
 from .session_export import SessionExporter
 
@@ -62,6 +63,19 @@ class FeatureRegistry:
             except Exception as e:
                 logger.error("Failed to initialize quick actions", error=str(e))
 
+        # Project context prefetch - conditionally enabled
+        if self.config.enable_project_prefetch:
+            try:
+                self.features["project_context"] = ProjectContextPrefetcher(
+                    config=self.config,
+                    file_handler=self.features.get("file_handler")
+                    or FileHandler(config=self.config, security=self.security),
+                    git=self.features.get("git"),
+                )
+                logger.info("Project context prefetch enabled")
+            except Exception as e:
+                logger.error("Failed to initialize project prefetch", error=str(e))
+
         # Session export - always enabled
         try:
             self.features["session_export"] = SessionExporter(storage=self.storage)
@@ -120,6 +134,10 @@ class FeatureRegistry:
         """Get conversation enhancer feature"""
         return self.get_feature("conversation")
 
+    def get_project_context(self) -> Optional[ProjectContextPrefetcher]:
+        """Get project context prefetch feature"""
+        return self.get_feature("project_context")
+
     def get_enabled_features(self) -> Dict[str, Any]:
         """Get all enabled features"""
         return self.features.copy()
@@ -133,6 +151,11 @@ class FeatureRegistry:
         if conversation:
             conversation.conversation_contexts.clear()
 
+        # Cancel pending project digest builds
+        project_context = self.get_project_context()
+        if project_context:
+            project_context.shutdown()
+
         # Clear feature registry
         self.features.clear()
 
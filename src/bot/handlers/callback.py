@@ -138,6 +138,12 @@ async def handle_cd_callback(
         context.user_data["current_directory"] = new_path
         context.user_data["claude_session_id"] = None
 
+        # Warm the project digest for the next prompt
+        features = context.bot_data.get("features")
+        project_context = features.get_project_context() if features else None
+        if project_context:
+            project_context.prefetch(new_path)
+
         # Send confirmation with new directory info
         relative_path = new_path.relative_to(settings.approved_directory)
 
@@ -548,7 +554,7 @@ async def _handle_status_action(query, context: ContextTypes.DEFAULT_TYPE) -> No
     usage_info = ""
     if rate_limiter:
         try:
-            user_status = rate_limiter.get_user_status(user_id)
+            user_status = await rate_limiter.get_user_status(user_id)
             cost_usage = user_status.get("cost_usage", {})
             current_cost = cost_usage.get("current", 0.0)
             cost_limit = cost_usage.get("limit", settings.claude_max_cost_per_user)
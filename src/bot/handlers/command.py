@@ -452,6 +452,12 @@ async def change_directory(update: Update, context: ContextTypes.DEFAULT_TYPE) -
         # Clear Claude session on directory change
         context.user_data["claude_session_id"] = None
 
+        # Warm the project digest for the next prompt
+        features = context.bot_data.get("features")
+        project_context = features.get_project_context() if features else None
+        if project_context:
+            project_context.prefetch(resolved_path)
+
         # Send confirmation
         relative_path = resolved_path.relative_to(settings.approved_directory)
         await update.message.reply_text(
@@ -583,7 +589,7 @@ async def session_status(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     usage_info = ""
     if rate_limiter:
         try:
-            user_status = rate_limiter.get_user_status(user_id)
+            user_status = await rate_limiter.get_user_status(user_id)
             cost_usage = user_status.get("cost_usage", {})
             current_cost = cost_usage.get("current", 0.0)
             cost_limit = cost_usage.get("limit", settings.claude_max_cost_per_user)
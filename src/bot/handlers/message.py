@@ -9,8 +9,10 @@ from telegram.ext import ContextTypes
 
 from ...claude.exceptions import ClaudeToolValidationError
 from ...config.settings import Settings
+from ..middleware.rate_limit import take_reservation
+from ..utils.progress_editor import ProgressEditor
 from ...security.audit import AuditLogger
-from ...security.rate_limiter import RateLimiter
+from ...security.rate_limiter import RateLimiter, RateLimitReservation
 from ...security.validators import SecurityValidator
 
 logger = structlog.get_logger()
@@ -318,17 +320,13 @@ async def handle_text_message(
         "Processing text message", user_id=user_id, message_length=len(message_text)
     )
 
+    reservation: Optional[RateLimitReservation] = None
     try:
-        # Check rate limit with estimated cost for text processing
-        estimated_cost = _estimate_text_processing_cost(message_text)
-
-        if rate_limiter:
-            allowed, limit_message = await rate_limiter.check_rate_limit(
-                user_id, estimated_cost
-            )
-            if not allowed:
-                await update.message.reply_text(f"⏱️ {limit_message}")
-                return
+        reservation = await _reserve_rate_limit(
+            update, context, rate_limiter, _estimate_text_processing_cost(message_text)
+        )
+        if reservation is not None and not reservation.allowed:
+            return
 
         # Send typing indicator
         await update.message.chat.send_action("typing")
@@ -365,29 +363,38 @@ async def handle_text_message(
 
         tool_tracker = ToolExecutionTracker()
 
-        # Track last progress text to avoid duplicate edits
-        last_progress_text = None
+        # Progress edits are merged and rate limited off the stream path
+        progress = ProgressEditor(
+            progress_msg, interval_ms=settings.progress_edit_interval_ms
+        )
 
         # Enhanced stream updates handler with progress tracking
         async def stream_handler(update_obj):
-            nonlocal last_progress_text
             try:
                 progress_text = await _format_progress_update(update_obj, tracker=tool_tracker)
-                if progress_text and progress_text != last_progress_text:
-                    await progress_msg.edit_text(progress_text, parse_mode="Markdown")
-                    last_progress_text = progress_text
+                if progress_text:
+                    progress.update(progress_text)
             except Exception as e:
                 logger.warning("Failed to update progress message", error=str(e))
 
         # Run Claude command
         try:
-            claude_response = await claude_integration.run_command(
-                prompt=message_text,
-                working_directory=current_dir,
-                user_id=user_id,
-                session_id=session_id,
-                on_stream=stream_handler,
-            )
+            try:
+                claude_response = await claude_integration.run_command(
+                    prompt=message_text,
+                    working_directory=current_dir,
+                    user_id=user_id,
+                    session_id=session_id,
+                    on_stream=stream_handler,
+                )
+            finally:
+                # The progress message is deleted below; don't edit it again
+                await progress.close(flush=False)
+                logger.debug(
+                    "Progress edits", user_id=user_id, **progress.get_stats()
+                )
+            if reservation is not None:
+                await reservation.commit(claude_response.cost)
 
             # Update session ID
             context.user_data["claude_session_id"] = claude_response.session_id
@@ -440,6 +447,7 @@ async def handle_text_message(
                 )
 
         except ClaudeToolValidationError as e:
+            await _charge_failed_run(reservation, e)
             # Tool validation error with detailed instructions
             logger.error(
                 "Tool validation error",
@@ -452,6 +460,7 @@ async def handle_text_message(
 
             formatted_messages = [FormattedMessage(str(e), parse_mode="Markdown")]
         except Exception as e:
+            await _charge_failed_run(reservation, e)
             logger.error("Claude integration failed", error=str(e), user_id=user_id)
             # Format error and create FormattedMessage
             from ..utils.formatting import FormattedMessage
@@ -565,6 +574,10 @@ async def handle_text_message(
             "Error processing text message",
             extra={"user_id": user_id, "error_type": type(e).__name__}
         )
+    finally:
+        # Refund the estimate if Claude never reported a cost
+        if reservation is not None:
+            await reservation.release()
 
 
 async def handle_document(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -587,6 +600,7 @@ async def handle_document(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         file_size=document.file_size,
     )
 
+    reservation: Optional[RateLimitReservation] = None
     try:
         # Validate filename using security validator
         if security_validator:
@@ -616,15 +630,15 @@ async def handle_document(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
             )
             return
 
-        # Check rate limit for file processing
-        file_cost = _estimate_file_processing_cost(document.file_size)
-        if rate_limiter:
-            allowed, limit_message = await rate_limiter.check_rate_limit(
-                user_id, file_cost
-            )
-            if not allowed:
-                await update.message.reply_text(f"⏱️ {limit_message}")
-                return
+        # Only files that will be processed count against the limits
+        reservation = await _reserve_rate_limit(
+            update,
+            context,
+            rate_limiter,
+            _estimate_file_processing_cost(document.file_size),
+        )
+        if reservation is not None and not reservation.allowed:
+            return
 
         # Send processing indicator
         await update.message.chat.send_action("upload_document")
@@ -726,6 +740,8 @@ async def handle_document(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
                 user_id=user_id,
                 session_id=session_id,
             )
+            if reservation is not None:
+                await reservation.commit(claude_response.cost)
 
             # Update session ID
             context.user_data["claude_session_id"] = claude_response.session_id
@@ -759,6 +775,7 @@ async def handle_document(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
                     await asyncio.sleep(1.5)
 
         except Exception as e:
+            await _charge_failed_run(reservation, e)
             await claude_progress_msg.edit_text(
                 _format_error_message(str(e)), parse_mode="Markdown"
             )
@@ -802,6 +819,10 @@ async def handle_document(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
             )
 
         logger.error("Error processing document", error=str(e), user_id=user_id)
+    finally:
+        # Refund the estimate if Claude never reported a cost
+        if reservation is not None:
+            await reservation.release()
 
 
 async def handle_photo(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -919,6 +940,55 @@ async def handle_photo(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
         )
 
 
+async def _reserve_rate_limit(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE,
+    rate_limiter: Optional[RateLimiter],
+    estimated_cost: float,
+) -> Optional[RateLimitReservation]:
+    """Claim this update's rate limit reservation, or make one.
+
+    The rate limit middleware normally reserved (and replied to a
+    rejection) already, holding only its generic per-message estimate;
+    the claimed reservation is topped up with ``estimated_cost`` so the
+    cost limit sees both. Only reserve here when the middleware did not
+    run.
+    """
+    reservation = take_reservation(context)
+    if reservation is not None:
+        if reservation.allowed and not await reservation.top_up(estimated_cost):
+            if update.message is not None:
+                await update.message.reply_text(f"⏱️ {reservation.message}")
+        return reservation
+
+    user = update.effective_user
+    if rate_limiter is None or user is None:
+        return None
+
+    settings: Settings = context.bot_data["settings"]
+    user_data = context.user_data or {}
+    reservation = await rate_limiter.reserve(
+        user.id,
+        estimated_cost,
+        project=str(user_data.get("current_directory", settings.approved_directory)),
+    )
+    if not reservation.allowed and update.message is not None:
+        await update.message.reply_text(f"⏱️ {reservation.message}")
+    return reservation
+
+
+async def _charge_failed_run(
+    reservation: Optional[RateLimitReservation], error: Exception
+) -> None:
+    """Charge what a failed Claude run had spent, when it reported it.
+
+    Otherwise the reservation is left to be released.
+    """
+    cost = getattr(error, "cost", None)
+    if reservation is not None and cost is not None:
+        await reservation.commit(cost)
+
+
 def _estimate_text_processing_cost(text: str) -> float:
     """Estimate cost for processing text message."""
     # Base cost
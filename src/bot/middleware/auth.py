@@ -12,10 +12,12 @@ async def auth_middleware(handler: Callable, event: Any, data: Dict[str, Any]) -
     """Check authentication before processing messages.
 
     This middleware:
-    1. Checks if user is authenticated
-    2. Attempts authentication if not authenticated
-    3. Updates session activity
-    4. Logs authentication events
+    1. Reuses the user's recent decision, if any (repeated denials are
+       dropped without another audit record or reply)
+    2. Checks if user is authenticated
+    3. Attempts authentication if not authenticated
+    4. Updates session activity
+    5. Logs authentication events
     """
     # Extract user information
     user_id = event.effective_user.id if event.effective_user else None
@@ -41,17 +43,27 @@ async def auth_middleware(handler: Callable, event: Any, data: Dict[str, Any]) -
             )
         return
 
-    # Check if user is already authenticated
-    if auth_manager.is_authenticated(user_id):
-        # Update session activity
-        if auth_manager.refresh_session(user_id):
-            session = auth_manager.get_session(user_id)
-            logger.debug(
-                "Session refreshed",
-                user_id=user_id,
-                username=username,
-                auth_provider=session.auth_provider if session else None,
-            )
+    # Allowed within the last few seconds: the session is live and was
+    # refreshed then, so there is nothing more to check
+    decision = auth_manager.get_cached_decision(user_id)
+    if decision:
+        return await handler(event, data)
+
+    # Turned away moments ago, which was audited and answered then; drop
+    # the repeats quietly rather than asking the providers again
+    if decision is False:
+        logger.debug("Authentication denied from cache", user_id=user_id)
+        return
+
+    # Check if user is already authenticated, updating session activity
+    if auth_manager.refresh_session(user_id):
+        session = auth_manager.sessions.get(user_id)
+        logger.debug(
+            "Session refreshed",
+            user_id=user_id,
+            username=username,
+            auth_provider=session.auth_provider if session else None,
+        )
 
         # Continue to handler
         return await handler(event, data)
@@ -84,8 +96,7 @@ async def auth_middleware(handler: Callable, event: Any, data: Dict[str, Any]) -
 
         # Welcome message for new session - but NOT for callback queries
         # Callback queries are button presses, not new text messages
-        from telegram import CallbackQuery
-        is_callback = isinstance(event, CallbackQuery)
+        is_callback = getattr(event, "callback_query", None) is not None
 
         if event.effective_message and not is_callback:
             await event.effective_message.reply_text(
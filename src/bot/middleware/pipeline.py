@@ -0,0 +1,102 @@
+"""Composed middleware chain for Telegram updates.
+
+Features:
+- Middleware functions chained once, run as one handler per update
+- Short-circuits as soon as a stage does not call on
+- Per-stage timing histograms and rejection counts
+"""
+
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Sequence, Tuple
+
+import structlog
+
+from ...utils.histogram import LatencyHistogram
+
+logger = structlog.get_logger()
+
+Handler = Callable[[Any, Dict[str, Any]], Awaitable[Any]]
+Middleware = Callable[[Handler, Any, Dict[str, Any]], Awaitable[Any]]
+
+# Returned through the chain when every stage called on
+_PASSED = object()
+
+
+class MiddlewarePipeline:
+    """Runs ``(handler, event, data)`` middleware functions as one chain.
+
+    Each stage receives the next stage as its ``handler``; a stage that
+    returns without calling it rejects the update and later stages do
+    not run. Stage timings exclude the time spent in later stages.
+    """
+
+    def __init__(self, stages: Sequence[Tuple[str, Middleware]]):
+        if not stages:
+            raise ValueError("pipeline needs at least one stage")
+
+        self.stage_names = [name for name, _ in stages]
+        self.histograms: Dict[str, LatencyHistogram] = {
+            name: LatencyHistogram() for name in self.stage_names
+        }
+        self.total = LatencyHistogram()
+        self.rejections: Dict[str, int] = {name: 0 for name in self.stage_names}
+        self.updates = 0
+        self.passed = 0
+
+        chain: Handler = self._done
+        for name, middleware in reversed(stages):
+            chain = self._stage(name, middleware, chain)
+        self._chain = chain
+
+    @staticmethod
+    async def _done(event: Any, data: Dict[str, Any]) -> Any:
+        return _PASSED
+
+    def _stage(self, name: str, middleware: Middleware, next_stage: Handler) -> Handler:
+        histogram = self.histograms[name]
+        perf_counter = time.perf_counter
+
+        async def stage(event: Any, data: Dict[str, Any]) -> Any:
+            downstream: List[float] = []
+
+            async def call_next(event: Any, data: Dict[str, Any]) -> Any:
+                started = perf_counter()
+                try:
+                    return await next_stage(event, data)
+                finally:
+                    downstream.append(perf_counter() - started)
+
+            started = perf_counter()
+            try:
+                result = await middleware(call_next, event, data)
+            finally:
+                histogram.observe(perf_counter() - started - sum(downstream))
+            if not downstream:
+                self.rejections[name] += 1
+            return result
+
+        return stage
+
+    async def run(self, event: Any, data: Dict[str, Any]) -> bool:
+        """Run every stage; True if the update should reach the handlers."""
+        self.updates += 1
+        started = time.perf_counter()
+        try:
+            passed = await self._chain(event, data) is _PASSED
+        finally:
+            self.total.observe(time.perf_counter() - started)
+        if passed:
+            self.passed += 1
+        return passed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Update counts and per-stage timings."""
+        return {
+            "updates": self.updates,
+            "passed": self.passed,
+            "rejected": dict(self.rejections),
+            "total": self.total.snapshot(),
+            "stages": {
+                name: self.histograms[name].snapshot() for name in self.stage_names
+            },
+        }
@@ -1,11 +1,24 @@
 """Rate limiting middleware for Telegram bot."""
 
-from typing import Any, Callable, Dict
+from typing import Any, Callable, Dict, Optional
 
 import structlog
 
+from ...security.rate_limiter import RateLimitReservation
+
 logger = structlog.get_logger()
 
+# Attribute on the per-update CallbackContext holding the reservation
+RESERVATION_ATTR = "rate_limit_reservation"
+
+
+def take_reservation(context: Any) -> Optional[RateLimitReservation]:
+    """Claim the reservation the middleware made for this update."""
+    reservation = getattr(context, RESERVATION_ATTR, None)
+    if reservation is not None:
+        setattr(context, RESERVATION_ATTR, None)
+    return reservation
+
 
 async def rate_limit_middleware(
     handler: Callable, event: Any, data: Dict[str, Any]
@@ -14,9 +27,12 @@ async def rate_limit_middleware(
 
     This middleware:
     1. Checks request rate limits
-    2. Estimates and checks cost limits
+    2. Estimates and reserves cost
     3. Logs rate limit violations
     4. Provides helpful error messages
+
+    The reservation (allowed or not) is attached to the update's context
+    so handlers can settle it with the real cost instead of checking again.
     """
     user_id = event.effective_user.id if event.effective_user else None
     username = (
@@ -41,12 +57,26 @@ async def rate_limit_middleware(
     # Estimate cost based on message content and type
     estimated_cost = estimate_message_cost(event)
 
-    # Check rate limits
-    allowed, message = await rate_limiter.check_rate_limit(
-        user_id=user_id, cost=estimated_cost, tokens=1  # One token per message
+    context = data.get("context")
+    project = None
+    settings = data.get("settings")
+    if context is not None and context.user_data is not None and settings:
+        project = str(
+            context.user_data.get("current_directory", settings.approved_directory)
+        )
+
+    # Check rate limits and hold the estimated cost
+    reservation = await rate_limiter.reserve(
+        user_id=user_id,
+        cost=estimated_cost,
+        tokens=1,  # One token per message
+        project=project,
     )
+    if context is not None:
+        setattr(context, RESERVATION_ATTR, reservation)
 
-    if not allowed:
+    message = reservation.message
+    if not reservation.allowed:
         logger.warning(
             "Rate limit exceeded",
             user_id=user_id,
@@ -90,12 +120,16 @@ def estimate_message_cost(event: Any) -> float:
     - Content complexity
     - Expected Claude usage
     """
-    message = event.effective_message
-    message_text = message.text if message else ""
-
     # Base cost for any message
     base_cost = 0.01
 
+    # A button press: the attached message is the bot's own
+    if getattr(event, "callback_query", None) is not None:
+        return base_cost
+
+    message = event.effective_message
+    message_text = message.text if message else ""
+
     # Additional cost based on message length
     length_cost = len(message_text) * 0.0001
 
@@ -1,11 +1,104 @@
 """Security middleware for input validation and threat detection."""
 
-from typing import Any, Callable, Dict
+import re
+import time
+from typing import Any, Callable, Dict, List, Optional
 
 import structlog
 
+from ...security.patterns import ContentScanner
+
 logger = structlog.get_logger()
 
+# Command injection patterns
+INJECTION_PATTERNS = [
+    r";\s*rm\s+",
+    r";\s*del\s+",
+    r";\s*format\s+",
+    r"`[^`]*`",
+    r"\$\([^)]*\)",
+    r"&&\s*rm\s+",
+    r"\|\s*mail\s+",
+    r">\s*/dev/",
+    r"curl\s+.*\|\s*sh",
+    r"wget\s+.*\|\s*sh",
+    r"exec\s*\(",
+    r"eval\s*\(",
+]
+
+# Path traversal attempts (case sensitive)
+PATH_TRAVERSAL_PATTERNS = [
+    r"\.\./.*",
+    r"~\/.*",
+    r"\/etc\/.*",
+    r"\/var\/.*",
+    r"\/usr\/.*",
+    r"\/sys\/.*",
+    r"\/proc\/.*",
+]
+
+# Suspicious URLs or domains
+SUSPICIOUS_URL_PATTERNS = [
+    r"https?://[^/]*\.ru/",
+    r"https?://[^/]*\.tk/",
+    r"https?://[^/]*\.ml/",
+    r"https?://bit\.ly/",
+    r"https?://tinyurl\.com/",
+    r"javascript:",
+    r"data:text/html",
+]
+
+# Commands that might indicate reconnaissance
+RECON_PATTERNS = [
+    r"ls\s+/",
+    r"find\s+/",
+    r"locate\s+",
+    r"which\s+",
+    r"whereis\s+",
+    r"ps\s+",
+    r"netstat\s+",
+    r"lsof\s+",
+    r"env\s*$",
+    r"printenv\s*$",
+    r"whoami\s*$",
+    r"id\s*$",
+    r"uname\s+",
+    r"cat\s+/etc/",
+    r"cat\s+/proc/",
+]
+
+# Every message is classified against all categories in one call
+MESSAGE_SCANNER = ContentScanner(
+    {
+        "injection": (INJECTION_PATTERNS, re.IGNORECASE),
+        "path_traversal": (PATH_TRAVERSAL_PATTERNS, 0),
+        "suspicious_url": (SUSPICIOUS_URL_PATTERNS, re.IGNORECASE),
+        "recon": (RECON_PATTERNS, re.IGNORECASE),
+    }
+)
+
+# Key in the per-update middleware data holding (text, scan result)
+SCAN_DATA_KEY = "message_scan"
+
+
+def scan_message(
+    text: str, data: Optional[Dict[str, Any]] = None
+) -> Dict[str, List[str]]:
+    """Classify message text, reusing the result for the same text.
+
+    Both middlewares see the same message text in turn; the result is
+    kept in the update's middleware ``data`` so it is scanned only once.
+    """
+    cached = data.get(SCAN_DATA_KEY) if data is not None else None
+    if cached is not None and cached[0] == text:
+        result: Dict[str, List[str]] = cached[1]
+        return result
+
+    result = MESSAGE_SCANNER.scan(text)
+    if data is not None:
+        data[SCAN_DATA_KEY] = (text, result)
+    return result
+
 
 async def security_middleware(
     handler: Callable, event: Any, data: Dict[str, Any]
@@ -38,11 +131,14 @@ async def security_middleware(
         # Continue without validation (log error but don't block)
         return await handler(event, data)
 
-    # Validate text content if present
-    message = event.effective_message
+    # Validate text content if present. A callback query's message is
+    # the bot's own; its handlers validate the button data themselves
+    message = (
+        None if getattr(event, "callback_query", None) else event.effective_message
+    )
     if message and message.text:
         is_safe, violation_type = await validate_message_content(
-            message.text, security_validator, user_id, audit_logger
+            message.text, security_validator, user_id, audit_logger, data
         )
         if not is_safe:
             await message.reply_text(
@@ -80,105 +176,73 @@ async def security_middleware(
 
 
 async def validate_message_content(
-    text: str, security_validator: Any, user_id: int, audit_logger: Any
+    text: str,
+    security_validator: Any,
+    user_id: int,
+    audit_logger: Any,
+    data: Optional[Dict[str, Any]] = None,
 ) -> tuple[bool, str]:
     """Validate message text content for security threats."""
+    findings = scan_message(text, data)
 
     # Check for command injection patterns
-    dangerous_patterns = [
-        r";\s*rm\s+",
-        r";\s*del\s+",
-        r";\s*format\s+",
-        r"`[^`]*`",
-        r"\$\([^)]*\)",
-        r"&&\s*rm\s+",
-        r"\|\s*mail\s+",
-        r">\s*/dev/",
-        r"curl\s+.*\|\s*sh",
-        r"wget\s+.*\|\s*sh",
-        r"exec\s*\(",
-        r"eval\s*\(",
-    ]
-
-    import re
-
-    for pattern in dangerous_patterns:
-        if re.search(pattern, text, re.IGNORECASE):
-            if audit_logger:
-                await audit_logger.log_security_violation(
-                    user_id=user_id,
-                    violation_type="command_injection_attempt",
-                    details=f"Dangerous pattern detected: {pattern}",
-                    severity="high",
-                    attempted_action="message_send",
-                )
-
-            logger.warning(
-                "Command injection attempt detected",
+    if findings["injection"]:
+        pattern = findings["injection"][0]
+        if audit_logger:
+            await audit_logger.log_security_violation(
                 user_id=user_id,
-                pattern=pattern,
-                text_preview=text[:100],
+                violation_type="command_injection_attempt",
+                details=f"Dangerous pattern detected: {pattern}",
+                severity="high",
+                attempted_action="message_send",
             )
-            return False, "Command injection attempt"
-
-    # Check for path traversal attempts
-    path_traversal_patterns = [
-        r"\.\./.*",
-        r"~\/.*",
-        r"\/etc\/.*",
-        r"\/var\/.*",
-        r"\/usr\/.*",
-        r"\/sys\/.*",
-        r"\/proc\/.*",
-    ]
 
-    for pattern in path_traversal_patterns:
-        if re.search(pattern, text):
-            if audit_logger:
-                await audit_logger.log_security_violation(
-                    user_id=user_id,
-                    violation_type="path_traversal_attempt",
-                    details=f"Path traversal pattern detected: {pattern}",
-                    severity="high",
-                    attempted_action="message_send",
-                )
+        logger.warning(
+            "Command injection attempt detected",
+            user_id=user_id,
+            pattern=pattern,
+            text_preview=text[:100],
+        )
+        return False, "Command injection attempt"
 
-            logger.warning(
-                "Path traversal attempt detected",
+    # Check for path traversal attempts
+    if findings["path_traversal"]:
+        pattern = findings["path_traversal"][0]
+        if audit_logger:
+            await audit_logger.log_security_violation(
                 user_id=user_id,
-                pattern=pattern,
-                text_preview=text[:100],
+                violation_type="path_traversal_attempt",
+                details=f"Path traversal pattern detected: {pattern}",
+                severity="high",
+                attempted_action="message_send",
             )
-            return False, "Path traversal attempt"
 
-    # Check for suspicious URLs or domains
-    suspicious_patterns = [
-        r"https?://[^/]*\.ru/",
-        r"https?://[^/]*\.tk/",
-        r"https?://[^/]*\.ml/",
-        r"https?://bit\.ly/",
-        r"https?://tinyurl\.com/",
-        r"javascript:",
-        r"data:text/html",
-    ]
+        logger.warning(
+            "Path traversal attempt detected",
+            user_id=user_id,
+            pattern=pattern,
+            text_preview=text[:100],
+        )
+        return False, "Path traversal attempt"
 
-    for pattern in suspicious_patterns:
-        if re.search(pattern, text, re.IGNORECASE):
-            if audit_logger:
-                await audit_logger.log_security_violation(
-                    user_id=user_id,
-                    violation_type="suspicious_url",
-                    details=f"Suspicious URL pattern detected: {pattern}",
-                    severity="medium",
-                    attempted_action="message_send",
-                )
+    # Check for suspicious URLs or domains
+    if findings["suspicious_url"]:
+        pattern = findings["suspicious_url"][0]
+        if audit_logger:
+            await audit_logger.log_security_violation(
+                user_id=user_id,
+                violation_type="suspicious_url",
+                details=f"Suspicious URL pattern detected: {pattern}",
+                severity="medium",
+                attempted_action="message_send",
+            )
 
-            logger.warning("Suspicious URL detected", user_id=user_id, pattern=pattern)
-            return False, "Suspicious URL detected"
+        logger.warning("Suspicious URL detected", user_id=user_id, pattern=pattern)
+        return False, "Suspicious URL detected"
 
-    # Sanitize content using security validator
-    sanitized = security_validator.sanitize_command_input(text)
-    if len(sanitized) < len(text) * 0.5:  # More than 50% removed
+    # Check how much of the content sanitization would strip
+    unsafe = security_validator.count_unsafe_characters(text)
+    if unsafe > len(text) * 0.5:  # More than 50% dangerous
         if audit_logger:
             await audit_logger.log_security_violation(
                 user_id=user_id,
@@ -192,7 +256,7 @@ async def validate_message_content(
             "Excessive content sanitization required",
             user_id=user_id,
             original_length=len(text),
-            sanitized_length=len(sanitized),
+            unsafe_characters=unsafe,
         )
         return False, "Content contains too many dangerous characters"
 
@@ -306,8 +370,11 @@ async def threat_detection_middleware(
 
     audit_logger = data.get("audit_logger")
 
-    # Track user behavior patterns
-    user_behavior = data.setdefault("user_behavior", {})
+    # Track user behavior patterns across updates in bot_data (``data``
+    # itself is a fresh copy for each update)
+    context = data.get("context")
+    store = context.bot_data if context is not None else data
+    user_behavior = store.setdefault("user_behavior", {})
     user_data = user_behavior.setdefault(
         user_id,
         {
@@ -319,8 +386,6 @@ async def threat_detection_middleware(
         },
     )
 
-    import time
-
     current_time = time.time()
 
     if user_data["first_seen"] is None:
@@ -333,29 +398,7 @@ async def threat_detection_middleware(
     text = message.text if message else ""
 
     # Suspicious commands that might indicate reconnaissance
-    recon_patterns = [
-        r"ls\s+/",
-        r"find\s+/",
-        r"locate\s+",
-        r"which\s+",
-        r"whereis\s+",
-        r"ps\s+",
-        r"netstat\s+",
-        r"lsof\s+",
-        r"env\s*$",
-        r"printenv\s*$",
-        r"whoami\s*$",
-        r"id\s*$",
-        r"uname\s+",
-        r"cat\s+/etc/",
-        r"cat\s+/proc/",
-    ]
-
-    import re
-
-    recon_attempts = sum(
-        1 for pattern in recon_patterns if re.search(pattern, text, re.IGNORECASE)
-    )
+    recon_attempts = len(scan_message(text, data)["recon"]) if text else 0
 
     if recon_attempts > 0:
         user_data["recon_attempts"] = (
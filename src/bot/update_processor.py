@@ -0,0 +1,123 @@
+"""Concurrent update processing with per-chat ordering.
+
+Features:
+- Updates from different chats are processed in parallel
+- Updates within one chat (messages and button presses alike) are
+  processed one at a time, in arrival order
+- A global bound on updates running at once
+- Queue-wait timings and backlog statistics
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Dict, Hashable, List, Optional
+
+from telegram.ext import BaseUpdateProcessor
+
+from ..utils.histogram import LatencyHistogram
+
+
+class ChatOrderedUpdateProcessor(BaseUpdateProcessor):
+    """Runs up to ``max_running`` updates at once, one per chat at a time.
+
+    python-telegram-bot holds one of its ``max_pending`` slots for every
+    update from arrival until it finishes. The chat's turn is awaited
+    before taking one of the ``max_running`` slots, so a user with a
+    backlog of messages queues behind their own running update instead
+    of occupying slots other users need. Callback queries (button
+    presses) wait their turn too: their handlers change the same
+    per-user state (directory, session) a running request writes back.
+    """
+
+    __slots__ = (
+        "max_running",
+        "_running",
+        "_chats",
+        "wait_times",
+        "running",
+        "processed",
+        "failed",
+        "max_backlog",
+    )
+
+    def __init__(self, max_running: int, max_pending: int = 1024):
+        if max_running < 1:
+            raise ValueError("max_running must be at least 1")
+        super().__init__(max(max_pending, max_running))
+        self.max_running = max_running
+        self._running = asyncio.BoundedSemaphore(max_running)
+        # chat key -> [lock, updates holding or waiting for it]
+        self._chats: Dict[Hashable, List[Any]] = {}
+        self.wait_times = LatencyHistogram()
+        self.running = 0
+        self.processed = 0
+        self.failed = 0
+        self.max_backlog = 0
+
+    @staticmethod
+    def ordering_key(update: object) -> Optional[Hashable]:
+        """Chat (or user) whose updates must stay in order; None for none."""
+        chat = getattr(update, "effective_chat", None)
+        if chat is not None:
+            chat_id: int = chat.id
+            return chat_id
+        user = getattr(update, "effective_user", None)
+        return ("user", user.id) if user is not None else None
+
+    async def do_process_update(
+        self, update: object, coroutine: Awaitable[Any]
+    ) -> None:
+        """Wait for the chat's turn and a free slot, then run the update."""
+        key = self.ordering_key(update)
+        arrived = time.perf_counter()
+
+        if key is None:
+            await self._run(coroutine, arrived)
+            return
+
+        entry = self._chats.get(key)
+        if entry is None:
+            entry = self._chats[key] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        if entry[1] > self.max_backlog:
+            self.max_backlog = entry[1]
+        try:
+            async with entry[0]:
+                await self._run(coroutine, arrived)
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self._chats[key]
+
+    async def _run(self, coroutine: Awaitable[Any], arrived: float) -> None:
+        async with self._running:
+            self.wait_times.observe(time.perf_counter() - arrived)
+            self.running += 1
+            try:
+                await coroutine
+            except Exception:
+                # Handler errors are reported by the application already
+                self.failed += 1
+                raise
+            finally:
+                self.running -= 1
+                self.processed += 1
+
+    async def initialize(self) -> None:
+        """Nothing to allocate."""
+
+    async def shutdown(self) -> None:
+        """Nothing to free; in-flight updates finish on their own."""
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Concurrency statistics."""
+        return {
+            "max_running": self.max_running,
+            "running": self.running,
+            "pending": self.current_concurrent_updates,
+            "chats_active": len(self._chats),
+            "max_backlog": self.max_backlog,
+            "processed": self.processed,
+            "failed": self.failed,
+            "wait": self.wait_times.snapshot(),
+        }
@@ -0,0 +1,153 @@
+"""Which update types the bot handles.
+
+Features:
+- Derives ``allowed_updates`` from the registered handlers
+- Counts received updates by type
+- Counts updates no handler would consume, which are dropped early
+"""
+
+from collections import Counter
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set
+
+from telegram import Update
+from telegram.ext import BaseHandler, CallbackQueryHandler, filters
+from telegram.ext.filters import BaseFilter, MessageFilter
+
+ALL_TYPES: FrozenSet[str] = frozenset(Update.ALL_TYPES)
+
+# Guest messages only exist from python-telegram-bot 22.8
+_GUEST_MESSAGE: Optional[str] = getattr(Update, "GUEST_MESSAGE", None)
+_GUEST_MESSAGE_FILTER: Optional[BaseFilter] = getattr(
+    filters.UpdateType, "GUEST_MESSAGE", None
+)
+
+# Updates carrying a message, i.e. what message filters look at
+MESSAGE_TYPES: FrozenSet[str] = frozenset(
+    {
+        Update.MESSAGE,
+        Update.EDITED_MESSAGE,
+        Update.CHANNEL_POST,
+        Update.EDITED_CHANNEL_POST,
+        Update.BUSINESS_MESSAGE,
+        Update.EDITED_BUSINESS_MESSAGE,
+    }
+    | ({_GUEST_MESSAGE} if _GUEST_MESSAGE else set())
+)
+
+_UPDATE_TYPE_FILTERS: Dict[BaseFilter, Set[str]] = {
+    filters.UpdateType.MESSAGE: {Update.MESSAGE},
+    filters.UpdateType.EDITED_MESSAGE: {Update.EDITED_MESSAGE},
+    filters.UpdateType.MESSAGES: {Update.MESSAGE, Update.EDITED_MESSAGE},
+    filters.UpdateType.CHANNEL_POST: {Update.CHANNEL_POST},
+    filters.UpdateType.EDITED_CHANNEL_POST: {Update.EDITED_CHANNEL_POST},
+    filters.UpdateType.CHANNEL_POSTS: {
+        Update.CHANNEL_POST,
+        Update.EDITED_CHANNEL_POST,
+    },
+    filters.UpdateType.BUSINESS_MESSAGE: {Update.BUSINESS_MESSAGE},
+    filters.UpdateType.EDITED_BUSINESS_MESSAGE: {Update.EDITED_BUSINESS_MESSAGE},
+    filters.UpdateType.BUSINESS_MESSAGES: {
+        Update.BUSINESS_MESSAGE,
+        Update.EDITED_BUSINESS_MESSAGE,
+    },
+    filters.UpdateType.EDITED: {
+        Update.EDITED_MESSAGE,
+        Update.EDITED_CHANNEL_POST,
+        Update.EDITED_BUSINESS_MESSAGE,
+    },
+}
+if _GUEST_MESSAGE and _GUEST_MESSAGE_FILTER is not None:
+    _UPDATE_TYPE_FILTERS[_GUEST_MESSAGE_FILTER] = {_GUEST_MESSAGE}
+
+
+def filter_update_types(update_filter: BaseFilter) -> FrozenSet[str]:
+    """Update types a filter can match.
+
+    Exact for ``filters.UpdateType`` and ``&``/``|`` combinations of
+    them; any other filter is assumed to match whatever it could see
+    (every message update for message filters, anything otherwise).
+    """
+    known = _UPDATE_TYPE_FILTERS.get(update_filter)
+    if known is not None:
+        return frozenset(known)
+
+    # ``a & b`` and ``a | b`` (``~a`` and ``a ^ b`` fall through below).
+    # ``_MergedFilter`` is private to python-telegram-bot; the tests pin
+    # the attributes used here so an upgrade that changes them fails there.
+    if isinstance(update_filter, filters._MergedFilter):
+        base = filter_update_types(update_filter.base_filter)
+        if update_filter.and_filter is not None:
+            return base & filter_update_types(update_filter.and_filter)
+        if update_filter.or_filter is not None:
+            return base | filter_update_types(update_filter.or_filter)
+
+    if isinstance(update_filter, MessageFilter):
+        return MESSAGE_TYPES
+    return ALL_TYPES
+
+
+def handler_update_types(handler: BaseHandler) -> FrozenSet[str]:
+    """Update types a handler can consume."""
+    if isinstance(handler, CallbackQueryHandler):
+        return frozenset({Update.CALLBACK_QUERY})
+    handler_filter = getattr(handler, "filters", None)
+    if isinstance(handler_filter, BaseFilter):
+        return filter_update_types(handler_filter)
+    return ALL_TYPES
+
+
+def allowed_update_types(handlers: Iterable[BaseHandler]) -> List[str]:
+    """``allowed_updates`` covering every given handler, in API order."""
+    wanted: Set[str] = set()
+    for handler in handlers:
+        wanted |= handler_update_types(handler)
+    return [update_type for update_type in Update.ALL_TYPES if update_type in wanted]
+
+
+def update_type(update: Update) -> Optional[str]:
+    """The update's type, e.g. ``"message"`` or ``"callback_query"``."""
+    for name in Update.ALL_TYPES:
+        if getattr(update, name, None) is not None:
+            return name
+    return None
+
+
+class UpdateTypeStats:
+    """Counts updates by type and drops those no handler consumes.
+
+    Telegram only sends the types in ``allowed_updates``, but updates
+    queued before the list changed (or delivered by a webhook someone
+    else registered) can still arrive; they are counted and stopped
+    before any middleware runs.
+    """
+
+    def __init__(self, allowed: Iterable[str]):
+        self.allowed = frozenset(allowed)
+        self.received: Counter = Counter()
+        self.dropped: Counter = Counter()
+
+    def accept(self, update: Update) -> bool:
+        """Count the update; False if it should be dropped.
+
+        Updates of a type this library version doesn't know are let
+        through for the handlers to judge.
+        """
+        name = update_type(update)
+        if name is None:
+            self.received["unknown"] += 1
+            return True
+        self.received[name] += 1
+        if name in self.allowed:
+            return True
+        self.dropped[name] += 1
+        return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Received and dropped counts by update type."""
+        return {
+            "allowed": sorted(self.allowed),
+            "received": dict(self.received),
+            "dropped": dict(self.dropped),
+            "total_received": sum(self.received.values()),
+            "total_dropped": sum(self.dropped.values()),
+        }
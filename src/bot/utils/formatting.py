@@ -7,6 +7,7 @@ from typing import Any, List, Optional
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 
 from ...config.settings import Settings
+from ...utils.message_splitter import split_message
 
 
 @dataclass
@@ -537,86 +538,11 @@ class ResponseFormatter:
 
     def _split_message(self, text: str) -> List[FormattedMessage]:
         """Split long messages while preserving formatting."""
-        # Return empty list for empty/whitespace-only text to trigger fallback
-        if not text or not text.strip():
-            return []
-
-        if len(text) <= self.max_message_length:
-            return [FormattedMessage(text)]
-
-        messages = []
-        current_lines = []
-        current_length = 0
-        in_code_block = False
-
-        lines = text.split("\n")
-
-        for line in lines:
-            line_length = len(line) + 1  # +1 for newline
-
-            # Check for code block markers
-            if line.strip() == "```":
-                in_code_block = not in_code_block
-
-            # If this is a very long line that exceeds limit by itself, split it
-            if line_length > self.max_message_length:
-                # Split the line into chunks
-                chunks = []
-                for i in range(0, len(line), self.max_message_length - 100):
-                    chunks.append(line[i : i + self.max_message_length - 100])
-
-                for chunk in chunks:
-                    chunk_length = len(chunk) + 1
-
-                    if (
-                        current_length + chunk_length > self.max_message_length
-                        and current_lines
-                    ):
-                        # Save current message
-                        if in_code_block:
-                            current_lines.append("```")
-                        messages.append(FormattedMessage("\n".join(current_lines)))
-
-                        # Start new message
-                        current_lines = []
-                        current_length = 0
-                        if in_code_block:
-                            current_lines.append("```")
-                            current_length = 4
-
-                    current_lines.append(chunk)
-                    current_length += chunk_length
-                continue
-
-            # Check if adding this line would exceed the limit
-            if current_length + line_length > self.max_message_length and current_lines:
-                # Close code block if we're in one
-                if in_code_block:
-                    current_lines.append("```")
-
-                # Save current message
-                messages.append(FormattedMessage("\n".join(current_lines)))
-
-                # Start new message
-                current_lines = []
-                current_length = 0
-
-                # Reopen code block if needed
-                if in_code_block:
-                    current_lines.append("```")
-                    current_length = 4  # Length of '```\n'
-
-            current_lines.append(line)
-            current_length += line_length
-
-        # Add remaining content
-        if current_lines:
-            # Close code block if needed
-            if in_code_block:
-                current_lines.append("```")
-            messages.append(FormattedMessage("\n".join(current_lines)))
-
-        return messages
+        # Empty/whitespace-only text yields no messages to trigger fallback
+        return [
+            FormattedMessage(chunk)
+            for chunk in split_message(text, self.max_message_length)
+        ]
 
     def _get_quick_actions_keyboard(self) -> InlineKeyboardMarkup:
         """Get quick actions inline keyboard."""
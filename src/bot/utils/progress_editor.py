@@ -0,0 +1,156 @@
+"""Throttled editing of progress messages.
+
+Features:
+- Coalesces progress updates; only the latest text is sent
+- At most one edit per interval, sent from a background task
+- Honours Telegram's retry_after on flood control
+- Flushes the final state on close
+"""
+
+import asyncio
+from datetime import timedelta
+from typing import Any, Dict, Optional
+
+import structlog
+from telegram import Message
+from telegram.error import BadRequest, RetryAfter
+
+logger = structlog.get_logger()
+
+
+class ProgressEditor:
+    """Keeps a progress message showing the latest text, within limits.
+
+    ``update`` never waits on the network: it records the text and wakes
+    a background task that edits the message at most once every
+    ``interval_ms``, skipping any texts superseded in between. When
+    Telegram answers with flood control the task waits the requested
+    time and sends whatever is latest by then. Since a chat's prompts run
+    one at a time, this is also the edit rate for the chat.
+
+    ``close`` stops the task. By default it first sends the latest text
+    if it is not shown yet, without waiting out the interval (only a
+    pending ``retry_after``).
+    """
+
+    def __init__(
+        self,
+        message: Message,
+        interval_ms: int = 1000,
+        parse_mode: Optional[str] = "Markdown",
+    ):
+        self.message = message
+        self.interval_ms = interval_ms
+        self.parse_mode = parse_mode
+
+        self._pending: Optional[str] = None
+        self._shown: Optional[str] = None
+        self._next_edit = 0.0
+        self._retry_until = 0.0
+        self._wake = asyncio.Event()
+        self._closed = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+        self.updates = 0
+        self.edits = 0
+        self.coalesced = 0
+        self.throttled = 0
+        self.failed = 0
+
+    def update(self, text: str) -> None:
+        """Show ``text`` as soon as the limits allow."""
+        if self._closed.is_set():
+            return
+        self.updates += 1
+        if text == self._pending or (self._pending is None and text == self._shown):
+            return
+        if self._pending is not None:
+            self.coalesced += 1
+        self._pending = text
+        self._wake.set()
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self, flush: bool = True) -> None:
+        """Stop editing; send the latest text first unless ``flush`` is off.
+
+        Returns once no edit is in flight, so the message can be deleted
+        or replaced safely afterwards.
+        """
+        if not flush:
+            self._pending = None
+        self._closed.set()
+        self._wake.set()
+        if self._task is not None:
+            await self._task
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            if self._pending is None:
+                if self._closed.is_set():
+                    return
+                self._wake.clear()
+                await self._wake.wait()
+                continue
+
+            # Wait for our turn; closing skips the interval, not retry_after
+            while True:
+                if self._closed.is_set():
+                    ready = self._retry_until
+                else:
+                    ready = max(self._next_edit, self._retry_until)
+                delay = ready - loop.time()
+                if delay <= 0:
+                    break
+                if self._closed.is_set():
+                    await asyncio.sleep(delay)
+                    continue
+                try:
+                    await asyncio.wait_for(self._closed.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+
+            await self._send(loop)
+
+    async def _send(self, loop: asyncio.AbstractEventLoop) -> None:
+        text, self._pending = self._pending, None
+        if text is None or text == self._shown:
+            return
+        try:
+            await self.message.edit_text(text, parse_mode=self.parse_mode)
+            self._shown = text
+            self.edits += 1
+        except RetryAfter as e:
+            self.throttled += 1
+            delay = (
+                e.retry_after.total_seconds()
+                if isinstance(e.retry_after, timedelta)
+                else e.retry_after
+            )
+            self._retry_until = loop.time() + delay
+            # Try again later, unless a newer text has arrived meanwhile
+            if self._pending is None:
+                self._pending = text
+            logger.debug("Progress edits throttled", retry_after=delay)
+        except BadRequest as e:
+            if "not modified" in str(e).lower():
+                self._shown = text
+            else:
+                self.failed += 1
+                logger.warning("Failed to update progress message", error=str(e))
+        except Exception as e:
+            self.failed += 1
+            logger.warning("Failed to update progress message", error=str(e))
+        finally:
+            self._next_edit = loop.time() + self.interval_ms / 1000
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Edit statistics."""
+        return {
+            "updates": self.updates,
+            "edits": self.edits,
+            "coalesced": self.coalesced,
+            "throttled": self.throttled,
+            "failed": self.failed,
+        }
@@ -0,0 +1,288 @@
+"""Webhook server for Telegram update deliveries.
+
+Features:
+- Minimal asyncio HTTP/1.1 server with keep-alive, no extra dependencies
+- Header and body size limits, read timeouts
+- Secret-token verification on every request
+- Bounded in-flight updates; Telegram is asked to retry when full
+- Request, queue-wait and rejection statistics
+"""
+
+import asyncio
+import hmac
+import json
+import secrets
+import time
+from http import HTTPStatus
+from typing import Any, Dict, Optional, Set, Tuple
+
+import structlog
+from telegram import Update
+from telegram.ext import Application
+
+from ..config.settings import Settings
+from ..utils.histogram import LatencyHistogram
+
+logger = structlog.get_logger()
+
+SECRET_HEADER = "x-telegram-bot-api-secret-token"
+MAX_HEADER_SIZE = 16 * 1024
+
+
+class WebhookServer:
+    """Receives webhook POSTs and hands updates to the application.
+
+    Each accepted update holds one of ``max_queue`` slots until the
+    application has finished processing it. When every slot is taken the
+    request waits up to ``queue_timeout`` seconds for one, then gets a
+    503 so Telegram delivers it again later; the update is never dropped.
+    Connections stay open between requests for ``keepalive_timeout``
+    seconds. Anything malformed, oversized or without the secret token is
+    rejected before the body is parsed.
+    """
+
+    def __init__(
+        self,
+        application: Application,
+        path: str,
+        secret_token: str,
+        host: str = "0.0.0.0",
+        port: int = 8443,
+        max_body_size: int = 1024 * 1024,
+        max_queue: int = 1000,
+        queue_timeout: float = 5.0,
+        keepalive_timeout: float = 75.0,
+        read_timeout: float = 10.0,
+    ):
+        if not secret_token:
+            raise ValueError("secret_token is required")
+
+        self.application = application
+        self.path = path if path.startswith("/") else f"/{path}"
+        self.secret_token = secret_token.encode()
+        self.host = host
+        self.port = port
+        self.max_body_size = max_body_size
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.keepalive_timeout = keepalive_timeout
+        self.read_timeout = read_timeout
+
+        self._slots = asyncio.Semaphore(max_queue)
+        self._server: Optional[asyncio.AbstractServer] = None
+        # Connections waiting for their next request, closed on stop
+        self._idle: Set[asyncio.StreamWriter] = set()
+        self._stopping = False
+
+        self.connections = 0
+        self.open_connections = 0
+        self.requests = 0
+        self.accepted = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.rejected: Dict[int, int] = {}
+        self.request_times = LatencyHistogram()
+        self.queue_waits = LatencyHistogram()
+
+    @classmethod
+    def from_settings(
+        cls, application: Application, settings: Settings
+    ) -> "WebhookServer":
+        """Server configured from settings (random secret if none is set)."""
+        return cls(
+            application,
+            path=settings.webhook_path,
+            secret_token=settings.webhook_secret_str or secrets.token_urlsafe(32),
+            port=settings.webhook_port,
+            max_body_size=settings.webhook_max_body_size,
+            max_queue=settings.webhook_max_queue,
+            keepalive_timeout=settings.webhook_keepalive_timeout,
+        )
+
+    @property
+    def secret(self) -> str:
+        """Token Telegram must send; pass it to ``set_webhook``."""
+        return self.secret_token.decode()
+
+    async def start(self) -> None:
+        """Start listening."""
+        self._stopping = False
+        self._server = await asyncio.start_server(
+            self._serve, self.host, self.port, limit=MAX_HEADER_SIZE
+        )
+        if not self.port:
+            self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(
+            "Webhook server listening",
+            host=self.host,
+            port=self.port,
+            path=self.path,
+            max_queue=self.max_queue,
+        )
+
+    async def stop(self) -> None:
+        """Stop accepting connections; accepted updates finish processing.
+
+        Idle keep-alive connections are closed rather than waited out;
+        requests in progress get their response, then the connection
+        closes.
+        """
+        if self._server is not None:
+            self._stopping = True
+            self._server.close()
+            for writer in list(self._idle):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+            logger.info("Webhook server stopped", **self.get_stats())
+
+    async def _serve(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Handle requests on one connection until it closes or idles out."""
+        self.connections += 1
+        self.open_connections += 1
+        try:
+            while not self._stopping:
+                self._idle.add(writer)
+                try:
+                    head = await asyncio.wait_for(
+                        reader.readuntil(b"\r\n\r\n"), self.keepalive_timeout
+                    )
+                except asyncio.LimitOverrunError:
+                    await self._respond(
+                        writer, HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, False
+                    )
+                    return
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError):
+                    return  # Idle, or the client or stop() closed the connection
+                finally:
+                    self._idle.discard(writer)
+
+                started = time.perf_counter()
+                self.requests += 1
+                status, keep_alive, headers = await self._handle(head, reader)
+                keep_alive = keep_alive and not self._stopping
+                await self._respond(writer, status, keep_alive, headers)
+                self.request_times.observe(time.perf_counter() - started)
+                if not keep_alive:
+                    return
+        except ConnectionError:
+            pass
+        finally:
+            self.open_connections -= 1
+            writer.close()
+
+    async def _handle(
+        self, head: bytes, reader: asyncio.StreamReader
+    ) -> Tuple[HTTPStatus, bool, Dict[str, str]]:
+        """Process one request; returns (status, keep connection, headers)."""
+        try:
+            request_line, *header_lines = head.decode("latin-1").split("\r\n")
+            method, target, version = request_line.split(" ")
+            headers = {}
+            for line in header_lines:
+                if line:
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+        except ValueError:
+            return HTTPStatus.BAD_REQUEST, False, {}
+
+        connection = headers.get("connection", "").lower()
+        keep_alive = (
+            connection != "close"
+            if version == "HTTP/1.1"
+            else connection == "keep-alive"
+        )
+
+        # Rejections before the body is read close the connection
+        if target.split("?", 1)[0] != self.path:
+            return HTTPStatus.NOT_FOUND, False, {}
+        if method != "POST":
+            return HTTPStatus.METHOD_NOT_ALLOWED, False, {"Allow": "POST"}
+        if not hmac.compare_digest(
+            headers.get(SECRET_HEADER, "").encode(), self.secret_token
+        ):
+            return HTTPStatus.FORBIDDEN, False, {}
+        if "transfer-encoding" in headers:
+            return HTTPStatus.LENGTH_REQUIRED, False, {}
+        try:
+            length = int(headers["content-length"])
+        except (KeyError, ValueError):
+            return HTTPStatus.LENGTH_REQUIRED, False, {}
+        if length > self.max_body_size:
+            return HTTPStatus.REQUEST_ENTITY_TOO_LARGE, False, {}
+
+        try:
+            body = await asyncio.wait_for(reader.readexactly(length), self.read_timeout)
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError):
+            return HTTPStatus.REQUEST_TIMEOUT, False, {}
+
+        try:
+            update = Update.de_json(json.loads(body), self.application.bot)
+        except Exception:
+            return HTTPStatus.BAD_REQUEST, keep_alive, {}
+
+        if not await self._enqueue(update):
+            return HTTPStatus.SERVICE_UNAVAILABLE, keep_alive, {"Retry-After": "1"}
+        return HTTPStatus.OK, keep_alive, {}
+
+    async def _enqueue(self, update: Update) -> bool:
+        """Take a slot and start processing; False if none freed up in time."""
+        waited = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            return False
+        self.queue_waits.observe(time.perf_counter() - waited)
+
+        self.accepted += 1
+        self.in_flight += 1
+        if self.in_flight > self.max_in_flight:
+            self.max_in_flight = self.in_flight
+        self.application.create_task(self._process(update), update=update)
+        return True
+
+    async def _process(self, update: Update) -> None:
+        try:
+            await self.application.update_processor.process_update(
+                update, self.application.process_update(update)
+            )
+        finally:
+            self.in_flight -= 1
+            self._slots.release()
+
+    async def _respond(
+        self,
+        writer: asyncio.StreamWriter,
+        status: HTTPStatus,
+        keep_alive: bool,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        if status != HTTPStatus.OK:
+            self.rejected[status.value] = self.rejected.get(status.value, 0) + 1
+        lines = [
+            f"HTTP/1.1 {status.value} {status.phrase}",
+            "Content-Length: 0",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        if keep_alive:
+            lines.append(f"Keep-Alive: timeout={int(self.keepalive_timeout)}")
+        lines.extend(f"{name}: {value}" for name, value in (headers or {}).items())
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        await writer.drain()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Server statistics."""
+        return {
+            "connections": self.connections,
+            "open_connections": self.open_connections,
+            "requests": self.requests,
+            "accepted": self.accepted,
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "max_queue": self.max_queue,
+            "rejected": dict(self.rejected),
+            "request": self.request_times.snapshot(),
+            "queue_wait": self.queue_waits.snapshot(),
+        }
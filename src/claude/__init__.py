@@ -10,7 +10,7 @@ from .exceptions import (
 from .facade import ClaudeIntegration
 from .integration import ClaudeProcessManager, ClaudeResponse, StreamUpdate
 from .monitor import ToolMonitor
-from .parser import OutputParser, ResponseFormatter
+from .parser import OutputParser, ResponseFormatter, StreamingOutputParser
 from .session import (
     ClaudeSession,
     InMemorySessionStorage,
@@ -37,5 +37,6 @@ __all__ = [
     "ClaudeSession",
     "ToolMonitor",
     "OutputParser",
+    "StreamingOutputParser",
     "ResponseFormatter",
 ]
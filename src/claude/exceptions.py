@@ -1,10 +1,20 @@
 """Claude-specific exceptions."""
 
+from typing import Optional
+
 
 class ClaudeError(Exception):
-    """Base Claude error."""
+    """Base Claude error.
 
-    pass
+    ``cost`` is what the run had spent before failing, if it reported it.
+    """
+
+    cost: Optional[float] = None
+
+    def with_cost(self, cost: Optional[float]) -> "ClaudeError":
+        """Record the cost already spent; returns the error for raising."""
+        self.cost = cost
+        return self
 
 
 class ClaudeTimeoutError(ClaudeError):
@@ -28,6 +28,7 @@ class ClaudeIntegration:
         sdk_manager: Optional[ClaudeSDKManager] = None,
         session_manager: Optional[SessionManager] = None,
         tool_monitor: Optional[ToolMonitor] = None,
+        context_provider: Optional[Callable[[Path], Optional[str]]] = None,
     ):
         """Initialize Claude integration facade."""
         self.config = config
@@ -46,6 +47,8 @@ class ClaudeIntegration:
 
         self.session_manager = session_manager
         self.tool_monitor = tool_monitor
+        # Returns a cached project digest for a directory, if one is ready
+        self.context_provider = context_provider
         self._sdk_failed_count = 0  # Track SDK failures for adaptive fallback
 
     async def run_command(
@@ -70,6 +73,17 @@ class ClaudeIntegration:
             user_id, working_directory, session_id
         )
 
+        # Give new sessions a head start with the prefetched project digest
+        if self.context_provider and getattr(session, "is_new_session", False):
+            try:
+                digest = self.context_provider(working_directory)
+            except Exception as e:
+                logger.warning("Project context provider failed", error=str(e))
+                digest = None
+            if digest:
+                prompt = f"{digest}\n\n{prompt}"
+                logger.debug("Prepended project digest", digest_length=len(digest))
+
         # Track streaming updates and validate tool calls
         tools_validated = True
         validation_errors = []
@@ -11,7 +11,6 @@ import asyncio
 import json
 import uuid
 from asyncio.subprocess import Process
-from collections import deque
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, AsyncIterator, Callable, Dict, List, Optional
@@ -24,6 +23,7 @@ from .exceptions import (
     ClaudeProcessError,
     ClaudeTimeoutError,
 )
+from .parser import StreamingOutputParser
 
 logger = structlog.get_logger()
 
@@ -97,7 +97,6 @@ class ClaudeProcessManager:
         self.active_processes: Dict[str, Process] = {}
 
         # Memory optimization settings
-        self.max_message_buffer = 1000  # Limit message history
         self.streaming_buffer_size = (
             65536  # 64KB streaming buffer for large JSON messages
         )
@@ -229,8 +228,7 @@ class ClaudeProcessManager:
         self, process: Process, stream_callback: Optional[Callable]
     ) -> ClaudeResponse:
         """Memory-optimized output handling with bounded buffers."""
-        message_buffer = deque(maxlen=self.max_message_buffer)
-        result = None
+        parser = StreamingOutputParser(keep_text=False)
         parsing_errors = []
 
         async for line in self._read_stream_bounded(process.stdout):
@@ -242,7 +240,7 @@ class ClaudeProcessManager:
                     parsing_errors.append(f"Invalid message structure: {line[:100]}")
                     continue
 
-                message_buffer.append(msg)
+                parser.feed(msg)
 
                 # Process immediately to avoid memory buildup
                 update = self._parse_stream_message(msg)
@@ -256,10 +254,6 @@ class ClaudeProcessManager:
                             update_type=update.type,
                         )
 
-                # Check for final result
-                if msg.get("type") == "result":
-                    result = msg
-
             except json.JSONDecodeError as e:
                 parsing_errors.append(f"JSON decode error: {e}")
                 logger.warning(
@@ -313,18 +307,18 @@ class ClaudeProcessManager:
                     f"• Contact support if you need a higher limit"
                 )
 
-                raise ClaudeProcessError(user_friendly_msg)
+                raise ClaudeProcessError(user_friendly_msg).with_cost(parser.cost)
 
             # Generic error handling for other cases
             raise ClaudeProcessError(
                 f"Claude Code exited with code {return_code}: {error_msg}"
-            )
+            ).with_cost(parser.cost)
 
-        if not result:
+        if not parser.result:
             logger.error("No result message received from Claude Code")
             raise ClaudeParsingError("No result message received from Claude Code")
 
-        return self._parse_result(result, list(message_buffer))
+        return self._parse_result(parser.result, parser.tools_used)
 
     async def _read_stream(self, stream) -> AsyncIterator[str]:
         """Read lines from stream."""
@@ -546,22 +540,10 @@ class ClaudeProcessManager:
 
         return f"✅ Completed: {', '.join(tool_parts)}"
 
-    def _parse_result(self, result: Dict, messages: List[Dict]) -> ClaudeResponse:
+    def _parse_result(
+        self, result: Dict, tools_used: List[Dict[str, Any]]
+    ) -> ClaudeResponse:
         """Parse final result message."""
-        # Extract tools used from messages
-        tools_used = []
-        for msg in messages:
-            if msg.get("type") == "assistant":
-                message = msg.get("message", {})
-                for block in message.get("content", []):
-                    if block.get("type") == "tool_use":
-                        tools_used.append(
-                            {
-                                "name": block.get("name"),
-                                "timestamp": msg.get("timestamp"),
-                            }
-                        )
-
         content = result.get("result", "")
 
         # Generate summary if content empty but tools were used
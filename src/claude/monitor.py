@@ -4,31 +4,70 @@ Features:
 - Track tool calls
 - Security validation
 - Usage analytics
+- Bounded violation history with O(1) counters
 """
 
-from collections import defaultdict
+from collections import Counter, defaultdict, deque
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Deque, Dict, List, Optional, Tuple
 
 import structlog
 
 from ..config.settings import Settings
 from ..security.validators import SecurityValidator
+from ..utils.constants import DEFAULT_TOOL_MONITOR_MAX_VIOLATIONS
+from .policy import FILE_TOOLS, SHELL_TOOLS, ToolPolicy
 
 logger = structlog.get_logger()
 
+# Distinct tool names tracked individually; the rest are folded together
+MAX_TRACKED_TOOLS = 256
+OTHER_TOOLS_KEY = "<other>"
+
 
 class ToolMonitor:
     """Monitor and validate Claude's tool usage."""
 
     def __init__(
-        self, config: Settings, security_validator: Optional[SecurityValidator] = None
+        self,
+        config: Settings,
+        security_validator: Optional[SecurityValidator] = None,
+        policy: Optional[ToolPolicy] = None,
     ):
         """Initialize tool monitor."""
         self.config = config
         self.security_validator = security_validator
+        self.policy = policy or ToolPolicy.from_settings(config)
+        self.max_violations: int = getattr(
+            config, "tool_monitor_max_violations", DEFAULT_TOOL_MONITOR_MAX_VIOLATIONS
+        )
+
+        # Counters survive eviction from the violation ring buffer
         self.tool_usage: Dict[str, int] = defaultdict(int)
-        self.security_violations: List[Dict[str, Any]] = []
+        self.user_tool_usage: Dict[int, Counter] = defaultdict(Counter)
+        self.user_violations: Dict[int, Counter] = defaultdict(Counter)
+        self.violation_count = 0
+        self.security_violations: Deque[Dict[str, Any]] = deque(
+            maxlen=self.max_violations
+        )
+
+    def _tool_key(self, tool_name: str, counts: Dict[str, int]) -> str:
+        """Return the counter key for a tool, folding overflow names."""
+        if tool_name in counts or len(counts) < MAX_TRACKED_TOOLS:
+            return tool_name
+        return OTHER_TOOLS_KEY
+
+    def _record_usage(self, tool_name: str, user_id: int) -> None:
+        """Count a successful tool call."""
+        self.tool_usage[self._tool_key(tool_name, self.tool_usage)] += 1
+        user_usage = self.user_tool_usage[user_id]
+        user_usage[self._tool_key(tool_name, user_usage)] += 1
+
+    def _record_violation(self, violation: Dict[str, Any]) -> None:
+        """Store a violation in the ring buffer and update counters."""
+        self.security_violations.append(violation)
+        self.violation_count += 1
+        self.user_violations[violation["user_id"]][violation["type"]] += 1
 
     async def validate_tool_call(
         self,
@@ -38,11 +77,13 @@ class ToolMonitor:
         user_id: int,
     ) -> Tuple[bool, Optional[str]]:
         """Validate tool call before execution."""
+        policy = self.policy
+
         # MASTER SWITCH: Skip all validation if Claude is fully trusted
-        if getattr(self.config, "trust_claude_completely", False):
-            self.tool_usage[tool_name] += 1
+        if policy.trust_all:
+            self._record_usage(tool_name, user_id)
             return True, None
-        
+
         logger.debug(
             "Validating tool call",
             tool_name=tool_name,
@@ -50,54 +91,32 @@ class ToolMonitor:
             user_id=user_id,
         )
 
-        # Check if tool is allowed
-        if (
-            hasattr(self.config, "claude_allowed_tools")
-            and self.config.claude_allowed_tools
-        ):
-            if tool_name not in self.config.claude_allowed_tools:
-                violation = {
-                    "type": "disallowed_tool",
-                    "tool_name": tool_name,
-                    "user_id": user_id,
-                    "working_directory": str(working_directory),
-                }
-                self.security_violations.append(violation)
+        # Check allowed/disallowed tool lists
+        violation_type = policy.check_tool_name(tool_name)
+        if violation_type:
+            violation = {
+                "type": violation_type,
+                "tool_name": tool_name,
+                "user_id": user_id,
+                "working_directory": str(working_directory),
+            }
+            self._record_violation(violation)
+            if violation_type == "disallowed_tool":
                 logger.warning("Tool not allowed", **violation)
                 return False, f"Tool not allowed: {tool_name}"
-
-        # Check if tool is explicitly disallowed
-        if (
-            hasattr(self.config, "claude_disallowed_tools")
-            and self.config.claude_disallowed_tools
-        ):
-            if tool_name in self.config.claude_disallowed_tools:
-                violation = {
-                    "type": "explicitly_disallowed_tool",
-                    "tool_name": tool_name,
-                    "user_id": user_id,
-                    "working_directory": str(working_directory),
-                }
-                self.security_violations.append(violation)
-                logger.warning("Tool explicitly disallowed", **violation)
-                return False, f"Tool explicitly disallowed: {tool_name}"
+            logger.warning("Tool explicitly disallowed", **violation)
+            return False, f"Tool explicitly disallowed: {tool_name}"
 
         # Validate file operations
-        if tool_name in [
-            "create_file",
-            "edit_file",
-            "read_file",
-            "Write",
-            "Edit",
-            "Read",
-        ]:
+        if tool_name in FILE_TOOLS:
             file_path = tool_input.get("path") or tool_input.get("file_path")
             if not file_path:
                 return False, "File path required"
 
             # Validate path security
             if self.security_validator:
-                valid, resolved_path, error = self.security_validator.validate_path(
+                # The validator caches resolutions and re-checks symlinks
+                valid, _, error = self.security_validator.validate_path(
                     file_path, working_directory
                 )
 
@@ -110,49 +129,29 @@ class ToolMonitor:
                         "working_directory": str(working_directory),
                         "error": error,
                     }
-                    self.security_violations.append(violation)
+                    self._record_violation(violation)
                     logger.warning("Invalid file path in tool call", **violation)
                     return False, error
 
-        # Validate shell commands
-        if tool_name in ["bash", "shell", "Bash"]:
+        # Validate shell commands (pattern check can be disabled via config)
+        elif tool_name in SHELL_TOOLS:
             command = tool_input.get("command", "")
-
-            # Check for dangerous commands (can be disabled via config)
-            if not getattr(self.config, "disable_dangerous_pattern_check", False):
-                dangerous_patterns = [
-                    "rm -rf",
-                    "sudo",
-                    "chmod 777",
-                    "curl",
-                    "wget",
-                    "nc ",
-                    "netcat",
-                    ">",
-                    ">>",
-                    "|",
-                    "&",
-                    ";",
-                    "$(",
-                    "`",
-                ]
-
-                for pattern in dangerous_patterns:
-                    if pattern in command.lower():
-                        violation = {
-                            "type": "dangerous_command",
-                            "tool_name": tool_name,
-                            "command": command,
-                            "pattern": pattern,
-                            "user_id": user_id,
-                            "working_directory": str(working_directory),
-                        }
-                        self.security_violations.append(violation)
-                        logger.warning("Dangerous command detected", **violation)
-                        return False, f"Dangerous command pattern detected: {pattern}"
+            pattern = policy.find_dangerous_pattern(command)
+            if pattern:
+                violation = {
+                    "type": "dangerous_command",
+                    "tool_name": tool_name,
+                    "command": command,
+                    "pattern": pattern,
+                    "user_id": user_id,
+                    "working_directory": str(working_directory),
+                }
+                self._record_violation(violation)
+                logger.warning("Dangerous command detected", **violation)
+                return False, f"Dangerous command pattern detected: {pattern}"
 
         # Track usage
-        self.tool_usage[tool_name] += 1
+        self._record_usage(tool_name, user_id)
 
         logger.debug("Tool call validated successfully", tool_name=tool_name)
         return True, None
@@ -163,47 +162,47 @@ class ToolMonitor:
             "total_calls": sum(self.tool_usage.values()),
             "by_tool": dict(self.tool_usage),
             "unique_tools": len(self.tool_usage),
-            "security_violations": len(self.security_violations),
+            "security_violations": self.violation_count,
+            "violations_retained": len(self.security_violations),
+            "max_violations": self.max_violations,
+            "policy": self.policy.get_stats(),
         }
 
-    def get_security_violations(self) -> List[Dict[str, Any]]:
-        """Get security violations."""
-        return self.security_violations.copy()
+    def get_security_violations(
+        self, user_id: Optional[int] = None, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Get retained security violations, most recent last."""
+        violations = [
+            v
+            for v in self.security_violations
+            if user_id is None or v.get("user_id") == user_id
+        ]
+        if limit is not None:
+            violations = violations[-limit:] if limit > 0 else []
+        return violations
 
     def reset_stats(self) -> None:
         """Reset statistics."""
         self.tool_usage.clear()
+        self.user_tool_usage.clear()
+        self.user_violations.clear()
+        self.violation_count = 0
         self.security_violations.clear()
         logger.info("Tool monitor statistics reset")
 
     def get_user_tool_usage(self, user_id: int) -> Dict[str, Any]:
         """Get tool usage for specific user."""
-        user_violations = [
-            v for v in self.security_violations if v.get("user_id") == user_id
-        ]
+        violations = self.user_violations.get(user_id, Counter())
+        usage = self.user_tool_usage.get(user_id, Counter())
 
         return {
             "user_id": user_id,
-            "security_violations": len(user_violations),
-            "violation_types": list(set(v.get("type") for v in user_violations)),
+            "tool_calls": sum(usage.values()),
+            "by_tool": dict(usage),
+            "security_violations": sum(violations.values()),
+            "violation_types": list(violations),
         }
 
     def is_tool_allowed(self, tool_name: str) -> bool:
         """Check if tool is allowed without validation."""
-        # Check allowed list
-        if (
-            hasattr(self.config, "claude_allowed_tools")
-            and self.config.claude_allowed_tools
-        ):
-            if tool_name not in self.config.claude_allowed_tools:
-                return False
-
-        # Check disallowed list
-        if (
-            hasattr(self.config, "claude_disallowed_tools")
-            and self.config.claude_disallowed_tools
-        ):
-            if tool_name in self.config.claude_disallowed_tools:
-                return False
-
-        return True
+        return self.policy.check_tool_name(tool_name) is None
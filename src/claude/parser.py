@@ -5,19 +5,216 @@ Features:
 - Stream parsing
 - Error detection
 - Tool extraction
+- Incremental single-pass parsing
 """
 
 import json
 import re
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, List, Optional
 
 import structlog
 
+from ..utils.message_splitter import split_message
 from .exceptions import ClaudeParsingError
 
 logger = structlog.get_logger()
 
 
+FILE_OPERATION_TOOLS = frozenset(
+    {"create_file", "edit_file", "read_file", "Write", "Edit", "Read"}
+)
+SHELL_COMMAND_TOOLS = frozenset({"bash", "shell", "Bash"})
+
+CODE_BLOCK_PATTERN = re.compile(r"```(\w+)?\n(.*?)```", re.DOTALL)
+# Opening fence of a CODE_BLOCK_PATTERN match
+FENCE_OPEN_PATTERN = re.compile(r"```\w*\n")
+
+
+class StreamingOutputParser:
+    """Single-pass parser fed one message at a time.
+
+    Keeps file operations, shell commands, tool results, errors and the
+    session summary as running state so callers never need to retain the
+    transcript. Code blocks are counted incrementally, scanning each text
+    once; only whether a fence is still open is carried between texts.
+    """
+
+    def __init__(self, keep_text: bool = True):
+        """Initialize empty running state."""
+        self.keep_text = keep_text
+        self.text_parts: List[str] = []
+        self.file_operations: List[Dict[str, Any]] = []
+        self.shell_commands: List[Dict[str, Any]] = []
+        self.tool_results: List[Dict[str, Any]] = []
+        self.tools_used: List[Dict[str, Any]] = []
+        self.errors: List[Dict[str, Any]] = []
+        self.result: Optional[Dict[str, Any]] = None
+        self.invalid_lines = 0
+
+        self.total_messages = 0
+        self.assistant_messages = 0
+        self.user_messages = 0
+        self.tool_result_messages = 0
+        self.error_messages = 0
+        self.code_blocks = 0
+        self._in_fence = False
+
+    def feed_line(self, line: str) -> Optional[Dict[str, Any]]:
+        """Parse one stream-json line and feed it; invalid lines are skipped."""
+        line = line.strip()
+        if not line:
+            return None
+
+        try:
+            msg: Dict[str, Any] = json.loads(line)
+        except json.JSONDecodeError:
+            self.invalid_lines += 1
+            logger.warning("Skipping invalid JSON line", line=line)
+            return None
+
+        self.feed(msg)
+        return msg
+
+    def feed_many(self, messages: Iterable[Dict[str, Any]]) -> "StreamingOutputParser":
+        """Feed an iterable of messages."""
+        for msg in messages:
+            self.feed(msg)
+        return self
+
+    def feed(self, msg: Dict[str, Any]) -> None:
+        """Update running state with one message."""
+        self.total_messages += 1
+        msg_type = msg.get("type")
+        timestamp = msg.get("timestamp")
+
+        if msg.get("is_error") or msg_type == "error":
+            self.errors.append(
+                {
+                    "type": msg.get("type", "unknown"),
+                    "subtype": msg.get("subtype"),
+                    "message": msg.get("message", str(msg)),
+                    "timestamp": timestamp,
+                }
+            )
+
+        if msg_type == "assistant":
+            self.assistant_messages += 1
+            message = msg.get("message", {})
+            for block in message.get("content", []):
+                block_type = block.get("type")
+                if block_type == "text":
+                    self._feed_text(block.get("text", ""))
+                elif block_type == "tool_use":
+                    self._feed_tool_use(block, timestamp)
+
+        elif msg_type == "user":
+            self.user_messages += 1
+
+        elif msg_type == "tool_result":
+            self.tool_result_messages += 1
+            result = msg.get("result", {})
+            self.tool_results.append(
+                {
+                    "tool_use_id": msg.get("tool_use_id"),
+                    "content": result.get("content"),
+                    "is_error": result.get("is_error", False),
+                    "timestamp": timestamp,
+                }
+            )
+            if result.get("is_error"):
+                self.errors.append(
+                    {
+                        "type": "tool_error",
+                        "tool_use_id": msg.get("tool_use_id"),
+                        "message": result.get("content", "Tool execution failed"),
+                        "timestamp": timestamp,
+                    }
+                )
+
+        elif msg.get("is_error") or msg_type == "error":
+            self.error_messages += 1
+
+        if msg_type == "result":
+            self.result = msg
+
+    def _feed_tool_use(self, block: Dict[str, Any], timestamp: Any) -> None:
+        """Record a tool_use block."""
+        tool_name = block.get("name", "")
+        tool_input = block.get("input", {})
+
+        self.tools_used.append(
+            {"name": block.get("name"), "timestamp": timestamp, "input": tool_input}
+        )
+
+        if tool_name in FILE_OPERATION_TOOLS:
+            self.file_operations.append(
+                {
+                    "operation": tool_name,
+                    "path": tool_input.get("path") or tool_input.get("file_path"),
+                    "content": tool_input.get("content")
+                    or tool_input.get("new_string"),
+                    "old_content": tool_input.get("old_string"),
+                    "timestamp": timestamp,
+                }
+            )
+        elif tool_name in SHELL_COMMAND_TOOLS:
+            self.shell_commands.append(
+                {
+                    "operation": tool_name,
+                    "command": tool_input.get("command"),
+                    "description": tool_input.get("description"),
+                    "timestamp": timestamp,
+                }
+            )
+
+    def _feed_text(self, text: str) -> None:
+        """Record assistant text and count completed code blocks."""
+        if self.keep_text:
+            self.text_parts.append(text)
+
+        # Texts are joined by newlines, so no fence spans two of them
+        chunk = text + "\n"
+        pos = 0
+        while True:
+            if self._in_fence:
+                close = chunk.find("```", pos)
+                if close < 0:
+                    return
+                self.code_blocks += 1
+                self._in_fence = False
+                pos = close + 3
+            else:
+                match = FENCE_OPEN_PATTERN.search(chunk, pos)
+                if match is None:
+                    return
+                self._in_fence = True
+                pos = match.end()
+
+    @property
+    def cost(self) -> Optional[float]:
+        """Cost from the result message, once it has arrived."""
+        return self.result.get("cost_usd") if self.result else None
+
+    @property
+    def response_text(self) -> str:
+        """All assistant text joined by newlines."""
+        return "\n".join(self.text_parts)
+
+    def summary(self) -> Dict[str, Any]:
+        """Session summary from running counters."""
+        return {
+            "total_messages": self.total_messages,
+            "assistant_messages": self.assistant_messages,
+            "user_messages": self.user_messages,
+            "tool_calls": len(self.tools_used),
+            "tool_results": self.tool_result_messages,
+            "errors": self.error_messages,
+            "code_blocks": self.code_blocks,
+            "file_operations": len(self.file_operations),
+            "shell_commands": len(self.shell_commands),
+        }
+
+
 class OutputParser:
     """Parse various Claude Code output formats."""
 
@@ -33,21 +230,15 @@ class OutputParser:
             raise ClaudeParsingError(f"Failed to parse JSON output: {e}")
 
     @staticmethod
-    def parse_stream_json(lines: List[str]) -> List[Dict[str, Any]]:
+    def parse_stream_json(lines: Iterable[str]) -> List[Dict[str, Any]]:
         """Parse streaming JSON output."""
+        parser = StreamingOutputParser(keep_text=False)
         messages = []
 
         for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-
-            try:
-                msg = json.loads(line)
+            msg = parser.feed_line(line)
+            if msg is not None:
                 messages.append(msg)
-            except json.JSONDecodeError:
-                logger.warning("Skipping invalid JSON line", line=line)
-                continue
 
         return messages
 
@@ -55,9 +246,8 @@ class OutputParser:
     def extract_code_blocks(content: str) -> List[Dict[str, str]]:
         """Extract code blocks from response."""
         code_blocks = []
-        pattern = r"```(\w+)?\n(.*?)```"
 
-        for match in re.finditer(pattern, content, re.DOTALL):
+        for match in CODE_BLOCK_PATTERN.finditer(content):
             language = match.group(1) or "text"
             code = match.group(2).strip()
 
@@ -67,192 +257,42 @@ class OutputParser:
         return code_blocks
 
     @staticmethod
-    def extract_file_operations(messages: List[Dict]) -> List[Dict[str, Any]]:
+    def extract_file_operations(messages: Iterable[Dict]) -> List[Dict[str, Any]]:
         """Extract file operations from tool calls."""
-        file_ops = []
-
-        for msg in messages:
-            if msg.get("type") != "assistant":
-                continue
-
-            message = msg.get("message", {})
-            for block in message.get("content", []):
-                if block.get("type") != "tool_use":
-                    continue
-
-                tool_name = block.get("name", "")
-                tool_input = block.get("input", {})
-
-                # Check for file-related tools
-                if tool_name in [
-                    "create_file",
-                    "edit_file",
-                    "read_file",
-                    "Write",
-                    "Edit",
-                    "Read",
-                ]:
-                    file_ops.append(
-                        {
-                            "operation": tool_name,
-                            "path": tool_input.get("path")
-                            or tool_input.get("file_path"),
-                            "content": tool_input.get("content")
-                            or tool_input.get("new_string"),
-                            "old_content": tool_input.get("old_string"),
-                            "timestamp": msg.get("timestamp"),
-                        }
-                    )
-
-        logger.debug("Extracted file operations", count=len(file_ops))
-        return file_ops
+        parser = StreamingOutputParser(keep_text=False).feed_many(messages)
+        logger.debug("Extracted file operations", count=len(parser.file_operations))
+        return parser.file_operations
 
     @staticmethod
-    def extract_shell_commands(messages: List[Dict]) -> List[Dict[str, Any]]:
+    def extract_shell_commands(messages: Iterable[Dict]) -> List[Dict[str, Any]]:
         """Extract shell commands from tool calls."""
-        shell_commands = []
-
-        for msg in messages:
-            if msg.get("type") != "assistant":
-                continue
-
-            message = msg.get("message", {})
-            for block in message.get("content", []):
-                if block.get("type") != "tool_use":
-                    continue
-
-                tool_name = block.get("name", "")
-                tool_input = block.get("input", {})
-
-                # Check for shell/bash tools
-                if tool_name in ["bash", "shell", "Bash"]:
-                    shell_commands.append(
-                        {
-                            "operation": tool_name,
-                            "command": tool_input.get("command"),
-                            "description": tool_input.get("description"),
-                            "timestamp": msg.get("timestamp"),
-                        }
-                    )
-
-        logger.debug("Extracted shell commands", count=len(shell_commands))
-        return shell_commands
+        parser = StreamingOutputParser(keep_text=False).feed_many(messages)
+        logger.debug("Extracted shell commands", count=len(parser.shell_commands))
+        return parser.shell_commands
 
     @staticmethod
-    def extract_response_text(messages: List[Dict]) -> str:
+    def extract_response_text(messages: Iterable[Dict]) -> str:
         """Extract all text content from assistant messages."""
-        text_parts = []
-
-        for msg in messages:
-            if msg.get("type") != "assistant":
-                continue
-
-            message = msg.get("message", {})
-            for block in message.get("content", []):
-                if block.get("type") == "text":
-                    text_parts.append(block.get("text", ""))
-
-        return "\n".join(text_parts)
+        return StreamingOutputParser().feed_many(messages).response_text
 
     @staticmethod
-    def extract_tool_results(messages: List[Dict]) -> List[Dict[str, Any]]:
+    def extract_tool_results(messages: Iterable[Dict]) -> List[Dict[str, Any]]:
         """Extract tool results from tool_result messages."""
-        tool_results = []
-
-        for msg in messages:
-            if msg.get("type") == "tool_result":
-                result = msg.get("result", {})
-                tool_results.append(
-                    {
-                        "tool_use_id": msg.get("tool_use_id"),
-                        "content": result.get("content"),
-                        "is_error": result.get("is_error", False),
-                        "timestamp": msg.get("timestamp"),
-                    }
-                )
-
-        logger.debug("Extracted tool results", count=len(tool_results))
-        return tool_results
+        parser = StreamingOutputParser(keep_text=False).feed_many(messages)
+        logger.debug("Extracted tool results", count=len(parser.tool_results))
+        return parser.tool_results
 
     @staticmethod
-    def detect_errors(messages: List[Dict]) -> List[Dict[str, Any]]:
+    def detect_errors(messages: Iterable[Dict]) -> List[Dict[str, Any]]:
         """Detect errors in message stream."""
-        errors = []
-
-        for msg in messages:
-            # Check for error messages
-            if msg.get("is_error") or msg.get("type") == "error":
-                errors.append(
-                    {
-                        "type": msg.get("type", "unknown"),
-                        "subtype": msg.get("subtype"),
-                        "message": msg.get("message", str(msg)),
-                        "timestamp": msg.get("timestamp"),
-                    }
-                )
-
-            # Check for tool result errors
-            if msg.get("type") == "tool_result":
-                result = msg.get("result", {})
-                if result.get("is_error"):
-                    errors.append(
-                        {
-                            "type": "tool_error",
-                            "tool_use_id": msg.get("tool_use_id"),
-                            "message": result.get("content", "Tool execution failed"),
-                            "timestamp": msg.get("timestamp"),
-                        }
-                    )
-
-        logger.debug("Detected errors", count=len(errors))
-        return errors
+        parser = StreamingOutputParser(keep_text=False).feed_many(messages)
+        logger.debug("Detected errors", count=len(parser.errors))
+        return parser.errors
 
     @staticmethod
-    def summarize_session(messages: List[Dict]) -> Dict[str, Any]:
-        """Create a summary of the session."""
-        summary = {
-            "total_messages": len(messages),
-            "assistant_messages": 0,
-            "user_messages": 0,
-            "tool_calls": 0,
-            "tool_results": 0,
-            "errors": 0,
-            "code_blocks": 0,
-            "file_operations": 0,
-            "shell_commands": 0,
-        }
-
-        full_text = ""
-
-        for msg in messages:
-            msg_type = msg.get("type")
-
-            if msg_type == "assistant":
-                summary["assistant_messages"] += 1
-
-                # Extract text for analysis
-                message = msg.get("message", {})
-                for block in message.get("content", []):
-                    if block.get("type") == "text":
-                        full_text += block.get("text", "") + "\n"
-                    elif block.get("type") == "tool_use":
-                        summary["tool_calls"] += 1
-
-            elif msg_type == "user":
-                summary["user_messages"] += 1
-
-            elif msg_type == "tool_result":
-                summary["tool_results"] += 1
-
-            elif msg.get("is_error") or msg_type == "error":
-                summary["errors"] += 1
-
-        # Analyze extracted content
-        summary["code_blocks"] = len(OutputParser.extract_code_blocks(full_text))
-        summary["file_operations"] = len(OutputParser.extract_file_operations(messages))
-        summary["shell_commands"] = len(OutputParser.extract_shell_commands(messages))
-
-        return summary
+    def summarize_session(messages: Iterable[Dict]) -> Dict[str, Any]:
+        """Create a summary of the session in a single pass."""
+        return StreamingOutputParser(keep_text=False).feed_many(messages).summary()
 
 
 class ResponseFormatter:
@@ -267,72 +307,11 @@ class ResponseFormatter:
         if not content.strip():
             return ["_(Empty response)_"]
 
-        # Split by code blocks first to preserve them
-        parts = self._split_preserving_code_blocks(content)
-
-        messages = []
-        for part in parts:
-            if len(part) <= self.max_message_length:
-                messages.append(part)
-            else:
-                # Split long parts
-                messages.extend(self._split_long_text(part))
+        # Single pass split that keeps code fences balanced per message
+        messages = split_message(content.rstrip(), self.max_message_length)
 
         # Ensure we have at least one message
         if not messages:
             messages = ["_✅ Operation completed._"]
 
         return messages
-
-    def _split_preserving_code_blocks(self, text: str) -> List[str]:
-        """Split text while preserving code blocks."""
-        parts = []
-        current_part = ""
-        in_code_block = False
-
-        lines = text.split("\n")
-
-        for line in lines:
-            # Check for code block markers
-            if line.strip().startswith("```"):
-                in_code_block = not in_code_block
-
-            line_with_newline = line + "\n"
-
-            # If adding this line would exceed limit and we're not in a code block
-            if (
-                len(current_part + line_with_newline) > self.max_message_length
-                and not in_code_block
-                and current_part.strip()
-            ):
-                parts.append(current_part.rstrip())
-                current_part = line_with_newline
-            else:
-                current_part += line_with_newline
-
-        if current_part.strip():
-            parts.append(current_part.rstrip())
-
-        return parts
-
-    def _split_long_text(self, text: str) -> List[str]:
-        """Split text that's too long for a single message."""
-        parts = []
-        current = ""
-
-        for char in text:
-            if len(current + char) > self.max_message_length:
-                if current:
-                    parts.append(current)
-                    current = char
-                else:
-                    # Single character somehow exceeds limit
-                    parts.append(char)
-                    current = ""
-            else:
-                current += char
-
-        if current:
-            parts.append(current)
-
-        return parts
@@ -0,0 +1,104 @@
+"""Precompiled tool validation policy.
+
+Features:
+- Tool allow/deny lists compiled to frozensets
+- Single combined regex for dangerous shell patterns
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Optional, Pattern, Tuple
+
+import structlog
+
+from ..config.settings import Settings
+
+logger = structlog.get_logger()
+
+# Tools whose input carries a path that must stay inside the approved directory
+FILE_TOOLS: FrozenSet[str] = frozenset(
+    {"create_file", "edit_file", "read_file", "Write", "Edit", "Read"}
+)
+
+# Tools whose input carries a shell command
+SHELL_TOOLS: FrozenSet[str] = frozenset({"bash", "shell", "Bash"})
+
+# Substrings rejected in shell commands (matched case-insensitively)
+DANGEROUS_SHELL_PATTERNS: Tuple[str, ...] = (
+    "rm -rf",
+    "sudo",
+    "chmod 777",
+    "curl",
+    "wget",
+    "nc ",
+    "netcat",
+    ">",
+    ">>",
+    "|",
+    "&",
+    ";",
+    "$(",
+    "`",
+)
+
+
+def compile_literal_alternation(patterns: Tuple[str, ...]) -> Pattern[str]:
+    """Compile literal substrings into one alternation regex.
+
+    Longer literals are tried first so that ``>>`` wins over ``>``.
+    """
+    ordered = sorted(set(patterns), key=len, reverse=True)
+    return re.compile("|".join(re.escape(p) for p in ordered))
+
+
+@dataclass
+class ToolPolicy:
+    """Tool validation rules compiled once from settings."""
+
+    allowed_tools: FrozenSet[str] = frozenset()
+    disallowed_tools: FrozenSet[str] = frozenset()
+    check_dangerous_patterns: bool = True
+    trust_all: bool = False
+    shell_pattern_re: Pattern[str] = field(
+        default_factory=lambda: compile_literal_alternation(DANGEROUS_SHELL_PATTERNS)
+    )
+
+    @classmethod
+    def from_settings(cls, config: Settings) -> "ToolPolicy":
+        """Build a policy from application settings."""
+        return cls(
+            allowed_tools=frozenset(
+                getattr(config, "claude_allowed_tools", None) or ()
+            ),
+            disallowed_tools=frozenset(
+                getattr(config, "claude_disallowed_tools", None) or ()
+            ),
+            check_dangerous_patterns=not getattr(
+                config, "disable_dangerous_pattern_check", False
+            ),
+            trust_all=getattr(config, "trust_claude_completely", False),
+        )
+
+    def check_tool_name(self, tool_name: str) -> Optional[str]:
+        """Return the violation type if the tool is blocked by the lists."""
+        if self.allowed_tools and tool_name not in self.allowed_tools:
+            return "disallowed_tool"
+        if tool_name in self.disallowed_tools:
+            return "explicitly_disallowed_tool"
+        return None
+
+    def find_dangerous_pattern(self, command: str) -> Optional[str]:
+        """Return the first dangerous pattern found in a shell command."""
+        if not self.check_dangerous_patterns or not command:
+            return None
+        match = self.shell_pattern_re.search(command.lower())
+        return match.group(0) if match else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get policy statistics."""
+        return {
+            "allowed_tools": len(self.allowed_tools),
+            "disallowed_tools": len(self.disallowed_tools),
+            "check_dangerous_patterns": self.check_dangerous_patterns,
+            "trust_all": self.trust_all,
+        }
@@ -27,6 +27,7 @@ from claude_code_sdk import (
 from claude_code_sdk.types import (
     AssistantMessage,
     ResultMessage,
+    SystemMessage,
     TextBlock,
     ToolResultBlock,
     ToolUseBlock,
@@ -39,6 +40,7 @@ from .exceptions import (
     ClaudeProcessError,
     ClaudeTimeoutError,
 )
+from .parser import StreamingOutputParser
 
 logger = structlog.get_logger()
 
@@ -104,6 +106,88 @@ def update_path_for_claude(claude_cli_path: Optional[str] = None) -> bool:
     return False
 
 
+def sdk_message_to_dicts(
+    message: Message, timestamp: Optional[float] = None
+) -> List[Dict[str, Any]]:
+    """Convert an SDK message into stream-json shaped dicts.
+
+    Lets SDK output be fed to ``StreamingOutputParser`` the same way as
+    subprocess output. Tool results carried in user messages become their
+    own ``tool_result`` entries.
+    """
+    if isinstance(message, AssistantMessage):
+        content = getattr(message, "content", [])
+        blocks: List[Dict[str, Any]] = []
+        if isinstance(content, list):
+            for block in content:
+                if isinstance(block, ToolUseBlock):
+                    blocks.append(
+                        {
+                            "type": "tool_use",
+                            "id": block.id,
+                            "name": block.name,
+                            "input": block.input,
+                        }
+                    )
+                elif hasattr(block, "text"):
+                    blocks.append({"type": "text", "text": block.text})
+        elif content:
+            blocks.append({"type": "text", "text": str(content)})
+        return [
+            {
+                "type": "assistant",
+                "message": {"content": blocks},
+                "timestamp": timestamp,
+            }
+        ]
+
+    if isinstance(message, UserMessage):
+        converted: List[Dict[str, Any]] = [{"type": "user", "timestamp": timestamp}]
+        content = getattr(message, "content", "")
+        if isinstance(content, list):
+            for block in content:
+                if isinstance(block, ToolResultBlock):
+                    converted.append(
+                        {
+                            "type": "tool_result",
+                            "tool_use_id": block.tool_use_id,
+                            "result": {
+                                "content": block.content,
+                                "is_error": bool(block.is_error),
+                            },
+                            "timestamp": timestamp,
+                        }
+                    )
+        return converted
+
+    if isinstance(message, ResultMessage):
+        return [
+            {
+                "type": "result",
+                "subtype": message.subtype,
+                "is_error": message.is_error,
+                "session_id": message.session_id,
+                "cost_usd": message.total_cost_usd or 0.0,
+                "duration_ms": message.duration_ms,
+                "num_turns": message.num_turns,
+                "result": message.result,
+                "timestamp": timestamp,
+            }
+        ]
+
+    if isinstance(message, SystemMessage):
+        return [
+            {
+                "type": "system",
+                "subtype": message.subtype,
+                "data": message.data,
+                "timestamp": timestamp,
+            }
+        ]
+
+    return []
+
+
 @dataclass
 class ClaudeResponse:
     """Response from Claude Code SDK."""
@@ -199,6 +283,10 @@ class ClaudeSDKManager:
             continue_session=continue_session,
         )
 
+        # Messages are folded into the parser as they arrive; only the
+        # reply text and tool records are kept, not the transcript
+        parser = StreamingOutputParser()
+
         try:
             # Build Claude Code options
             options = ClaudeCodeOptions(
@@ -207,15 +295,10 @@ class ClaudeSDKManager:
                 allowed_tools=self.config.claude_allowed_tools,
             )
 
-            # Collect messages
-            messages = []
-            cost = 0.0
-            tools_used = []
-
             # Execute with streaming and timeout
             await asyncio.wait_for(
                 self._execute_query_with_streaming(
-                    prompt, options, messages, stream_callback
+                    prompt, options, parser, stream_callback
                 ),
                 timeout=self.config.claude_timeout_seconds,
             )
@@ -223,11 +306,9 @@ class ClaudeSDKManager:
             # Extract cost and tools from result message
             cost = 0.0
             tools_used = []
-            for message in messages:
-                if isinstance(message, ResultMessage):
-                    cost = getattr(message, "total_cost_usd", 0.0) or 0.0
-                    tools_used = self._extract_tools_from_messages(messages)
-                    break
+            if parser.result:
+                cost = parser.result.get("cost_usd", 0.0)
+                tools_used = parser.tools_used
 
             # Calculate duration
             duration_ms = int((asyncio.get_event_loop().time() - start_time) * 1000)
@@ -236,10 +317,11 @@ class ClaudeSDKManager:
             final_session_id = session_id or str(uuid.uuid4())
 
             # Update session
-            self._update_session(final_session_id, messages)
+            self._update_session(final_session_id)
 
             # Extract content
-            content = self._extract_content_from_messages(messages)
+            original_content = parser.response_text
+            content = original_content
 
             # Generate summary if content empty but tools were used
             if (not content or not content.strip()) and tools_used:
@@ -254,13 +336,12 @@ class ClaudeSDKManager:
                 content = "✅ Command executed successfully."
 
             # DEBUG: Log empty content detection
-            original_content = self._extract_content_from_messages(messages)
             if not original_content or not original_content.strip():
                 logger.debug(
                     "Empty SDK result content detected",
                     tools_used_count=len(tools_used),
                     tool_names=[t.get("name") for t in tools_used],
-                    message_count=len(messages),
+                    message_count=parser.total_messages,
                     session_id=final_session_id,
                     generated_content=content,
                 )
@@ -270,13 +351,7 @@ class ClaudeSDKManager:
                 session_id=final_session_id,
                 cost=cost,
                 duration_ms=duration_ms,
-                num_turns=len(
-                    [
-                        m
-                        for m in messages
-                        if isinstance(m, (UserMessage, AssistantMessage))
-                    ]
-                ),
+                num_turns=parser.user_messages + parser.assistant_messages,
                 tools_used=tools_used,
             )
 
@@ -287,7 +362,7 @@ class ClaudeSDKManager:
             )
             raise ClaudeTimeoutError(
                 f"Claude SDK timed out after {self.config.claude_timeout_seconds}s"
-            )
+            ).with_cost(parser.cost)
 
         except CLINotFoundError as e:
             logger.error("Claude CLI not found", error=str(e))
@@ -307,15 +382,21 @@ class ClaudeSDKManager:
                 error=str(e),
                 exit_code=getattr(e, "exit_code", None),
             )
-            raise ClaudeProcessError(f"Claude process error: {str(e)}")
+            raise ClaudeProcessError(f"Claude process error: {str(e)}").with_cost(
+                parser.cost
+            )
 
         except CLIConnectionError as e:
             logger.error("Claude connection error", error=str(e))
-            raise ClaudeProcessError(f"Failed to connect to Claude: {str(e)}")
+            raise ClaudeProcessError(
+                f"Failed to connect to Claude: {str(e)}"
+            ).with_cost(parser.cost)
 
         except ClaudeSDKError as e:
             logger.error("Claude SDK error", error=str(e))
-            raise ClaudeProcessError(f"Claude SDK error: {str(e)}")
+            raise ClaudeProcessError(f"Claude SDK error: {str(e)}").with_cost(
+                parser.cost
+            )
 
         except Exception as e:
             # Handle ExceptionGroup from TaskGroup operations (Python 3.11+)
@@ -334,7 +415,7 @@ class ClaudeSDKManager:
                 main_exception = exceptions[0] if exceptions else e
                 raise ClaudeProcessError(
                     f"Claude SDK task error: {str(main_exception)}"
-                )
+                ).with_cost(parser.cost)
 
             # Check if it's an ExceptionGroup disguised as a regular exception
             elif hasattr(e, "__notes__") and "TaskGroup" in str(e):
@@ -343,7 +424,9 @@ class ClaudeSDKManager:
                     error=str(e),
                     error_type=type(e).__name__,
                 )
-                raise ClaudeProcessError(f"Claude SDK task error: {str(e)}")
+                raise ClaudeProcessError(f"Claude SDK task error: {str(e)}").with_cost(
+                    parser.cost
+                )
 
             else:
                 logger.error(
@@ -351,15 +434,23 @@ class ClaudeSDKManager:
                     error=str(e),
                     error_type=type(e).__name__,
                 )
-                raise ClaudeProcessError(f"Unexpected error: {str(e)}")
+                raise ClaudeProcessError(f"Unexpected error: {str(e)}").with_cost(
+                    parser.cost
+                )
 
     async def _execute_query_with_streaming(
-        self, prompt: str, options, messages: List, stream_callback: Optional[Callable]
+        self,
+        prompt: str,
+        options,
+        parser: StreamingOutputParser,
+        stream_callback: Optional[Callable],
     ) -> None:
-        """Execute query with streaming and collect messages."""
+        """Execute query with streaming, feeding each message to the parser."""
         try:
             async for message in query(prompt=prompt, options=options):
-                messages.append(message)
+                timestamp = asyncio.get_event_loop().time()
+                for msg in sdk_message_to_dicts(message, timestamp):
+                    parser.feed(msg)
 
                 # Handle streaming callback
                 if stream_callback:
@@ -433,49 +524,10 @@ class ClaudeSDKManager:
         except Exception as e:
             logger.warning("Stream callback failed", error=str(e))
 
-    def _extract_content_from_messages(self, messages: List[Message]) -> str:
-        """Extract content from message list."""
-        content_parts = []
-
-        for message in messages:
-            if isinstance(message, AssistantMessage):
-                content = getattr(message, "content", [])
-                if content and isinstance(content, list):
-                    # Extract text from TextBlock objects
-                    for block in content:
-                        if hasattr(block, "text"):
-                            content_parts.append(block.text)
-                elif content:
-                    # Fallback for non-list content
-                    content_parts.append(str(content))
-
-        return "\n".join(content_parts)
-
-    def _extract_tools_from_messages(
-        self, messages: List[Message]
-    ) -> List[Dict[str, Any]]:
-        """Extract tools used from message list."""
-        tools_used = []
-        current_time = asyncio.get_event_loop().time()
-
-        for message in messages:
-            if isinstance(message, AssistantMessage):
-                content = getattr(message, "content", [])
-                if content and isinstance(content, list):
-                    for block in content:
-                        if isinstance(block, ToolUseBlock):
-                            tools_used.append(
-                                {
-                                    "name": getattr(block, "tool_name", "unknown"),
-                                    "timestamp": current_time,
-                                    "input": getattr(block, "tool_input", {}),
-                                }
-                            )
-
-        return tools_used
-
-    def _update_session(self, session_id: str, messages: List[Message]) -> None:
-        """Update session data."""
+    def _update_session(
+        self, session_id: str, messages: Optional[List[Message]] = None
+    ) -> None:
+        """Update session data; a transcript is stored only if given."""
         if session_id not in self.active_sessions:
             self.active_sessions[session_id] = {
                 "messages": [],
@@ -483,7 +535,8 @@ class ClaudeSDKManager:
             }
 
         session_data = self.active_sessions[session_id]
-        session_data["messages"] = messages
+        if messages is not None:
+            session_data["messages"] = messages
         session_data["last_used"] = asyncio.get_event_loop().time()
 
     async def kill_all_processes(self) -> None:
@@ -15,15 +15,32 @@ from pydantic import Field, SecretStr, field_validator, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 from src.utils.constants import (
+    DEFAULT_AUDIT_BATCH_SIZE,
+    DEFAULT_AUDIT_FLUSH_INTERVAL,
+    DEFAULT_AUTH_DECISION_CACHE_TTL,
+    DEFAULT_AUTH_TOKEN_CACHE_TTL,
     DEFAULT_CLAUDE_MAX_COST_PER_USER,
     DEFAULT_CLAUDE_MAX_TURNS,
     DEFAULT_CLAUDE_TIMEOUT_SECONDS,
+    DEFAULT_CONCURRENT_UPDATES,
     DEFAULT_DATABASE_URL,
     DEFAULT_MAX_SESSIONS_PER_USER,
+    DEFAULT_PATH_CACHE_SIZE,
+    DEFAULT_PATH_CACHE_TTL,
+    DEFAULT_PROGRESS_EDIT_INTERVAL_MS,
     DEFAULT_RATE_LIMIT_BURST,
+    DEFAULT_RATE_LIMIT_CHECKPOINT_INTERVAL,
+    DEFAULT_RATE_LIMIT_CLEANUP_INTERVAL,
+    DEFAULT_RATE_LIMIT_COST_WINDOW_HOURS,
+    DEFAULT_RATE_LIMIT_IDLE_TIMEOUT,
     DEFAULT_RATE_LIMIT_REQUESTS,
     DEFAULT_RATE_LIMIT_WINDOW,
     DEFAULT_SESSION_TIMEOUT_HOURS,
+    DEFAULT_TOOL_MONITOR_MAX_VIOLATIONS,
+    DEFAULT_WEBHOOK_KEEPALIVE_TIMEOUT,
+    DEFAULT_WEBHOOK_MAX_BODY_SIZE,
+    DEFAULT_WEBHOOK_MAX_CONNECTIONS,
+    DEFAULT_WEBHOOK_MAX_QUEUE,
 )
 
 
@@ -47,6 +64,16 @@ class Settings(BaseSettings):
     auth_token_secret: Optional[SecretStr] = Field(
         None, description="Secret for auth tokens"
     )
+    auth_token_cache_ttl: float = Field(
+        DEFAULT_AUTH_TOKEN_CACHE_TTL,
+        description="Seconds a token verification result is reused (0 disables)",
+        ge=0,
+    )
+    auth_decision_cache_ttl: float = Field(
+        DEFAULT_AUTH_DECISION_CACHE_TTL,
+        description="Seconds a per-user auth decision is reused (0 disables)",
+        ge=0,
+    )
 
     # Claude settings
     claude_binary_path: Optional[str] = Field(
@@ -104,6 +131,16 @@ class Settings(BaseSettings):
         default=False,
         description="Disable path validation (allows access to files outside approved directory)",
     )
+    path_cache_size: int = Field(
+        DEFAULT_PATH_CACHE_SIZE,
+        description="Resolved paths cached by the path validator (0 disables)",
+        ge=0,
+    )
+    path_cache_ttl: float = Field(
+        DEFAULT_PATH_CACHE_TTL,
+        description="Seconds a cached path resolution stays valid",
+        ge=0,
+    )
     trust_claude_completely: bool = Field(
         default=False,
         description="MASTER SWITCH: Completely trust Claude, disables all tool validation",
@@ -119,6 +156,52 @@ class Settings(BaseSettings):
     rate_limit_burst: int = Field(
         DEFAULT_RATE_LIMIT_BURST, description="Burst capacity"
     )
+    rate_limit_global_requests: int = Field(
+        0, description="Requests per window across all users (0 disables)", ge=0
+    )
+    rate_limit_global_burst: int = Field(
+        0, description="Global burst capacity (0 uses the global request count)", ge=0
+    )
+    rate_limit_project_requests: int = Field(
+        0, description="Requests per window per project directory (0 disables)", ge=0
+    )
+    rate_limit_project_burst: int = Field(
+        0,
+        description="Per-project burst capacity (0 uses the project request count)",
+        ge=0,
+    )
+    rate_limit_cost_window_hours: float = Field(
+        DEFAULT_RATE_LIMIT_COST_WINDOW_HOURS,
+        description="Length of the per-user cost window in hours",
+        gt=0,
+    )
+    rate_limit_sliding_cost_window: bool = Field(
+        True,
+        description="Fade out the previous cost window instead of a hard reset",
+    )
+    rate_limit_backend: str = Field(
+        "memory",
+        description="Rate limit state backend: memory (one worker) or sqlite (shared)",
+    )
+    rate_limit_sqlite_path: Optional[Path] = Field(
+        None,
+        description="SQLite file shared by workers (defaults next to the database)",
+    )
+    rate_limit_checkpoint_interval: int = Field(
+        DEFAULT_RATE_LIMIT_CHECKPOINT_INTERVAL,
+        description="Seconds between rate limit state checkpoints (0 disables)",
+        ge=0,
+    )
+    rate_limit_idle_timeout: int = Field(
+        DEFAULT_RATE_LIMIT_IDLE_TIMEOUT,
+        description="Seconds without requests before a user's limiter state is freed",
+        ge=1,
+    )
+    rate_limit_cleanup_interval: int = Field(
+        DEFAULT_RATE_LIMIT_CLEANUP_INTERVAL,
+        description="Seconds between idle rate limit state sweeps (0 disables)",
+        ge=0,
+    )
 
     # Storage
     database_url: str = Field(
@@ -136,6 +219,16 @@ class Settings(BaseSettings):
     max_sessions_per_user: int = Field(
         DEFAULT_MAX_SESSIONS_PER_USER, description="Max concurrent sessions"
     )
+    audit_batch_size: int = Field(
+        DEFAULT_AUDIT_BATCH_SIZE,
+        description="Queued audit events that trigger an early database write",
+        ge=1,
+    )
+    audit_flush_interval: float = Field(
+        DEFAULT_AUDIT_FLUSH_INTERVAL,
+        description="Seconds between audit log batch writes (0 writes each event)",
+        ge=0,
+    )
 
     # Features
     enable_mcp: bool = Field(False, description="Enable Model Context Protocol")
@@ -145,20 +238,70 @@ class Settings(BaseSettings):
     enable_git_integration: bool = Field(True, description="Enable git commands")
     enable_file_uploads: bool = Field(True, description="Enable file upload handling")
     enable_quick_actions: bool = Field(True, description="Enable quick action buttons")
+    enable_project_prefetch: bool = Field(
+        False,
+        description="Build a project digest in the background on /cd and "
+        "prepend it to the first prompt of a new session",
+    )
 
     # Monitoring
     log_level: str = Field("INFO", description="Logging level")
     enable_telemetry: bool = Field(False, description="Enable anonymous telemetry")
+    tool_monitor_max_violations: int = Field(
+        DEFAULT_TOOL_MONITOR_MAX_VIOLATIONS,
+        description="Most recent tool security violations kept in memory",
+        ge=1,
+    )
     sentry_dsn: Optional[str] = Field(None, description="Sentry DSN for error tracking")
 
     # Development
     debug: bool = Field(False, description="Enable debug mode")
     development_mode: bool = Field(False, description="Enable development features")
 
+    # Update processing
+    concurrent_updates: int = Field(
+        DEFAULT_CONCURRENT_UPDATES,
+        description="Updates processed at once across chats (1 = one at a time)",
+        ge=1,
+    )
+    drop_pending_updates: bool = Field(
+        True, description="Discard updates that arrived while the bot was down"
+    )
+    progress_edit_interval_ms: int = Field(
+        DEFAULT_PROGRESS_EDIT_INTERVAL_MS,
+        description="Minimum milliseconds between edits of a progress message",
+        ge=100,
+    )
+
     # Webhook settings (optional)
     webhook_url: Optional[str] = Field(None, description="Webhook URL for bot")
     webhook_port: int = Field(8443, description="Webhook port")
     webhook_path: str = Field("/webhook", description="Webhook path")
+    webhook_secret_token: Optional[SecretStr] = Field(
+        None,
+        description="Secret Telegram sends with each delivery (random if unset)",
+    )
+    webhook_max_body_size: int = Field(
+        DEFAULT_WEBHOOK_MAX_BODY_SIZE,
+        description="Largest accepted webhook request body in bytes",
+        ge=1024,
+    )
+    webhook_max_queue: int = Field(
+        DEFAULT_WEBHOOK_MAX_QUEUE,
+        description="Webhook updates accepted but not yet processed before 503s",
+        ge=1,
+    )
+    webhook_keepalive_timeout: float = Field(
+        DEFAULT_WEBHOOK_KEEPALIVE_TIMEOUT,
+        description="Seconds an idle webhook connection is kept open",
+        gt=0,
+    )
+    webhook_max_connections: int = Field(
+        DEFAULT_WEBHOOK_MAX_CONNECTIONS,
+        description="Simultaneous connections Telegram may open to the webhook",
+        ge=1,
+        le=100,
+    )
 
     model_config = SettingsConfigDict(
         env_file=".env", env_file_encoding="utf-8", case_sensitive=False, extra="ignore"
@@ -217,6 +360,15 @@ class Settings(BaseSettings):
             raise ValueError(f"log_level must be one of {valid_levels}")
         return v.upper()  # type: ignore[no-any-return]
 
+    @field_validator("rate_limit_backend")
+    @classmethod
+    def validate_rate_limit_backend(cls, v: Any) -> str:
+        """Validate rate limit backend name."""
+        valid_backends = ["memory", "sqlite"]
+        if v.lower() not in valid_backends:
+            raise ValueError(f"rate_limit_backend must be one of {valid_backends}")
+        return v.lower()  # type: ignore[no-any-return]
+
     @model_validator(mode="after")
     def validate_cross_field_dependencies(self) -> "Settings":
         """Validate dependencies between fields."""
@@ -230,6 +382,15 @@ class Settings(BaseSettings):
         if self.enable_mcp and not self.mcp_config_path:
             raise ValueError("mcp_config_path required when enable_mcp is True")
 
+        # The shared backend only keeps per-user limits
+        if self.rate_limit_backend == "sqlite" and (
+            self.rate_limit_global_requests or self.rate_limit_project_requests
+        ):
+            raise ValueError(
+                "rate_limit_global_requests and rate_limit_project_requests "
+                "are not supported with rate_limit_backend sqlite"
+            )
+
         return self
 
     @property
@@ -245,6 +406,15 @@ class Settings(BaseSettings):
             return Path(db_path).resolve()
         return None
 
+    @property
+    def rate_limit_state_path(self) -> Path:
+        """SQLite file for the shared rate limit backend."""
+        if self.rate_limit_sqlite_path:
+            return self.rate_limit_sqlite_path
+        if self.database_path:
+            return self.database_path.with_name("rate_limits.db")
+        return Path("data/rate_limits.db").resolve()
+
     @property
     def telegram_token_str(self) -> str:
         """Get Telegram token as string."""
@@ -257,6 +427,13 @@ class Settings(BaseSettings):
             return self.auth_token_secret.get_secret_value()
         return None
 
+    @property
+    def webhook_secret_str(self) -> Optional[str]:
+        """Get webhook secret token as string."""
+        if self.webhook_secret_token:
+            return self.webhook_secret_token.get_secret_value()
+        return None
+
     @property
     def anthropic_api_key_str(self) -> Optional[str]:
         """Get Anthropic API key as string."""
@@ -6,7 +6,7 @@ import logging
 import signal
 import sys
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 
 import structlog
 
@@ -23,17 +23,24 @@ from src.config.features import FeatureFlags
 from src.config.loader import load_config
 from src.config.settings import Settings
 from src.exceptions import ConfigurationError
-from src.security.audit import AuditLogger, InMemoryAuditStorage
+from src.security.audit import AuditLogger
 from src.security.auth import (
     AuthenticationManager,
-    InMemoryTokenStorage,
+    AuthProvider,
     TokenAuthProvider,
     WhitelistAuthProvider,
 )
-from src.security.rate_limiter import RateLimiter
+from src.security.rate_limit_sqlite import SQLiteRateLimitBackend
+from src.security.rate_limiter import (
+    RateLimitCheckpointer,
+    RateLimitCleaner,
+    RateLimiter,
+)
 from src.security.validators import SecurityValidator
+from src.storage.audit_storage import SQLiteAuditStorage
 from src.storage.facade import Storage
 from src.storage.session_storage import SQLiteSessionStorage
+from src.storage.token_storage import SQLiteTokenStorage
 
 
 def setup_logging(debug: bool = False) -> None:
@@ -99,16 +106,29 @@ async def create_application(config: Settings) -> Dict[str, Any]:
     await storage.initialize()
 
     # Create security components
-    providers = []
+    providers: List[AuthProvider] = []
 
     # Add whitelist provider if users are configured
     if config.allowed_users:
         providers.append(WhitelistAuthProvider(config.allowed_users))
 
     # Add token provider if enabled
+    token_storage = None
     if config.enable_token_auth:
-        token_storage = InMemoryTokenStorage()  # TODO: Use database storage
-        providers.append(TokenAuthProvider(config.auth_token_secret, token_storage))
+        secret = config.auth_secret_str
+        if secret is None:
+            raise ConfigurationError(
+                "auth_token_secret required when enable_token_auth is True"
+            )
+        token_storage = SQLiteTokenStorage(storage.tokens)
+        token_storage.start()
+        providers.append(
+            TokenAuthProvider(
+                secret,
+                token_storage,
+                cache_ttl=config.auth_token_cache_ttl,
+            )
+        )
 
     # Fall back to allowing all users in development mode
     if not providers and config.development_mode:
@@ -119,16 +139,48 @@ async def create_application(config: Settings) -> Dict[str, Any]:
     elif not providers:
         raise ConfigurationError("No authentication providers configured")
 
-    auth_manager = AuthenticationManager(providers)
+    auth_manager = AuthenticationManager(
+        providers, decision_ttl=config.auth_decision_cache_ttl
+    )
     security_validator = SecurityValidator(
-        config.approved_directory, 
-        disable_path_validation=config.disable_path_validation
+        config.approved_directory,
+        disable_path_validation=config.disable_path_validation,
+        path_cache_size=config.path_cache_size,
+        path_cache_ttl=config.path_cache_ttl,
+    )
+    rate_limit_backend = None
+    if config.rate_limit_backend == "sqlite":
+        # Shared by every worker process on this host
+        rate_limit_backend = SQLiteRateLimitBackend.from_settings(
+            config, path=config.rate_limit_state_path
+        )
+    rate_limiter = RateLimiter(config, backend=rate_limit_backend)
+
+    # Restore limits from the database so restarts don't reset budgets
+    rate_limit_checkpointer = RateLimitCheckpointer(
+        rate_limiter,
+        storage.rate_limits,
+        storage.costs,
+        interval=config.rate_limit_checkpoint_interval,
     )
-    rate_limiter = RateLimiter(config)
+    await rate_limit_checkpointer.warm_start()
+    rate_limit_checkpointer.start()
+
+    # Free state of idle users in the background
+    rate_limit_cleaner = RateLimitCleaner(
+        rate_limiter, interval=config.rate_limit_cleanup_interval
+    )
+    rate_limit_cleaner.start()
 
     # Create audit storage and logger
-    audit_storage = InMemoryAuditStorage()  # TODO: Use database storage in production
+    audit_storage = SQLiteAuditStorage(
+        storage.audit,
+        batch_size=config.audit_batch_size,
+        flush_interval=config.audit_flush_interval,
+    )
+    audit_storage.start()
     audit_logger = AuditLogger(audit_storage)
+    await audit_logger.warm_start()
 
     # Create Claude integration components with persistent storage
     session_storage = SQLiteSessionStorage(storage.db_manager)
@@ -172,6 +224,11 @@ async def create_application(config: Settings) -> Dict[str, Any]:
         "bot": bot,
         "claude_integration": claude_integration,
         "storage": storage,
+        "rate_limiter": rate_limiter,
+        "rate_limit_checkpointer": rate_limit_checkpointer,
+        "rate_limit_cleaner": rate_limit_cleaner,
+        "audit_storage": audit_storage,
+        "token_storage": token_storage,
         "config": config,
     }
 
@@ -182,6 +239,11 @@ async def run_application(app: Dict[str, Any]) -> None:
     bot: ClaudeCodeBot = app["bot"]
     claude_integration: ClaudeIntegration = app["claude_integration"]
     storage: Storage = app["storage"]
+    rate_limiter: RateLimiter = app["rate_limiter"]
+    rate_limit_checkpointer: RateLimitCheckpointer = app["rate_limit_checkpointer"]
+    rate_limit_cleaner: RateLimitCleaner = app["rate_limit_cleaner"]
+    audit_storage: SQLiteAuditStorage = app["audit_storage"]
+    token_storage: Optional[SQLiteTokenStorage] = app.get("token_storage")
 
     # Set up signal handlers for graceful shutdown
     shutdown_event = asyncio.Event()
@@ -224,6 +286,12 @@ async def run_application(app: Dict[str, Any]) -> None:
         try:
             await bot.stop()
             await claude_integration.shutdown()
+            await rate_limit_cleaner.stop()
+            await rate_limit_checkpointer.stop()
+            await rate_limiter.close()
+            await audit_storage.stop()
+            if token_storage is not None:
+                await token_storage.stop()
             await storage.close()
         except Exception as e:
             logger.error("Error during shutdown", error=str(e))
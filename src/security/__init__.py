@@ -22,7 +22,16 @@ from .auth import (
     UserSession,
     WhitelistAuthProvider,
 )
-from .rate_limiter import RateLimitBucket, RateLimiter
+from .rate_limit_sqlite import SQLiteRateLimitBackend
+from .rate_limiter import (
+    InMemoryRateLimitBackend,
+    RateLimitBackend,
+    RateLimitBucket,
+    RateLimitCheckpointer,
+    RateLimitCleaner,
+    RateLimiter,
+    RateLimitReservation,
+)
 from .validators import SecurityValidator
 
 __all__ = [
@@ -32,7 +41,13 @@ __all__ = [
     "AuthenticationManager",
     "UserSession",
     "RateLimiter",
+    "RateLimitReservation",
     "RateLimitBucket",
+    "RateLimitCheckpointer",
+    "RateLimitCleaner",
+    "RateLimitBackend",
+    "InMemoryRateLimitBackend",
+    "SQLiteRateLimitBackend",
     "SecurityValidator",
     "AuditLogger",
     "AuditEvent",
@@ -5,12 +5,14 @@ Features:
 - Command execution
 - File access
 - Security violations
+- Rolling per-minute counters for dashboards and activity summaries
 """
 
 import json
+from collections import Counter, OrderedDict, deque
 from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Deque, Dict, List, Optional
 
 import structlog
 
@@ -67,31 +69,49 @@ class AuditStorage:
         """Get security violations."""
         raise NotImplementedError
 
+    def _log_high_risk(self, event: AuditEvent) -> None:
+        """Log high-risk events immediately, before they are stored."""
+        if event.risk_level in ["high", "critical"]:
+            logger.warning(
+                "High-risk security event",
+                event_type=event.event_type,
+                user_id=event.user_id,
+                risk_level=event.risk_level,
+                details=event.details,
+            )
+
 
 class InMemoryAuditStorage(AuditStorage):
-    """In-memory audit storage for development/testing."""
+    """In-memory audit storage for development/testing.
+
+    Events are kept in arrival order in a bounded deque, so storing is
+    O(1) and the oldest event falls off once ``max_events`` is reached.
+    Queries walk backwards from the newest event and stop once ``limit``
+    events matched (or ``start_time`` is passed), as long as events
+    arrived in timestamp order.
+    """
 
     def __init__(self, max_events: int = 10000):
-        self.events: List[AuditEvent] = []
-        self.max_events = max_events
+        self.events: Deque[AuditEvent] = deque(maxlen=max_events)
+        # Whether arrival order is also timestamp order
+        self._ordered = True
+
+    @property
+    def max_events(self) -> int:
+        """Number of events kept."""
+        return self.events.maxlen  # type: ignore[return-value]
+
+    @max_events.setter
+    def max_events(self, value: int) -> None:
+        self.events = deque(self.events, maxlen=value)
 
     async def store_event(self, event: AuditEvent) -> None:
         """Store event in memory."""
+        if self.events and event.timestamp < self.events[-1].timestamp:
+            self._ordered = False
         self.events.append(event)
 
-        # Trim old events if we exceed limit
-        if len(self.events) > self.max_events:
-            self.events = self.events[-self.max_events :]
-
-        # Log high-risk events immediately
-        if event.risk_level in ["high", "critical"]:
-            logger.warning(
-                "High-risk security event",
-                event_type=event.event_type,
-                user_id=event.user_id,
-                risk_level=event.risk_level,
-                details=event.details,
-            )
+        self._log_high_risk(event)
 
     async def get_events(
         self,
@@ -102,7 +122,22 @@ class InMemoryAuditStorage(AuditStorage):
         limit: int = 100,
     ) -> List[AuditEvent]:
         """Get filtered events."""
-        filtered_events = self.events
+        if self._ordered:
+            matches: List[AuditEvent] = []
+            for event in reversed(self.events):
+                if len(matches) >= limit:
+                    break
+                if start_time is not None and event.timestamp < start_time:
+                    break
+                if (
+                    (user_id is None or event.user_id == user_id)
+                    and (event_type is None or event.event_type == event_type)
+                    and (end_time is None or event.timestamp <= end_time)
+                ):
+                    matches.append(event)
+            return matches
+
+        filtered_events = list(self.events)
 
         # Apply filters
         if user_id is not None:
@@ -130,13 +165,181 @@ class InMemoryAuditStorage(AuditStorage):
         )
 
 
+_EPOCH = datetime(1970, 1, 1)
+
+# Counter keys
+EVENTS = "events"
+SUCCESSES = "successes"
+AUTH_FAILURES = "auth_failures"
+VIOLATIONS = "violations"
+
+
+class RollingAuditCounters:
+    """Event counts in one-minute buckets over a trailing window.
+
+    Kept overall and per user and updated as events are logged, so
+    aggregate queries cost O(buckets) instead of refetching and
+    recounting events. Each bucket is a ``Counter`` holding the totals
+    above plus ``("type", event_type)``, ``("risk", level)`` and
+    ``("violation", violation_type)`` keys. Running totals for the whole
+    window are kept alongside, so full-window queries only read those.
+    Buckets and users older than the window are pruned (and subtracted)
+    as time moves on.
+    """
+
+    def __init__(self, window: timedelta = timedelta(hours=24)):
+        self.window_minutes = int(window.total_seconds() // 60)
+        self._buckets: "OrderedDict[int, Counter]" = OrderedDict()
+        self._user_buckets: Dict[int, "OrderedDict[int, Counter]"] = {}
+        self._window_totals: Counter = Counter()
+        self._user_totals: Dict[int, Counter] = {}
+        self._last_activity: Dict[int, datetime] = {}
+        self._pruned_minute = 0
+
+    @staticmethod
+    def _minute(timestamp: datetime) -> int:
+        return int((timestamp - _EPOCH).total_seconds() // 60)
+
+    def _cutoff(self) -> int:
+        """Newest minute that has fallen out of the window."""
+        return self._minute(datetime.utcnow()) - self.window_minutes
+
+    def record(self, event: AuditEvent) -> None:
+        """Count an event in its minute, overall and for its user."""
+        cutoff = self._cutoff()
+        minute = self._minute(event.timestamp)
+        if minute <= cutoff:
+            return
+
+        keys: List[Any] = [
+            EVENTS,
+            ("type", event.event_type),
+            ("risk", event.risk_level),
+        ]
+        if event.success:
+            keys.append(SUCCESSES)
+        elif event.event_type == "auth_attempt":
+            keys.append(AUTH_FAILURES)
+        if event.event_type == "security_violation":
+            keys.append(VIOLATIONS)
+            keys.append(("violation", event.details.get("violation_type", "unknown")))
+
+        user_buckets = self._user_buckets.setdefault(event.user_id, OrderedDict())
+        for buckets in (self._buckets, user_buckets):
+            bucket = buckets.get(minute)
+            if bucket is None:
+                bucket = buckets[minute] = Counter()
+            bucket.update(keys)
+        self._window_totals.update(keys)
+        self._user_totals.setdefault(event.user_id, Counter()).update(keys)
+
+        last = self._last_activity.get(event.user_id)
+        if last is None or event.timestamp > last:
+            self._last_activity[event.user_id] = event.timestamp
+
+        self._prune(cutoff)
+
+    def _prune(self, cutoff: int) -> None:
+        """Drop expired buckets and idle users (at most once a minute)."""
+        if cutoff == self._pruned_minute:
+            return
+        self._pruned_minute = cutoff
+
+        self._drop_expired(self._buckets, self._window_totals, cutoff)
+        for user_id in list(self._user_buckets):
+            buckets = self._user_buckets[user_id]
+            self._drop_expired(buckets, self._user_totals[user_id], cutoff)
+            if not buckets:
+                del self._user_buckets[user_id]
+                del self._user_totals[user_id]
+                del self._last_activity[user_id]
+
+    @staticmethod
+    def _drop_expired(
+        buckets: "OrderedDict[int, Counter]", totals: Counter, cutoff: int
+    ) -> None:
+        for minute in [m for m in buckets if m <= cutoff]:
+            totals.subtract(buckets.pop(minute))
+
+    def covers(self, hours: float) -> bool:
+        """Whether ``hours`` fits inside the window."""
+        return hours * 60 <= self.window_minutes
+
+    def totals(self, hours: float, user_id: Optional[int] = None) -> Counter:
+        """Summed counts for the last ``hours``, overall or for one user."""
+        if hours * 60 == self.window_minutes:
+            self._prune(self._cutoff())
+            if user_id is None:
+                return Counter(self._window_totals)
+            return Counter(self._user_totals.get(user_id, {}))
+
+        since = self._minute(datetime.utcnow()) - int(hours * 60)
+        buckets = (
+            self._buckets
+            if user_id is None
+            else self._user_buckets.get(user_id, OrderedDict())
+        )
+        totals: Counter = Counter()
+        for minute, bucket in buckets.items():
+            if minute > since:
+                totals.update(bucket)
+        return totals
+
+    def active_users(self, hours: float) -> int:
+        """Users with at least one event in the last ``hours``."""
+        since = datetime.utcnow() - timedelta(hours=hours)
+        return sum(1 for last in self._last_activity.values() if last >= since)
+
+    def last_activity(self, user_id: int) -> Optional[datetime]:
+        """Timestamp of the user's newest counted event."""
+        return self._last_activity.get(user_id)
+
+    @staticmethod
+    def breakdown(totals: Counter, kind: str) -> Dict[str, int]:
+        """``{label: count}`` for one kind of labelled key."""
+        return {
+            key[1]: count
+            for key, count in totals.items()
+            if isinstance(key, tuple) and key[0] == kind and count
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counter memory statistics."""
+        return {
+            "window_minutes": self.window_minutes,
+            "buckets": len(self._buckets),
+            "users": len(self._user_buckets),
+            "user_buckets": sum(len(b) for b in self._user_buckets.values()),
+        }
+
+
 class AuditLogger:
     """Security audit logger."""
 
-    def __init__(self, storage: AuditStorage):
+    def __init__(self, storage: AuditStorage, window: timedelta = timedelta(hours=24)):
         self.storage = storage
+        self.counters = RollingAuditCounters(window)
         logger.info("Audit logger initialized")
 
+    async def _store(self, event: AuditEvent) -> None:
+        """Count and store an event."""
+        self.counters.record(event)
+        await self.storage.store_event(event)
+
+    async def warm_start(self, limit: int = 100000) -> int:
+        """Count stored events that are still inside the window."""
+        start_time = datetime.utcnow() - timedelta(minutes=self.counters.window_minutes)
+        try:
+            events = await self.storage.get_events(start_time=start_time, limit=limit)
+        except Exception as e:
+            logger.warning("Audit counter warm start failed", error=str(e))
+            return 0
+
+        for event in events:
+            self.counters.record(event)
+        logger.info("Audit counters warm started", events=len(events))
+        return len(events)
+
     async def log_auth_attempt(
         self,
         user_id: int,
@@ -158,7 +361,7 @@ class AuditLogger:
             risk_level=risk_level,
         )
 
-        await self.storage.store_event(event)
+        await self._store(event)
 
         logger.info(
             "Authentication attempt logged",
@@ -185,7 +388,7 @@ class AuditLogger:
             risk_level="low",
         )
 
-        await self.storage.store_event(event)
+        await self._store(event)
 
     async def log_command(
         self,
@@ -216,7 +419,7 @@ class AuditLogger:
             risk_level=risk_level,
         )
 
-        await self.storage.store_event(event)
+        await self._store(event)
 
         logger.info(
             "Command execution logged",
@@ -247,7 +450,7 @@ class AuditLogger:
             risk_level=risk_level,
         )
 
-        await self.storage.store_event(event)
+        await self._store(event)
 
     async def log_security_violation(
         self,
@@ -276,7 +479,7 @@ class AuditLogger:
             risk_level=risk_level,
         )
 
-        await self.storage.store_event(event)
+        await self._store(event)
 
         logger.warning(
             "Security violation logged",
@@ -308,7 +511,7 @@ class AuditLogger:
             risk_level="low",
         )
 
-        await self.storage.store_event(event)
+        await self._store(event)
 
     def _assess_command_risk(self, command: str, args: List[str]) -> str:
         """Assess risk level of command execution."""
@@ -394,6 +597,27 @@ class AuditLogger:
         self, user_id: int, hours: int = 24
     ) -> Dict[str, Any]:
         """Get activity summary for user."""
+        if not self.counters.covers(hours):
+            return await self._summarize_user_events(user_id, hours)
+
+        totals = self.counters.totals(hours, user_id=user_id)
+        last_activity = self.counters.last_activity(user_id)
+        total_events = totals[EVENTS]
+        return {
+            "user_id": user_id,
+            "period_hours": hours,
+            "total_events": total_events,
+            "event_types": self.counters.breakdown(totals, "type"),
+            "risk_levels": self.counters.breakdown(totals, "risk"),
+            "success_rate": totals[SUCCESSES] / total_events if total_events else 0,
+            "security_violations": totals[VIOLATIONS],
+            "last_activity": (
+                last_activity.isoformat() if last_activity and total_events else None
+            ),
+        }
+
+    async def _summarize_user_events(self, user_id: int, hours: int) -> Dict[str, Any]:
+        """Activity summary recounted from stored events (beyond the window)."""
         start_time = datetime.utcnow() - timedelta(hours=hours)
         events = await self.storage.get_events(
             user_id=user_id, start_time=start_time, limit=1000
@@ -441,41 +665,14 @@ class AuditLogger:
         return summary
 
     async def get_security_dashboard(self) -> Dict[str, Any]:
-        """Get security dashboard data."""
-        # Get recent events (last 24 hours)
-        start_time = datetime.utcnow() - timedelta(hours=24)
-        recent_events = await self.storage.get_events(start_time=start_time, limit=1000)
-
-        # Get security violations
-        violations = await self.storage.get_security_violations(limit=100)
-
-        dashboard: Dict[str, Any] = {
+        """Get security dashboard data for the last 24 hours."""
+        totals = self.counters.totals(24)
+        return {
             "period": "24_hours",
-            "total_events": len(recent_events),
-            "security_violations": len(violations),
-            "active_users": len(set(e.user_id for e in recent_events)),
-            "risk_distribution": {},
-            "top_violation_types": {},
-            "authentication_failures": 0,
+            "total_events": totals[EVENTS],
+            "security_violations": totals[VIOLATIONS],
+            "active_users": self.counters.active_users(24),
+            "risk_distribution": self.counters.breakdown(totals, "risk"),
+            "top_violation_types": self.counters.breakdown(totals, "violation"),
+            "authentication_failures": totals[AUTH_FAILURES],
         }
-
-        # Analyze events
-        for event in recent_events:
-            # Risk distribution
-            risk = event.risk_level
-            dashboard["risk_distribution"][risk] = (
-                dashboard["risk_distribution"].get(risk, 0) + 1
-            )
-
-            # Authentication failures
-            if event.event_type == "auth_attempt" and not event.success:
-                dashboard["authentication_failures"] += 1
-
-        # Analyze violations
-        for violation in violations:
-            violation_type = violation.details.get("violation_type", "unknown")
-            dashboard["top_violation_types"][violation_type] = (
-                dashboard["top_violation_types"].get(violation_type, 0) + 1
-            )
-
-        return dashboard
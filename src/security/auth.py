@@ -3,16 +3,20 @@
 Features:
 - Telegram ID whitelist
 - Token-based authentication
-- Session management
+- Session management with expiry-ordered cleanup
 - Audit logging
 """
 
 import hashlib
+import heapq
+import itertools
 import secrets
+import time
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import structlog
 
@@ -50,6 +54,9 @@ class UserSession:
 class AuthProvider(ABC):
     """Base authentication provider."""
 
+    def __init__(self) -> None:
+        self._revocation_listeners: List[Callable[[int], None]] = []
+
     @abstractmethod
     async def authenticate(self, user_id: int, credentials: Dict[str, Any]) -> bool:
         """Verify user credentials."""
@@ -60,11 +67,20 @@ class AuthProvider(ABC):
         """Get user information."""
         pass
 
+    def add_revocation_listener(self, listener: Callable[[int], None]) -> None:
+        """Call ``listener(user_id)`` when a user's credentials are revoked."""
+        self._revocation_listeners.append(listener)
+
+    def _notify_revoked(self, user_id: int) -> None:
+        for listener in self._revocation_listeners:
+            listener(user_id)
+
 
 class WhitelistAuthProvider(AuthProvider):
     """Whitelist-based authentication."""
 
     def __init__(self, allowed_users: List[int], allow_all_dev: bool = False):
+        super().__init__()
         self.allowed_users = set(allowed_users)
         self.allow_all_dev = allow_all_dev
         logger.info(
@@ -112,6 +128,9 @@ class TokenStorage(ABC):
         """Revoke token for user."""
         pass
 
+    async def record_use(self, user_id: int) -> None:
+        """Note a successful authentication (optional)."""
+
 
 class InMemoryTokenStorage(TokenStorage):
     """In-memory token storage for development/testing."""
@@ -145,17 +164,39 @@ class InMemoryTokenStorage(TokenStorage):
 
 
 class TokenAuthProvider(AuthProvider):
-    """Token-based authentication."""
+    """Token-based authentication.
+
+    Verification results are cached per (user, token) for ``cache_ttl``
+    seconds (never past the token's expiry) and failures for at most
+    ``negative_cache_ttl`` seconds, so repeated updates skip the hash and
+    the storage lookup. Generating or revoking a user's token drops their
+    cached results in this process and tells the revocation listeners, as
+    a new token replaces the old one; other processes sharing the storage
+    see the change once their entries expire.
+    """
 
     def __init__(
         self,
         secret: str,
         storage: TokenStorage,
         token_lifetime: timedelta = timedelta(days=30),
+        cache_ttl: float = 30.0,
+        negative_cache_ttl: float = 5.0,
+        cache_size: int = 1024,
     ):
+        super().__init__()
         self.secret = secret
         self.storage = storage
         self.token_lifetime = token_lifetime
+        self.cache_ttl = cache_ttl
+        self.negative_cache_ttl = min(negative_cache_ttl, cache_ttl)
+        self.cache_size = cache_size
+        # (user_id, token) -> (valid, monotonic expiry)
+        self._verified: "OrderedDict[Tuple[int, str], Tuple[bool, float]]" = (
+            OrderedDict()
+        )
+        self.cache_hits = 0
+        self.cache_misses = 0
         logger.info("Token auth provider initialized")
 
     async def authenticate(self, user_id: int, credentials: Dict[str, Any]) -> bool:
@@ -167,17 +208,82 @@ class TokenAuthProvider(AuthProvider):
             )
             return False
 
+        cached = self._cached_result(user_id, token)
+        if cached is not None:
+            if cached:
+                await self.storage.record_use(user_id)
+            return cached
+
         stored_token = await self.storage.get_user_token(user_id)
         if not stored_token:
+            self._cache_result(user_id, token, False)
             logger.warning(
                 "Token authentication failed: no stored token", user_id=user_id
             )
             return False
 
         is_valid = self._verify_token(token, stored_token["hash"])
+        self._cache_result(user_id, token, is_valid, stored_token.get("expires_at"))
+        if is_valid:
+            await self.storage.record_use(user_id)
         logger.info("Token authentication attempt", user_id=user_id, success=is_valid)
         return is_valid
 
+    def _cached_result(self, user_id: int, token: str) -> Optional[bool]:
+        """Cached verification result, if still fresh."""
+        if self.cache_ttl <= 0:
+            return None
+
+        key = (user_id, token)
+        entry = self._verified.get(key)
+        if entry is None or entry[1] <= time.monotonic():
+            if entry is not None:
+                del self._verified[key]
+            self.cache_misses += 1
+            return None
+
+        self._verified.move_to_end(key)
+        self.cache_hits += 1
+        return entry[0]
+
+    def _cache_result(
+        self,
+        user_id: int,
+        token: str,
+        valid: bool,
+        expires_at: Optional[datetime] = None,
+    ) -> None:
+        if self.cache_ttl <= 0:
+            return
+
+        ttl = self.cache_ttl if valid else self.negative_cache_ttl
+        if expires_at is not None:
+            ttl = min(ttl, (expires_at - datetime.utcnow()).total_seconds())
+        if ttl <= 0:
+            return
+
+        key = (user_id, token)
+        self._verified[key] = (valid, time.monotonic() + ttl)
+        self._verified.move_to_end(key)
+        while len(self._verified) > self.cache_size:
+            self._verified.popitem(last=False)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Drop every cached result for the user."""
+        for key in [key for key in self._verified if key[0] == user_id]:
+            del self._verified[key]
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Verification cache statistics."""
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            "entries": len(self._verified),
+            "ttl": self.cache_ttl,
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "hit_rate": self.cache_hits / lookups if lookups else 0.0,
+        }
+
     async def generate_token(self, user_id: int) -> str:
         """Generate new authentication token."""
         token = secrets.token_urlsafe(32)
@@ -185,6 +291,8 @@ class TokenAuthProvider(AuthProvider):
         expires_at = datetime.utcnow() + self.token_lifetime
 
         await self.storage.store_token(user_id, hashed, expires_at)
+        self.invalidate_user(user_id)
+        self._notify_revoked(user_id)
 
         logger.info(
             "Token generated", user_id=user_id, expires_at=expires_at.isoformat()
@@ -194,6 +302,8 @@ class TokenAuthProvider(AuthProvider):
     async def revoke_token(self, user_id: int) -> None:
         """Revoke user's token."""
         await self.storage.revoke_token(user_id)
+        self.invalidate_user(user_id)
+        self._notify_revoked(user_id)
         logger.info("Token revoked", user_id=user_id)
 
     async def get_user_info(self, user_id: int) -> Optional[Dict[str, Any]]:
@@ -219,14 +329,48 @@ class TokenAuthProvider(AuthProvider):
 
 
 class AuthenticationManager:
-    """Main authentication manager supporting multiple providers."""
+    """Main authentication manager supporting multiple providers.
+
+    Sessions are also kept in a min-heap by the time they were due to
+    expire when scheduled, so cleanup only looks at sessions whose
+    deadline has passed instead of scanning all of them. Refreshing a
+    session does not touch the heap: when a refreshed session comes up it
+    is rescheduled at its new deadline. Ended or replaced sessions leave
+    stale entries that are skipped when popped, and the heap is rebuilt
+    once stale entries outnumber live ones.
+
+    The latest decision per user is also cached for ``decision_ttl``
+    seconds (never past the session's expiry), so the middleware can let
+    a user through, or turn them away, without asking the providers or
+    checking the session again. Ending a session or revoking a user's
+    credentials drops the cached decision.
+    """
 
-    def __init__(self, providers: List[AuthProvider]):
+    def __init__(
+        self,
+        providers: List[AuthProvider],
+        decision_ttl: float = 10.0,
+        decision_cache_size: int = 10000,
+    ):
         if not providers:
             raise SecurityError("At least one authentication provider is required")
 
         self.providers = providers
         self.sessions: Dict[int, UserSession] = {}
+        # (deadline, tie-breaker, session)
+        self._expiry_heap: List[Tuple[datetime, int, UserSession]] = []
+        self._expiry_seq = itertools.count()
+
+        self.decision_ttl = decision_ttl
+        self.decision_cache_size = decision_cache_size
+        # user_id -> (allowed, monotonic expiry), oldest first
+        self._decisions: Dict[int, Tuple[bool, float]] = {}
+        self.decision_hits = 0
+        self.decision_misses = 0
+        self.provider_calls = 0
+
+        for provider in providers:
+            provider.add_revocation_listener(self.end_session)
         logger.info("Authentication manager initialized", providers=len(self.providers))
 
     async def authenticate_user(
@@ -241,6 +385,7 @@ class AuthenticationManager:
         # Try each provider
         for provider in self.providers:
             try:
+                self.provider_calls += 1
                 if await provider.authenticate(user_id, credentials):
                     await self._create_session(user_id, provider)
                     logger.info(
@@ -257,19 +402,24 @@ class AuthenticationManager:
                     error=str(e),
                 )
 
+        if not self.is_authenticated(user_id):
+            self._remember_decision(user_id, False)
         logger.warning("Authentication failed for user", user_id=user_id)
         return False
 
     async def _create_session(self, user_id: int, provider: AuthProvider) -> None:
         """Create authenticated session."""
         user_info = await provider.get_user_info(user_id)
-        self.sessions[user_id] = UserSession(
+        session = UserSession(
             user_id=user_id,
             auth_provider=provider.__class__.__name__,
             created_at=datetime.utcnow(),
             last_activity=datetime.utcnow(),
             user_info=user_info,
         )
+        self.sessions[user_id] = session
+        self._schedule_expiry(session)
+        self._remember_decision(user_id, True, session)
 
         logger.info(
             "Session created", user_id=user_id, provider=provider.__class__.__name__
@@ -283,6 +433,7 @@ class AuthenticationManager:
         elif session:
             # Remove expired session
             del self.sessions[user_id]
+            self._decisions.pop(user_id, None)
             logger.info("Expired session removed", user_id=user_id)
         return False
 
@@ -297,28 +448,106 @@ class AuthenticationManager:
         session = self.get_session(user_id)
         if session:
             session.refresh()
+            self._remember_decision(user_id, True, session)
             return True
         return False
 
     def end_session(self, user_id: int) -> None:
         """End user session."""
+        self._decisions.pop(user_id, None)
         if user_id in self.sessions:
             del self.sessions[user_id]
             logger.info("Session ended", user_id=user_id)
 
+    def _schedule_expiry(self, session: UserSession) -> None:
+        """Add the session to the expiry heap at its current deadline."""
+        heap = self._expiry_heap
+        if len(heap) > 2 * len(self.sessions) + 64:
+            # Mostly stale entries: rebuild from the live sessions
+            heap[:] = [
+                (s.last_activity + s.session_timeout, next(self._expiry_seq), s)
+                for s in self.sessions.values()
+                if s is not session
+            ]
+            heapq.heapify(heap)
+        heapq.heappush(
+            heap,
+            (
+                session.last_activity + session.session_timeout,
+                next(self._expiry_seq),
+                session,
+            ),
+        )
+
     def _cleanup_expired_sessions(self) -> None:
-        """Remove expired sessions."""
-        expired_sessions = [
-            user_id
-            for user_id, session in self.sessions.items()
-            if session.is_expired()
-        ]
-
-        for user_id in expired_sessions:
-            del self.sessions[user_id]
+        """Remove expired sessions whose deadline has passed."""
+        heap = self._expiry_heap
+        now = datetime.utcnow()
+        expired = 0
+
+        while heap and heap[0][0] < now:
+            _, _, session = heapq.heappop(heap)
+            if self.sessions.get(session.user_id) is not session:
+                continue  # Ended or replaced since it was scheduled
+            if session.is_expired():
+                del self.sessions[session.user_id]
+                self._decisions.pop(session.user_id, None)
+                expired += 1
+            else:
+                self._schedule_expiry(session)  # Refreshed meanwhile
+
+        if expired:
+            logger.info("Expired sessions cleaned up", count=expired)
+
+    def get_cached_decision(self, user_id: int) -> Optional[bool]:
+        """Recent decision for the user, if still fresh."""
+        if self.decision_ttl <= 0:
+            return None
+
+        entry = self._decisions.get(user_id)
+        if entry is not None and entry[1] > time.monotonic():
+            self.decision_hits += 1
+            return entry[0]
+        self.decision_misses += 1
+        return None
 
-        if expired_sessions:
-            logger.info("Expired sessions cleaned up", count=len(expired_sessions))
+    def _remember_decision(
+        self, user_id: int, allowed: bool, session: Optional[UserSession] = None
+    ) -> None:
+        if self.decision_ttl <= 0:
+            return
+
+        ttl = self.decision_ttl
+        if session is not None:
+            deadline = session.last_activity + session.session_timeout
+            ttl = min(ttl, (deadline - datetime.utcnow()).total_seconds())
+
+        decisions = self._decisions
+        decisions.pop(user_id, None)
+        now = time.monotonic()
+        if ttl > 0:
+            decisions[user_id] = (allowed, now + ttl)
+
+        # Re-inserting keeps the dict roughly in expiry order
+        while decisions:
+            oldest = next(iter(decisions))
+            if len(decisions) <= self.decision_cache_size and (
+                decisions[oldest][1] > now
+            ):
+                break
+            del decisions[oldest]
+
+    def get_decision_stats(self) -> Dict[str, Any]:
+        """Decision cache statistics."""
+        lookups = self.decision_hits + self.decision_misses
+        return {
+            "entries": len(self._decisions),
+            "ttl": self.decision_ttl,
+            "hits": self.decision_hits,
+            "misses": self.decision_misses,
+            "hit_rate": self.decision_hits / lookups if lookups else 0.0,
+            "provider_calls": self.provider_calls,
+        }
 
     def get_active_sessions_count(self) -> int:
         """Get count of active sessions."""
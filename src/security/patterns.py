@@ -0,0 +1,109 @@
+"""Compiled multi-pattern matching.
+
+Features:
+- Many regexes compiled once into a single alternation
+- One scan per input instead of one per pattern
+- Named groups report which source pattern matched
+- Categorised scanning that reports every matching pattern
+"""
+
+import re
+from typing import Dict, Iterable, List, Mapping, Optional, Pattern, Tuple
+
+# (category, source, compiled, lower-case variant or None)
+CompiledPattern = Tuple[str, str, Pattern[str], Optional[Pattern[str]]]
+
+
+class PatternSet:
+    """A list of regexes matched as one compiled alternation.
+
+    Scanning uses a plain alternation of non-capturing groups, which lets
+    the regex engine skip ahead to characters that can start a match.
+    Only on a hit is the named version (each pattern as group
+    ``p<index>``) matched at that position to find the source pattern
+    for error messages and logs; named groups alone would disable that
+    skip. Patterns must not contain capturing groups of their own. When
+    several patterns could match, the leftmost hit wins (ties go to the
+    earlier pattern).
+    """
+
+    __slots__ = ("patterns", "scanner", "regex")
+
+    def __init__(self, patterns: Iterable[str], flags: int = 0):
+        self.patterns: Tuple[str, ...] = tuple(patterns)
+        self.scanner = re.compile("|".join(f"(?:{p})" for p in self.patterns), flags)
+        self.regex = re.compile(
+            "|".join(f"(?P<p{i}>{p})" for i, p in enumerate(self.patterns)),
+            flags,
+        )
+
+    def _source(self, text: str, hit: Optional["re.Match[str]"]) -> Optional[str]:
+        if hit is None:
+            return None
+        named = self.regex.match(text, hit.start())
+        if named is None or named.lastgroup is None:
+            return None  # Unreachable: both regexes match the same texts
+        return self.patterns[int(named.lastgroup[1:])]
+
+    def search(self, text: str) -> Optional[str]:
+        """Source of the pattern found anywhere in ``text``, if any."""
+        return self._source(text, self.scanner.search(text))
+
+    def match(self, text: str) -> Optional[str]:
+        """Source of the pattern matching at the start of ``text``, if any."""
+        return self._source(text, self.scanner.match(text))
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+
+class ContentScanner:
+    """Finds every pattern, across named categories, that matches a text.
+
+    Gives the same answer as ``re.search`` with each pattern and its
+    category's flags, but faster on long text. ``re.IGNORECASE`` stops
+    sre from using its fast literal search, so case-insensitive patterns
+    (which must be written in lower case) run case-sensitively against a
+    lower-cased copy of the text, made once per scan. Text containing one
+    of the few characters that ``str.lower`` and the regex engine fold
+    differently is scanned with the original flags instead.
+    """
+
+    __slots__ = ("categories", "_compiled")
+
+    # Non-ASCII characters that IGNORECASE matches to an ASCII letter
+    # while str.lower() maps them elsewhere (or to two characters)
+    _CASE_MISMATCH = re.compile("[\u0130\u0131\u017f]")
+
+    def __init__(self, categories: Mapping[str, Tuple[Iterable[str], int]]):
+        self.categories: Dict[str, Tuple[str, ...]] = {}
+        self._compiled: List[CompiledPattern] = []
+        for name, (patterns, flags) in categories.items():
+            self.categories[name] = tuple(patterns)
+            for source in self.categories[name]:
+                lowered = None
+                if flags & re.IGNORECASE:
+                    if re.search(r"[A-Z]", re.sub(r"\\.", "", source)):
+                        raise ValueError(
+                            f"Case-insensitive pattern must be lower case: {source}"
+                        )
+                    lowered = re.compile(source, flags & ~re.IGNORECASE)
+                self._compiled.append(
+                    (name, source, re.compile(source, flags), lowered)
+                )
+
+    def scan(self, text: str) -> Dict[str, List[str]]:
+        """Matching source patterns per category, in declaration order."""
+        lower: Optional[str] = None
+        if text.isascii() or not self._CASE_MISMATCH.search(text):
+            lower = text.lower()
+
+        found: Dict[str, List[str]] = {name: [] for name in self.categories}
+        for name, source, regex, lowered in self._compiled:
+            if lowered is not None and lower is not None:
+                hit = lowered.search(lower)
+            else:
+                hit = regex.search(text)
+            if hit:
+                found[name].append(source)
+        return found
@@ -0,0 +1,358 @@
+"""Shared rate limiter state in a SQLite file.
+
+Features:
+- One atomic UPSERT ... RETURNING per check (refill, check and consume)
+- Sliding cost window with the same two-counter scheme as the memory backend
+- Safe across several bot processes on the same host (WAL mode)
+- Wall-clock timestamps so every worker agrees on refill time
+- Writes run on a dedicated thread, never on the event loop
+"""
+
+import asyncio
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar, Union
+
+import structlog
+
+from .rate_limiter import RateLimitBackend, RateLimitDecision
+
+logger = structlog.get_logger()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rate_limits (
+    user_id INTEGER PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    cost REAL NOT NULL DEFAULT 0.0,
+    prev_cost REAL NOT NULL DEFAULT 0.0,
+    cost_reset_at REAL NOT NULL,
+    last_result INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_rate_limits_updated_at ON rate_limits(updated_at);
+"""
+
+# last_result values
+RESULT_ALLOWED = 0
+RESULT_RATE_LIMITED = 1
+RESULT_COST_LIMITED = 2
+
+T = TypeVar("T")
+
+
+def _acquire_expressions(
+    tokens: str, updated_at: str, cost: str, prev_cost: str, reset_at: str
+) -> Dict[str, str]:
+    """SET expressions for a check against the given (old) column values.
+
+    SQLite evaluates every SET expression against the row as it was before
+    the update, so each column can be derived from the same old state.
+    """
+    refilled = f"MIN(:capacity, {tokens} + MAX(:now - {updated_at}, 0) * :rate)"
+
+    # Roll the cost window forward by whole windows
+    windows = f"CAST((:now - {reset_at}) / :window AS INTEGER)"
+    new_start = f"({reset_at} + {windows} * :window)"
+    new_cost = f"(CASE WHEN {windows} = 0 THEN {cost} ELSE 0.0 END)"
+    new_prev = (
+        f"(CASE WHEN {windows} = 0 THEN {prev_cost} "
+        f"WHEN {windows} = 1 AND :sliding THEN {cost} ELSE 0.0 END)"
+    )
+    weight = f"MAX(1.0 - (:now - {new_start}) / :window, 0.0)"
+    window_cost = f"({new_cost} + {new_prev} * {weight})"
+
+    result = (
+        f"(CASE WHEN {refilled} < :tokens THEN {RESULT_RATE_LIMITED} "
+        f"WHEN {window_cost} + :cost > :max_cost THEN {RESULT_COST_LIMITED} "
+        f"ELSE {RESULT_ALLOWED} END)"
+    )
+    allowed = f"({result} = {RESULT_ALLOWED})"
+    return {
+        "tokens": (
+            f"(CASE WHEN {allowed} THEN {refilled} - :tokens ELSE {refilled} END)"
+        ),
+        "updated_at": ":now",
+        "cost": f"(CASE WHEN {allowed} THEN {new_cost} + :cost ELSE {new_cost} END)",
+        "prev_cost": new_prev,
+        "cost_reset_at": new_start,
+        "last_result": result,
+    }
+
+
+def _build_acquire_sql() -> str:
+    """Single statement that creates or updates a user's state."""
+    # A new user starts from a full bucket and an empty cost window
+    fresh = _acquire_expressions(":capacity", ":now", "0.0", "0.0", ":now")
+    existing = _acquire_expressions(
+        "tokens", "updated_at", "cost", "prev_cost", "cost_reset_at"
+    )
+    columns = list(fresh)
+    return (
+        f"INSERT INTO rate_limits (user_id, {', '.join(columns)}) "
+        f"VALUES (:user_id, {', '.join(fresh[c] for c in columns)}) "
+        f"ON CONFLICT(user_id) DO UPDATE SET "
+        + ", ".join(f"{c} = {existing[c]}" for c in columns)
+        + " RETURNING tokens, "
+        "cost + prev_cost * MAX(1.0 - (:now - cost_reset_at) / :window, 0.0), "
+        "last_result"
+    )
+
+
+ACQUIRE_SQL = _build_acquire_sql()
+
+
+class SQLiteRateLimitBackend(RateLimitBackend):
+    """Rate limit state shared by every process that opens the same file.
+
+    Each check is one statement that SQLite serialises under its write
+    lock, so workers never over-admit. Statements run on a single
+    dedicated thread, so waiting up to ``busy_timeout`` for another
+    worker's lock never stalls the event loop.
+
+    Only per-user limits are kept here; global and per-project buckets
+    would not be shared between workers, so configuring them is an error.
+    """
+
+    name = "sqlite"
+
+    def __init__(
+        self,
+        capacity: int,
+        refill_rate: float,
+        max_cost: float,
+        path: Union[str, Path] = "rate_limits.db",
+        busy_timeout: float = 5.0,
+        **limits: Any,
+    ):
+        super().__init__(capacity, refill_rate, max_cost, **limits)
+        if self.global_capacity or self.project_capacity:
+            raise ValueError(
+                "Global and project rate limits are not supported by the "
+                "SQLite backend"
+            )
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        # One thread keeps statements in order and off the event loop; the
+        # lock guards the connection against the final close
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="rate-limit-sqlite"
+        )
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.path),
+            timeout=busy_timeout,
+            isolation_level=None,  # autocommit: each statement is its own txn
+            check_same_thread=False,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        columns = {
+            row[1] for row in self._conn.execute("PRAGMA table_info(rate_limits)")
+        }
+        if "prev_cost" not in columns:
+            self._conn.execute(
+                "ALTER TABLE rate_limits ADD COLUMN prev_cost REAL NOT NULL DEFAULT 0.0"
+            )
+
+        self._params: Dict[str, Any] = {
+            "capacity": float(capacity),
+            "rate": refill_rate,
+            "max_cost": max_cost,
+            "window": self.cost_window.total_seconds(),
+            "sliding": int(self.sliding_cost_window),
+        }
+
+        logger.info("SQLite rate limit backend opened", path=str(self.path))
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        """Run ``func`` on the database thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    def _execute(self, sql: str, params: Any = ()) -> int:
+        """Run a statement; returns the rows it changed."""
+        with self._lock:
+            return self._conn.execute(sql, params).rowcount
+
+    def _fetchone(self, sql: str, params: Any = ()) -> Any:
+        """Run a statement to completion and return its first row."""
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()
+
+    async def acquire(
+        self, user_id: int, tokens: int, cost: float, project: Optional[str] = None
+    ) -> RateLimitDecision:
+        """Check the user's limits and consume tokens and cost if they pass."""
+        params = dict(
+            self._params, user_id=user_id, now=time.time(), tokens=tokens, cost=cost
+        )
+        left, current_cost, result = await self._run(
+            self._fetchone, ACQUIRE_SQL, params
+        )
+
+        if result == RESULT_RATE_LIMITED:
+            return RateLimitDecision(
+                allowed=False,
+                reason="rate",
+                tokens=left,
+                capacity=self.capacity,
+                wait_time=(tokens - left) / self.refill_rate,
+                current_cost=current_cost,
+            )
+        return RateLimitDecision(
+            allowed=result == RESULT_ALLOWED,
+            reason="cost" if result == RESULT_COST_LIMITED else None,
+            tokens=left,
+            capacity=self.capacity,
+            current_cost=current_cost,
+        )
+
+    async def adjust_cost(self, user_id: int, delta: float) -> None:
+        """Add ``delta`` (possibly negative) to the user's current cost.
+
+        Applied to the stored window as is; if it has ended since the
+        reservation, the correction rolls over with it on the next check.
+        """
+        await self._run(
+            self._execute,
+            "UPDATE rate_limits SET cost = MAX(cost + ?, 0.0) WHERE user_id = ?",
+            (delta, user_id),
+        )
+
+    async def reset(self, user_id: int) -> float:
+        """Refill the bucket and clear the cost; returns the old cost."""
+        now = time.time()
+        row = await self._run(self._reset_row, user_id, now)
+        return self._window_cost(*row, now)[0] if row else 0.0
+
+    def _reset_row(
+        self, user_id: int, now: float
+    ) -> Optional[Tuple[float, float, float]]:
+        """Reset the user's row; returns its old cost columns, if any."""
+        with self._lock:
+            row: Optional[Tuple[float, float, float]] = self._conn.execute(
+                "SELECT cost, prev_cost, cost_reset_at FROM rate_limits "
+                "WHERE user_id = ?",
+                (user_id,),
+            ).fetchone()
+            self._conn.execute(
+                """
+                INSERT INTO rate_limits
+                (user_id, tokens, updated_at, cost, prev_cost, cost_reset_at)
+                VALUES (?, ?, ?, 0.0, 0.0, ?)
+                ON CONFLICT(user_id) DO UPDATE SET
+                    tokens = excluded.tokens,
+                    updated_at = excluded.updated_at,
+                    cost = 0.0,
+                    prev_cost = 0.0,
+                    cost_reset_at = excluded.cost_reset_at,
+                    last_result = 0
+                """,
+                (user_id, float(self.capacity), now, now),
+            )
+        return row
+
+    def _window_cost(
+        self, cost: float, prev_cost: float, reset_at: float, now: float
+    ) -> Tuple[float, Optional[float]]:
+        """Cost counted against the limit and the current window start.
+
+        Mirrors the roll-forward in ``ACQUIRE_SQL`` without writing it back.
+        """
+        window = self.cost_window.total_seconds()
+        windows = int((now - reset_at) // window)
+        if windows == 0:
+            current, previous = cost, prev_cost
+        elif windows == 1 and self.sliding_cost_window:
+            current, previous = 0.0, cost
+        else:
+            return 0.0, None
+
+        start = reset_at + windows * window
+        weight = max(1.0 - (now - start) / window, 0.0)
+        return current + previous * weight, start
+
+    async def get_usage(self, user_id: int) -> Dict[str, Any]:
+        """Bucket status plus ``cost`` and ``cost_reset_at`` for a user."""
+        now = time.time()
+        row = await self._run(
+            self._fetchone,
+            "SELECT tokens, updated_at, cost, prev_cost, cost_reset_at "
+            "FROM rate_limits WHERE user_id = ?",
+            (user_id,),
+        )
+
+        if row is None:
+            tokens, cost, reset_at = float(self.capacity), 0.0, None
+        else:
+            stored, updated_at, current, previous, start = row
+            tokens = min(
+                self.capacity, stored + max(now - updated_at, 0) * self.refill_rate
+            )
+            cost, reset_at = self._window_cost(current, previous, start, now)
+
+        return {
+            "capacity": self.capacity,
+            "tokens": tokens,
+            "utilization": (self.capacity - tokens) / self.capacity,
+            "refill_rate": self.refill_rate,
+            "cost": cost,
+            "cost_reset_at": (
+                datetime.utcfromtimestamp(reset_at) if reset_at is not None else None
+            ),
+        }
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """``active_users`` and ``total_cost`` across all users."""
+        active_users, total_cost = await self._run(
+            self._fetchone,
+            "SELECT COUNT(*), "
+            "COALESCE(SUM(CASE WHEN ? - cost_reset_at < ? THEN cost END), 0.0) "
+            "FROM rate_limits",
+            (time.time(), self.cost_window.total_seconds()),
+        )
+        return {
+            "active_users": active_users,
+            "total_cost": total_cost,
+            "global_bucket": None,
+            "active_projects": 0,
+        }
+
+    async def cleanup_inactive(self, inactive_threshold: timedelta) -> int:
+        """Drop users idle for longer than the threshold.
+
+        Users whose spend still counts against the limit are kept: the
+        current window's cost until the window ends (or the one after,
+        when sliding) and the previous window's until the current ends.
+        """
+        now = time.time()
+        return await self._run(
+            self._execute,
+            """
+            DELETE FROM rate_limits
+            WHERE updated_at < :cutoff
+              AND (cost = 0 OR cost_reset_at + :window * (1 + :sliding) <= :now)
+              AND (prev_cost = 0 OR cost_reset_at + :window <= :now)
+            """,
+            {
+                "cutoff": now - inactive_threshold.total_seconds(),
+                "now": now,
+                "window": self._params["window"],
+                "sliding": self._params["sliding"],
+            },
+        )
+
+    async def close(self) -> None:
+        """Close the database connection."""
+        await self._run(self._close)
+        self._executor.shutdown(wait=False)
+
+    def _close(self) -> None:
+        with self._lock:
+            self._conn.close()
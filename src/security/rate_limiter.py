@@ -2,60 +2,125 @@
 
 Features:
 - Token bucket algorithm
-- Cost-based limiting
+- Cost-based limiting with a sliding window
+- Hierarchical limits: global, per-project and per-user
 - Per-user tracking
 - Burst handling
+- Pluggable state backends (in-process or shared between workers)
+- Batched checkpoints and warm start from the database
+- Background expiry of idle users on a timing wheel
+- Cost reservations settled against the real cost of a request
 """
 
 import asyncio
+import math
+import sys
+import time
+from abc import ABC, abstractmethod
 from collections import defaultdict
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
 
 import structlog
 
 from ..config.settings import Settings
+from ..utils.timing_wheel import TimingWheel
 
 logger = structlog.get_logger()
 
+# Default length of a user's cost window
+COST_RESET_INTERVAL = timedelta(hours=24)
+
+# Default idle time before a user's state is freed
+IDLE_TIMEOUT = timedelta(hours=24)
+
+# Rough per-entry overhead of a dict slot (hash, key and value pointers)
+DICT_ENTRY_BYTES = 3 * 8
+
+# Upper bound on timing wheel slots; longer timeouts take extra rounds
+MAX_WHEEL_SLOTS = 4096
+
+# Expiry wheel keys: a user id, or ("project", name)
+WheelKey = Union[int, Tuple[str, str]]
+
+
+def _to_monotonic(value: Union[datetime, float, None]) -> float:
+    """Convert a wall-clock datetime (or monotonic float) to monotonic time."""
+    now = time.monotonic()
+    if value is None:
+        return now
+    if isinstance(value, datetime):
+        wall_now = datetime.now(value.tzinfo) if value.tzinfo else datetime.utcnow()
+        return now - (wall_now - value).total_seconds()
+    return float(value)
+
 
-@dataclass
 class RateLimitBucket:
-    """Token bucket for rate limiting."""
+    """Token bucket for rate limiting.
 
-    capacity: int
-    tokens: float
-    last_update: datetime
-    refill_rate: float = 1.0  # tokens per second
+    Timestamps are ``time.monotonic()`` floats so refills never allocate
+    datetime/timedelta objects and are immune to wall-clock jumps.
+    ``last_update`` is still accepted and exposed as a UTC datetime.
+    """
 
-    def consume(self, tokens: int = 1) -> bool:
+    __slots__ = ("capacity", "tokens", "refill_rate", "updated_at")
+
+    def __init__(
+        self,
+        capacity: int,
+        tokens: float,
+        last_update: Union[datetime, float, None] = None,
+        refill_rate: float = 1.0,  # tokens per second
+    ):
+        self.capacity = capacity
+        self.tokens = float(tokens)
+        self.refill_rate = refill_rate
+        self.updated_at = _to_monotonic(last_update)
+
+    @property
+    def last_update(self) -> datetime:
+        """Time of the last refill as a naive UTC datetime."""
+        return datetime.utcnow() - timedelta(seconds=time.monotonic() - self.updated_at)
+
+    @last_update.setter
+    def last_update(self, value: Union[datetime, float]) -> None:
+        self.updated_at = _to_monotonic(value)
+
+    def refill(self, now: Optional[float] = None) -> None:
+        """Refill tokens based on time passed."""
+        if now is None:
+            now = time.monotonic()
+        elapsed = now - self.updated_at
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_rate)
+        self.updated_at = now
+
+    # Backwards compatible name
+    _refill = refill
+
+    def consume(self, tokens: int = 1, now: Optional[float] = None) -> bool:
         """Try to consume tokens from bucket."""
-        self._refill()
+        self.refill(now)
         if self.tokens >= tokens:
             self.tokens -= tokens
             return True
         return False
 
-    def _refill(self) -> None:
-        """Refill tokens based on time passed."""
-        now = datetime.utcnow()
-        elapsed = (now - self.last_update).total_seconds()
-        self.tokens = min(self.capacity, self.tokens + (elapsed * self.refill_rate))
-        self.last_update = now
-
-    def get_wait_time(self, tokens: int = 1) -> float:
-        """Get time to wait before tokens are available."""
-        self._refill()
+    def wait_time(self, tokens: int = 1) -> float:
+        """Time until tokens are available, without refilling first."""
         if self.tokens >= tokens:
             return 0.0
+        return (tokens - self.tokens) / self.refill_rate
 
-        tokens_needed = tokens - self.tokens
-        return tokens_needed / self.refill_rate
+    def get_wait_time(self, tokens: int = 1) -> float:
+        """Get time to wait before tokens are available."""
+        self.refill()
+        return self.wait_time(tokens)
 
     def get_status(self) -> Dict[str, float]:
         """Get current bucket status."""
-        self._refill()
+        self.refill()
         return {
             "capacity": self.capacity,
             "tokens": self.tokens,
@@ -63,24 +128,643 @@ class RateLimitBucket:
             "refill_rate": self.refill_rate,
         }
 
+    def __repr__(self) -> str:
+        return (
+            f"RateLimitBucket(capacity={self.capacity}, tokens={self.tokens:.2f}, "
+            f"refill_rate={self.refill_rate})"
+        )
 
-class RateLimiter:
-    """Main rate limiting system with request and cost-based limits."""
 
-    def __init__(self, config: Settings):
-        self.config = config
+@dataclass
+class RateLimitDecision:
+    """Outcome of one atomic check-and-consume."""
+
+    allowed: bool
+    reason: Optional[str] = None  # "global", "project", "rate" or "cost"
+    tokens: float = 0.0  # tokens left in the limiting bucket
+    capacity: int = 0
+    wait_time: float = 0.0  # seconds until the request would fit
+    current_cost: float = 0.0  # cost counted against the window
+
+
+@dataclass
+class RateLimitCleanup:
+    """What one idle-state sweep freed."""
+
+    users: int = 0
+    projects: int = 0
+    bytes: int = 0  # approximate, from shallow object sizes
+
+
+class RateLimitBackend(ABC):
+    """Storage for per-user request buckets and cost budgets.
+
+    ``acquire`` must refill, check and consume as one atomic step so two
+    concurrent checks (in one process or across workers) can never both
+    spend the last token.
+
+    With a sliding cost window the spend of the previous window is counted
+    with a weight that falls linearly to zero over the current window, so
+    budgets never jump back to full at a window boundary. Two numbers per
+    user are enough, whatever the traffic.
+    """
+
+    name = "abstract"
+
+    def __init__(
+        self,
+        capacity: int,
+        refill_rate: float,
+        max_cost: float,
+        cost_window: timedelta = COST_RESET_INTERVAL,
+        sliding_cost_window: bool = True,
+        global_capacity: int = 0,
+        global_refill_rate: float = 0.0,
+        project_capacity: int = 0,
+        project_refill_rate: float = 0.0,
+        idle_timeout: timedelta = IDLE_TIMEOUT,
+        cleanup_interval: float = 60.0,
+    ):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.max_cost = max_cost
+        self.cost_window = cost_window
+        self.sliding_cost_window = sliding_cost_window
+        self.global_capacity = global_capacity
+        self.global_refill_rate = global_refill_rate
+        self.project_capacity = project_capacity
+        self.project_refill_rate = project_refill_rate
+        self.idle_timeout = idle_timeout
+        self.cleanup_interval = cleanup_interval
+        # Users whose state changed since the last checkpoint
+        self._dirty: Set[int] = set()
+
+    @classmethod
+    def from_settings(cls, config: Settings, **kwargs: Any) -> "RateLimitBackend":
+        """Build a backend with the limits from application settings."""
+        window = config.rate_limit_window
+        return cls(
+            capacity=config.rate_limit_burst,
+            refill_rate=config.rate_limit_requests / window,
+            max_cost=config.claude_max_cost_per_user,
+            cost_window=timedelta(hours=config.rate_limit_cost_window_hours),
+            sliding_cost_window=config.rate_limit_sliding_cost_window,
+            global_capacity=(
+                config.rate_limit_global_burst or config.rate_limit_global_requests
+            ),
+            global_refill_rate=config.rate_limit_global_requests / window,
+            project_capacity=(
+                config.rate_limit_project_burst or config.rate_limit_project_requests
+            ),
+            project_refill_rate=config.rate_limit_project_requests / window,
+            idle_timeout=timedelta(seconds=config.rate_limit_idle_timeout),
+            cleanup_interval=config.rate_limit_cleanup_interval,
+            **kwargs,
+        )
+
+    @abstractmethod
+    async def acquire(
+        self, user_id: int, tokens: int, cost: float, project: Optional[str] = None
+    ) -> RateLimitDecision:
+        """Check every limit and consume tokens and cost if they all pass."""
+
+    @abstractmethod
+    async def adjust_cost(self, user_id: int, delta: float) -> None:
+        """Add ``delta`` (possibly negative) to the user's current cost."""
+
+    @abstractmethod
+    async def reset(self, user_id: int) -> float:
+        """Refill the bucket and clear the cost; returns the old cost."""
+
+    @abstractmethod
+    async def get_usage(self, user_id: int) -> Dict[str, Any]:
+        """Bucket status plus ``cost`` and ``cost_reset_at`` for a user."""
+
+    @abstractmethod
+    async def get_stats(self) -> Dict[str, Any]:
+        """``active_users`` and ``total_cost``, plus any shared bucket state."""
+
+    @abstractmethod
+    async def cleanup_inactive(self, inactive_threshold: timedelta) -> int:
+        """Drop users idle for longer than the threshold."""
+
+    async def expire_idle(self) -> RateLimitCleanup:
+        """Drop users idle for longer than ``idle_timeout``."""
+        return RateLimitCleanup(users=await self.cleanup_inactive(self.idle_timeout))
+
+    async def close(self) -> None:
+        """Release backend resources."""
+
+    # Checkpointing; shared backends persist every check themselves
+
+    def snapshot_user(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """Capture a user's bucket and cost state for persistence."""
+        return None
+
+    def restore_user(
+        self,
+        user_id: int,
+        tokens: Optional[float] = None,
+        bucket_updated_at: Optional[datetime] = None,
+        cost: float = 0.0,
+        cost_reset_at: Optional[datetime] = None,
+        previous_cost: float = 0.0,
+    ) -> None:
+        """Restore persisted state for a user."""
+
+    def drain_dirty(self) -> List[Dict[str, Any]]:
+        """Snapshot and clear every user changed since the last call."""
+        dirty, self._dirty = self._dirty, set()
+        snapshots = (self.snapshot_user(user_id) for user_id in dirty)
+        return [snapshot for snapshot in snapshots if snapshot is not None]
+
+    def mark_dirty(self, user_ids: Iterable[int]) -> None:
+        """Queue users for the next checkpoint (e.g. after a failed save)."""
+        self._dirty.update(user_ids)
+
+    @property
+    def pending_changes(self) -> int:
+        """Users waiting for the next checkpoint."""
+        return len(self._dirty)
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """Per-process state in dicts; the default for a single bot worker.
+
+    Every user and project bucket is put on a timing wheel once, due
+    ``idle_timeout`` after it was created. Requests only update the
+    bucket's timestamp; when the wheel fires, a key that has been active
+    since (or whose spend still counts, or whose lock is held) is
+    rescheduled, so expiring idle state never scans every user.
+    """
+
+    name = "memory"
+
+    def __init__(
+        self,
+        capacity: int,
+        refill_rate: float,
+        max_cost: float,
+        **limits: Any,
+    ):
+        super().__init__(capacity, refill_rate, max_cost, **limits)
         self.request_buckets: Dict[int, RateLimitBucket] = {}
+        # Spend in the current window, and in the one before it (sliding)
         self.cost_tracker: Dict[int, float] = defaultdict(float)
+        self.previous_cost: Dict[int, float] = {}
+        # Start of each user's current cost window
         self.cost_reset_time: Dict[int, datetime] = {}
         self.locks: Dict[int, asyncio.Lock] = defaultdict(asyncio.Lock)
 
+        self.global_bucket: Optional[RateLimitBucket] = None
+        if self.global_capacity > 0:
+            self.global_bucket = RateLimitBucket(
+                capacity=self.global_capacity,
+                tokens=self.global_capacity,
+                refill_rate=self.global_refill_rate,
+            )
+        self.project_buckets: Dict[str, RateLimitBucket] = {}
+
+        tick = self.cleanup_interval or 60.0
+        self._wheel: TimingWheel[WheelKey] = TimingWheel(
+            tick=tick,
+            slots=min(
+                math.ceil(self.idle_timeout.total_seconds() / tick) + 1,
+                MAX_WHEEL_SLOTS,
+            ),
+            now=time.monotonic(),
+        )
+
+    async def acquire(
+        self, user_id: int, tokens: int, cost: float, project: Optional[str] = None
+    ) -> RateLimitDecision:
+        """Check every limit and consume tokens and cost if they all pass.
+
+        Buckets are evaluated top-down (global, project, user) against a
+        single refill, then the cost window; nothing is consumed unless
+        every level admits the request.
+        """
+        async with self.locks[user_id]:
+            now = time.monotonic()
+            bucket = self.get_or_create_bucket(user_id, now)
+            levels = (
+                ("global", self.global_bucket),
+                ("project", self._get_project_bucket(project, now)),
+                ("rate", bucket),
+            )
+
+            for reason, level in levels:
+                if level is None:
+                    continue
+                level.refill(now)
+                if level.tokens < tokens:
+                    return RateLimitDecision(
+                        allowed=False,
+                        reason=reason,
+                        tokens=level.tokens,
+                        capacity=level.capacity,
+                        wait_time=level.wait_time(tokens),
+                        current_cost=self.window_cost(user_id),
+                    )
+
+            self.maybe_reset_cost(user_id)
+            current_cost = self.window_cost(user_id)
+            if current_cost + cost > self.max_cost:
+                return RateLimitDecision(
+                    allowed=False,
+                    reason="cost",
+                    tokens=bucket.tokens,
+                    capacity=bucket.capacity,
+                    current_cost=current_cost,
+                )
+
+            # Only consume once every level passes
+            for _, level in levels:
+                if level is not None:
+                    level.tokens -= tokens
+            self.cost_tracker[user_id] += cost
+            self._dirty.add(user_id)
+            return RateLimitDecision(
+                allowed=True,
+                tokens=bucket.tokens,
+                capacity=bucket.capacity,
+                current_cost=current_cost + cost,
+            )
+
+    def _get_project_bucket(
+        self, project: Optional[str], now: float
+    ) -> Optional[RateLimitBucket]:
+        """Bucket shared by every request for a project, if enabled."""
+        if not project or self.project_capacity <= 0:
+            return None
+
+        bucket = self.project_buckets.get(project)
+        if bucket is None:
+            bucket = RateLimitBucket(
+                capacity=self.project_capacity,
+                tokens=self.project_capacity,
+                last_update=now,
+                refill_rate=self.project_refill_rate,
+            )
+            self.project_buckets[project] = bucket
+            self._schedule(("project", project), bucket.updated_at)
+        return bucket
+
+    def get_or_create_bucket(
+        self, user_id: int, now: Optional[float] = None
+    ) -> RateLimitBucket:
+        """Get or create rate limit bucket for user."""
+        bucket = self.request_buckets.get(user_id)
+        if bucket is None:
+            bucket = RateLimitBucket(
+                capacity=self.capacity,
+                tokens=self.capacity,
+                last_update=now,
+                refill_rate=self.refill_rate,
+            )
+            self.request_buckets[user_id] = bucket
+            self._schedule(user_id, bucket.updated_at)
+            logger.debug("Created rate limit bucket", user_id=user_id)
+
+        return bucket
+
+    def maybe_reset_cost(self, user_id: int) -> None:
+        """Roll the user's cost window forward if it has ended."""
+        now = datetime.utcnow()
+        start = self.cost_reset_time.get(user_id)
+        if start is None:
+            self.cost_tracker[user_id] = 0
+            self.cost_reset_time[user_id] = now
+            return
+
+        elapsed = now - start
+        if elapsed < self.cost_window:
+            return
+
+        windows = int(elapsed / self.cost_window)
+        old_cost = self.cost_tracker[user_id]
+        if self.sliding_cost_window and windows == 1 and old_cost > 0:
+            self.previous_cost[user_id] = old_cost
+        else:
+            self.previous_cost.pop(user_id, None)
+        self.cost_tracker[user_id] = 0
+        # Keep windows aligned so the sliding weight stays meaningful
+        self.cost_reset_time[user_id] = start + windows * self.cost_window
+
+        if old_cost > 0:
+            self._dirty.add(user_id)
+            logger.info(
+                "Cost tracker reset",
+                user_id=user_id,
+                old_cost=old_cost,
+                reset_time=now.isoformat(),
+            )
+
+    def window_cost(self, user_id: int) -> float:
+        """Cost counted against the limit: this window plus weighted previous."""
+        current = self.cost_tracker.get(user_id, 0.0)
+        previous = self.previous_cost.get(user_id, 0.0)
+        if not previous:
+            return current
+
+        elapsed = datetime.utcnow() - self.cost_reset_time[user_id]
+        weight = 1.0 - elapsed / self.cost_window
+        return current + previous * max(weight, 0.0)
+
+    async def adjust_cost(self, user_id: int, delta: float) -> None:
+        """Add ``delta`` (possibly negative) to the user's current cost."""
+        async with self.locks[user_id]:
+            self.maybe_reset_cost(user_id)
+            self.cost_tracker[user_id] = max(self.cost_tracker[user_id] + delta, 0.0)
+            self._dirty.add(user_id)
+
+    async def reset(self, user_id: int) -> float:
+        """Refill the bucket and clear the cost; returns the old cost."""
+        async with self.locks[user_id]:
+            old_cost = self.window_cost(user_id)
+            self.cost_tracker[user_id] = 0
+            self.previous_cost.pop(user_id, None)
+            self.cost_reset_time[user_id] = datetime.utcnow()
+
+            if user_id in self.request_buckets:
+                bucket = self.request_buckets[user_id]
+                bucket.tokens = bucket.capacity
+                bucket.updated_at = time.monotonic()
+
+            self._dirty.add(user_id)
+            return old_cost
+
+    async def get_usage(self, user_id: int) -> Dict[str, Any]:
+        """Bucket status plus ``cost`` and ``cost_reset_at`` for a user."""
+        usage: Dict[str, Any] = self.get_or_create_bucket(user_id).get_status()
+        self.maybe_reset_cost(user_id)
+        usage["cost"] = self.window_cost(user_id)
+        usage["cost_reset_at"] = self.cost_reset_time.get(user_id)
+        return usage
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """``active_users`` and ``total_cost``, plus any shared bucket state."""
+        return {
+            "active_users": len(self.request_buckets),
+            "total_cost": sum(self.cost_tracker.values()),
+            "global_bucket": (
+                self.global_bucket.get_status() if self.global_bucket else None
+            ),
+            "active_projects": len(self.project_buckets),
+            "scheduled_expiries": len(self._wheel),
+        }
+
+    async def cleanup_inactive(self, inactive_threshold: timedelta) -> int:
+        """Drop users idle for longer than the threshold.
+
+        Scans every user; the periodic sweep uses ``expire_idle`` instead.
+        Users whose lock is held or whose spend still counts are skipped.
+        """
+        cutoff = time.monotonic() - inactive_threshold.total_seconds()
+        inactive_users = [
+            user_id
+            for user_id, bucket in self.request_buckets.items()
+            if bucket.updated_at < cutoff
+            and not self._is_locked(user_id)
+            and self._cost_expires_in(user_id) <= 0
+        ]
+
+        for user_id in inactive_users:
+            self._drop_user(user_id)
+
+        idle_projects = [
+            project
+            for project, bucket in self.project_buckets.items()
+            if bucket.updated_at < cutoff
+        ]
+        for project in idle_projects:
+            del self.project_buckets[project]
+
+        return len(inactive_users)
+
+    async def expire_idle(self) -> RateLimitCleanup:
+        """Free users and projects whose wheel deadline passed while idle."""
+        now = time.monotonic()
+        idle_seconds = self.idle_timeout.total_seconds()
+        cleanup = RateLimitCleanup()
+
+        for key in self._wheel.advance(now):
+            if isinstance(key, tuple):
+                project = key[1]
+                bucket = self.project_buckets.get(project)
+                if bucket is None:
+                    continue
+                if bucket.updated_at + idle_seconds > now:
+                    self._schedule(key, bucket.updated_at)
+                    continue
+                del self.project_buckets[project]
+                cleanup.projects += 1
+                cleanup.bytes += (
+                    sys.getsizeof(project) + sys.getsizeof(bucket) + DICT_ENTRY_BYTES
+                )
+                continue
+
+            user_id = key
+            bucket = self.request_buckets.get(user_id)
+            if bucket is None and user_id not in self.cost_tracker:
+                continue  # already removed by cleanup_inactive or reset
+            if self._is_locked(user_id):
+                # A check is in flight; look again on the next tick
+                self._wheel.schedule(user_id, now + self._wheel.tick)
+                continue
+            if bucket is not None and bucket.updated_at + idle_seconds > now:
+                self._schedule(user_id, bucket.updated_at)
+                continue
+            cost_left = self._cost_expires_in(user_id)
+            if cost_left > 0:
+                # Freeing the user now would forget spend that still counts
+                self._wheel.schedule(user_id, now + cost_left)
+                continue
+
+            cleanup.bytes += self._drop_user(user_id)
+            cleanup.users += 1
+
+        return cleanup
+
+    def _schedule(self, key: WheelKey, last_active: float) -> None:
+        """Put a user or ``("project", name)`` key on the expiry wheel."""
+        self._wheel.schedule(key, last_active + self.idle_timeout.total_seconds())
+
+    def _is_locked(self, user_id: int) -> bool:
+        lock = self.locks.get(user_id)
+        return lock is not None and lock.locked()
+
+    def _cost_expires_in(self, user_id: int) -> float:
+        """Seconds until the user's spend stops counting against the limit."""
+        start = self.cost_reset_time.get(user_id)
+        if start is None:
+            return 0.0
+
+        if self.cost_tracker.get(user_id, 0.0) > 0:
+            # Current spend counts for this window, then fades over the next
+            windows = 2 if self.sliding_cost_window else 1
+        elif self.previous_cost.get(user_id, 0.0) > 0:
+            windows = 1
+        else:
+            return 0.0
+
+        end = start + self.cost_window * windows
+        return max((end - datetime.utcnow()).total_seconds(), 0.0)
+
+    def _drop_user(self, user_id: int) -> int:
+        """Forget every trace of a user; returns approximate bytes freed."""
+        freed = sys.getsizeof(user_id)
+        for mapping in (
+            self.request_buckets,
+            self.cost_tracker,
+            self.previous_cost,
+            self.cost_reset_time,
+            self.locks,
+        ):
+            value = mapping.pop(user_id, None)  # type: ignore[attr-defined]
+            if value is not None:
+                freed += sys.getsizeof(value) + DICT_ENTRY_BYTES
+        self._dirty.discard(user_id)
+        return freed
+
+    def snapshot_user(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """Capture a user's bucket and cost state for persistence."""
+        bucket = self.request_buckets.get(user_id)
+        if bucket is None:
+            return None
+
+        return {
+            "user_id": user_id,
+            "tokens": bucket.tokens,
+            "bucket_updated_at": bucket.last_update,
+            "cost": self.cost_tracker.get(user_id, 0.0),
+            "cost_reset_at": self.cost_reset_time.get(user_id),
+            "previous_cost": self.previous_cost.get(user_id, 0.0),
+        }
+
+    def restore_user(
+        self,
+        user_id: int,
+        tokens: Optional[float] = None,
+        bucket_updated_at: Optional[datetime] = None,
+        cost: float = 0.0,
+        cost_reset_at: Optional[datetime] = None,
+        previous_cost: float = 0.0,
+    ) -> None:
+        """Restore persisted state for a user.
+
+        The bucket refills for the wall time elapsed since it was saved.
+        Costs are only restored while they still count against the limit,
+        and the larger of the restored and in-memory cost wins; the window
+        rolls forward on the next check as usual.
+        """
+        if tokens is not None and bucket_updated_at is not None:
+            self.request_buckets[user_id] = RateLimitBucket(
+                capacity=self.capacity,
+                tokens=min(tokens, self.capacity),
+                last_update=bucket_updated_at,
+                refill_rate=self.refill_rate,
+            )
+            self._schedule(user_id, self.request_buckets[user_id].updated_at)
+
+        if cost_reset_at is None or (cost <= 0 and previous_cost <= 0):
+            return
+        horizon = self.cost_window * (2 if self.sliding_cost_window else 1)
+        if datetime.utcnow() - cost_reset_at >= horizon:
+            return
+        if cost >= self.cost_tracker.get(user_id, 0.0):
+            self.cost_tracker[user_id] = cost
+            self.cost_reset_time[user_id] = cost_reset_at
+            if previous_cost > 0 and self.sliding_cost_window:
+                self.previous_cost[user_id] = previous_cost
+            self._schedule(user_id, time.monotonic())
+
+
+class RateLimitReservation:
+    """Cost held for one request until its real cost is known.
+
+    Rejected reservations carry the limit message and settle to nothing.
+    Settling is idempotent: only the first ``commit`` or ``release``
+    counts.
+    """
+
+    __slots__ = ("rate_limiter", "user_id", "cost", "message", "settled")
+
+    def __init__(
+        self,
+        rate_limiter: "RateLimiter",
+        user_id: int,
+        cost: float,
+        message: Optional[str] = None,
+    ):
+        self.rate_limiter = rate_limiter
+        self.user_id = user_id
+        self.cost = cost
+        self.message = message
+        self.settled = message is not None
+
+    @property
+    def allowed(self) -> bool:
+        return self.message is None
+
+    async def commit(self, actual_cost: float) -> None:
+        """Charge ``actual_cost`` instead of the estimate."""
+        if not self.settled:
+            self.settled = True
+            await self.rate_limiter.commit_reservation(self, actual_cost)
+
+    async def release(self) -> None:
+        """Refund the estimate (the request never ran)."""
+        if not self.settled:
+            self.settled = True
+            await self.rate_limiter.release_reservation(self)
+
+    async def top_up(self, cost: float) -> bool:
+        """Hold ``cost`` more if the cost limit still allows it.
+
+        A refused top-up releases the reservation, which then carries the
+        limit message like a rejected one.
+        """
+        if self.settled:
+            return False
+        message = await self.rate_limiter.top_up_reservation(self, cost)
+        if message is not None:
+            await self.release()
+            self.message = message
+        return message is None
+
+    def __repr__(self) -> str:
+        if not self.allowed:
+            state = "rejected"
+        else:
+            state = "settled" if self.settled else "held"
+        return (
+            f"RateLimitReservation(user_id={self.user_id}, cost={self.cost:.4f}, "
+            f"{state})"
+        )
+
+
+class RateLimiter:
+    """Main rate limiting system with request and cost-based limits."""
+
+    def __init__(self, config: Settings, backend: Optional[RateLimitBackend] = None):
+        self.config = config
+
         # Calculate refill rate from config
         self.refill_rate = (
             self.config.rate_limit_requests / self.config.rate_limit_window
         )
+        self.backend = backend or InMemoryRateLimitBackend.from_settings(config)
+
+        # Reservation outcomes and the net cost correction they applied
+        self.reservations_made = 0
+        self.reservations_committed = 0
+        self.reservations_released = 0
+        self.reservation_adjustment = 0.0
 
         logger.info(
             "Rate limiter initialized",
+            backend=self.backend.name,
             requests_per_window=self.config.rate_limit_requests,
             window_seconds=self.config.rate_limit_window,
             burst_capacity=self.config.rate_limit_burst,
@@ -88,174 +772,248 @@ class RateLimiter:
             refill_rate=self.refill_rate,
         )
 
+    # In-process state of the default backend
+
+    def _memory_backend(self) -> InMemoryRateLimitBackend:
+        backend = self.backend
+        if not isinstance(backend, InMemoryRateLimitBackend):
+            raise TypeError(f"The {backend.name} backend keeps no in-process state")
+        return backend
+
+    @property
+    def request_buckets(self) -> Dict[int, RateLimitBucket]:
+        return self._memory_backend().request_buckets
+
+    @property
+    def cost_tracker(self) -> Dict[int, float]:
+        return self._memory_backend().cost_tracker
+
+    @property
+    def cost_reset_time(self) -> Dict[int, datetime]:
+        return self._memory_backend().cost_reset_time
+
+    @property
+    def locks(self) -> Dict[int, asyncio.Lock]:
+        return self._memory_backend().locks
+
     async def check_rate_limit(
-        self, user_id: int, cost: float = 1.0, tokens: int = 1
+        self,
+        user_id: int,
+        cost: float = 1.0,
+        tokens: int = 1,
+        project: Optional[str] = None,
     ) -> Tuple[bool, Optional[str]]:
-        """Check if request is allowed under rate limits."""
-        async with self.locks[user_id]:
-            # Check request rate limit
-            rate_allowed, rate_message = self._check_request_rate(user_id, tokens)
-            if not rate_allowed:
-                logger.warning(
-                    "Request rate limit exceeded",
-                    user_id=user_id,
-                    tokens_requested=tokens,
-                )
-                return False, rate_message
-
-            # Check cost limit
-            cost_allowed, cost_message = self._check_cost_limit(user_id, cost)
-            if not cost_allowed:
-                logger.warning(
-                    "Cost limit exceeded",
-                    user_id=user_id,
-                    cost_requested=cost,
-                    current_usage=self.cost_tracker[user_id],
-                )
-                return False, cost_message
+        """Check if request is allowed under every level of rate limits."""
+        reservation = await self.reserve(user_id, cost, tokens, project)
+        return reservation.allowed, reservation.message
 
-            # If both checks pass, consume resources
-            self._consume_request_tokens(user_id, tokens)
-            self._track_cost(user_id, cost)
+    async def reserve(
+        self,
+        user_id: int,
+        cost: float = 1.0,
+        tokens: int = 1,
+        project: Optional[str] = None,
+    ) -> "RateLimitReservation":
+        """Check every limit and hold ``cost`` until the real cost is known.
 
-            logger.debug(
-                "Rate limit check passed", user_id=user_id, cost=cost, tokens=tokens
-            )
-            return True, None
+        The request's tokens are spent immediately. If allowed, settle the
+        reservation with ``commit(actual_cost)`` or ``release()``; left
+        alone, the estimate simply stays charged.
+        """
+        decision = await self.backend.acquire(user_id, tokens, cost, project)
+        message = self._limit_message(decision, user_id, cost, tokens, project)
+        if decision.allowed:
+            self.reservations_made += 1
+        return RateLimitReservation(
+            self, user_id, cost if decision.allowed else 0.0, message
+        )
 
-    def _check_request_rate(
-        self, user_id: int, tokens: int
-    ) -> Tuple[bool, Optional[str]]:
-        """Check request rate limit."""
-        bucket = self._get_or_create_bucket(user_id)
+    async def top_up_reservation(
+        self, reservation: "RateLimitReservation", cost: float
+    ) -> Optional[str]:
+        """Add ``cost`` to a held reservation; the limit message if refused.
 
-        if bucket.consume(tokens):
-            return True, None
+        Only the cost limit applies: the request's token was spent when
+        the reservation was made.
+        """
+        decision = await self.backend.acquire(reservation.user_id, 0, cost)
+        if decision.allowed:
+            reservation.cost += cost
+        return self._limit_message(decision, reservation.user_id, cost, 0, None)
 
-        wait_time = bucket.get_wait_time(tokens)
-        status = bucket.get_status()
+    async def commit_reservation(
+        self, reservation: "RateLimitReservation", actual_cost: float
+    ) -> float:
+        """Replace a reservation's estimate with the actual cost."""
+        delta = actual_cost - reservation.cost
+        if delta:
+            await self.backend.adjust_cost(reservation.user_id, delta)
+        self.reservations_committed += 1
+        self.reservation_adjustment += delta
+        return delta
 
-        message = (
-            f"Rate limit exceeded. Please wait {wait_time:.1f} seconds "
-            f"before making more requests. "
-            f"Bucket: {status['tokens']:.1f}/{status['capacity']} tokens available."
-        )
-        return False, message
+    async def release_reservation(self, reservation: "RateLimitReservation") -> None:
+        """Refund a reservation's estimate; nothing was spent."""
+        if reservation.cost:
+            await self.backend.adjust_cost(reservation.user_id, -reservation.cost)
+        self.reservations_released += 1
+        self.reservation_adjustment -= reservation.cost
 
-    def _check_cost_limit(
-        self, user_id: int, cost: float
-    ) -> Tuple[bool, Optional[str]]:
-        """Check cost-based limit."""
-        # Reset cost tracker if enough time has passed
-        self._maybe_reset_cost_tracker(user_id)
-
-        current_cost = self.cost_tracker[user_id]
-        if current_cost + cost > self.config.claude_max_cost_per_user:
-            remaining = max(0, self.config.claude_max_cost_per_user - current_cost)
-            message = (
-                f"Cost limit exceeded. Remaining budget: ${remaining:.2f}. "
-                f"Current usage: ${current_cost:.2f}/"
-                f"${self.config.claude_max_cost_per_user:.2f}"
+    def _limit_message(
+        self,
+        decision: RateLimitDecision,
+        user_id: int,
+        cost: float,
+        tokens: int,
+        project: Optional[str],
+    ) -> Optional[str]:
+        """User-facing explanation of a rejection (None when allowed)."""
+        if decision.reason == "global":
+            logger.warning(
+                "Global rate limit exceeded",
+                user_id=user_id,
+                tokens_requested=tokens,
+            )
+            return (
+                f"The bot is handling too many requests right now. "
+                f"Please try again in {decision.wait_time:.1f} seconds."
             )
-            return False, message
 
-        return True, None
+        if decision.reason == "project":
+            logger.warning(
+                "Project rate limit exceeded",
+                user_id=user_id,
+                project=project,
+                tokens_requested=tokens,
+            )
+            return (
+                f"Project rate limit exceeded. Please wait "
+                f"{decision.wait_time:.1f} seconds before sending more requests "
+                f"for this project."
+            )
 
-    def _consume_request_tokens(self, user_id: int, tokens: int) -> None:
-        """Consume tokens from request bucket."""
-        bucket = self._get_or_create_bucket(user_id)
-        bucket.consume(tokens)
+        if decision.reason == "rate":
+            logger.warning(
+                "Request rate limit exceeded",
+                user_id=user_id,
+                tokens_requested=tokens,
+            )
+            return (
+                f"Rate limit exceeded. Please wait {decision.wait_time:.1f} seconds "
+                f"before making more requests. "
+                f"Bucket: {decision.tokens:.1f}/{decision.capacity} tokens available."
+            )
 
-    def _track_cost(self, user_id: int, cost: float) -> None:
-        """Track cost usage for user."""
-        self.cost_tracker[user_id] += cost
+        if decision.reason == "cost":
+            logger.warning(
+                "Cost limit exceeded",
+                user_id=user_id,
+                cost_requested=cost,
+                current_usage=decision.current_cost,
+            )
+            max_cost = self.config.claude_max_cost_per_user
+            remaining = max(0, max_cost - decision.current_cost)
+            return (
+                f"Cost limit exceeded. Remaining budget: ${remaining:.2f}. "
+                f"Current usage: ${decision.current_cost:.2f}/"
+                f"${max_cost:.2f}"
+            )
 
         logger.debug(
-            "Cost tracked",
+            "Rate limit check passed",
             user_id=user_id,
             cost=cost,
-            total_usage=self.cost_tracker[user_id],
+            tokens=tokens,
+            total_usage=decision.current_cost,
         )
+        return None
 
-    def _get_or_create_bucket(self, user_id: int) -> RateLimitBucket:
-        """Get or create rate limit bucket for user."""
-        if user_id not in self.request_buckets:
-            self.request_buckets[user_id] = RateLimitBucket(
-                capacity=self.config.rate_limit_burst,
-                tokens=self.config.rate_limit_burst,
-                last_update=datetime.utcnow(),
-                refill_rate=self.refill_rate,
-            )
-            logger.debug("Created rate limit bucket", user_id=user_id)
-
-        return self.request_buckets[user_id]
+    def _get_or_create_bucket(
+        self, user_id: int, now: Optional[float] = None
+    ) -> RateLimitBucket:
+        """Get or create rate limit bucket for user (in-memory backend)."""
+        return self._memory_backend().get_or_create_bucket(user_id, now)
 
     def _maybe_reset_cost_tracker(self, user_id: int) -> None:
-        """Reset cost tracker if reset period has passed."""
-        now = datetime.utcnow()
-        last_reset = self.cost_reset_time.get(user_id, now - timedelta(days=1))
-
-        # Reset daily (configurable)
-        reset_interval = timedelta(hours=24)
-        if now - last_reset >= reset_interval:
-            old_cost = self.cost_tracker[user_id]
-            self.cost_tracker[user_id] = 0
-            self.cost_reset_time[user_id] = now
-
-            if old_cost > 0:
-                logger.info(
-                    "Cost tracker reset",
-                    user_id=user_id,
-                    old_cost=old_cost,
-                    reset_time=now.isoformat(),
-                )
+        """Reset cost tracker if reset period has passed (in-memory backend)."""
+        self._memory_backend().maybe_reset_cost(user_id)
 
     async def reset_user_limits(self, user_id: int) -> None:
         """Reset all limits for a user (admin function)."""
-        async with self.locks[user_id]:
-            # Reset cost tracking
-            old_cost = self.cost_tracker[user_id]
-            self.cost_tracker[user_id] = 0
-            self.cost_reset_time[user_id] = datetime.utcnow()
+        old_cost = await self.backend.reset(user_id)
+        logger.info("User limits reset", user_id=user_id, old_cost=old_cost)
 
-            # Reset request bucket
-            if user_id in self.request_buckets:
-                self.request_buckets[user_id].tokens = self.request_buckets[
-                    user_id
-                ].capacity
-                self.request_buckets[user_id].last_update = datetime.utcnow()
+    def snapshot_user(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """Capture a user's bucket and cost state for persistence."""
+        return self.backend.snapshot_user(user_id)
 
-            logger.info("User limits reset", user_id=user_id, old_cost=old_cost)
+    def drain_dirty(self) -> List[Dict[str, Any]]:
+        """Snapshot and clear every user changed since the last call."""
+        return self.backend.drain_dirty()
 
-    def get_user_status(self, user_id: int) -> Dict[str, Any]:
-        """Get current rate limit status for user."""
-        # Get request bucket status
-        bucket = self._get_or_create_bucket(user_id)
-        bucket_status = bucket.get_status()
+    def mark_dirty(self, user_ids: Iterable[int]) -> None:
+        """Queue users for the next checkpoint (e.g. after a failed save)."""
+        self.backend.mark_dirty(user_ids)
+
+    def restore_user(self, user_id: int, **state: Any) -> None:
+        """Restore persisted state for a user."""
+        self.backend.restore_user(user_id, **state)
 
-        # Get cost status
-        self._maybe_reset_cost_tracker(user_id)
-        current_cost = self.cost_tracker[user_id]
-        cost_remaining = max(0, self.config.claude_max_cost_per_user - current_cost)
+    async def get_user_status(self, user_id: int) -> Dict[str, Any]:
+        """Get current rate limit status for user."""
+        usage = await self.backend.get_usage(user_id)
+        current_cost = usage.pop("cost")
+        last_reset = usage.pop("cost_reset_at") or datetime.utcnow()
+        max_cost = self.config.claude_max_cost_per_user
 
         return {
-            "request_bucket": bucket_status,
+            "request_bucket": usage,
             "cost_usage": {
                 "current": current_cost,
-                "limit": self.config.claude_max_cost_per_user,
-                "remaining": cost_remaining,
-                "utilization": current_cost / self.config.claude_max_cost_per_user,
+                "limit": max_cost,
+                "remaining": max(0, max_cost - current_cost),
+                "utilization": current_cost / max_cost,
             },
-            "last_reset": self.cost_reset_time.get(
-                user_id, datetime.utcnow()
-            ).isoformat(),
+            "last_reset": last_reset.isoformat(),
         }
 
-    def get_global_status(self) -> Dict[str, Any]:
+    async def get_global_status(self) -> Dict[str, Any]:
         """Get global rate limiter statistics."""
+        stats = await self.backend.get_stats()
+        config = self.config
         return {
-            "active_users": len(self.request_buckets),
-            "total_cost_tracked": sum(self.cost_tracker.values()),
+            "backend": self.backend.name,
+            "active_users": stats["active_users"],
+            "total_cost_tracked": stats["total_cost"],
+            "hierarchy": {
+                "global": {
+                    "enabled": self.backend.global_capacity > 0,
+                    "requests_per_window": config.rate_limit_global_requests,
+                    "burst_capacity": self.backend.global_capacity,
+                    "bucket": stats.get("global_bucket"),
+                },
+                "project": {
+                    "enabled": self.backend.project_capacity > 0,
+                    "requests_per_window": config.rate_limit_project_requests,
+                    "burst_capacity": self.backend.project_capacity,
+                    "active_projects": stats.get("active_projects", 0),
+                },
+                "user": {
+                    "requests_per_window": config.rate_limit_requests,
+                    "burst_capacity": config.rate_limit_burst,
+                },
+                "cost": {
+                    "max_cost_per_user": config.claude_max_cost_per_user,
+                    "window_hours": config.rate_limit_cost_window_hours,
+                    "sliding": config.rate_limit_sliding_cost_window,
+                },
+            },
+            "reservations": {
+                "made": self.reservations_made,
+                "committed": self.reservations_committed,
+                "released": self.reservations_released,
+                "cost_adjustment": self.reservation_adjustment,
+            },
             "config": {
                 "requests_per_window": self.config.rate_limit_requests,
                 "window_seconds": self.config.rate_limit_window,
@@ -269,26 +1027,251 @@ class RateLimiter:
         self, inactive_threshold: timedelta = timedelta(hours=24)
     ) -> int:
         """Clean up rate limit data for inactive users."""
-        now = datetime.utcnow()
-        inactive_users = []
-
-        # Find users with old buckets
-        for user_id, bucket in self.request_buckets.items():
-            if now - bucket.last_update > inactive_threshold:
-                inactive_users.append(user_id)
-
-        # Clean up data
-        for user_id in inactive_users:
-            self.request_buckets.pop(user_id, None)
-            self.cost_tracker.pop(user_id, None)
-            self.cost_reset_time.pop(user_id, None)
-            self.locks.pop(user_id, None)
+        cleaned = await self.backend.cleanup_inactive(inactive_threshold)
 
-        if inactive_users:
+        if cleaned:
             logger.info(
                 "Cleaned up inactive users",
-                count=len(inactive_users),
+                count=cleaned,
                 threshold_hours=inactive_threshold.total_seconds() / 3600,
             )
 
-        return len(inactive_users)
+        return cleaned
+
+    async def expire_idle_users(self) -> RateLimitCleanup:
+        """Free state of users idle for longer than the configured timeout."""
+        cleanup = await self.backend.expire_idle()
+
+        if cleanup.users or cleanup.projects:
+            logger.info(
+                "Expired idle rate limit state",
+                users=cleanup.users,
+                projects=cleanup.projects,
+                reclaimed_bytes=cleanup.bytes,
+            )
+
+        return cleanup
+
+    async def close(self) -> None:
+        """Release backend resources."""
+        await self.backend.close()
+
+
+class RateLimitCheckpointer:
+    """Persist rate limiter state in batches and restore it on boot.
+
+    ``state_repository`` provides ``load_states()``, ``save_states(states)``
+    and ``prune_states(max_age)``; the optional ``cost_repository``
+    provides ``get_costs_for_date()`` so today's recorded spend survives
+    even when no checkpoint was written. Requests never touch the
+    database: changed users are collected in memory and flushed every
+    ``interval`` seconds.
+
+    Rows of users gone quiet for longer than their state can matter are
+    deleted on warm start and after each periodic checkpoint, like the
+    cleaner frees them in memory.
+    """
+
+    def __init__(
+        self,
+        rate_limiter: RateLimiter,
+        state_repository: Any,
+        cost_repository: Optional[Any] = None,
+        interval: float = 60.0,
+    ):
+        self.rate_limiter = rate_limiter
+        self.state_repository = state_repository
+        self.cost_repository = cost_repository
+        self.interval = interval
+
+        self._task: Optional[asyncio.Task] = None
+        self.checkpoints = 0
+        self.states_saved = 0
+        self.states_pruned = 0
+        self.failures = 0
+
+    async def warm_start(self) -> int:
+        """Load persisted state into the limiter; returns users restored."""
+        await self.prune()
+        restored: Set[int] = set()
+        try:
+            for state in await self.state_repository.load_states():
+                self.rate_limiter.restore_user(
+                    state.user_id,
+                    tokens=state.tokens,
+                    bucket_updated_at=state.bucket_updated_at,
+                    cost=state.cost,
+                    cost_reset_at=state.cost_reset_at,
+                    previous_cost=state.previous_cost,
+                )
+                restored.add(state.user_id)
+
+            if self.cost_repository is not None:
+                # cost_tracking is keyed by UTC date, so that budget started
+                # at midnight and resets at the next one
+                midnight = datetime.utcnow().replace(
+                    hour=0, minute=0, second=0, microsecond=0
+                )
+                costs = await self.cost_repository.get_costs_for_date()
+                for user_id, cost in costs.items():
+                    self.rate_limiter.restore_user(
+                        user_id, cost=cost, cost_reset_at=midnight
+                    )
+                    restored.add(user_id)
+        except Exception as e:
+            logger.warning("Rate limiter warm start failed", error=str(e))
+
+        logger.info("Rate limiter warm started", users=len(restored))
+        return len(restored)
+
+    async def checkpoint(self) -> int:
+        """Save every changed user in one batch; returns states saved."""
+        states = self.rate_limiter.drain_dirty()
+        if not states:
+            return 0
+
+        try:
+            saved: int = await self.state_repository.save_states(states)
+        except Exception as e:
+            # Keep the users queued so the next checkpoint retries them
+            self.rate_limiter.mark_dirty(state["user_id"] for state in states)
+            self.failures += 1
+            logger.warning(
+                "Rate limiter checkpoint failed", users=len(states), error=str(e)
+            )
+            return 0
+
+        self.checkpoints += 1
+        self.states_saved += saved
+        logger.debug("Rate limiter checkpoint saved", users=saved)
+        return saved
+
+    def state_retention(self) -> timedelta:
+        """How long a saved state can still affect a decision.
+
+        By then the user's bucket has sat idle past the idle timeout and
+        every cost window their spend counted in is over (the sliding
+        window carries it into one more).
+        """
+        backend = self.rate_limiter.backend
+        windows = 2 if backend.sliding_cost_window else 1
+        return max(backend.idle_timeout, backend.cost_window * windows)
+
+    async def prune(self) -> int:
+        """Delete states older than ``state_retention()``; returns rows."""
+        try:
+            pruned: int = await self.state_repository.prune_states(
+                self.state_retention()
+            )
+        except Exception as e:
+            logger.warning("Rate limiter state prune failed", error=str(e))
+            return 0
+
+        self.states_pruned += pruned
+        if pruned:
+            logger.debug("Rate limiter states pruned", users=pruned)
+        return pruned
+
+    def start(self) -> Optional[asyncio.Task]:
+        """Start periodic checkpoints (no-op when the interval is 0)."""
+        if self.interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._run())
+        return self._task
+
+    async def _run(self) -> None:
+        """Checkpoint loop."""
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.checkpoint()
+            await self.prune()
+
+    async def stop(self) -> None:
+        """Stop the loop and write a final checkpoint."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.checkpoint()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Checkpoint statistics."""
+        return {
+            "interval": self.interval,
+            "running": self._task is not None,
+            "pending": self.rate_limiter.backend.pending_changes,
+            "checkpoints": self.checkpoints,
+            "states_saved": self.states_saved,
+            "states_pruned": self.states_pruned,
+            "failures": self.failures,
+        }
+
+
+class RateLimitCleaner:
+    """Expire idle rate limiter state in the background.
+
+    Each sweep only touches users whose timing wheel deadline has passed,
+    so it stays cheap however many users are tracked.
+    """
+
+    def __init__(self, rate_limiter: RateLimiter, interval: float = 60.0):
+        self.rate_limiter = rate_limiter
+        self.interval = interval
+
+        self._task: Optional[asyncio.Task] = None
+        self.sweeps = 0
+        self.users_reclaimed = 0
+        self.projects_reclaimed = 0
+        self.bytes_reclaimed = 0
+        self.failures = 0
+
+    async def sweep(self) -> RateLimitCleanup:
+        """Run one expiry pass and add it to the totals."""
+        try:
+            cleanup = await self.rate_limiter.expire_idle_users()
+        except Exception as e:
+            self.failures += 1
+            logger.warning("Rate limiter cleanup failed", error=str(e))
+            return RateLimitCleanup()
+
+        self.sweeps += 1
+        self.users_reclaimed += cleanup.users
+        self.projects_reclaimed += cleanup.projects
+        self.bytes_reclaimed += cleanup.bytes
+        return cleanup
+
+    def start(self) -> Optional[asyncio.Task]:
+        """Start periodic sweeps (no-op when the interval is 0)."""
+        if self.interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._run())
+        return self._task
+
+    async def _run(self) -> None:
+        """Cleanup loop."""
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.sweep()
+
+    async def stop(self) -> None:
+        """Stop the loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cleanup statistics."""
+        return {
+            "interval": self.interval,
+            "running": self._task is not None,
+            "sweeps": self.sweeps,
+            "users_reclaimed": self.users_reclaimed,
+            "projects_reclaimed": self.projects_reclaimed,
+            "bytes_reclaimed": self.bytes_reclaimed,
+            "failures": self.failures,
+        }
@@ -5,19 +5,157 @@ Features:
 - Command injection prevention
 - File type validation
 - Input sanitization
+- Pattern lists precompiled into single-pass scanners
+- Bounded cache of resolved paths, checked against the parent directory
 """
 
+import os
 import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 import structlog
 
+from ..utils.constants import DEFAULT_PATH_CACHE_SIZE, DEFAULT_PATH_CACHE_TTL
+from .patterns import PatternSet
+
 # from src.exceptions import SecurityError  # Future use
 
 logger = structlog.get_logger()
 
 
+@dataclass
+class CachedPath:
+    """A resolved path and the directory state it was resolved against."""
+
+    resolved: Path
+    within_approved: bool
+    anchor: str  # parent directory of the resolved path
+    fingerprint: Tuple[int, int, int]  # (st_dev, st_ino, st_mtime_ns) of anchor
+    components: int
+    expires_at: float
+
+
+class PathResolutionCache:
+    """LRU cache of ``Path.resolve()`` results keyed by (cwd, user path).
+
+    Only paths that resolve to themselves (no symlink anywhere along the
+    way) are cached. A hit costs one ``stat`` of the parent directory
+    instead of an ``lstat`` per component: the entry is dropped if the
+    directory's device, inode or mtime changed (an entry was added,
+    removed or swapped for a symlink, or an ancestor now points
+    elsewhere) or once ``ttl`` seconds have passed.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_PATH_CACHE_SIZE,
+        ttl: float = DEFAULT_PATH_CACHE_TTL,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple[str, str], CachedPath]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.invalidated = 0
+        self.uncacheable = 0
+        self.syscalls_saved = 0
+
+    @staticmethod
+    def _fingerprint(anchor: str) -> Tuple[int, int, int]:
+        st = os.stat(anchor)
+        return (st.st_dev, st.st_ino, st.st_mtime_ns)
+
+    def get(self, cwd: Path, user_path: str) -> Optional[CachedPath]:
+        """Return a still-valid entry, dropping it if stale."""
+        key = (str(cwd), user_path)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        if time.monotonic() >= entry.expires_at:
+            del self._entries[key]
+            self.expired += 1
+            self.misses += 1
+            return None
+
+        try:
+            fingerprint = self._fingerprint(entry.anchor)
+        except OSError:
+            fingerprint = None
+        if fingerprint != entry.fingerprint:
+            del self._entries[key]
+            self.invalidated += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        # resolve() would have lstat'ed every component; the check above
+        # cost one stat
+        self.syscalls_saved += entry.components - 1
+        return entry
+
+    def put(
+        self,
+        cwd: Path,
+        user_path: str,
+        target: Path,
+        resolved: Path,
+        within_approved: bool,
+    ) -> None:
+        """Cache a resolution unless a symlink or missing parent is involved."""
+        if os.path.normpath(target) != str(resolved):
+            self.uncacheable += 1
+            return
+
+        anchor = str(resolved.parent)
+        try:
+            fingerprint = self._fingerprint(anchor)
+        except OSError:
+            self.uncacheable += 1
+            return
+
+        key = (str(cwd), user_path)
+        self._entries[key] = CachedPath(
+            resolved=resolved,
+            within_approved=within_approved,
+            anchor=anchor,
+            fingerprint=fingerprint,
+            components=len(resolved.parts),
+            expires_at=time.monotonic() + self.ttl,
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache statistics."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "expired": self.expired,
+            "invalidated": self.invalidated,
+            "uncacheable": self.uncacheable,
+            "syscalls_saved": self.syscalls_saved,
+        }
+
+
 class SecurityValidator:
     """Security validation for user inputs."""
 
@@ -131,14 +269,30 @@ class SecurityValidator:
         r".*\.rar$",  # Archives (potentially dangerous)
     ]
 
-    def __init__(self, approved_directory: Path, disable_path_validation: bool = False):
+    # Compiled once; each check is a single scan of the input
+    _DANGEROUS = PatternSet(DANGEROUS_PATTERNS, re.IGNORECASE)
+    _DANGEROUS_FILES = PatternSet(DANGEROUS_FILE_PATTERNS, re.IGNORECASE)
+    _FORBIDDEN_NAMES = frozenset(name.lower() for name in FORBIDDEN_FILENAMES)
+    _UNSAFE_CHARS = re.compile(r"[`$;|&<>#\x00-\x1f\x7f]")
+
+    def __init__(
+        self,
+        approved_directory: Path,
+        disable_path_validation: bool = False,
+        path_cache_size: int = DEFAULT_PATH_CACHE_SIZE,
+        path_cache_ttl: float = DEFAULT_PATH_CACHE_TTL,
+    ):
         """Initialize validator with approved directory."""
         self.approved_directory = approved_directory.resolve()
         self.disable_path_validation = disable_path_validation
+        self.path_cache: Optional[PathResolutionCache] = None
+        if path_cache_size > 0 and path_cache_ttl > 0:
+            self.path_cache = PathResolutionCache(path_cache_size, path_cache_ttl)
         logger.info(
             "Security validator initialized",
             approved_directory=str(self.approved_directory),
             disable_path_validation=disable_path_validation,
+            path_cache_size=path_cache_size if self.path_cache else 0,
         )
 
     def validate_path(
@@ -157,34 +311,46 @@ class SecurityValidator:
             user_path = user_path.strip()
 
             # Check for dangerous patterns
-            for pattern in self.DANGEROUS_PATTERNS:
-                if re.search(pattern, user_path, re.IGNORECASE):
-                    logger.warning(
-                        "Dangerous pattern detected in path",
-                        path=user_path,
-                        pattern=pattern,
-                    )
-                    return (
-                        False,
-                        None,
-                        f"Invalid path: contains forbidden pattern '{pattern}'",
-                    )
+            pattern = self._DANGEROUS.search(user_path)
+            if pattern:
+                logger.warning(
+                    "Dangerous pattern detected in path",
+                    path=user_path,
+                    pattern=pattern,
+                )
+                return (
+                    False,
+                    None,
+                    f"Invalid path: contains forbidden pattern '{pattern}'",
+                )
 
             # Handle path resolution
             current_dir = current_dir or self.approved_directory
 
-            if user_path.startswith("/"):
-                # Absolute path - use as-is
-                target = Path(user_path)
+            cached = (
+                self.path_cache.get(current_dir, user_path) if self.path_cache else None
+            )
+            if cached is not None:
+                target = cached.resolved
+                within = cached.within_approved
             else:
-                # Relative path
-                target = current_dir / user_path
-
-            # Resolve path and check boundaries
-            target = target.resolve()
+                if user_path.startswith("/"):
+                    # Absolute path - use as-is
+                    unresolved = Path(user_path)
+                else:
+                    # Relative path
+                    unresolved = current_dir / user_path
+
+                # Resolve path and check boundaries
+                target = unresolved.resolve()
+                within = self._is_within_directory(target, self.approved_directory)
+                if self.path_cache:
+                    self.path_cache.put(
+                        current_dir, user_path, unresolved, target, within
+                    )
 
             # Ensure target is within approved directory (unless validation is disabled)
-            if not self.disable_path_validation and not self._is_within_directory(target, self.approved_directory):
+            if not self.disable_path_validation and not within:
                 logger.warning(
                     "Path traversal attempt detected",
                     requested_path=user_path,
@@ -230,25 +396,23 @@ class SecurityValidator:
             return False, "Invalid filename: contains path separators"
 
         # Check for forbidden patterns
-        for pattern in self.DANGEROUS_PATTERNS:
-            if re.search(pattern, filename, re.IGNORECASE):
-                logger.warning(
-                    "Dangerous pattern in filename", filename=filename, pattern=pattern
-                )
-                return False, "Invalid filename: contains forbidden pattern"
+        pattern = self._DANGEROUS.search(filename)
+        if pattern:
+            logger.warning(
+                "Dangerous pattern in filename", filename=filename, pattern=pattern
+            )
+            return False, "Invalid filename: contains forbidden pattern"
 
         # Check for forbidden filenames
-        if filename.lower() in {name.lower() for name in self.FORBIDDEN_FILENAMES}:
+        if filename.lower() in self._FORBIDDEN_NAMES:
             logger.warning("Forbidden filename", filename=filename)
             return False, f"Forbidden filename: {filename}"
 
         # Check for dangerous file patterns
-        for pattern in self.DANGEROUS_FILE_PATTERNS:
-            if re.match(pattern, filename, re.IGNORECASE):
-                logger.warning(
-                    "Dangerous file pattern", filename=filename, pattern=pattern
-                )
-                return False, f"File type not allowed: {filename}"
+        pattern = self._DANGEROUS_FILES.match(filename)
+        if pattern:
+            logger.warning("Dangerous file pattern", filename=filename, pattern=pattern)
+            return False, f"File type not allowed: {filename}"
 
         # Check extension
         path_obj = Path(filename)
@@ -272,6 +436,10 @@ class SecurityValidator:
         logger.debug("Filename validation successful", filename=filename)
         return True, None
 
+    def count_unsafe_characters(self, text: str) -> int:
+        """Number of characters ``sanitize_command_input`` would strip."""
+        return len(text) - len(self._UNSAFE_CHARS.sub("", text))
+
     def sanitize_command_input(self, text: str) -> str:
         """Sanitize text input for commands.
 
@@ -283,7 +451,7 @@ class SecurityValidator:
 
         # Remove dangerous characters but preserve basic ones
         # Note: This is very restrictive - adjust based on actual needs
-        sanitized = re.sub(r"[`$;|&<>#\x00-\x1f\x7f]", "", text)
+        sanitized = self._UNSAFE_CHARS.sub("", text)
 
         # Limit length to prevent buffer overflow attacks
         max_length = 1000
@@ -322,12 +490,12 @@ class SecurityValidator:
 
         for arg in args:
             # Check for dangerous patterns
-            for pattern in self.DANGEROUS_PATTERNS:
-                if re.search(pattern, arg, re.IGNORECASE):
-                    logger.warning(
-                        "Dangerous pattern in command arg", arg=arg, pattern=pattern
-                    )
-                    return False, [], "Invalid argument: contains forbidden pattern"
+            pattern = self._DANGEROUS.search(arg)
+            if pattern:
+                logger.warning(
+                    "Dangerous pattern in command arg", arg=arg, pattern=pattern
+                )
+                return False, [], "Invalid argument: contains forbidden pattern"
 
             # Sanitize argument
             sanitized = self.sanitize_command_input(arg)
@@ -351,16 +519,15 @@ class SecurityValidator:
         dirname = dirname.strip()
 
         # Check for dangerous patterns
-        for pattern in self.DANGEROUS_PATTERNS:
-            if re.search(pattern, dirname, re.IGNORECASE):
-                return False
+        if self._DANGEROUS.search(dirname):
+            return False
 
         # Check for path separators
         if "/" in dirname or "\\" in dirname:
             return False
 
         # Check for forbidden names
-        if dirname.lower() in {name.lower() for name in self.FORBIDDEN_FILENAMES}:
+        if dirname.lower() in self._FORBIDDEN_NAMES:
             return False
 
         # Check for hidden directories
@@ -383,4 +550,5 @@ class SecurityValidator:
             "dangerous_file_patterns_count": len(self.DANGEROUS_FILE_PATTERNS),
             "max_filename_length": 255,
             "max_command_length": 1000,
+            "path_cache": self.path_cache.get_stats() if self.path_cache else None,
         }
@@ -0,0 +1,188 @@
+"""Persistent audit storage implementation.
+
+Features:
+- Audit events kept in the ``audit_log`` table
+- Batched writes from a background task, one transaction per batch
+- Indexed queries for every ``get_events`` filter
+"""
+
+import asyncio
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional
+
+import structlog
+
+from ..security.audit import AuditEvent, AuditStorage
+from ..utils.constants import DEFAULT_AUDIT_BATCH_SIZE, DEFAULT_AUDIT_FLUSH_INTERVAL
+from .models import AuditLogModel
+from .repositories import AuditLogRepository
+
+logger = structlog.get_logger()
+
+
+class SQLiteAuditStorage(AuditStorage):
+    """SQLite-based audit storage with a background batch writer.
+
+    ``store_event`` only queues the event. Once ``start`` has been called,
+    the queue is written every ``flush_interval`` seconds, or as soon as
+    ``batch_size`` events are waiting; before that (or with an interval
+    of 0) each event is written immediately. Queries flush first, so
+    they always see every stored event. If a write fails the batch stays
+    queued for the next one; beyond ``max_pending`` queued events the
+    oldest are dropped.
+    """
+
+    def __init__(
+        self,
+        repository: AuditLogRepository,
+        batch_size: int = DEFAULT_AUDIT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_AUDIT_FLUSH_INTERVAL,
+        max_pending: int = 10000,
+    ):
+        """Initialize with the audit log repository."""
+        self.repository = repository
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+
+        self._pending: Deque[AuditEvent] = deque()
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+        self.batches = 0
+        self.events_written = 0
+        self.failures = 0
+        self.dropped = 0
+
+    async def store_event(self, event: AuditEvent) -> None:
+        """Queue event for the next batch."""
+        self._pending.append(event)
+        self._log_high_risk(event)
+
+        if self._task is None or len(self._pending) >= self.max_pending:
+            await self.flush()
+        elif len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+    async def flush(self) -> int:
+        """Write every queued event in one transaction; returns events written."""
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+
+            batch = list(self._pending)
+            self._pending.clear()
+            try:
+                written = await self.repository.log_events(
+                    self._to_model(event) for event in batch
+                )
+            except Exception as e:
+                # Keep the batch, ahead of anything queued meanwhile
+                self._pending.extendleft(reversed(batch))
+                overflow = len(self._pending) - self.max_pending
+                for _ in range(max(overflow, 0)):
+                    self._pending.popleft()
+                    self.dropped += 1
+                self.failures += 1
+                logger.warning(
+                    "Audit log write failed", events=len(batch), error=str(e)
+                )
+                return 0
+
+            self.batches += 1
+            self.events_written += written
+            return written
+
+    def start(self) -> Optional[asyncio.Task]:
+        """Start the batch writer (no-op when the interval is 0)."""
+        if self.flush_interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._run())
+        return self._task
+
+    async def _run(self) -> None:
+        """Flush loop."""
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def stop(self) -> None:
+        """Stop the writer and flush what is still queued."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def get_events(
+        self,
+        user_id: Optional[int] = None,
+        event_type: Optional[str] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        limit: int = 100,
+    ) -> List[AuditEvent]:
+        """Get filtered events, newest first."""
+        await self.flush()
+        rows = await self.repository.get_events(
+            user_id=user_id,
+            event_type=event_type,
+            start_time=start_time,
+            end_time=end_time,
+            limit=limit,
+        )
+        return [self._from_model(row) for row in rows]
+
+    async def get_security_violations(
+        self, user_id: Optional[int] = None, limit: int = 100
+    ) -> List[AuditEvent]:
+        """Get security violations."""
+        return await self.get_events(
+            user_id=user_id, event_type="security_violation", limit=limit
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Batch writer statistics."""
+        return {
+            "flush_interval": self.flush_interval,
+            "running": self._task is not None,
+            "pending": len(self._pending),
+            "batches": self.batches,
+            "events_written": self.events_written,
+            "failures": self.failures,
+            "dropped": self.dropped,
+        }
+
+    @staticmethod
+    def _to_model(event: AuditEvent) -> AuditLogModel:
+        return AuditLogModel(
+            user_id=event.user_id,
+            event_type=event.event_type,
+            timestamp=event.timestamp,
+            event_data=event.details,
+            success=event.success,
+            ip_address=event.ip_address,
+            session_id=event.session_id,
+            risk_level=event.risk_level,
+        )
+
+    @staticmethod
+    def _from_model(row: AuditLogModel) -> AuditEvent:
+        return AuditEvent(
+            timestamp=row.timestamp,
+            user_id=row.user_id,
+            event_type=row.event_type,
+            success=bool(row.success),
+            details=row.event_data or {},
+            ip_address=row.ip_address,
+            session_id=row.session_id,
+            risk_level=row.risk_level or "low",
+        )
@@ -230,6 +230,67 @@ class DatabaseManager:
                 GROUP BY u.user_id;
                 """,
             ),
+            (
+                3,
+                """
+                -- Rate limiter checkpoints
+                CREATE TABLE IF NOT EXISTS rate_limit_state (
+                    user_id INTEGER PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    bucket_updated_at TIMESTAMP NOT NULL,
+                    cost REAL DEFAULT 0.0,
+                    cost_reset_at TIMESTAMP,
+                    saved_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+                """,
+            ),
+            (
+                4,
+                """
+                -- Previous cost window for sliding-window accounting
+                ALTER TABLE rate_limit_state ADD COLUMN previous_cost REAL DEFAULT 0.0;
+                """,
+            ),
+            (
+                5,
+                """
+                -- Audit log as security event storage: events are recorded
+                -- for users who never registered (failed auth), so the
+                -- foreign key goes; risk level and session are kept
+                CREATE TABLE audit_log_new (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id INTEGER NOT NULL,
+                    event_type TEXT NOT NULL,
+                    event_data JSON,
+                    success BOOLEAN DEFAULT TRUE,
+                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    ip_address TEXT,
+                    session_id TEXT,
+                    risk_level TEXT DEFAULT 'low'
+                );
+                INSERT INTO audit_log_new
+                    (id, user_id, event_type, event_data, success, timestamp,
+                     ip_address)
+                SELECT id, user_id, event_type, event_data, success, timestamp,
+                       ip_address
+                FROM audit_log;
+                DROP TABLE audit_log;
+                ALTER TABLE audit_log_new RENAME TO audit_log;
+
+                CREATE INDEX idx_audit_log_timestamp ON audit_log(timestamp);
+                CREATE INDEX idx_audit_log_user_id ON audit_log(user_id, timestamp);
+                CREATE INDEX idx_audit_log_type_time
+                    ON audit_log(event_type, timestamp);
+                """,
+            ),
+            (
+                6,
+                """
+                -- Token lookups are by user
+                CREATE INDEX IF NOT EXISTS idx_user_tokens_user_id
+                    ON user_tokens(user_id, is_active);
+                """,
+            ),
         ]
 
     async def _init_pool(self):
@@ -22,9 +22,11 @@ from .repositories import (
     AuditLogRepository,
     CostTrackingRepository,
     MessageRepository,
+    RateLimitStateRepository,
     SessionRepository,
     ToolUsageRepository,
     UserRepository,
+    UserTokenRepository,
 )
 
 logger = structlog.get_logger()
@@ -42,6 +44,8 @@ class Storage:
         self.tools = ToolUsageRepository(self.db_manager)
         self.audit = AuditLogRepository(self.db_manager)
         self.costs = CostTrackingRepository(self.db_manager)
+        self.rate_limits = RateLimitStateRepository(self.db_manager)
+        self.tokens = UserTokenRepository(self.db_manager)
         self.analytics = AnalyticsRepository(self.db_manager)
 
     async def initialize(self):
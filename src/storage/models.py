@@ -178,6 +178,8 @@ class AuditLogModel:
     event_data: Optional[Dict[str, Any]] = None
     success: bool = True
     ip_address: Optional[str] = None
+    session_id: Optional[str] = None
+    risk_level: str = "low"
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
@@ -229,6 +231,40 @@ class CostTrackingModel:
         return asdict(self)
 
 
+@dataclass
+class RateLimitStateModel:
+    """Checkpointed rate limiter state for one user."""
+
+    user_id: int
+    tokens: float
+    bucket_updated_at: datetime
+    cost: float = 0.0
+    cost_reset_at: Optional[datetime] = None
+    saved_at: Optional[datetime] = None
+    previous_cost: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        data = asdict(self)
+        # Convert datetime to ISO format
+        for key in ["bucket_updated_at", "cost_reset_at", "saved_at"]:
+            if data[key]:
+                data[key] = data[key].isoformat()
+        return data
+
+    @classmethod
+    def from_row(cls, row: aiosqlite.Row) -> "RateLimitStateModel":
+        """Create from database row."""
+        data = dict(row)
+
+        # Parse datetime fields
+        for field in ["bucket_updated_at", "cost_reset_at", "saved_at"]:
+            if data.get(field):
+                data[field] = datetime.fromisoformat(data[field])
+
+        return cls(**data)
+
+
 @dataclass
 class UserTokenModel:
     """User token data model."""
@@ -7,8 +7,8 @@ Features:
 """
 
 import json
-from datetime import datetime
-from typing import Dict, List, Optional
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
 
 import structlog
 
@@ -17,9 +17,11 @@ from .models import (
     AuditLogModel,
     CostTrackingModel,
     MessageModel,
+    RateLimitStateModel,
     SessionModel,
     ToolUsageModel,
     UserModel,
+    UserTokenModel,
 )
 
 logger = structlog.get_logger()
@@ -418,6 +420,72 @@ class AuditLogRepository:
             await conn.commit()
             return cursor.lastrowid
 
+    async def log_events(self, audit_logs: Iterable[AuditLogModel]) -> int:
+        """Insert a batch of audit events in a single transaction."""
+        rows = [
+            (
+                audit_log.user_id,
+                audit_log.event_type,
+                json.dumps(audit_log.event_data, default=str)
+                if audit_log.event_data
+                else None,
+                audit_log.success,
+                audit_log.timestamp,
+                audit_log.ip_address,
+                audit_log.session_id,
+                audit_log.risk_level,
+            )
+            for audit_log in audit_logs
+        ]
+        if not rows:
+            return 0
+
+        async with self.db.get_connection() as conn:
+            await conn.executemany(
+                """
+                INSERT INTO audit_log
+                (user_id, event_type, event_data, success, timestamp, ip_address,
+                 session_id, risk_level)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+                rows,
+            )
+            await conn.commit()
+        return len(rows)
+
+    async def get_events(
+        self,
+        user_id: Optional[int] = None,
+        event_type: Optional[str] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        limit: int = 100,
+    ) -> List[AuditLogModel]:
+        """Newest events matching every given filter."""
+        conditions = []
+        params: List[Any] = []
+        if user_id is not None:
+            conditions.append("user_id = ?")
+            params.append(user_id)
+        if event_type is not None:
+            conditions.append("event_type = ?")
+            params.append(event_type)
+        if start_time is not None:
+            conditions.append("timestamp >= ?")
+            params.append(start_time)
+        if end_time is not None:
+            conditions.append("timestamp <= ?")
+            params.append(end_time)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        async with self.db.get_connection() as conn:
+            cursor = await conn.execute(
+                f"SELECT * FROM audit_log {where} ORDER BY timestamp DESC LIMIT ?",
+                (*params, limit),
+            )
+            rows = await cursor.fetchall()
+            return [AuditLogModel.from_row(row) for row in rows]
+
     async def get_user_audit_log(
         self, user_id: int, limit: int = 100
     ) -> List[AuditLogModel]:
@@ -450,6 +518,81 @@ class AuditLogRepository:
             return [AuditLogModel.from_row(row) for row in rows]
 
 
+class UserTokenRepository:
+    """Auth token data access."""
+
+    def __init__(self, db_manager: DatabaseManager):
+        """Initialize repository."""
+        self.db = db_manager
+
+    async def store_token(
+        self, user_id: int, token_hash: str, expires_at: Optional[datetime]
+    ) -> int:
+        """Make ``token_hash`` the user's only active token; returns its ID."""
+        async with self.db.get_connection() as conn:
+            # Tokens can be issued before the user ever talks to the bot
+            await conn.execute(
+                "INSERT OR IGNORE INTO users (user_id) VALUES (?)", (user_id,)
+            )
+            await conn.execute(
+                "UPDATE user_tokens SET is_active = FALSE "
+                "WHERE user_id = ? AND is_active = TRUE",
+                (user_id,),
+            )
+            cursor = await conn.execute(
+                """
+                INSERT INTO user_tokens (user_id, token_hash, created_at, expires_at)
+                VALUES (?, ?, ?, ?)
+            """,
+                (user_id, token_hash, datetime.utcnow(), expires_at),
+            )
+            await conn.commit()
+            token_id = cursor.lastrowid
+            assert token_id is not None
+            return token_id
+
+    async def get_active_token(self, user_id: int) -> Optional[UserTokenModel]:
+        """Get the user's active, unexpired token."""
+        async with self.db.get_connection() as conn:
+            cursor = await conn.execute(
+                """
+                SELECT * FROM user_tokens
+                WHERE user_id = ? AND is_active = TRUE
+                  AND (expires_at IS NULL OR expires_at > ?)
+                ORDER BY token_id DESC
+                LIMIT 1
+            """,
+                (user_id, datetime.utcnow()),
+            )
+            row = await cursor.fetchone()
+            return UserTokenModel.from_row(row) if row else None
+
+    async def revoke_tokens(self, user_id: int) -> int:
+        """Deactivate every active token of the user."""
+        async with self.db.get_connection() as conn:
+            cursor = await conn.execute(
+                "UPDATE user_tokens SET is_active = FALSE "
+                "WHERE user_id = ? AND is_active = TRUE",
+                (user_id,),
+            )
+            await conn.commit()
+            return cursor.rowcount
+
+    async def update_last_used(self, last_used: Dict[int, datetime]) -> int:
+        """Set ``last_used`` on active tokens for a batch of users."""
+        if not last_used:
+            return 0
+
+        async with self.db.get_connection() as conn:
+            await conn.executemany(
+                "UPDATE user_tokens SET last_used = ? "
+                "WHERE user_id = ? AND is_active = TRUE",
+                [(used_at, user_id) for user_id, used_at in last_used.items()],
+            )
+            await conn.commit()
+        return len(last_used)
+
+
 class CostTrackingRepository:
     """Cost tracking data access."""
 
@@ -512,6 +655,86 @@ class CostTrackingRepository:
             rows = await cursor.fetchall()
             return [dict(row) for row in rows]
 
+    async def get_costs_for_date(self, date: Optional[str] = None) -> Dict[int, float]:
+        """Get each user's total cost for one day (today by default)."""
+        if not date:
+            date = datetime.utcnow().strftime("%Y-%m-%d")
+
+        async with self.db.get_connection() as conn:
+            cursor = await conn.execute(
+                "SELECT user_id, daily_cost FROM cost_tracking WHERE date = ?",
+                (date,),
+            )
+            rows = await cursor.fetchall()
+            return {row["user_id"]: row["daily_cost"] or 0.0 for row in rows}
+
+
+class RateLimitStateRepository:
+    """Rate limiter checkpoint data access."""
+
+    def __init__(self, db_manager: DatabaseManager):
+        """Initialize repository."""
+        self.db = db_manager
+
+    async def save_states(self, states: Iterable[Dict[str, Any]]) -> int:
+        """Upsert a batch of user states in a single transaction."""
+        rows = [
+            {
+                "user_id": state["user_id"],
+                "tokens": state["tokens"],
+                "bucket_updated_at": state["bucket_updated_at"].isoformat(),
+                "cost": state.get("cost", 0.0),
+                "cost_reset_at": (
+                    state["cost_reset_at"].isoformat()
+                    if state.get("cost_reset_at")
+                    else None
+                ),
+                "previous_cost": state.get("previous_cost", 0.0),
+            }
+            for state in states
+        ]
+        if not rows:
+            return 0
+
+        async with self.db.get_connection() as conn:
+            await conn.executemany(
+                """
+                INSERT INTO rate_limit_state
+                (user_id, tokens, bucket_updated_at, cost, cost_reset_at,
+                 previous_cost, saved_at)
+                VALUES
+                (:user_id, :tokens, :bucket_updated_at, :cost, :cost_reset_at,
+                 :previous_cost, CURRENT_TIMESTAMP)
+                ON CONFLICT(user_id) DO UPDATE SET
+                    tokens = excluded.tokens,
+                    bucket_updated_at = excluded.bucket_updated_at,
+                    cost = excluded.cost,
+                    cost_reset_at = excluded.cost_reset_at,
+                    previous_cost = excluded.previous_cost,
+                    saved_at = excluded.saved_at
+            """,
+                rows,
+            )
+            await conn.commit()
+        return len(rows)
+
+    async def load_states(self) -> List[RateLimitStateModel]:
+        """Load all checkpointed states."""
+        async with self.db.get_connection() as conn:
+            cursor = await conn.execute("SELECT * FROM rate_limit_state")
+            rows = await cursor.fetchall()
+            return [RateLimitStateModel.from_row(row) for row in rows]
+
+    async def prune_states(self, max_age: timedelta) -> int:
+        """Delete states not saved within ``max_age``; returns rows deleted."""
+        async with self.db.get_connection() as conn:
+            cursor = await conn.execute(
+                "DELETE FROM rate_limit_state WHERE saved_at < datetime('now', ?)",
+                (f"-{int(max_age.total_seconds())} seconds",),
+            )
+            await conn.commit()
+            return cursor.rowcount
+
 
 class AnalyticsRepository:
     """Analytics and reporting."""
@@ -0,0 +1,119 @@
+"""Persistent auth token storage implementation.
+
+Features:
+- Token hashes kept in the ``user_tokens`` table
+- One active token per user; issuing a new one deactivates the old
+- ``last_used`` recorded in memory and written in batches
+"""
+
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import structlog
+
+from ..security.auth import TokenStorage
+from .repositories import UserTokenRepository
+
+logger = structlog.get_logger()
+
+
+class SQLiteTokenStorage(TokenStorage):
+    """SQLite-based token storage.
+
+    Successful authentications only note the time in memory; the latest
+    use per user is written in one batch every ``flush_interval`` seconds
+    once ``start`` has been called (and on ``stop``).
+    """
+
+    def __init__(self, repository: UserTokenRepository, flush_interval: float = 60.0):
+        """Initialize with the token repository."""
+        self.repository = repository
+        self.flush_interval = flush_interval
+
+        self._last_used: Dict[int, datetime] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.flushes = 0
+        self.failures = 0
+
+    async def store_token(
+        self, user_id: int, token_hash: str, expires_at: datetime
+    ) -> None:
+        """Store token hash, replacing the user's previous token."""
+        await self.repository.store_token(user_id, token_hash, expires_at)
+        self._last_used.pop(user_id, None)
+
+    async def get_user_token(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """Get the active token's data."""
+        token = await self.repository.get_active_token(user_id)
+        if token is None:
+            return None
+        return {
+            "hash": token.token_hash,
+            "expires_at": token.expires_at,
+            "created_at": token.created_at,
+            "last_used": self._last_used.get(user_id, token.last_used),
+        }
+
+    async def revoke_token(self, user_id: int) -> None:
+        """Deactivate the user's token."""
+        await self.repository.revoke_tokens(user_id)
+        self._last_used.pop(user_id, None)
+
+    async def record_use(self, user_id: int) -> None:
+        """Note a successful authentication for the next batch."""
+        self._last_used[user_id] = datetime.utcnow()
+
+    async def flush_last_used(self) -> int:
+        """Write every pending ``last_used`` in one batch."""
+        if not self._last_used:
+            return 0
+
+        pending, self._last_used = self._last_used, {}
+        try:
+            written = await self.repository.update_last_used(pending)
+        except Exception as e:
+            # Keep the newest time per user for the next flush
+            for user_id, used_at in pending.items():
+                self._last_used.setdefault(user_id, used_at)
+            self.failures += 1
+            logger.warning(
+                "Token last_used update failed", users=len(pending), error=str(e)
+            )
+            return 0
+
+        self.flushes += 1
+        return written
+
+    def start(self) -> Optional[asyncio.Task]:
+        """Start periodic flushes (no-op when the interval is 0)."""
+        if self.flush_interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._run())
+        return self._task
+
+    async def _run(self) -> None:
+        """Flush loop."""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush_last_used()
+
+    async def stop(self) -> None:
+        """Stop the loop and write what is still pending."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush_last_used()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Batch writer statistics."""
+        return {
+            "flush_interval": self.flush_interval,
+            "running": self._task is not None,
+            "pending": len(self._last_used),
+            "flushes": self.flushes,
+            "failures": self.failures,
+        }
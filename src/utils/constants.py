@@ -12,10 +12,26 @@ DEFAULT_CLAUDE_MAX_COST_PER_USER = 10.0
 DEFAULT_RATE_LIMIT_REQUESTS = 10
 DEFAULT_RATE_LIMIT_WINDOW = 60
 DEFAULT_RATE_LIMIT_BURST = 20
+DEFAULT_RATE_LIMIT_CHECKPOINT_INTERVAL = 60
+DEFAULT_RATE_LIMIT_COST_WINDOW_HOURS = 24.0
+DEFAULT_RATE_LIMIT_IDLE_TIMEOUT = 86400
+DEFAULT_RATE_LIMIT_CLEANUP_INTERVAL = 60
 
 DEFAULT_SESSION_TIMEOUT_HOURS = 24
 DEFAULT_MAX_SESSIONS_PER_USER = 5
 
+DEFAULT_TOOL_MONITOR_MAX_VIOLATIONS = 1000
+DEFAULT_PATH_CACHE_SIZE = 1024
+DEFAULT_AUTH_TOKEN_CACHE_TTL = 30.0
+DEFAULT_AUTH_DECISION_CACHE_TTL = 10.0
+DEFAULT_PATH_CACHE_TTL = 5.0
+DEFAULT_CONCURRENT_UPDATES = 16
+DEFAULT_WEBHOOK_MAX_BODY_SIZE = 1024 * 1024
+DEFAULT_WEBHOOK_MAX_QUEUE = 1000
+DEFAULT_WEBHOOK_KEEPALIVE_TIMEOUT = 75.0
+DEFAULT_WEBHOOK_MAX_CONNECTIONS = 40
+DEFAULT_PROGRESS_EDIT_INTERVAL_MS = 1000
+
 # Message limits
 TELEGRAM_MAX_MESSAGE_LENGTH = 4096
 SAFE_MESSAGE_LENGTH = 4000  # Leave room for formatting
@@ -77,6 +93,8 @@ DANGEROUS_PATTERNS = [
 
 # Database defaults
 DEFAULT_DATABASE_URL = "sqlite:///data/bot.db"
+DEFAULT_AUDIT_BATCH_SIZE = 100
+DEFAULT_AUDIT_FLUSH_INTERVAL = 1.0
 DEFAULT_BACKUP_RETENTION_DAYS = 30
 
 # Claude Code defaults
@@ -0,0 +1,95 @@
+"""Fixed-bucket latency histogram.
+
+Features:
+- O(log buckets) recording with no per-sample storage
+- Percentile estimates from bucket upper bounds
+- Plain-dict snapshots for stats and status reports
+"""
+
+from bisect import bisect_left
+from typing import Any, Dict, List, Sequence
+
+# Upper bounds in seconds, roughly 1-2.5-5 per decade from 0.1 ms to 10 s
+DEFAULT_BOUNDS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class LatencyHistogram:
+    """Counts durations (in seconds) into buckets with fixed upper bounds.
+
+    A sample lands in the first bucket whose bound it does not exceed;
+    anything slower than the last bound goes to an overflow bucket.
+    Percentiles report the bound of the bucket holding that rank (the
+    observed maximum for the overflow bucket), so they are upper
+    estimates accurate to one bucket.
+    """
+
+    __slots__ = ("bounds", "counts", "count", "total", "max")
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_BOUNDS):
+        if list(bounds) != sorted(bounds) or not bounds:
+            raise ValueError("bounds must be non-empty and ascending")
+
+        self.bounds = tuple(bounds)
+        self.counts: List[int] = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Record one duration."""
+        self.counts[bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, fraction: float) -> float:
+        """Upper estimate of the ``fraction`` quantile (0 < fraction <= 1)."""
+        if not self.count:
+            return 0.0
+
+        rank = fraction * self.count
+        seen = 0
+        for index, bucket in enumerate(self.counts):
+            seen += bucket
+            if seen >= rank and bucket:
+                if index == len(self.bounds):
+                    return self.max
+                return min(self.bounds[index], self.max)
+        return self.max
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Summary in milliseconds, with non-empty buckets by bound."""
+        buckets = {
+            f"<={bound * 1000:g}ms": count
+            for bound, count in zip(self.bounds, self.counts)
+            if count
+        }
+        if self.counts[-1]:
+            buckets[f">{self.bounds[-1] * 1000:g}ms"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count * 1000 if self.count else 0.0,
+            "p50_ms": self.percentile(0.5) * 1000,
+            "p95_ms": self.percentile(0.95) * 1000,
+            "p99_ms": self.percentile(0.99) * 1000,
+            "max_ms": self.max * 1000,
+            "buckets": buckets,
+        }
@@ -0,0 +1,107 @@
+"""Split long text into Telegram-sized chunks.
+
+Features:
+- Single pass over the input, O(n) in text length
+- Code fences closed at chunk ends and reopened (with language) in the next
+- Lines longer than a chunk are hard-split without inserting characters
+"""
+
+from typing import List, Optional
+
+FENCE = "```"
+CLOSING_FENCE = "\n" + FENCE
+
+# Reopened fence headers longer than this fall back to a bare fence
+MAX_FENCE_HEADER = 64
+
+
+def split_message(text: str, max_length: int) -> List[str]:
+    """Split text into chunks of at most ``max_length`` characters.
+
+    Chunks break on line boundaries where possible. A chunk that ends
+    inside a code block gets a closing fence and the next chunk reopens it,
+    so every chunk renders as balanced Markdown. Text that already fits is
+    returned unchanged; whitespace-only chunks are dropped.
+    """
+    if len(text) <= max_length:
+        return [text] if text.strip() else []
+
+    chunks: List[str] = []
+    parts: List[str] = []
+    size = 0
+    has_body = False
+    fence: Optional[str] = None
+    # Index in parts where a fence opened in this chunk with no body yet
+    opened_at: Optional[int] = None
+
+    def flush() -> None:
+        nonlocal parts, size, has_body, opened_at
+        if has_body:
+            if opened_at is not None:
+                # Move a dangling opening fence to the next chunk
+                del parts[opened_at:]
+            elif fence is not None:
+                parts.append(CLOSING_FENCE)
+            chunk = "".join(parts)
+            if chunk.strip():
+                chunks.append(chunk)
+        opened_at = None
+        if fence is not None:
+            header = fence if len(fence) <= MAX_FENCE_HEADER else FENCE
+            parts, size = [header], len(header)
+        else:
+            parts, size = [], 0
+        has_body = False
+
+    for line in text.split("\n"):
+        stripped = line.strip()
+        closes_fence = fence is not None and stripped.startswith(FENCE)
+        if closes_fence:
+            next_fence = None
+        elif fence is None and stripped.startswith(FENCE):
+            next_fence = stripped
+        else:
+            next_fence = fence
+
+        # Room needed for this line plus a closing fence if still inside one
+        reserve = len(CLOSING_FENCE) if next_fence is not None else 0
+        if has_body and size + 1 + len(line) + reserve > max_length:
+            flush()
+            if closes_fence:
+                # flush() already closed the block; don't emit an empty one
+                fence = None
+                parts, size = [], 0
+                continue
+
+        separator = 1 if parts else 0
+        if size + separator + len(line) + reserve <= max_length:
+            opens_fence = fence is None and next_fence is not None
+            opened_at = len(parts) if opens_fence else None
+            if separator:
+                parts.append("\n")
+            parts.append(line)
+            size += separator + len(line)
+            has_body = True
+            fence = next_fence
+            continue
+
+        # Line does not fit even in a fresh chunk: hard-split it
+        opened_at = None
+        reserve = len(CLOSING_FENCE) if fence is not None else 0
+        start = 0
+        while start < len(line):
+            separator = 1 if parts else 0
+            room = max(max_length - size - separator - reserve, 1)
+            piece = line[start : start + room]
+            if separator:
+                parts.append("\n")
+            parts.append(piece)
+            size += separator + len(piece)
+            has_body = True
+            start += len(piece)
+            if start < len(line):
+                flush()
+        fence = next_fence
+
+    flush()
+    return chunks
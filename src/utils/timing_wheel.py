@@ -0,0 +1,85 @@
+"""Hashed timing wheel for cheap expiry scheduling.
+
+Features:
+- O(1) schedule and cancel
+- Advancing costs O(slots passed + keys due), independent of total keys
+- Deadlines beyond one rotation wait in their slot until their round
+"""
+
+import math
+from typing import Dict, Generic, Hashable, List, Set, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+
+
+class TimingWheel(Generic[K]):
+    """Buckets keys by deadline into ``slots`` slots of ``tick`` seconds.
+
+    Each key is scheduled at most once; scheduling a key that is already
+    waiting keeps its earlier deadline. Callers that track activity
+    lazily re-check a key when it fires and schedule it again if it is
+    still live, so busy keys cost nothing until their deadline.
+    """
+
+    def __init__(self, tick: float, slots: int, now: float = 0.0):
+        if tick <= 0:
+            raise ValueError("tick must be positive")
+        if slots < 1:
+            raise ValueError("slots must be at least 1")
+
+        self.tick = tick
+        self.slots: List[Set[K]] = [set() for _ in range(slots)]
+        # key -> (deadline, slot index)
+        self._entries: Dict[K, Tuple[float, int]] = {}
+        # Earliest tick whose slot may still hold keys
+        self._cursor = self._tick_of(now)
+
+    def _tick_of(self, when: float) -> int:
+        return math.floor(when / self.tick)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    def schedule(self, key: K, deadline: float) -> bool:
+        """Schedule ``key``; returns False if it was already scheduled."""
+        if key in self._entries:
+            return False
+
+        # Anything already due lands in the next slot to be processed
+        index = max(self._tick_of(deadline), self._cursor) % len(self.slots)
+        self._entries[key] = (deadline, index)
+        self.slots[index].add(key)
+        return True
+
+    def cancel(self, key: K) -> bool:
+        """Remove ``key``; returns False if it was not scheduled."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+
+        self.slots[entry[1]].discard(key)
+        return True
+
+    def advance(self, now: float) -> List[K]:
+        """Move the wheel to ``now`` and return every key that is due."""
+        target = self._tick_of(now)
+        if target < self._cursor:
+            return []
+
+        due: List[K] = []
+        # One rotation visits every slot; any further ticks add nothing
+        steps = min(target - self._cursor + 1, len(self.slots))
+        for step in range(steps):
+            slot = self.slots[(self._cursor + step) % len(self.slots)]
+            expired = [key for key in slot if self._entries[key][0] <= now]
+            for key in expired:
+                slot.discard(key)
+                del self._entries[key]
+            due.extend(expired)
+
+        # Keys due within the current tick but after ``now`` stay put
+        self._cursor = target
+        return due
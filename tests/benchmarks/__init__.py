@@ -0,0 +1,6 @@
+"""Microbenchmarks for hot paths.
+
+Run individual benchmarks as modules, e.g.::
+
+    python -m tests.benchmarks.bench_tool_policy
+"""
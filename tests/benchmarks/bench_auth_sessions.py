@@ -0,0 +1,103 @@
+"""Benchmark AuthenticationManager session cleanup with many sessions.
+
+Compares the expiry heap with the previous full scan of every session on
+each authentication, and checks both leave the same sessions behind.
+
+Usage::
+
+    python -m tests.benchmarks.bench_auth_sessions [sessions]
+"""
+
+import asyncio
+import logging
+import sys
+import time
+from datetime import datetime, timedelta
+
+import structlog
+
+from src.security.auth import AuthenticationManager, UserSession, WhitelistAuthProvider
+
+# Keep logging out of the measurement
+structlog.configure(
+    wrapper_class=structlog.make_filtering_bound_logger(logging.CRITICAL)
+)
+
+
+def legacy_cleanup(manager: AuthenticationManager) -> None:
+    """The full scan the manager used to run on every authentication."""
+    expired = [
+        user_id for user_id, session in manager.sessions.items() if session.is_expired()
+    ]
+    for user_id in expired:
+        del manager.sessions[user_id]
+
+
+def populate(manager: AuthenticationManager, size: int, expired_every: int) -> None:
+    """Sessions with staggered activity; every Nth one already expired."""
+    now = datetime.utcnow()
+    for user_id in range(size):
+        age = timedelta(hours=25) if user_id % expired_every == 0 else timedelta(0)
+        session = UserSession(
+            user_id=user_id,
+            auth_provider="WhitelistAuthProvider",
+            created_at=now - age,
+            last_activity=now - age - timedelta(seconds=user_id % 3600),
+        )
+        manager.sessions[user_id] = session
+        manager._schedule_expiry(session)
+
+
+def bench(name: str, func, rounds: int) -> float:
+    """Mean wall time per call in microseconds."""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    per_call = (time.perf_counter() - start) / rounds * 1e6
+    print(f"{name:<40} {per_call:10.2f} us/call")
+    return per_call
+
+
+async def bench_authenticate(size: int, rounds: int) -> None:
+    """Time authenticate_user end to end with ``size`` live sessions."""
+    manager = AuthenticationManager([WhitelistAuthProvider([], allow_all_dev=True)])
+    populate(manager, size, expired_every=size + 1)
+
+    start = time.perf_counter()
+    for i in range(rounds):
+        await manager.authenticate_user(size + i % 100)
+    per_call = (time.perf_counter() - start) / rounds * 1e6
+    print(f"{'authenticate_user, heap':<40} {per_call:10.2f} us/call")
+
+
+def main(size: int) -> None:
+    """Run session cleanup benchmarks."""
+    heap_manager = AuthenticationManager([WhitelistAuthProvider([1])])
+    scan_manager = AuthenticationManager([WhitelistAuthProvider([1])])
+    for manager in (heap_manager, scan_manager):
+        populate(manager, size, expired_every=10)
+
+    start = time.perf_counter()
+    heap_manager._cleanup_expired_sessions()
+    heap_first = time.perf_counter() - start
+    start = time.perf_counter()
+    legacy_cleanup(scan_manager)
+    scan_first = time.perf_counter() - start
+    assert heap_manager.sessions.keys() == scan_manager.sessions.keys()
+    print(
+        f"{size:,} sessions, {size - len(heap_manager.sessions):,} expired "
+        "(same sessions removed)"
+    )
+    print(f"{'first cleanup, full scan':<40} {scan_first * 1e3:10.2f} ms")
+    print(f"{'first cleanup, heap':<40} {heap_first * 1e3:10.2f} ms")
+
+    # Steady state: nothing new has expired, as on almost every update
+    old = bench("cleanup, full scan", lambda: legacy_cleanup(scan_manager), 20)
+    new = bench("cleanup, heap", heap_manager._cleanup_expired_sessions, 20_000)
+    print(f"{'':<40} {old / new:10.0f}x")
+
+    asyncio.run(bench_authenticate(size, 2_000))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,146 @@
+"""Load test: many users sending prompts at once.
+
+Each simulated user sends a few prompts in a row. Updates go through a
+real Application (python-telegram-bot's update queue, the bot's
+middleware pipeline and a prompt handler that stands in for a Claude run
+with a typing action, a sleep and a reply) against an offline Bot API.
+Compares one-at-a-time processing with ChatOrderedUpdateProcessor, and
+checks every user's prompts were handled in the order sent.
+
+Usage::
+
+    python -m tests.benchmarks.bench_concurrent_updates [users] [prompts] [run_ms]
+"""
+
+import asyncio
+import logging
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import structlog
+from telegram.ext import MessageHandler, filters
+
+from src.bot.core import ClaudeCodeBot
+from src.bot.update_processor import ChatOrderedUpdateProcessor
+from src.config import create_test_config
+from src.security.audit import AuditLogger, InMemoryAuditStorage
+from src.security.auth import AuthenticationManager, WhitelistAuthProvider
+from src.security.rate_limiter import RateLimiter
+from src.security.validators import SecurityValidator
+from src.utils.histogram import LatencyHistogram
+from tests.benchmarks.telegram_stub import build_application, make_update
+
+# Keep logging out of the measurement
+structlog.configure(
+    wrapper_class=structlog.make_filtering_bound_logger(logging.CRITICAL)
+)
+
+
+async def run(
+    approved: Path,
+    users: int,
+    prompts: int,
+    run_time: float,
+    processor: Optional[ChatOrderedUpdateProcessor],
+) -> Tuple[float, LatencyHistogram, bool]:
+    """Process every prompt; returns wall time, latencies and ordering."""
+    user_ids = list(range(1000, 1000 + users))
+    settings = create_test_config(
+        approved_directory=str(approved),
+        rate_limit_requests=1_000_000,
+        rate_limit_window=1,
+        rate_limit_burst=1_000_000,
+        claude_max_cost_per_user=1e9,
+    )
+    deps = {
+        "auth_manager": AuthenticationManager([WhitelistAuthProvider(user_ids)]),
+        "security_validator": SecurityValidator(approved),
+        "rate_limiter": RateLimiter(settings),
+        "audit_logger": AuditLogger(InMemoryAuditStorage()),
+    }
+
+    options = {"concurrent_updates": processor} if processor else {}
+    bot = ClaudeCodeBot(settings, deps)
+    bot.app = app = build_application(**options)
+    bot._publish_dependencies()
+    bot._add_middleware()
+
+    rng = random.Random(42)
+    durations = {}
+    enqueued: Dict[int, float] = {}
+    latencies = LatencyHistogram()
+    handled: Dict[int, List[int]] = {user_id: [] for user_id in user_ids}
+    total = users * prompts
+    done = asyncio.Event()
+
+    async def prompt_handler(update, context):
+        """Stand-in for a Claude run."""
+        await update.message.chat.send_action("typing")
+        await asyncio.sleep(durations[update.update_id])
+        await update.message.reply_text("Done")
+        handled[update.effective_user.id].append(update.update_id)
+        latencies.observe(time.perf_counter() - enqueued[update.update_id])
+        if latencies.count == total:
+            done.set()
+
+    app.add_handler(
+        MessageHandler(filters.TEXT & ~filters.COMMAND, prompt_handler), group=10
+    )
+
+    await app.initialize()
+    await app.start()
+    start = time.perf_counter()
+    update_id = 0
+    for n in range(prompts):
+        for user_id in user_ids:
+            update_id += 1
+            durations[update_id] = run_time * rng.uniform(0.5, 1.5)
+            enqueued[update_id] = time.perf_counter()
+            await app.update_queue.put(
+                make_update(app.bot, update_id, user_id, f"prompt {n}")
+            )
+    await done.wait()
+    elapsed = time.perf_counter() - start
+    await app.stop()
+    await app.shutdown()
+
+    in_order = all(ids == sorted(ids) for ids in handled.values())
+    return elapsed, latencies, in_order
+
+
+def report(name: str, elapsed: float, latencies: LatencyHistogram, in_order: bool):
+    snapshot = latencies.snapshot()
+    print(
+        f"{name:<26} {elapsed:7.2f} s  {latencies.count / elapsed:7.1f} prompts/s  "
+        f"latency p50 {snapshot['p50_ms']:7.0f} ms  p95 {snapshot['p95_ms']:7.0f} ms  "
+        f"max {snapshot['max_ms']:7.0f} ms  {'ordered' if in_order else 'OUT OF ORDER'}"
+    )
+
+
+async def main(users: int, prompts: int, run_ms: float) -> None:
+    """Run the load test."""
+    print(f"{users} users x {prompts} prompts, ~{run_ms:g} ms per run")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        approved = Path(tmp_dir)
+        report(
+            "one at a time", *await run(approved, users, prompts, run_ms / 1000, None)
+        )
+        for limit in (16, 64):
+            processor = ChatOrderedUpdateProcessor(limit)
+            result = await run(approved, users, prompts, run_ms / 1000, processor)
+            report(f"per-chat order, {limit} at once", *result)
+            stats = processor.get_stats()
+            print(
+                f"{'':<26} max backlog per chat {stats['max_backlog']}, "
+                f"wait p95 {stats['wait']['p95_ms']:.0f} ms"
+            )
+
+
+if __name__ == "__main__":
+    args = [float(arg) for arg in sys.argv[1:]]
+    users, prompts, run_ms = (args + [50, 3, 50][len(args) :])[:3]
+    asyncio.run(main(int(users), int(prompts), run_ms))
@@ -0,0 +1,163 @@
+"""Benchmark per-update dispatch overhead through the bot's handler stack.
+
+Runs updates through python-telegram-bot's dispatch and the security,
+auth and rate limit middleware, once into a no-op handler (dispatch
+overhead alone) and once into the real /pwd command handler, against an
+offline Bot API. Compares the current wiring (dependencies published
+once, one middleware pipeline) with the previous one, where three
+middleware groups and every handler wrapper re-copied all dependencies
+into ``bot_data`` on each update.
+
+Usage::
+
+    python -m tests.benchmarks.bench_dispatch [updates]
+"""
+
+import asyncio
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import structlog
+from telegram.ext import Application, CommandHandler, MessageHandler, filters
+
+from src.bot.core import ClaudeCodeBot
+from src.bot.handlers import command
+from src.bot.middleware.auth import auth_middleware
+from src.bot.middleware.rate_limit import rate_limit_middleware
+from src.bot.middleware.security import security_middleware
+from src.config import create_test_config
+from src.security.audit import AuditLogger, InMemoryAuditStorage
+from src.security.auth import AuthenticationManager, WhitelistAuthProvider
+from src.security.rate_limiter import RateLimiter
+from src.security.validators import SecurityValidator
+from tests.benchmarks.telegram_stub import build_application, make_update
+
+# Keep logging out of the measurement
+structlog.configure(
+    wrapper_class=structlog.make_filtering_bound_logger(logging.CRITICAL)
+)
+
+USERS = list(range(100, 110))
+
+
+def make_dependencies(approved: Path):
+    settings = create_test_config(
+        approved_directory=str(approved),
+        rate_limit_requests=1_000_000,
+        rate_limit_window=1,
+        rate_limit_burst=1_000_000,
+        claude_max_cost_per_user=1e9,
+    )
+    deps = {
+        "auth_manager": AuthenticationManager([WhitelistAuthProvider(USERS)]),
+        "security_validator": SecurityValidator(approved),
+        "rate_limiter": RateLimiter(settings),
+        "audit_logger": AuditLogger(InMemoryAuditStorage()),
+        "claude_integration": None,
+        "storage": None,
+        "features": None,
+    }
+    return settings, deps
+
+
+async def noop(update, context):
+    context.bot_data["settings"]
+
+
+def current_app(settings, deps, handler) -> Application:
+    """The bot's own wiring."""
+    bot = ClaudeCodeBot(settings, deps)
+    bot.app = build_application()
+    bot._publish_dependencies()
+    bot.app.add_handler(CommandHandler("pwd", handler))
+    bot._add_middleware()
+    return bot.app
+
+
+def legacy_app(settings, deps, handler) -> Application:
+    """Three middleware groups and per-update dependency injection."""
+    app = build_application()
+
+    def inject(context):
+        for key, value in deps.items():
+            context.bot_data[key] = value
+        context.bot_data["settings"] = settings
+
+    def inject_deps(handler):
+        async def wrapped(update, context):
+            inject(context)
+            return await handler(update, context)
+
+        return wrapped
+
+    def middleware_handler(middleware):
+        async def wrapper(update, context):
+            inject(context)
+
+            async def dummy_handler(event, data):
+                return None
+
+            data = dict(context.bot_data)
+            data["context"] = context
+            return await middleware(dummy_handler, update, data)
+
+        return wrapper
+
+    app.add_handler(CommandHandler("pwd", inject_deps(handler)))
+    for group, middleware in (
+        (-3, security_middleware),
+        (-2, auth_middleware),
+        (-1, rate_limit_middleware),
+    ):
+        app.add_handler(
+            MessageHandler(filters.ALL, middleware_handler(middleware)), group=group
+        )
+    return app
+
+
+async def run(name: str, app: Application, updates) -> float:
+    await app.initialize()
+    # Warm up: sessions, buckets and caches
+    for update in updates[: len(USERS)]:
+        await app.process_update(update)
+
+    start = time.perf_counter()
+    for update in updates:
+        await app.process_update(update)
+    elapsed = time.perf_counter() - start
+    await app.shutdown()
+
+    per_update = elapsed / len(updates) * 1e6
+    sent = app.bot.request.calls["sendMessage"]
+    print(
+        f"{name:<28} {per_update:8.1f} us/update  "
+        f"{len(updates) / elapsed:>9,.0f} updates/sec  ({sent:,} replies)"
+    )
+    return per_update
+
+
+async def main(count: int) -> None:
+    """Run dispatch benchmarks."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        approved = Path(tmp_dir)
+        for label, handler in (
+            ("no-op handler", noop),
+            ("/pwd handler", command.print_working_directory),
+        ):
+            results = {}
+            for name, factory in (("legacy", legacy_app), ("pipeline", current_app)):
+                settings, deps = make_dependencies(approved)
+                app = factory(settings, deps, handler)
+                updates = [
+                    make_update(app.bot, i, USERS[i % len(USERS)], "/pwd")
+                    for i in range(count)
+                ]
+                results[name] = await run(f"{label}, {name}", app, updates)
+            print(f"{'':<28} {results['legacy'] / results['pipeline']:8.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000))
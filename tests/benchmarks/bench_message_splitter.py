@@ -0,0 +1,55 @@
+"""Benchmark message splitting on large outputs with many code blocks.
+
+Usage::
+
+    python -m tests.benchmarks.bench_message_splitter [size_mb]
+"""
+
+import sys
+import time
+
+from src.claude.parser import ResponseFormatter
+from src.utils.message_splitter import split_message
+
+
+def build_output(size: int) -> str:
+    """Build Claude-like output mixing prose, code blocks and long lines."""
+    block = (
+        "Here is the updated implementation:\n\n"
+        "```python\n"
+        + "\n".join(f"def handler_{i}(x):\n    return x * {i}" for i in range(40))
+        + "\n```\n\n"
+        "And a long log line: " + "x" * 5000 + "\n\n"
+    )
+    return (block * (size // len(block) + 1))[:size]
+
+
+def bench(name: str, func, text: str, rounds: int = 3) -> None:
+    """Time a splitter and print throughput."""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        chunks = func(text)
+        best = min(best, time.perf_counter() - start)
+
+    mb = len(text) / (1024 * 1024)
+    print(
+        f"{name:<32} {best * 1000:8.1f} ms  {mb / best:8.1f} MB/s  {len(chunks)} chunks"
+    )
+
+
+def main(size_mb: float) -> None:
+    """Run splitter benchmarks."""
+    text = build_output(int(size_mb * 1024 * 1024))
+    print(f"input: {len(text):,} chars, {text.count('```')} fences")
+
+    bench("split_message(4000)", lambda t: split_message(t, 4000), text)
+    bench(
+        "ResponseFormatter.format_response",
+        ResponseFormatter(4000).format_response,
+        text,
+    )
+
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 1.0)
@@ -0,0 +1,106 @@
+"""Benchmark rate limit backends across worker processes.
+
+Every worker opens its own backend on one shared SQLite file and runs
+checks round-robin over the same users, the way several bot processes
+behind a load balancer would. The in-memory backend is measured in a
+single process for comparison.
+
+Usage::
+
+    python -m tests.benchmarks.bench_rate_limit_backends [workers] [checks] [users]
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import structlog
+
+from src.security.rate_limit_sqlite import SQLiteRateLimitBackend
+from src.security.rate_limiter import InMemoryRateLimitBackend
+
+# Keep logging out of the measurement
+structlog.configure(
+    wrapper_class=structlog.make_filtering_bound_logger(logging.CRITICAL)
+)
+
+LIMITS = dict(capacity=1_000_000, refill_rate=1000.0, max_cost=1e9)
+
+
+async def run_checks(backend, checks: int, users: int, offset: int = 0) -> int:
+    """Run checks round-robin over users; returns the number allowed."""
+    allowed = 0
+    for i in range(checks):
+        decision = await backend.acquire((i + offset) % users, 1, 0.001)
+        allowed += decision.allowed
+    return allowed
+
+
+def sqlite_worker(path: str, checks: int, users: int, offset: int, start, results):
+    """Worker process body: wait for the start signal, then check."""
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(logging.CRITICAL)
+    )
+    backend = SQLiteRateLimitBackend(path=path, **LIMITS)
+    start.wait()
+    allowed = asyncio.run(run_checks(backend, checks, users, offset))
+    results.put(allowed)
+
+
+def bench_sqlite(workers: int, checks: int, users: int) -> None:
+    """Measure aggregate checks/sec for N processes on one file."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = str(Path(tmp_dir) / "rate_limits.db")
+        SQLiteRateLimitBackend(path=path, **LIMITS)  # create the schema once
+
+        start = multiprocessing.Event()
+        results = multiprocessing.Queue()
+        processes = [
+            multiprocessing.Process(
+                target=sqlite_worker,
+                args=(path, checks, users, n * 7919, start, results),
+            )
+            for n in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        time.sleep(0.5)  # let every worker open its connection
+
+        began = time.perf_counter()
+        start.set()
+        allowed = sum(results.get() for _ in processes)
+        elapsed = time.perf_counter() - began
+        for process in processes:
+            process.join()
+
+    total = workers * checks
+    print(
+        f"sqlite x{workers:<3} {total:>9,} checks  {elapsed:7.3f}s  "
+        f"{total / elapsed:>10,.0f} checks/sec  ({allowed:,} allowed)"
+    )
+
+
+def bench_memory(checks: int, users: int) -> None:
+    """Measure single-process checks/sec for the in-memory backend."""
+    backend = InMemoryRateLimitBackend(**LIMITS)
+    began = time.perf_counter()
+    allowed = asyncio.run(run_checks(backend, checks, users))
+    elapsed = time.perf_counter() - began
+    print(
+        f"memory x1   {checks:>9,} checks  {elapsed:7.3f}s  "
+        f"{checks / elapsed:>10,.0f} checks/sec  ({allowed:,} allowed)"
+    )
+
+
+if __name__ == "__main__":
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    checks = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+    users = int(sys.argv[3]) if len(sys.argv) > 3 else 1_000
+
+    bench_memory(checks, users)
+    for n in sorted({1, 2, workers}):
+        bench_sqlite(n, checks, users)
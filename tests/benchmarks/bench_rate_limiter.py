@@ -0,0 +1,54 @@
+"""Benchmark RateLimiter checks across many users.
+
+Usage::
+
+    python -m tests.benchmarks.bench_rate_limiter [users] [checks]
+"""
+
+import asyncio
+import logging
+import sys
+import time
+
+import structlog
+
+from src.config import create_test_config
+from src.security.rate_limiter import RateLimiter
+
+# Keep logging out of the measurement
+structlog.configure(
+    wrapper_class=structlog.make_filtering_bound_logger(logging.CRITICAL)
+)
+
+
+async def run(users: int, checks: int) -> None:
+    """Run checks round-robin over users and print checks/sec."""
+    config = create_test_config(
+        rate_limit_requests=1000,
+        rate_limit_window=1,
+        rate_limit_burst=1000,
+        claude_max_cost_per_user=1e9,
+    )
+    limiter = RateLimiter(config)
+
+    # Warm up: create every bucket
+    for user_id in range(users):
+        await limiter.check_rate_limit(user_id, cost=0.0)
+
+    allowed = 0
+    start = time.perf_counter()
+    for i in range(checks):
+        ok, _ = await limiter.check_rate_limit(i % users, cost=0.001)
+        allowed += ok
+    elapsed = time.perf_counter() - start
+
+    print(f"users:       {users:,}")
+    print(f"checks:      {checks:,} ({allowed:,} allowed)")
+    print(f"elapsed:     {elapsed:.3f}s")
+    print(f"checks/sec:  {checks / elapsed:,.0f}")
+
+
+if __name__ == "__main__":
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    checks = int(sys.argv[2]) if len(sys.argv) > 2 else 200_000
+    asyncio.run(run(users, checks))
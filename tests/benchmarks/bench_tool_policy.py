@@ -0,0 +1,58 @@
+"""Benchmark ToolMonitor validation throughput.
+
+Usage::
+
+    python -m tests.benchmarks.bench_tool_policy [iterations]
+"""
+
+import asyncio
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import structlog
+
+from src.claude.monitor import ToolMonitor
+from src.config import create_test_config
+from src.security.validators import SecurityValidator
+
+CALLS = [
+    ("Read", {"file_path": "src/main.py"}),
+    ("Edit", {"file_path": "src/app/models.py"}),
+    ("Bash", {"command": "python -m pytest -q tests/unit"}),
+    ("Bash", {"command": "git status && git diff"}),
+    ("Glob", {"pattern": "**/*.py"}),
+    ("Unknown", {}),
+]
+
+
+# Keep logging out of the measurement
+structlog.configure(
+    wrapper_class=structlog.make_filtering_bound_logger(logging.CRITICAL)
+)
+
+
+async def run(iterations: int) -> None:
+    """Run validations and print validations/sec."""
+    with tempfile.TemporaryDirectory() as tmp:
+        approved = Path(tmp)
+        (approved / "src" / "app").mkdir(parents=True)
+        config = create_test_config(approved_directory=str(approved))
+        monitor = ToolMonitor(config, SecurityValidator(approved))
+
+        start = time.perf_counter()
+        for i in range(iterations):
+            tool_name, tool_input = CALLS[i % len(CALLS)]
+            await monitor.validate_tool_call(tool_name, tool_input, approved, 1)
+        elapsed = time.perf_counter() - start
+
+        print(f"validations:      {iterations}")
+        print(f"elapsed:          {elapsed:.3f}s")
+        print(f"validations/sec:  {iterations / elapsed:,.0f}")
+        print(f"policy:           {monitor.policy.get_stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(run(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000))
@@ -0,0 +1,142 @@
+"""Benchmark SecurityValidator pattern checks on a realistic corpus.
+
+Compares the compiled single-pass scanners with the previous approach of
+calling ``re.search`` for every pattern, and checks both give the same
+verdict on every input. Also times ``validate_path`` with and without the
+resolved-path cache.
+
+Usage::
+
+    python -m tests.benchmarks.bench_validators [corpus_size]
+"""
+
+import logging
+import random
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import structlog
+
+from src.security.validators import SecurityValidator
+
+# Keep logging out of the measurement
+structlog.configure(
+    wrapper_class=structlog.make_filtering_bound_logger(logging.CRITICAL)
+)
+
+DIRS = ["src", "tests", "docs", "lib", "app/models", "packages/core/src", "scripts"]
+STEMS = ["main", "utils", "config", "handler", "index", "README", "test_api", "setup"]
+EXTS = [".py", ".ts", ".md", ".json", ".yaml", ".go", ".rs", ".pem", ".exe", ".txt"]
+ATTACKS = ["../../etc/passwd", "~/.ssh/id_rsa", "$(whoami)", "a; rm -rf /", "x|nc"]
+
+
+def build_corpus(size: int, seed: int = 7):
+    """Mostly benign paths and filenames with a few attacks mixed in."""
+    rng = random.Random(seed)
+    paths, filenames = [], []
+    for i in range(size):
+        name = f"{rng.choice(STEMS)}_{i % 97}{rng.choice(EXTS)}"
+        filenames.append(name)
+        if i % 50 == 0:
+            paths.append(rng.choice(ATTACKS))
+        else:
+            depth = rng.randint(1, 4)
+            paths.append("/".join(rng.choice(DIRS) for _ in range(depth)) + "/" + name)
+    return paths, filenames
+
+
+def legacy_dangerous(text: str) -> bool:
+    """The per-pattern loop the validator used to run."""
+    return any(
+        re.search(pattern, text, re.IGNORECASE)
+        for pattern in SecurityValidator.DANGEROUS_PATTERNS
+    )
+
+
+def legacy_dangerous_file(name: str) -> bool:
+    return any(
+        re.match(pattern, name, re.IGNORECASE)
+        for pattern in SecurityValidator.DANGEROUS_FILE_PATTERNS
+    )
+
+
+def bench(name: str, func, items, rounds: int = 5) -> float:
+    """Best wall time per item in microseconds."""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for item in items:
+            func(item)
+        best = min(best, time.perf_counter() - start)
+    per_item = best / len(items) * 1e6
+    print(f"{name:<36} {per_item:8.2f} us/item  {len(items) / best:>12,.0f} items/sec")
+    return per_item
+
+
+def main(size: int) -> None:
+    """Run validator benchmarks."""
+    paths, filenames = build_corpus(size)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        validator = SecurityValidator(Path(tmp_dir))
+
+        dangerous = SecurityValidator._DANGEROUS
+        dangerous_files = SecurityValidator._DANGEROUS_FILES
+        for text in paths + filenames:
+            assert legacy_dangerous(text) == (dangerous.search(text) is not None)
+        for name in filenames:
+            assert legacy_dangerous_file(name) == (
+                dangerous_files.match(name) is not None
+            )
+        print(
+            f"corpus: {len(paths):,} paths, {len(filenames):,} filenames "
+            "(verdicts match)"
+        )
+
+        old = bench("dangerous patterns, per-pattern loop", legacy_dangerous, paths)
+        new = bench("dangerous patterns, compiled", dangerous.search, paths)
+        print(f"{'':<36} {old / new:8.1f}x")
+        old = bench("file patterns, per-pattern loop", legacy_dangerous_file, filenames)
+        new = bench("file patterns, compiled", dangerous_files.match, filenames)
+        print(f"{'':<36} {old / new:8.1f}x")
+
+        bench("validate_filename", validator.validate_filename, filenames)
+        bench("is_safe_directory_name", validator.is_safe_directory_name, filenames)
+        bench(
+            "validate_command_args",
+            lambda p: validator.validate_command_args([p]),
+            paths,
+        )
+        uncached = SecurityValidator(Path(tmp_dir), path_cache_size=0)
+        bench("validate_path, no cache", uncached.validate_path, paths)
+
+        # Repeated lookups of files that exist, as in a working session
+        root = Path(tmp_dir).resolve()
+        existing = []
+        for directory in DIRS:
+            (root / directory).mkdir(parents=True, exist_ok=True)
+            for stem in STEMS:
+                (root / directory / f"{stem}.py").write_text("")
+                existing.append(f"{directory}/{stem}.py")
+        session = [existing[i % len(existing)] for i in range(size)]
+        old = bench(
+            "validate_path existing, no cache",
+            lambda p: uncached.validate_path(p, root),
+            session,
+        )
+        new = bench(
+            "validate_path existing, cached",
+            lambda p: validator.validate_path(p, root),
+            session,
+        )
+        stats = validator.path_cache.get_stats()
+        print(
+            f"{'':<36} {old / new:8.1f}x  hit rate {stats['hit_rate']:.1%}, "
+            f"{stats['syscalls_saved']:,} syscalls saved"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
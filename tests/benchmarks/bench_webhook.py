@@ -0,0 +1,179 @@
+"""Load test for the webhook server.
+
+Concurrent keep-alive connections POST synthetic updates the way
+Telegram delivers them (up to ``WEBHOOK_MAX_CONNECTIONS`` connections,
+next update once the previous one is acknowledged). Updates go through a
+real Application with the bot's middleware pipeline into a handler that
+replies through an offline Bot API. A second run uses a small queue and
+a slow handler to show deliveries being pushed back with 503s, and
+retried until every update is processed.
+
+Usage::
+
+    python -m tests.benchmarks.bench_webhook [updates] [connections]
+"""
+
+import asyncio
+import json
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import structlog
+from telegram.ext import MessageHandler, filters
+
+from src.bot.core import ClaudeCodeBot
+from src.bot.webhook import SECRET_HEADER, WebhookServer
+from src.config import create_test_config
+from src.security.audit import AuditLogger, InMemoryAuditStorage
+from src.security.auth import AuthenticationManager, WhitelistAuthProvider
+from src.security.rate_limiter import RateLimiter
+from src.security.validators import SecurityValidator
+from src.utils.histogram import LatencyHistogram
+from tests.benchmarks.telegram_stub import build_application
+
+# Keep logging out of the measurement
+structlog.configure(
+    wrapper_class=structlog.make_filtering_bound_logger(logging.CRITICAL)
+)
+
+USERS = list(range(100, 200))
+SECRET = "bench-secret"
+
+
+def update_body(update_id: int) -> bytes:
+    user_id = USERS[update_id % len(USERS)]
+    return json.dumps(
+        {
+            "update_id": update_id,
+            "message": {
+                "message_id": update_id,
+                "date": 0,
+                "chat": {"id": user_id, "type": "private"},
+                "from": {"id": user_id, "is_bot": False, "first_name": "user"},
+                "text": f"prompt {update_id}",
+            },
+        }
+    ).encode()
+
+
+async def run(
+    approved: Path,
+    count: int,
+    connections: int,
+    max_queue: int,
+    handler_delay: float,
+) -> None:
+    settings = create_test_config(
+        approved_directory=str(approved),
+        rate_limit_requests=1_000_000,
+        rate_limit_window=1,
+        rate_limit_burst=1_000_000,
+        claude_max_cost_per_user=1e9,
+    )
+    deps = {
+        "auth_manager": AuthenticationManager([WhitelistAuthProvider(USERS)]),
+        "security_validator": SecurityValidator(approved),
+        "rate_limiter": RateLimiter(settings),
+        "audit_logger": AuditLogger(InMemoryAuditStorage()),
+    }
+    bot = ClaudeCodeBot(settings, deps)
+    bot.app = app = build_application(concurrent_updates=True)
+    bot._publish_dependencies()
+    bot._add_middleware()
+
+    handled = 0
+    done = asyncio.Event()
+
+    async def handler(update, context):
+        nonlocal handled
+        if handler_delay:
+            await asyncio.sleep(handler_delay)
+        await update.message.reply_text("ok")
+        handled += 1
+        if handled == count:
+            done.set()
+
+    app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handler), group=10)
+
+    server = WebhookServer(
+        app,
+        path="/webhook",
+        secret_token=SECRET,
+        host="127.0.0.1",
+        port=0,
+        max_queue=max_queue,
+        queue_timeout=0.05,
+    )
+    await app.initialize()
+    await app.start()
+    await server.start()
+
+    next_id = iter(range(count))
+    latencies = LatencyHistogram()
+    retries = 0
+
+    async def client() -> None:
+        """One Telegram connection: deliver, wait for the answer, repeat."""
+        nonlocal retries
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        for update_id in next_id:
+            body = update_body(update_id)
+            request = (
+                f"POST /webhook HTTP/1.1\r\nHost: bench\r\n"
+                f"{SECRET_HEADER}: {SECRET}\r\nContent-Length: {len(body)}\r\n\r\n"
+            ).encode() + body
+            while True:
+                started = time.perf_counter()
+                writer.write(request)
+                head = await reader.readuntil(b"\r\n\r\n")
+                latencies.observe(time.perf_counter() - started)
+                if head.startswith(b"HTTP/1.1 200"):
+                    break
+                retries += 1
+                await asyncio.sleep(0.1)
+        writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(connections)))
+    delivered = time.perf_counter() - start
+    await done.wait()
+    processed = time.perf_counter() - start
+
+    await server.stop()
+    await app.stop()
+    await app.shutdown()
+
+    stats = server.get_stats()
+    snapshot = latencies.snapshot()
+    print(
+        f"  delivered {count:,} in {delivered:.2f} s ({count / delivered:,.0f} req/s), "
+        f"all processed after {processed:.2f} s"
+    )
+    print(
+        f"  request latency p50 {snapshot['p50_ms']:.1f} ms  "
+        f"p99 {snapshot['p99_ms']:.1f} ms  max {snapshot['max_ms']:.1f} ms"
+    )
+    print(
+        f"  connections {stats['connections']}, max in flight "
+        f"{stats['max_in_flight']}/{max_queue}, rejected {stats['rejected']}, "
+        f"retries {retries}, replies {app.bot.request.calls['sendMessage']:,}"
+    )
+
+
+async def main(count: int, connections: int) -> None:
+    """Run the load test."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        approved = Path(tmp_dir)
+        print(f"{connections} connections, fast handler, queue 1000")
+        await run(approved, count, connections, max_queue=1000, handler_delay=0)
+        print(f"{connections} connections, 200 ms handler, queue 20")
+        await run(approved, count // 10, connections, max_queue=20, handler_delay=0.2)
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    count, connections = (args + [5_000, 40][len(args) :])[:2]
+    asyncio.run(main(count, connections))
@@ -0,0 +1,93 @@
+"""Offline Bot API for benchmarks that drive a real Application.
+
+``OfflineRequest`` answers every Bot API call locally (optionally after a
+simulated network delay), so updates can go through python-telegram-bot's
+dispatch, the bot's middleware and its handlers without a network.
+"""
+
+import asyncio
+import json
+from collections import Counter
+from typing import Any, Dict, Optional, Tuple
+
+from telegram import Bot, Update
+from telegram.ext import Application
+from telegram.request import BaseRequest
+
+BOT_USER = {"id": 1, "is_bot": True, "first_name": "Bench", "username": "bench_bot"}
+
+
+class OfflineRequest(BaseRequest):
+    """Replies ``ok`` to every call; messages sent get a fake Message back."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls: Counter = Counter()
+        self._message_id = 0
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
+
+    @property
+    def read_timeout(self) -> Optional[float]:
+        return None
+
+    async def do_request(
+        self, url: str, method: str, request_data=None, *args, **kwargs
+    ) -> Tuple[int, bytes]:
+        api_method = url.rsplit("/", 1)[-1]
+        self.calls[api_method] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        params: Dict[str, Any] = request_data.parameters if request_data else {}
+        result: Any = True
+        if api_method == "getMe":
+            result = BOT_USER
+        elif api_method.startswith("send") or api_method == "editMessageText":
+            self._message_id += 1
+            result = {
+                "message_id": params.get("message_id", self._message_id),
+                "date": 0,
+                "chat": {"id": params.get("chat_id", 1), "type": "private"},
+                "from": BOT_USER,
+                "text": params.get("text", ""),
+            }
+        return 200, json.dumps({"ok": True, "result": result}).encode()
+
+
+def build_application(latency: float = 0.0, **builder_options: Any) -> Application:
+    """Application whose bot talks to an ``OfflineRequest``."""
+    builder = Application.builder().token("1:offline")
+    builder.request(OfflineRequest(latency))
+    builder.get_updates_request(OfflineRequest())
+    for option, value in builder_options.items():
+        getattr(builder, option)(value)
+    return builder.build()
+
+
+def make_update(bot: Bot, update_id: int, user_id: int, text: str) -> Update:
+    """A private-chat text message from ``user_id``."""
+    user = {"id": user_id, "is_bot": False, "first_name": f"user{user_id}"}
+    entities = []
+    if text.startswith("/"):
+        entities = [
+            {"type": "bot_command", "offset": 0, "length": len(text.split()[0])}
+        ]
+    return Update.de_json(
+        {
+            "update_id": update_id,
+            "message": {
+                "message_id": update_id,
+                "date": 0,
+                "chat": {"id": user_id, "type": "private"},
+                "from": user,
+                "text": text,
+                "entities": entities,
+            },
+        },
+        bot,
+    )
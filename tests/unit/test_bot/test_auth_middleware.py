@@ -0,0 +1,71 @@
+"""Test the authentication middleware fast path."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.bot.middleware.auth import auth_middleware
+from src.security.auth import AuthenticationManager, WhitelistAuthProvider
+
+
+def make_update(user_id=1):
+    message = SimpleNamespace(text="hello", reply_text=AsyncMock())
+    return SimpleNamespace(
+        effective_user=SimpleNamespace(id=user_id, username="user"),
+        effective_message=message,
+    )
+
+
+class TestAuthMiddleware:
+    """Test cached per-user decisions in the middleware."""
+
+    @pytest.fixture
+    def auth_manager(self):
+        return AuthenticationManager([WhitelistAuthProvider([1])])
+
+    async def test_allowed_user_skips_providers(self, auth_manager):
+        """Test that later updates are let through from the cache."""
+        handler = AsyncMock()
+        data = {"auth_manager": auth_manager}
+
+        for _ in range(5):
+            await auth_middleware(handler, make_update(), data)
+
+        assert handler.await_count == 5
+        stats = auth_manager.get_decision_stats()
+        assert stats["provider_calls"] == 1
+        assert stats["hits"] == 4
+
+    async def test_denied_user_skips_providers(self, auth_manager):
+        """Test that a rejected user is turned away without a provider call."""
+        handler = AsyncMock()
+        audit_logger = AsyncMock()
+        data = {"auth_manager": auth_manager, "audit_logger": audit_logger}
+
+        updates = [make_update(user_id=2) for _ in range(3)]
+        for update in updates:
+            await auth_middleware(handler, update, data)
+
+        handler.assert_not_called()
+        assert auth_manager.get_decision_stats()["provider_calls"] == 1
+        # Only the first denial is audited and answered
+        assert audit_logger.log_auth_attempt.await_count == 1
+        updates[0].effective_message.reply_text.assert_awaited_once()
+        for update in updates[1:]:
+            update.effective_message.reply_text.assert_not_called()
+
+    async def test_ended_session_rechecked(self, auth_manager):
+        """Test that ending a session sends the next update to the providers."""
+        handler = AsyncMock()
+        data = {"auth_manager": auth_manager}
+        await auth_middleware(handler, make_update(), data)
+
+        auth_manager.end_session(1)
+        update = make_update()
+        await auth_middleware(handler, update, data)
+
+        assert auth_manager.get_decision_stats()["provider_calls"] == 2
+        # A new session was started and announced
+        update.effective_message.reply_text.assert_awaited_once()
+        assert handler.await_count == 2
@@ -0,0 +1,143 @@
+"""Test the composed middleware pipeline."""
+
+import asyncio
+from types import MappingProxyType, SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from telegram.ext import ApplicationHandlerStop
+
+from src.bot.core import ClaudeCodeBot
+from src.bot.middleware.pipeline import MiddlewarePipeline
+from src.config import create_test_config
+
+
+def passing(calls, name):
+    async def middleware(handler, event, data):
+        calls.append(name)
+        return await handler(event, data)
+
+    return middleware
+
+
+def rejecting(calls, name):
+    async def middleware(handler, event, data):
+        calls.append(name)
+
+    return middleware
+
+
+class TestMiddlewarePipeline:
+    """Test chaining, short-circuiting and stats."""
+
+    async def test_runs_stages_in_order(self):
+        """Test every stage runs once and the update passes."""
+        calls = []
+        pipeline = MiddlewarePipeline(
+            [(name, passing(calls, name)) for name in ("security", "auth", "rate")]
+        )
+
+        assert await pipeline.run(SimpleNamespace(), {}) is True
+        assert calls == ["security", "auth", "rate"]
+
+    async def test_rejection_short_circuits(self):
+        """Test later stages don't run after a rejection."""
+        calls = []
+        pipeline = MiddlewarePipeline(
+            [
+                ("security", passing(calls, "security")),
+                ("auth", rejecting(calls, "auth")),
+                ("rate", passing(calls, "rate")),
+            ]
+        )
+
+        assert await pipeline.run(SimpleNamespace(), {}) is False
+        assert calls == ["security", "auth"]
+
+        stats = pipeline.get_stats()
+        assert stats["updates"] == 1
+        assert stats["passed"] == 0
+        assert stats["rejected"] == {"security": 0, "auth": 1, "rate": 0}
+        assert stats["stages"]["rate"]["count"] == 0
+        assert stats["stages"]["security"]["count"] == 1
+
+    async def test_stage_timing_excludes_later_stages(self):
+        """Test a stage isn't charged for the stages after it."""
+
+        async def slow(handler, event, data):
+            await asyncio.sleep(0.05)
+            return await handler(event, data)
+
+        calls = []
+        pipeline = MiddlewarePipeline(
+            [("fast", passing(calls, "fast")), ("slow", slow)]
+        )
+        await pipeline.run(SimpleNamespace(), {})
+
+        assert pipeline.histograms["fast"].max < 0.02
+        assert pipeline.histograms["slow"].max >= 0.04
+        assert pipeline.total.max >= 0.04
+
+
+class TestBotMiddlewareHandler:
+    """Test the pipeline's handler in the bot."""
+
+    @pytest.fixture
+    def bot(self, tmp_path):
+        bot = ClaudeCodeBot(create_test_config(approved_directory=str(tmp_path)), {})
+        bot.dependencies = MappingProxyType({"auth_manager": object()})
+        return bot
+
+    def make_context(self):
+        return SimpleNamespace(bot_data={})
+
+    async def test_rejected_update_stops_handlers(self, bot):
+        """Test a rejection stops the remaining handler groups."""
+        bot.middleware = MiddlewarePipeline([("auth", rejecting([], "auth"))])
+
+        with pytest.raises(ApplicationHandlerStop):
+            await bot._run_middleware(SimpleNamespace(), self.make_context())
+
+    async def test_passed_update_continues(self, bot):
+        """Test middleware sees the dependencies and this update's context."""
+        seen = []
+
+        async def check(handler, event, data):
+            seen.append(data)
+            return await handler(event, data)
+
+        bot.middleware = MiddlewarePipeline([("check", check)])
+        context = self.make_context()
+
+        await bot._run_middleware(SimpleNamespace(), context)
+
+        assert seen[0]["context"] is context
+        assert "auth_manager" in seen[0]
+
+    async def test_middleware_error_fails_closed(self, bot):
+        """Test an exception in a stage stops the update."""
+        bot.middleware = MiddlewarePipeline(
+            [("broken", AsyncMock(side_effect=RuntimeError("boom")))]
+        )
+
+        with pytest.raises(ApplicationHandlerStop):
+            await bot._run_middleware(SimpleNamespace(), self.make_context())
+
+
+class TestDependencyPublishing:
+    """Test dependencies are published to bot_data once."""
+
+    def test_published_read_only(self, tmp_path):
+        """Test bot_data gets every dependency and the frozen container."""
+        settings = create_test_config(approved_directory=str(tmp_path))
+        auth_manager = object()
+        bot = ClaudeCodeBot(settings, {"auth_manager": auth_manager})
+        bot.app = SimpleNamespace(bot_data={})
+
+        bot._publish_dependencies()
+
+        assert bot.app.bot_data["auth_manager"] is auth_manager
+        assert bot.app.bot_data["settings"] is settings
+        assert bot.app.bot_data["dependencies"]["auth_manager"] is auth_manager
+        with pytest.raises(TypeError):
+            bot.dependencies["auth_manager"] = None
@@ -0,0 +1,138 @@
+"""Test the throttled progress message editor."""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from telegram.error import BadRequest, RetryAfter
+
+from src.bot.utils.progress_editor import ProgressEditor
+
+
+@pytest.fixture
+def message():
+    message = Mock()
+    message.edit_text = AsyncMock()
+    return message
+
+
+def sent(message):
+    return [call.args[0] for call in message.edit_text.await_args_list]
+
+
+class TestProgressEditor:
+    """Test coalescing, throttling, flood control and flushing."""
+
+    async def test_coalesces_updates(self, message):
+        """Test a burst of updates becomes one edit with the latest text."""
+        editor = ProgressEditor(message, interval_ms=50)
+        for n in range(5):
+            editor.update(f"step {n}")
+        await asyncio.sleep(0.01)
+
+        assert sent(message) == ["step 4"]
+        message.edit_text.assert_awaited_with("step 4", parse_mode="Markdown")
+        assert editor.get_stats()["coalesced"] == 4
+        await editor.close()
+
+    async def test_throttles_edits(self, message):
+        """Test edits are spaced by the interval and repeats are skipped."""
+        loop = asyncio.get_running_loop()
+        times = []
+        message.edit_text.side_effect = lambda *args, **kwargs: times.append(
+            loop.time()
+        )
+        editor = ProgressEditor(message, interval_ms=100)
+
+        editor.update("a")
+        await asyncio.sleep(0.01)
+        editor.update("a")
+        editor.update("b")
+        await asyncio.sleep(0.15)
+        await editor.close()
+
+        assert sent(message) == ["a", "b"]
+        assert times[1] - times[0] >= 0.09
+
+    async def test_update_does_not_wait_for_network(self, message):
+        """Test a slow edit does not block the caller."""
+        release = asyncio.Event()
+
+        async def edit_text(text, **kwargs):
+            await release.wait()
+
+        message.edit_text.side_effect = edit_text
+        editor = ProgressEditor(message, interval_ms=100)
+
+        editor.update("a")
+        await asyncio.sleep(0)
+        editor.update("b")  # Returns while "a" is still being sent
+
+        release.set()
+        await editor.close()
+        assert sent(message) == ["a", "b"]
+
+    async def test_honours_retry_after(self, message):
+        """Test flood control delays the next edit, which sends the latest."""
+        loop = asyncio.get_running_loop()
+        times = []
+
+        async def edit_text(text, **kwargs):
+            times.append(loop.time())
+            if len(times) == 1:
+                raise RetryAfter(0.2)
+
+        message.edit_text.side_effect = edit_text
+        editor = ProgressEditor(message, interval_ms=100)
+
+        editor.update("a")
+        await asyncio.sleep(0.01)
+        editor.update("b")
+        await asyncio.sleep(0.3)
+
+        assert sent(message) == ["a", "b"]
+        assert times[1] - times[0] >= 0.19
+        assert editor.get_stats()["throttled"] == 1
+        await editor.close()
+
+    async def test_close_flushes_final_state(self, message):
+        """Test close sends the latest text without waiting the interval."""
+        editor = ProgressEditor(message, interval_ms=10_000)
+        editor.update("a")
+        await asyncio.sleep(0.01)
+        editor.update("done")
+
+        await asyncio.wait_for(editor.close(), 1)
+
+        assert sent(message) == ["a", "done"]
+        editor.update("late")
+        await asyncio.sleep(0.01)
+        assert sent(message) == ["a", "done"]
+
+    async def test_close_without_flush(self, message):
+        """Test pending text is discarded when not flushing."""
+        editor = ProgressEditor(message, interval_ms=10_000)
+        editor.update("a")
+        await asyncio.sleep(0.01)
+        editor.update("b")
+
+        await asyncio.wait_for(editor.close(flush=False), 1)
+
+        assert sent(message) == ["a"]
+
+    async def test_edit_failures(self, message):
+        """Test failed edits are counted and don't stop later ones."""
+        message.edit_text.side_effect = [
+            BadRequest("Message is not modified"),
+            BadRequest("Can't parse entities"),
+            None,
+        ]
+        editor = ProgressEditor(message, interval_ms=0)
+
+        for text in ("a", "b", "c"):
+            editor.update(text)
+            await asyncio.sleep(0.01)
+        await editor.close()
+
+        assert sent(message) == ["a", "b", "c"]
+        assert editor.get_stats()["failed"] == 1
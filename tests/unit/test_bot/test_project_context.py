@@ -0,0 +1,139 @@
+"""Test project context prefetching."""
+
+import os
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.bot.features.file_handler import FileHandler
+from src.bot.features.project_context import ProjectContextPrefetcher
+from src.claude.facade import ClaudeIntegration
+from src.config import create_test_config
+
+
+@pytest.fixture
+def project(tmp_path):
+    """Small project inside the approved directory."""
+    root = tmp_path / "proj"
+    (root / "src").mkdir(parents=True)
+    (root / "src" / "main.py").write_text("print('hi')\n")
+    (root / "node_modules").mkdir()
+    (root / "README.md").write_text("# Project\n")
+    return root
+
+
+@pytest.fixture
+def config(tmp_path):
+    """Test configuration rooted at tmp_path."""
+    return create_test_config(approved_directory=str(tmp_path))
+
+
+@pytest.fixture
+def prefetcher(config):
+    """Prefetcher with a real file handler and no git."""
+    return ProjectContextPrefetcher(
+        config=config, file_handler=FileHandler(config=config, security=None)
+    )
+
+
+class TestProjectContextPrefetcher:
+    """Test digest building and caching."""
+
+    async def test_build_digest(self, prefetcher, project):
+        """Test digest lists languages, entry points and tree."""
+        digest = await prefetcher.build_digest(project)
+
+        assert "Directory: proj/" in digest
+        assert "Python (1)" in digest
+        assert "src/main.py" in digest
+        assert "src/ (1 entries)" in digest
+        assert "node_modules" not in digest
+
+    async def test_prefetch_populates_cache(self, prefetcher, project):
+        """Test digest is available after the background build."""
+        assert prefetcher.get_digest(project) is None
+
+        task = prefetcher.prefetch(project)
+        await task
+
+        assert "Python" in prefetcher.get_digest(project)
+        assert prefetcher.prefetch(project) is None  # Fresh, nothing to do
+        assert prefetcher.get_stats()["hits"] == 1
+
+    async def test_prefetch_deduplicates_in_flight(self, prefetcher, project):
+        """Test concurrent prefetches share one build."""
+        first = prefetcher.prefetch(project)
+        second = prefetcher.prefetch(project)
+
+        assert first is second
+        await first
+
+    async def test_digest_invalidated_on_change(self, prefetcher, project):
+        """Test digest is stale once the directory mtime changes."""
+        await prefetcher.prefetch(project)
+
+        (project / "new.py").write_text("")
+        stat = project.stat()
+        os.utime(project, (stat.st_atime, stat.st_mtime + 10))
+
+        assert prefetcher.get_digest(project) is None
+
+    async def test_digest_expires(self, config, project):
+        """Test a digest is rebuilt after max_age even if nothing changed."""
+        prefetcher = ProjectContextPrefetcher(config=config, max_age=0.0)
+        await prefetcher.prefetch(project)
+
+        assert prefetcher.get_digest(project) is None
+        rebuild = prefetcher.prefetch(project)
+        assert rebuild is not None
+        await rebuild
+
+    async def test_digest_truncated(self, config, project):
+        """Test digest respects the character budget."""
+        prefetcher = ProjectContextPrefetcher(config=config, max_chars=60)
+
+        digest = await prefetcher.build_digest(project)
+
+        assert len(digest) <= 64
+        assert digest.endswith("...")
+
+
+class TestContextProviderIntegration:
+    """Test digest is prepended to new sessions."""
+
+    def _integration(self, config, is_new_session):
+        session = MagicMock(session_id="s1", is_new_session=is_new_session)
+        session_manager = MagicMock()
+        session_manager.get_or_create_session = AsyncMock(return_value=session)
+        session_manager.update_session = AsyncMock()
+
+        integration = ClaudeIntegration(
+            config,
+            process_manager=MagicMock(),
+            session_manager=session_manager,
+            tool_monitor=MagicMock(),
+            context_provider=lambda path: "DIGEST",
+        )
+        integration._execute_with_fallback = AsyncMock(
+            return_value=MagicMock(session_id="s1", content="ok", cost=0.0)
+        )
+        return integration
+
+    async def test_prepends_digest_for_new_session(self, config):
+        """Test new sessions receive the digest."""
+        integration = self._integration(config, is_new_session=True)
+
+        await integration.run_command("do it", Path("/tmp"), 1)
+
+        prompt = integration._execute_with_fallback.call_args.kwargs["prompt"]
+        assert prompt == "DIGEST\n\ndo it"
+
+    async def test_skips_digest_for_existing_session(self, config):
+        """Test continuing sessions are left alone."""
+        integration = self._integration(config, is_new_session=False)
+
+        await integration.run_command("do it", Path("/tmp"), 1, session_id="s1")
+
+        prompt = integration._execute_with_fallback.call_args.kwargs["prompt"]
+        assert prompt == "do it"
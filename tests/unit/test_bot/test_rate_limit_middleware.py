@@ -0,0 +1,148 @@
+"""Test the rate limit middleware and handler reservations."""
+
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.bot.handlers.message import (
+    _charge_failed_run,
+    _reserve_rate_limit,
+    handle_document,
+)
+from src.bot.middleware.rate_limit import rate_limit_middleware, take_reservation
+from src.claude.exceptions import ClaudeProcessError
+from src.config import create_test_config
+from src.security.rate_limiter import RateLimiter
+
+
+def make_update(user_id=1, text="hello"):
+    message = SimpleNamespace(
+        text=text, document=None, photo=None, reply_text=AsyncMock()
+    )
+    return SimpleNamespace(
+        effective_user=SimpleNamespace(id=user_id, username="user"),
+        effective_message=message,
+        message=message,
+    )
+
+
+def make_context(settings, rate_limiter):
+    return SimpleNamespace(
+        user_data={"current_directory": Path("/projects/app")},
+        bot_data={"settings": settings, "rate_limiter": rate_limiter},
+    )
+
+
+class TestRateLimitReservations:
+    """Test that each update is checked once."""
+
+    @pytest.fixture
+    def settings(self, tmp_path):
+        return create_test_config(
+            approved_directory=str(tmp_path),
+            rate_limit_requests=10,
+            rate_limit_window=60,
+            rate_limit_burst=5,
+            claude_max_cost_per_user=1.0,
+        )
+
+    @pytest.fixture
+    def rate_limiter(self, settings):
+        return RateLimiter(settings)
+
+    async def test_handler_uses_middleware_reservation(self, settings, rate_limiter):
+        """Test that the handler settles the middleware's reservation."""
+        update = make_update()
+        context = make_context(settings, rate_limiter)
+        data = dict(context.bot_data, context=context)
+
+        await rate_limit_middleware(AsyncMock(), update, data)
+        reservation = await _reserve_rate_limit(update, context, rate_limiter, 0.5)
+
+        assert reservation is not None and reservation.allowed
+        assert take_reservation(context) is None
+        # One token, both estimates held on the one reservation
+        assert rate_limiter.request_buckets[1].tokens == pytest.approx(4, abs=0.01)
+        assert reservation.cost > 0.5
+        assert rate_limiter.cost_tracker[1] == pytest.approx(reservation.cost)
+
+        await reservation.commit(0.2)
+        assert rate_limiter.cost_tracker[1] == pytest.approx(0.2)
+
+    async def test_middleware_rejection_reaches_handler(self, settings, rate_limiter):
+        """Test that a rejected update is not checked or answered twice."""
+        update = make_update()
+        context = make_context(settings, rate_limiter)
+        data = dict(context.bot_data, context=context)
+        await rate_limiter.check_rate_limit(1, cost=1.0)
+
+        handler = AsyncMock()
+        await rate_limit_middleware(handler, update, data)
+        reservation = await _reserve_rate_limit(update, context, rate_limiter, 0.5)
+
+        handler.assert_not_called()
+        assert not reservation.allowed
+        update.message.reply_text.assert_awaited_once()
+        assert rate_limiter.request_buckets[1].tokens == pytest.approx(4, abs=0.01)
+
+    async def test_handler_estimate_counts_against_cost_limit(
+        self, settings, rate_limiter
+    ):
+        """Test the handler's estimate can still turn the update away."""
+        update = make_update()
+        context = make_context(settings, rate_limiter)
+        data = dict(context.bot_data, context=context)
+        await rate_limiter.check_rate_limit(1, cost=0.6)
+
+        handler = AsyncMock()
+        await rate_limit_middleware(handler, update, data)
+        handler.assert_awaited_once()
+        reservation = await _reserve_rate_limit(update, context, rate_limiter, 0.5)
+
+        assert not reservation.allowed
+        assert "Cost limit exceeded" in reservation.message
+        update.message.reply_text.assert_awaited_once()
+        # The middleware's hold is refunded; its request token stays spent
+        assert rate_limiter.cost_tracker[1] == pytest.approx(0.6)
+        assert rate_limiter.request_buckets[1].tokens == pytest.approx(3, abs=0.01)
+
+    async def test_handler_reserves_without_middleware(self, settings, rate_limiter):
+        """Test the fallback check when the middleware did not run."""
+        update = make_update()
+        context = make_context(settings, rate_limiter)
+
+        reservation = await _reserve_rate_limit(update, context, rate_limiter, 0.5)
+
+        assert reservation.allowed
+        assert rate_limiter.cost_tracker[1] == 0.5
+        await reservation.release()
+        assert rate_limiter.cost_tracker[1] == 0.0
+
+    async def test_rejected_upload_reserves_nothing(self, settings, rate_limiter):
+        """Test uploads failing validation never touch the limits."""
+        update = make_update()
+        update.message.document = SimpleNamespace(
+            file_name="big.txt", file_size=20 * 1024 * 1024
+        )
+        context = make_context(settings, rate_limiter)
+
+        await handle_document(update, context)
+
+        assert "File Too Large" in update.message.reply_text.await_args.args[0]
+        assert 1 not in rate_limiter.request_buckets
+
+    async def test_failed_run_charges_reported_cost(self, settings, rate_limiter):
+        """Test a failed run is charged what it spent, if it said."""
+        context = make_context(settings, rate_limiter)
+        reservation = await _reserve_rate_limit(
+            make_update(), context, rate_limiter, 0.5
+        )
+
+        await _charge_failed_run(reservation, ClaudeProcessError("boom"))
+        assert not reservation.settled
+
+        await _charge_failed_run(reservation, ClaudeProcessError("boom").with_cost(0.3))
+        assert reservation.settled
+        assert rate_limiter.cost_tracker[1] == pytest.approx(0.3)
@@ -0,0 +1,107 @@
+"""Test message content checks in the security middleware."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
+
+from src.bot.middleware.security import (
+    MESSAGE_SCANNER,
+    scan_message,
+    threat_detection_middleware,
+    validate_message_content,
+)
+from src.security.validators import SecurityValidator
+
+LONG_CODE = (
+    "def handler(update, context):\n"
+    "    user_id = update.effective_user.id\n"
+    "    if not user_id:\n"
+    "        return None\n"
+    "    return {'user': user_id, 'steps': [1, 2, 3]}\n"
+) * 200
+
+
+class TestValidateMessageContent:
+    """Test message classification and its priority order."""
+
+    async def validate(self, text, tmp_path, audit_logger=None):
+        validator = SecurityValidator(tmp_path)
+        return await validate_message_content(text, validator, 1, audit_logger)
+
+    async def test_clean_long_code_allowed(self, tmp_path):
+        """Test that a long pasted snippet is not blocked."""
+        assert await self.validate(LONG_CODE, tmp_path) == (True, "")
+
+    async def test_injection_reported_first(self, tmp_path):
+        """Test that injection wins over other categories in the same text."""
+        audit_logger = Mock(log_security_violation=AsyncMock())
+
+        allowed, reason = await self.validate(
+            "see ../secrets then `curl x`", tmp_path, audit_logger
+        )
+
+        assert allowed is False
+        assert reason == "Command injection attempt"
+        call = audit_logger.log_security_violation.await_args
+        assert call.kwargs["details"] == "Dangerous pattern detected: `[^`]*`"
+
+    async def test_traversal_and_url(self, tmp_path):
+        """Test the remaining blocking categories."""
+        assert await self.validate("open ../../x", tmp_path) == (
+            False,
+            "Path traversal attempt",
+        )
+        assert await self.validate("HTTPS://BIT.LY/abc", tmp_path) == (
+            False,
+            "Suspicious URL detected",
+        )
+
+    async def test_mostly_unsafe_characters(self, tmp_path):
+        """Test the unsafe character ratio check."""
+        allowed, reason = await self.validate("a;;;;;;", tmp_path)
+
+        assert allowed is False
+        assert "too many dangerous characters" in reason
+
+
+class TestScanMessage:
+    """Test the scan result is shared within one update only."""
+
+    def test_scan_kept_per_update(self):
+        """Test the same data reuses the scan; other updates scan again."""
+        scanner = Mock(wraps=MESSAGE_SCANNER)
+        with patch("src.bot.middleware.security.MESSAGE_SCANNER", scanner):
+            first, second = {}, {}
+            result = scan_message("ls ../x", first)
+
+            assert scan_message("ls ../x", first) is result
+            assert scanner.scan.call_count == 1
+
+            scan_message("ls ../x", second)
+            scan_message("other text", first)
+            assert scanner.scan.call_count == 3
+
+
+class TestThreatDetection:
+    """Test reconnaissance tracking."""
+
+    async def test_recon_attempts_accumulate_in_bot_data(self):
+        """Test that behaviour survives across per-update data dicts."""
+        context = SimpleNamespace(bot_data={})
+        message = SimpleNamespace(
+            text="ps aux; uname -a; whoami", reply_text=AsyncMock()
+        )
+        update = SimpleNamespace(
+            effective_user=SimpleNamespace(id=1), effective_message=message
+        )
+        handler = AsyncMock()
+
+        for _ in range(2):
+            await threat_detection_middleware(
+                handler, update, dict(context.bot_data, context=context)
+            )
+
+        user_data = context.bot_data["user_behavior"][1]
+        assert user_data["recon_attempts"] == 6
+        assert user_data["message_count"] == 2
+        message.reply_text.assert_awaited_once()
+        assert handler.await_count == 2
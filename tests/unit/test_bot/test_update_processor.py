@@ -0,0 +1,152 @@
+"""Test concurrent update processing with per-chat ordering."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.bot.update_processor import ChatOrderedUpdateProcessor
+
+
+def message_update(chat_id):
+    return SimpleNamespace(
+        callback_query=None,
+        effective_chat=SimpleNamespace(id=chat_id),
+        effective_user=SimpleNamespace(id=chat_id),
+    )
+
+
+class TestChatOrderedUpdateProcessor:
+    """Test ordering, parallelism and the global bound."""
+
+    async def run_all(self, processor, jobs):
+        """Start every job in arrival order, like the application does."""
+        tasks = []
+        for update, coroutine in jobs:
+            tasks.append(
+                asyncio.create_task(processor.process_update(update, coroutine))
+            )
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+
+    async def test_same_chat_in_order(self):
+        """Test one chat's updates run one at a time, in order."""
+        processor = ChatOrderedUpdateProcessor(max_running=8)
+        log = []
+
+        async def job(n, delay):
+            log.append(("start", n))
+            await asyncio.sleep(delay)
+            log.append(("end", n))
+
+        await self.run_all(
+            processor,
+            [
+                (message_update(1), job(n, delay))
+                for n, delay in enumerate([0.03, 0, 0.01])
+            ],
+        )
+
+        assert log == [
+            ("start", 0),
+            ("end", 0),
+            ("start", 1),
+            ("end", 1),
+            ("start", 2),
+            ("end", 2),
+        ]
+        stats = processor.get_stats()
+        assert stats["max_backlog"] == 3
+        assert stats["chats_active"] == 0
+        assert stats["processed"] == 3
+
+    async def test_chats_run_in_parallel(self):
+        """Test a slow chat doesn't hold up the others."""
+        processor = ChatOrderedUpdateProcessor(max_running=8)
+        finished = []
+
+        async def job(chat_id, delay):
+            await asyncio.sleep(delay)
+            finished.append(chat_id)
+
+        await self.run_all(
+            processor,
+            [(message_update(1), job(1, 0.05))]
+            + [(message_update(chat_id), job(chat_id, 0)) for chat_id in (2, 3, 4)],
+        )
+
+        assert finished == [2, 3, 4, 1]
+
+    async def test_global_bound(self):
+        """Test no more than max_running updates run at once."""
+        processor = ChatOrderedUpdateProcessor(max_running=2)
+        peak = 0
+
+        async def job():
+            nonlocal peak
+            peak = max(peak, processor.running)
+            await asyncio.sleep(0.01)
+
+        await self.run_all(
+            processor, [(message_update(chat_id), job()) for chat_id in range(6)]
+        )
+
+        assert peak == 2
+        assert processor.get_stats()["wait"]["count"] == 6
+
+    async def test_backlog_does_not_take_slots(self):
+        """Test a chat's queued updates leave slots for other chats."""
+        processor = ChatOrderedUpdateProcessor(max_running=2)
+        release = asyncio.Event()
+        other_done = asyncio.Event()
+
+        async def blocked():
+            await release.wait()
+
+        async def other():
+            other_done.set()
+
+        tasks = [
+            asyncio.create_task(processor.process_update(message_update(1), blocked()))
+            for _ in range(5)
+        ]
+        await asyncio.sleep(0)
+        tasks.append(
+            asyncio.create_task(processor.process_update(message_update(2), other()))
+        )
+
+        await asyncio.wait_for(other_done.wait(), timeout=1)
+        release.set()
+        await asyncio.gather(*tasks)
+
+    async def test_callback_queries_serialized(self):
+        """Test a button press waits for its chat's running request."""
+        processor = ChatOrderedUpdateProcessor(max_running=4)
+        release = asyncio.Event()
+        pressed = asyncio.Event()
+        button = SimpleNamespace(
+            callback_query=object(), effective_chat=SimpleNamespace(id=1)
+        )
+
+        async def long_run():
+            await release.wait()
+
+        async def press():
+            pressed.set()
+
+        run = asyncio.create_task(
+            processor.process_update(message_update(1), long_run())
+        )
+        await asyncio.sleep(0)
+        pressing = asyncio.create_task(processor.process_update(button, press()))
+        await asyncio.sleep(0.01)
+
+        assert not pressed.is_set()
+        release.set()
+        await asyncio.gather(run, pressing)
+        assert pressed.is_set()
+
+    def test_requires_positive_bound(self):
+        """Test max_running is validated."""
+        with pytest.raises(ValueError):
+            ChatOrderedUpdateProcessor(max_running=0)
@@ -0,0 +1,147 @@
+"""Test allowed update types and update type statistics."""
+
+import importlib
+
+import pytest
+from telegram import Update
+from telegram.ext import (
+    Application,
+    ApplicationHandlerStop,
+    CallbackQueryHandler,
+    CommandHandler,
+    MessageHandler,
+    filters,
+)
+
+from src.bot import update_types
+from src.bot.core import ClaudeCodeBot
+from src.bot.update_types import (
+    MESSAGE_TYPES,
+    UpdateTypeStats,
+    allowed_update_types,
+    filter_update_types,
+)
+from src.config import create_test_config
+
+
+async def noop(update, context):
+    pass
+
+
+def make_update(kind):
+    message = {
+        "message_id": 1,
+        "date": 0,
+        "chat": {"id": 1, "type": "private"},
+        "text": "hi",
+    }
+    return Update.de_json({"update_id": 1, kind: message}, None)
+
+
+class TestFilterUpdateTypes:
+    """Test deriving update types from filters and handlers."""
+
+    def test_message_filters_see_every_message_type(self):
+        """Test content filters alone don't restrict the update type."""
+        assert filter_update_types(filters.TEXT & ~filters.COMMAND) == MESSAGE_TYPES
+
+    def test_update_type_filters(self):
+        """Test combinations with update type filters."""
+        assert filter_update_types(filters.UpdateType.MESSAGE & filters.PHOTO) == {
+            Update.MESSAGE
+        }
+        assert filter_update_types(
+            filters.UpdateType.MESSAGE | filters.UpdateType.CHANNEL_POST
+        ) == {Update.MESSAGE, Update.CHANNEL_POST}
+
+    def test_merged_filter_internals(self):
+        """Test the private PTB attributes filter_update_types relies on."""
+        and_filter = filters.TEXT & filters.PHOTO
+        or_filter = filters.TEXT | filters.PHOTO
+
+        assert isinstance(and_filter, filters._MergedFilter)
+        assert isinstance(or_filter, filters._MergedFilter)
+        assert and_filter.base_filter is filters.TEXT
+        assert (and_filter.and_filter, and_filter.or_filter) == (
+            filters.PHOTO,
+            None,
+        )
+        assert (or_filter.and_filter, or_filter.or_filter) == (None, filters.PHOTO)
+
+    def test_without_guest_messages(self, monkeypatch):
+        """Test the module works on releases before guest messages (< 22.8)."""
+        monkeypatch.delattr(Update, "GUEST_MESSAGE", raising=False)
+        monkeypatch.delattr(filters.UpdateType, "GUEST_MESSAGE", raising=False)
+        try:
+            module = importlib.reload(update_types)
+            assert Update.MESSAGE in module.MESSAGE_TYPES
+            assert module.filter_update_types(filters.UpdateType.MESSAGE) == {
+                Update.MESSAGE
+            }
+        finally:
+            monkeypatch.undo()
+            importlib.reload(update_types)
+
+    def test_allowed_update_types(self):
+        """Test the union over handlers, in Bot API order."""
+        handlers = [
+            CallbackQueryHandler(noop),
+            CommandHandler("start", noop),
+        ]
+
+        assert allowed_update_types(handlers) == [
+            Update.MESSAGE,
+            Update.EDITED_MESSAGE,
+            Update.CALLBACK_QUERY,
+        ]
+
+    def test_unfiltered_handler_allows_everything(self):
+        """Test handlers that could take anything keep every type."""
+        handlers = [MessageHandler(None, noop), CallbackQueryHandler(noop)]
+
+        assert set(allowed_update_types(handlers)) >= MESSAGE_TYPES
+
+
+class TestBotAllowedUpdates:
+    """Test the bot's own registrations and the early drop."""
+
+    @pytest.fixture
+    def bot(self, tmp_path):
+        bot = ClaudeCodeBot(create_test_config(approved_directory=str(tmp_path)), {})
+        bot.app = Application.builder().token("1:test").build()
+        bot._register_handlers()
+        return bot
+
+    def test_registered_handlers(self, bot):
+        """Test only new messages and button presses are requested."""
+        assert bot.allowed_updates == [Update.MESSAGE, Update.CALLBACK_QUERY]
+        assert bot.app.bot_data["update_stats"] is bot.update_stats
+
+    async def test_unhandled_type_dropped_before_middleware(self, bot):
+        """Test an edited message never reaches the pipeline."""
+        bot.middleware = None  # Would fail if the pipeline ran
+
+        with pytest.raises(ApplicationHandlerStop):
+            await bot._run_middleware(make_update("edited_message"), None)
+
+        stats = bot.update_stats.get_stats()
+        assert stats["received"] == {Update.EDITED_MESSAGE: 1}
+        assert stats["dropped"] == {Update.EDITED_MESSAGE: 1}
+
+
+class TestUpdateTypeStats:
+    """Test counting by update type."""
+
+    def test_counts(self):
+        """Test received and dropped counts."""
+        stats = UpdateTypeStats([Update.MESSAGE])
+
+        assert stats.accept(make_update("message"))
+        assert stats.accept(make_update("message"))
+        assert not stats.accept(make_update("channel_post"))
+
+        result = stats.get_stats()
+        assert result["received"] == {Update.MESSAGE: 2, Update.CHANNEL_POST: 1}
+        assert result["dropped"] == {Update.CHANNEL_POST: 1}
+        assert result["total_received"] == 3
+        assert result["total_dropped"] == 1
@@ -0,0 +1,216 @@
+"""Test the webhook server."""
+
+import asyncio
+import json
+
+import pytest
+from telegram.ext import SimpleUpdateProcessor
+
+from src.bot.webhook import SECRET_HEADER, WebhookServer
+
+SECRET = "s3cret"
+
+
+class FakeApplication:
+    """Just what the server uses of an Application."""
+
+    def __init__(self):
+        self.bot = None
+        self.update_processor = SimpleUpdateProcessor(64)
+        self.processed = []
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def process_update(self, update):
+        await self.release.wait()
+        self.processed.append(update.update_id)
+
+    def create_task(self, coroutine, update=None):
+        return asyncio.create_task(coroutine)
+
+
+def update_body(update_id):
+    return json.dumps(
+        {
+            "update_id": update_id,
+            "message": {
+                "message_id": update_id,
+                "date": 0,
+                "chat": {"id": 1, "type": "private"},
+                "text": "hi",
+            },
+        }
+    ).encode()
+
+
+async def send(reader, writer, body=b"", method="POST", path="/webhook", headers=None):
+    """Send one request and return (status, response headers)."""
+    request_headers = {
+        "Host": "localhost",
+        SECRET_HEADER: SECRET,
+        "Content-Length": str(len(body)),
+        **(headers or {}),
+    }
+    head = f"{method} {path} HTTP/1.1\r\n" + "".join(
+        f"{name}: {value}\r\n" for name, value in request_headers.items()
+    )
+    writer.write(head.encode() + b"\r\n" + body)
+    await writer.drain()
+
+    response = (await reader.readuntil(b"\r\n\r\n")).decode().split("\r\n")
+    status = int(response[0].split(" ")[1])
+    response_headers = {}
+    for line in response[1:]:
+        if line:
+            name, _, value = line.partition(":")
+            response_headers[name.lower()] = value.strip()
+    return status, response_headers
+
+
+@pytest.fixture
+async def server():
+    server = WebhookServer(
+        FakeApplication(),
+        path="/webhook",
+        secret_token=SECRET,
+        host="127.0.0.1",
+        port=0,
+        max_body_size=4096,
+        max_queue=2,
+        queue_timeout=0.05,
+    )
+    await server.start()
+    yield server
+    await server.stop()
+
+
+@pytest.fixture
+async def connection(server):
+    reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+    yield reader, writer
+    writer.close()
+
+
+class TestWebhookServer:
+    """Test request handling, rejections and backpressure."""
+
+    async def test_accepts_update(self, server, connection):
+        """Test a valid delivery is acknowledged and processed."""
+        status, headers = await send(*connection, update_body(1))
+        await asyncio.sleep(0.01)
+
+        assert status == 200
+        assert headers["connection"] == "keep-alive"
+        assert server.application.processed == [1]
+        assert server.get_stats()["accepted"] == 1
+
+    async def test_keep_alive(self, server, connection):
+        """Test several deliveries share one connection."""
+        for update_id in range(1, 4):
+            status, _ = await send(*connection, update_body(update_id))
+            assert status == 200
+        await asyncio.sleep(0.01)
+
+        assert server.application.processed == [1, 2, 3]
+        stats = server.get_stats()
+        assert stats["connections"] == 1
+        assert stats["requests"] == 3
+
+    async def test_wrong_secret(self, server, connection):
+        """Test deliveries without the secret token are refused."""
+        status, headers = await send(
+            *connection, update_body(1), headers={SECRET_HEADER: "guess"}
+        )
+
+        assert status == 403
+        assert headers["connection"] == "close"
+        assert server.application.processed == []
+
+    @pytest.mark.parametrize(
+        "method,path,expected",
+        [("POST", "/other", 404), ("GET", "/webhook", 405)],
+    )
+    async def test_wrong_route(self, server, connection, method, path, expected):
+        """Test unknown paths and methods."""
+        status, _ = await send(*connection, method=method, path=path)
+
+        assert status == expected
+        assert server.get_stats()["rejected"] == {expected: 1}
+
+    async def test_oversized_body(self, server, connection):
+        """Test bodies over the limit are refused before being read."""
+        status, _ = await send(
+            *connection, headers={"Content-Length": str(server.max_body_size + 1)}
+        )
+
+        assert status == 413
+
+    async def test_chunked_body(self, server, connection):
+        """Test bodies without a length are refused."""
+        status, _ = await send(*connection, headers={"Transfer-Encoding": "chunked"})
+
+        assert status == 411
+
+    async def test_bad_json(self, server, connection):
+        """Test malformed bodies keep the connection usable."""
+        status, _ = await send(*connection, b"{not json")
+        assert status == 400
+
+        status, _ = await send(*connection, update_body(2))
+        assert status == 200
+
+    async def test_full_queue(self, server, connection):
+        """Test deliveries get 503 while every slot is taken."""
+        application = server.application
+        application.release.clear()
+
+        for update_id in (1, 2):
+            status, _ = await send(*connection, update_body(update_id))
+            assert status == 200
+        status, headers = await send(*connection, update_body(3))
+
+        assert status == 503
+        assert headers["retry-after"] == "1"
+        assert server.get_stats()["in_flight"] == 2
+
+        application.release.set()
+        await asyncio.sleep(0.01)
+        status, _ = await send(*connection, update_body(3))
+        await asyncio.sleep(0.01)
+
+        assert status == 200
+        assert sorted(application.processed) == [1, 2, 3]
+        stats = server.get_stats()
+        assert stats["in_flight"] == 0
+        assert stats["max_in_flight"] == 2
+
+    async def test_stop_closes_idle_connections(self, server, connection):
+        """Test stop doesn't wait for idle keep-alive connections to time out."""
+        reader, _ = connection
+        status, _ = await send(*connection, update_body(1))
+        assert status == 200
+
+        await asyncio.wait_for(server.stop(), 1)
+
+        assert await asyncio.wait_for(reader.read(), 1) == b""
+        assert server.get_stats()["open_connections"] == 0
+
+    async def test_stop_answers_request_in_progress(self, server, connection):
+        """Test a request waiting for a slot is answered, then closed."""
+        server.application.release.clear()
+        for update_id in (1, 2):
+            await send(*connection, update_body(update_id))
+
+        waiting = asyncio.create_task(send(*connection, update_body(3)))
+        await asyncio.sleep(0.01)
+        await server.stop()
+        status, headers = await waiting
+
+        assert status == 503
+        assert headers["connection"] == "close"
+        server.application.release.set()
+
+    def test_requires_secret(self):
+        """Test the server refuses to run without a secret token."""
+        with pytest.raises(ValueError):
+            WebhookServer(FakeApplication(), path="/webhook", secret_token="")
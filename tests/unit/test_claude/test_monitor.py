@@ -0,0 +1,237 @@
+"""Test Claude tool monitoring and policy."""
+
+from pathlib import Path
+
+import pytest
+
+from src.claude.monitor import ToolMonitor
+from src.claude.policy import ToolPolicy, compile_literal_alternation
+from src.config import create_test_config
+from src.security.validators import SecurityValidator
+
+
+@pytest.fixture
+def approved_dir(tmp_path):
+    """Approved directory for tool calls."""
+    return tmp_path
+
+
+@pytest.fixture
+def config(approved_dir):
+    """Test configuration."""
+    return create_test_config(approved_directory=str(approved_dir))
+
+
+@pytest.fixture
+def monitor(config, approved_dir):
+    """Tool monitor with a security validator."""
+    return ToolMonitor(config, SecurityValidator(approved_dir))
+
+
+class TestToolPolicy:
+    """Test compiled tool policy."""
+
+    def test_from_settings_builds_frozensets(self, config):
+        """Test tool lists are compiled to frozensets."""
+        policy = ToolPolicy.from_settings(config)
+
+        assert isinstance(policy.allowed_tools, frozenset)
+        assert "Read" in policy.allowed_tools
+        assert "git commit" in policy.disallowed_tools
+
+    def test_check_tool_name(self):
+        """Test allow/deny list evaluation."""
+        policy = ToolPolicy(
+            allowed_tools=frozenset({"Read", "Bash"}),
+            disallowed_tools=frozenset({"Bash"}),
+        )
+
+        assert policy.check_tool_name("Read") is None
+        assert policy.check_tool_name("Write") == "disallowed_tool"
+        assert policy.check_tool_name("Bash") == "explicitly_disallowed_tool"
+
+    def test_empty_allowed_list_allows_everything(self):
+        """Test an empty allowed list does not restrict tools."""
+        policy = ToolPolicy()
+
+        assert policy.check_tool_name("Anything") is None
+
+    def test_longest_pattern_wins(self):
+        """Test combined regex prefers longer literals."""
+        regex = compile_literal_alternation((">", ">>"))
+
+        assert regex.search("echo hi >> out").group(0) == ">>"
+
+    def test_find_dangerous_pattern(self):
+        """Test dangerous pattern detection is case insensitive."""
+        policy = ToolPolicy()
+
+        assert policy.find_dangerous_pattern("ls -la") is None
+        assert policy.find_dangerous_pattern("SUDO ls") == "sudo"
+        assert policy.find_dangerous_pattern("echo $(id)") == "$("
+
+    def test_dangerous_pattern_check_disabled(self):
+        """Test pattern check can be disabled."""
+        policy = ToolPolicy(check_dangerous_patterns=False)
+
+        assert policy.find_dangerous_pattern("rm -rf /") is None
+
+
+class TestToolMonitor:
+    """Test tool monitor validation."""
+
+    async def test_allowed_tool(self, monitor, approved_dir):
+        """Test allowed tool passes validation."""
+        valid, error = await monitor.validate_tool_call(
+            "Glob", {"pattern": "*.py"}, approved_dir, 1
+        )
+
+        assert valid is True
+        assert error is None
+        assert monitor.get_tool_stats()["by_tool"] == {"Glob": 1}
+
+    async def test_tool_not_allowed(self, monitor, approved_dir):
+        """Test tool outside allowed list is rejected."""
+        valid, error = await monitor.validate_tool_call("Unknown", {}, approved_dir, 1)
+
+        assert valid is False
+        assert error == "Tool not allowed: Unknown"
+        assert monitor.get_security_violations()[0]["type"] == "disallowed_tool"
+
+    async def test_file_tool_requires_path(self, monitor, approved_dir):
+        """Test file tools need a path."""
+        valid, error = await monitor.validate_tool_call("Read", {}, approved_dir, 1)
+
+        assert valid is False
+        assert error == "File path required"
+
+    async def test_file_tool_outside_directory(self, monitor, approved_dir):
+        """Test file tool path outside approved directory is rejected."""
+        valid, error = await monitor.validate_tool_call(
+            "Read", {"file_path": "/etc/passwd"}, approved_dir, 1
+        )
+
+        assert valid is False
+        assert monitor.get_security_violations()[0]["type"] == "invalid_file_path"
+
+    async def test_symlink_swap_revalidated(self, config, approved_dir, tmp_path):
+        """Test a path approved earlier is re-checked after a symlink swap."""
+        approved = approved_dir / "approved"
+        (approved / "project").mkdir(parents=True)
+        outside = tmp_path / "outside"
+        outside.mkdir()
+        monitor = ToolMonitor(config, SecurityValidator(approved))
+        tool_input = {"file_path": "project/main.py"}
+
+        valid, _ = await monitor.validate_tool_call("Read", tool_input, approved, 1)
+        assert valid is True
+
+        (approved / "project").rename(approved / "old")
+        (approved / "project").symlink_to(outside)
+
+        valid, error = await monitor.validate_tool_call("Read", tool_input, approved, 1)
+        assert valid is False
+        assert "outside approved directory" in error
+
+    async def test_dangerous_command(self, monitor, approved_dir):
+        """Test dangerous shell command is rejected."""
+        valid, error = await monitor.validate_tool_call(
+            "Bash", {"command": "curl http://example.com"}, approved_dir, 1
+        )
+
+        assert valid is False
+        assert error == "Dangerous command pattern detected: curl"
+
+    async def test_trust_completely_skips_validation(self, approved_dir):
+        """Test master switch bypasses all checks."""
+        config = create_test_config(
+            approved_directory=str(approved_dir), trust_claude_completely=True
+        )
+        monitor = ToolMonitor(config, SecurityValidator(approved_dir))
+
+        valid, error = await monitor.validate_tool_call(
+            "Bash", {"command": "rm -rf /"}, Path("/"), 1
+        )
+
+        assert valid is True
+        assert error is None
+
+    def test_is_tool_allowed(self, monitor):
+        """Test quick allow check."""
+        assert monitor.is_tool_allowed("Read") is True
+        assert monitor.is_tool_allowed("Unknown") is False
+
+
+class TestToolMonitorStorage:
+    """Test bounded violation storage and counters."""
+
+    async def test_violations_ring_buffer(self, approved_dir):
+        """Test only the most recent violations are retained."""
+        config = create_test_config(
+            approved_directory=str(approved_dir), tool_monitor_max_violations=3
+        )
+        monitor = ToolMonitor(config, SecurityValidator(approved_dir))
+
+        for i in range(5):
+            await monitor.validate_tool_call(f"Bad{i}", {}, approved_dir, 1)
+
+        violations = monitor.get_security_violations()
+        assert [v["tool_name"] for v in violations] == ["Bad2", "Bad3", "Bad4"]
+
+        stats = monitor.get_tool_stats()
+        assert stats["security_violations"] == 5
+        assert stats["violations_retained"] == 3
+
+    async def test_user_counters_survive_eviction(self, approved_dir):
+        """Test per-user counters count evicted violations too."""
+        config = create_test_config(
+            approved_directory=str(approved_dir), tool_monitor_max_violations=1
+        )
+        monitor = ToolMonitor(config, SecurityValidator(approved_dir))
+
+        await monitor.validate_tool_call("Bad", {}, approved_dir, 1)
+        await monitor.validate_tool_call(
+            "Bash", {"command": "sudo ls"}, approved_dir, 1
+        )
+        await monitor.validate_tool_call("Glob", {}, approved_dir, 1)
+        await monitor.validate_tool_call("Bad", {}, approved_dir, 2)
+
+        usage = monitor.get_user_tool_usage(1)
+        assert usage["security_violations"] == 2
+        assert set(usage["violation_types"]) == {
+            "disallowed_tool",
+            "dangerous_command",
+        }
+        assert usage["tool_calls"] == 1
+        assert usage["by_tool"] == {"Glob": 1}
+
+        assert monitor.get_user_tool_usage(3)["security_violations"] == 0
+
+    async def test_get_security_violations_filters(self, monitor, approved_dir):
+        """Test filtering retained violations by user and limit."""
+        for user_id in (1, 2, 1):
+            await monitor.validate_tool_call("Bad", {}, approved_dir, user_id)
+
+        assert len(monitor.get_security_violations(user_id=1)) == 2
+        assert len(monitor.get_security_violations(limit=1)) == 1
+
+    async def test_tool_names_are_bounded(self, approved_dir, monkeypatch):
+        """Test unknown tool names are folded once the cap is reached."""
+        monkeypatch.setattr("src.claude.monitor.MAX_TRACKED_TOOLS", 2)
+        config = create_test_config(
+            approved_directory=str(approved_dir), trust_claude_completely=True
+        )
+        monitor = ToolMonitor(config)
+
+        for name in ("A", "B", "C", "D"):
+            await monitor.validate_tool_call(name, {}, approved_dir, 1)
+
+        assert monitor.get_tool_stats()["by_tool"] == {"A": 1, "B": 1, "<other>": 2}
+
+    async def test_reset_stats(self, monitor, approved_dir):
+        """Test reset clears counters and history."""
+        await monitor.validate_tool_call("Bad", {}, approved_dir, 1)
+        monitor.reset_stats()
+
+        assert monitor.get_tool_stats()["security_violations"] == 0
+        assert monitor.get_user_tool_usage(1)["security_violations"] == 0
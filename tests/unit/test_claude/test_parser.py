@@ -2,7 +2,12 @@
 
 import pytest
 
-from src.claude.parser import OutputParser, ResponseFormatter
+from src.claude.parser import (
+    CODE_BLOCK_PATTERN,
+    OutputParser,
+    ResponseFormatter,
+    StreamingOutputParser,
+)
 
 
 class TestOutputParser:
@@ -197,6 +202,93 @@ Some plain text
         assert summary["file_operations"] == 1
 
 
+class TestStreamingOutputParser:
+    """Test incremental single-pass parser."""
+
+    def test_feed_lines_incrementally(self):
+        """Test running state is built from stream-json lines."""
+        parser = StreamingOutputParser()
+        lines = [
+            '{"type": "assistant", "message": {"content": ['
+            '{"type": "text", "text": "Hi"},'
+            '{"type": "tool_use", "name": "Bash", "input": {"command": "ls"}}]}}',
+            "not json",
+            "",
+            '{"type": "tool_result", "tool_use_id": "1",'
+            ' "result": {"content": "x", "is_error": true}}',
+            '{"type": "result", "result": "done", "cost_usd": 0.1}',
+        ]
+
+        for line in lines:
+            parser.feed_line(line)
+
+        assert parser.invalid_lines == 1
+        assert parser.response_text == "Hi"
+        assert parser.shell_commands[0]["command"] == "ls"
+        assert parser.tool_results[0]["is_error"] is True
+        assert parser.errors[0]["type"] == "tool_error"
+        assert parser.result["cost_usd"] == 0.1
+        assert parser.summary()["total_messages"] == 3
+
+    def test_code_block_split_across_messages(self):
+        """Test a fence opened in one message and closed in another counts once."""
+        parser = StreamingOutputParser(keep_text=False)
+
+        for text in ("```python\nprint(1)", "print(2)\n```", "no code here"):
+            parser.feed(
+                {
+                    "type": "assistant",
+                    "message": {"content": [{"type": "text", "text": text}]},
+                }
+            )
+
+        assert parser.code_blocks == 1
+        assert parser.response_text == ""
+
+    def test_code_blocks_match_pattern(self):
+        """Test incremental counting agrees with the regex over the joined text."""
+        texts = [
+            "```py\nx = 1",
+            "still open ``` closed",
+            "``` not a fence",
+            "```\n",
+            "a ```` b",
+            "```sh\nls```",
+            "tail ```",
+        ]
+        parser = StreamingOutputParser(keep_text=False)
+
+        for text in texts:
+            parser._feed_text(text)
+
+        joined = "".join(text + "\n" for text in texts)
+        assert parser.code_blocks == len(CODE_BLOCK_PATTERN.findall(joined))
+
+    def test_matches_batch_summary(self):
+        """Test incremental summary equals the one-shot summary."""
+        messages = [
+            {"type": "user", "message": "Hello"},
+            {
+                "type": "assistant",
+                "message": {
+                    "content": [
+                        {"type": "text", "text": "```\na\n```\n```js\nb\n```"},
+                        {"type": "tool_use", "name": "Edit", "input": {}},
+                    ]
+                },
+            },
+            {"type": "error", "message": "bad"},
+        ]
+
+        parser = StreamingOutputParser()
+        for msg in messages:
+            parser.feed(msg)
+
+        assert parser.summary() == OutputParser.summarize_session(iter(messages))
+        assert parser.summary()["code_blocks"] == 2
+        assert parser.summary()["errors"] == 1
+
+
 class TestResponseFormatter:
     """Test response formatter."""
 
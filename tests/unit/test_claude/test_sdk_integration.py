@@ -7,7 +7,13 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 from claude_code_sdk import ClaudeCodeOptions
 
-from src.claude.sdk_integration import ClaudeResponse, ClaudeSDKManager, StreamUpdate
+from src.claude.parser import StreamingOutputParser
+from src.claude.sdk_integration import (
+    ClaudeResponse,
+    ClaudeSDKManager,
+    StreamUpdate,
+    sdk_message_to_dicts,
+)
 from src.config.settings import Settings
 
 
@@ -114,6 +120,68 @@ class TestClaudeSDKManager:
         assert not response.is_error
         assert response.cost == 0.05
 
+    async def test_execute_command_reads_stream_incrementally(self, sdk_manager):
+        """Test content and turns come from the stream, not a kept transcript."""
+        from claude_code_sdk.types import (
+            AssistantMessage,
+            ResultMessage,
+            TextBlock,
+            UserMessage,
+        )
+
+        async def mock_query(prompt, options):
+            yield UserMessage(content="Test prompt")
+            yield AssistantMessage(content=[TextBlock(text="first")])
+            yield AssistantMessage(content=[TextBlock(text="second")])
+            yield ResultMessage(
+                subtype="success",
+                duration_ms=1000,
+                duration_api_ms=800,
+                is_error=False,
+                num_turns=2,
+                session_id="test-session",
+                total_cost_usd=0.05,
+            )
+
+        with patch("src.claude.sdk_integration.query", side_effect=mock_query):
+            response = await sdk_manager.execute_command(
+                prompt="Test prompt",
+                working_directory=Path("/test"),
+                session_id="test-session",
+            )
+
+        assert response.content == "first\nsecond"
+        assert response.num_turns == 3
+        session_data = sdk_manager.active_sessions["test-session"]
+        assert session_data["messages"] == []
+
+    async def test_failed_command_reports_spent_cost(self, sdk_manager):
+        """Test an error after the result message carries its cost."""
+        from claude_code_sdk import ProcessError
+        from claude_code_sdk.types import ResultMessage
+
+        from src.claude.exceptions import ClaudeProcessError
+
+        async def mock_query(prompt, options):
+            yield ResultMessage(
+                subtype="error_during_execution",
+                duration_ms=1000,
+                duration_api_ms=800,
+                is_error=True,
+                num_turns=1,
+                session_id="test-session",
+                total_cost_usd=0.05,
+            )
+            raise ProcessError("exited", exit_code=1)
+
+        with patch("src.claude.sdk_integration.query", side_effect=mock_query):
+            with pytest.raises(ClaudeProcessError) as exc_info:
+                await sdk_manager.execute_command(
+                    prompt="Test prompt", working_directory=Path("/test")
+                )
+
+        assert exc_info.value.cost == 0.05
+
     async def test_execute_command_with_streaming(self, sdk_manager):
         """Test command execution with streaming callback."""
         from claude_code_sdk.types import AssistantMessage, ResultMessage
@@ -204,3 +272,69 @@ class TestClaudeSDKManager:
         sdk_manager.active_sessions["session2"] = {"test": "data2"}
 
         assert sdk_manager.get_active_process_count() == 2
+
+
+class TestSDKMessageConversion:
+    """Test conversion of SDK messages for the streaming parser."""
+
+    def test_assistant_message_with_tool_use(self):
+        """Test assistant blocks are converted to stream-json blocks."""
+        from claude_code_sdk.types import AssistantMessage, TextBlock, ToolUseBlock
+
+        message = AssistantMessage(
+            content=[
+                TextBlock(text="Reading file"),
+                ToolUseBlock(id="t1", name="Read", input={"file_path": "a.py"}),
+            ]
+        )
+
+        converted = sdk_message_to_dicts(message, timestamp=1.0)
+
+        assert converted[0]["type"] == "assistant"
+        blocks = converted[0]["message"]["content"]
+        assert blocks[0] == {"type": "text", "text": "Reading file"}
+        assert blocks[1]["name"] == "Read"
+
+    def test_user_message_tool_results(self):
+        """Test tool results in user messages become tool_result entries."""
+        from claude_code_sdk.types import ToolResultBlock, UserMessage
+
+        message = UserMessage(
+            content=[ToolResultBlock(tool_use_id="t1", content="boom", is_error=True)]
+        )
+
+        converted = sdk_message_to_dicts(message)
+
+        assert [m["type"] for m in converted] == ["user", "tool_result"]
+        assert converted[1]["result"]["is_error"] is True
+
+    def test_parser_fed_from_sdk_messages(self):
+        """Test SDK output produces the same running summary."""
+        from claude_code_sdk.types import (
+            AssistantMessage,
+            ResultMessage,
+            ToolUseBlock,
+        )
+
+        parser = StreamingOutputParser()
+        for message in (
+            AssistantMessage(
+                content=[ToolUseBlock(id="t1", name="Bash", input={"command": "ls"})]
+            ),
+            ResultMessage(
+                subtype="success",
+                duration_ms=10,
+                duration_api_ms=5,
+                is_error=False,
+                num_turns=1,
+                session_id="s",
+                total_cost_usd=0.01,
+                result="done",
+            ),
+        ):
+            for msg in sdk_message_to_dicts(message):
+                parser.feed(msg)
+
+        assert parser.result["cost_usd"] == 0.01
+        assert parser.shell_commands[0]["command"] == "ls"
+        assert parser.tools_used[0]["name"] == "Bash"
@@ -199,6 +199,33 @@ def test_log_level_validation():
         assert settings.log_level == "DEBUG"
 
 
+def test_rate_limit_backend_validation():
+    """Test rate limit backend validation and shared state path."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with pytest.raises(ValidationError) as exc_info:
+            Settings(
+                telegram_bot_token="test_token",
+                telegram_bot_username="test_bot",
+                approved_directory=tmp_dir,
+                rate_limit_backend="redis",
+            )
+
+        assert "must be one of" in str(exc_info.value)
+
+        settings = Settings(
+            telegram_bot_token="test_token",
+            telegram_bot_username="test_bot",
+            approved_directory=tmp_dir,
+            rate_limit_backend="SQLite",
+            database_url=f"sqlite:///{tmp_dir}/bot.db",
+        )
+
+        assert settings.rate_limit_backend == "sqlite"
+        assert (
+            settings.rate_limit_state_path == Path(tmp_dir).resolve() / "rate_limits.db"
+        )
+
+
 def test_computed_properties(tmp_path):
     """Test computed properties."""
     test_dir = tmp_path / "projects"
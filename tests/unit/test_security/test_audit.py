@@ -4,7 +4,12 @@ from datetime import datetime, timedelta
 
 import pytest
 
-from src.security.audit import AuditEvent, AuditLogger, InMemoryAuditStorage
+from src.security.audit import (
+    AuditEvent,
+    AuditLogger,
+    InMemoryAuditStorage,
+    RollingAuditCounters,
+)
 
 
 class TestAuditEvent:
@@ -177,6 +182,25 @@ class TestInMemoryAuditStorage:
         assert len(recent_events) == 1
         assert recent_events[0].event_type == "new"
 
+    async def test_get_events_out_of_order(self, storage):
+        """Test newest-first results when events arrive out of order."""
+        now = datetime.utcnow()
+        for minutes in [5, 30, 1, 10]:
+            await storage.store_event(
+                AuditEvent(
+                    timestamp=now - timedelta(minutes=minutes),
+                    user_id=minutes,
+                    event_type="test",
+                    success=True,
+                    details={},
+                )
+            )
+
+        events = await storage.get_events(
+            start_time=now - timedelta(minutes=20), limit=2
+        )
+        assert [e.user_id for e in events] == [1, 5]
+
     async def test_get_events_with_limit(self, storage):
         """Test getting events with limit."""
         # Store multiple events
@@ -454,3 +478,88 @@ class TestAuditLogger:
         assert dashboard["active_users"] == 2
         assert "path_traversal" in dashboard["top_violation_types"]
         assert "injection" in dashboard["top_violation_types"]
+
+
+class TestRollingAuditCounters:
+    """Test precomputed dashboard aggregates."""
+
+    def make_event(self, minutes_ago=0, user_id=1, event_type="command", **kwargs):
+        return AuditEvent(
+            timestamp=datetime.utcnow() - timedelta(minutes=minutes_ago),
+            user_id=user_id,
+            event_type=event_type,
+            success=kwargs.pop("success", True),
+            details=kwargs.pop("details", {}),
+            **kwargs,
+        )
+
+    async def test_dashboard_counts_every_event(self):
+        """Test that the dashboard is not capped at the newest 1000 events."""
+        audit_logger = AuditLogger(InMemoryAuditStorage(max_events=10))
+        for i in range(1500):
+            await audit_logger.log_command(i % 3, "ls", [], True)
+        await audit_logger.log_auth_attempt(7, False, "token")
+
+        dashboard = await audit_logger.get_security_dashboard()
+
+        assert dashboard["total_events"] == 1501
+        assert dashboard["active_users"] == 4
+        assert dashboard["authentication_failures"] == 1
+        assert dashboard["risk_distribution"] == {"low": 1500, "medium": 1}
+        summary = await audit_logger.get_user_activity_summary(0)
+        assert summary["total_events"] == 500
+        assert summary["event_types"] == {"command": 500}
+        assert summary["success_rate"] == 1.0
+
+    def test_window_and_pruning(self):
+        """Test that old events age out of totals and memory."""
+        counters = RollingAuditCounters(window=timedelta(hours=1))
+        counters.record(self.make_event(minutes_ago=90))  # already outside
+        counters.record(self.make_event(minutes_ago=50, user_id=2))
+        counters.record(
+            self.make_event(
+                minutes_ago=5,
+                event_type="security_violation",
+                success=False,
+                details={"violation_type": "path_traversal"},
+                risk_level="high",
+            )
+        )
+
+        assert counters.totals(1)["events"] == 2
+        assert counters.totals(0.5)["events"] == 1
+        assert counters.breakdown(counters.totals(1), "violation") == {
+            "path_traversal": 1
+        }
+        assert counters.totals(1, user_id=2)["events"] == 1
+        assert counters.active_users(0.5) == 1
+
+        # An hour later only buckets inside the window survive
+        counters._pruned_minute = 0
+        counters._prune(counters._cutoff() + 55)
+        assert counters.get_stats()["buckets"] == 0
+        assert counters.get_stats()["users"] == 0
+
+    async def test_longer_periods_fall_back_to_storage(self):
+        """Test summaries beyond the window recount stored events."""
+        storage = InMemoryAuditStorage()
+        audit_logger = AuditLogger(storage, window=timedelta(hours=1))
+        await storage.store_event(self.make_event(minutes_ago=120))
+        await audit_logger.log_command(1, "ls", [], True)
+
+        assert (await audit_logger.get_user_activity_summary(1, hours=1))[
+            "total_events"
+        ] == 1
+        assert (await audit_logger.get_user_activity_summary(1, hours=3))[
+            "total_events"
+        ] == 2
+
+    async def test_warm_start(self):
+        """Test that counters pick up events stored before a restart."""
+        storage = InMemoryAuditStorage()
+        for minutes_ago in (10, 20, 60 * 30):
+            await storage.store_event(self.make_event(minutes_ago=minutes_ago))
+
+        audit_logger = AuditLogger(storage)
+        assert await audit_logger.warm_start() == 2
+        assert (await audit_logger.get_security_dashboard())["total_events"] == 2
@@ -1,6 +1,7 @@
 """Tests for authentication system."""
 
 from datetime import datetime, timedelta
+from unittest.mock import AsyncMock
 
 import pytest
 
@@ -195,6 +196,57 @@ class TestTokenAuthProvider:
         result = await provider.authenticate(user_id, {"token": token})
         assert result is False
 
+    async def test_verification_cache(self, provider):
+        """Test that repeated checks skip the storage lookup."""
+        token = await provider.generate_token(123)
+        provider.storage.get_user_token = AsyncMock(
+            wraps=provider.storage.get_user_token
+        )
+
+        for _ in range(3):
+            assert await provider.authenticate(123, {"token": token})
+        assert not await provider.authenticate(123, {"token": "wrong"})
+        assert not await provider.authenticate(123, {"token": "wrong"})
+
+        # One lookup for the valid token, one for the wrong one
+        assert provider.storage.get_user_token.await_count == 2
+        stats = provider.get_cache_stats()
+        assert stats["hits"] == 3
+        assert stats["misses"] == 2
+
+    async def test_cache_invalidated_on_new_token(self, provider):
+        """Test that issuing a new token drops cached results."""
+        old = await provider.generate_token(123)
+        assert await provider.authenticate(123, {"token": old})
+
+        new = await provider.generate_token(123)
+        assert not await provider.authenticate(123, {"token": old})
+        assert await provider.authenticate(123, {"token": new})
+
+    async def test_cache_disabled(self):
+        """Test that a zero TTL looks up every time."""
+        provider = TokenAuthProvider("secret", InMemoryTokenStorage(), cache_ttl=0)
+        token = await provider.generate_token(1)
+        provider.storage.get_user_token = AsyncMock(
+            wraps=provider.storage.get_user_token
+        )
+
+        assert await provider.authenticate(1, {"token": token})
+        assert await provider.authenticate(1, {"token": token})
+        assert provider.storage.get_user_token.await_count == 2
+        assert provider.get_cache_stats()["entries"] == 0
+
+    async def test_cache_respects_token_expiry(self):
+        """Test that a cached result never outlives the token."""
+        provider = TokenAuthProvider("secret", InMemoryTokenStorage())
+        token = await provider.generate_token(1)
+        stored = await provider.storage.get_user_token(1)
+        stored["expires_at"] = datetime.utcnow() - timedelta(seconds=1)
+        provider.storage.get_user_token = AsyncMock(return_value=stored)
+
+        assert await provider.authenticate(1, {"token": token})
+        assert provider.get_cache_stats()["entries"] == 0
+
 
 class TestAuthenticationManager:
     """Test authentication manager."""
@@ -305,3 +357,93 @@ class TestAuthenticationManager:
         # End one session
         auth_manager.end_session(123)
         assert auth_manager.get_active_sessions_count() == 1
+
+    async def test_cleanup_uses_expiry_order(self, auth_manager):
+        """Test heap cleanup removes only sessions past their deadline."""
+        await auth_manager.authenticate_user(123)
+        await auth_manager.authenticate_user(456)
+        stale = auth_manager.sessions[123]
+        refreshed = auth_manager.sessions[456]
+
+        # Both were scheduled 25 hours ago, but 456 was active since
+        stale.last_activity = datetime.utcnow() - timedelta(hours=25)
+        refreshed.last_activity = datetime.utcnow() - timedelta(hours=25)
+        auth_manager._expiry_heap.clear()
+        for session in (stale, refreshed):
+            auth_manager._schedule_expiry(session)
+        refreshed.refresh()
+
+        assert auth_manager.get_active_sessions_count() == 1
+        assert 123 not in auth_manager.sessions
+        # The refreshed session is rescheduled at its new deadline
+        assert auth_manager._expiry_heap[0][2] is refreshed
+        assert auth_manager._expiry_heap[0][0] > datetime.utcnow()
+
+    async def test_expiry_heap_stays_bounded(self, auth_manager):
+        """Test that ended and replaced sessions don't pile up in the heap."""
+        for _ in range(500):
+            await auth_manager.authenticate_user(123)
+            auth_manager.end_session(456)
+            await auth_manager.authenticate_user(456)
+
+        assert auth_manager.get_active_sessions_count() == 2
+        assert len(auth_manager._expiry_heap) <= 2 * 2 + 64 + 1
+
+    async def test_decision_cache(self, auth_manager):
+        """Test cached decisions and their invalidation."""
+        assert auth_manager.get_cached_decision(123) is None
+        await auth_manager.authenticate_user(123)
+        await auth_manager.authenticate_user(999)
+
+        assert auth_manager.get_cached_decision(123) is True
+        assert auth_manager.get_cached_decision(999) is False
+
+        auth_manager.end_session(123)
+        assert auth_manager.get_cached_decision(123) is None
+
+        stats = auth_manager.get_decision_stats()
+        assert stats["hits"] == 2
+        assert stats["misses"] == 2
+        # Whitelist for 123; whitelist and token provider for 999
+        assert stats["provider_calls"] == 3
+
+    async def test_revocation_drops_decision(self, auth_manager):
+        """Test that revoking a token ends the session and its decision."""
+        token_provider = auth_manager.providers[1]
+        token = await token_provider.generate_token(789)
+        await auth_manager.authenticate_user(789, {"token": token})
+        assert auth_manager.get_cached_decision(789) is True
+
+        await token_provider.revoke_token(789)
+
+        assert auth_manager.get_cached_decision(789) is None
+        assert not auth_manager.is_authenticated(789)
+
+    async def test_new_token_drops_denial(self, auth_manager):
+        """Test that a cached denial does not outlive a newly issued token."""
+        token_provider = auth_manager.providers[1]
+        await auth_manager.authenticate_user(789)
+        assert auth_manager.get_cached_decision(789) is False
+
+        token = await token_provider.generate_token(789)
+
+        assert auth_manager.get_cached_decision(789) is None
+        assert await auth_manager.authenticate_user(789, {"token": token})
+
+    async def test_decision_cache_bounded(self):
+        """Test that the oldest decisions are dropped beyond the size limit."""
+        manager = AuthenticationManager(
+            [WhitelistAuthProvider([])], decision_cache_size=3
+        )
+        for user_id in range(5):
+            await manager.authenticate_user(user_id)
+
+        assert list(manager._decisions) == [2, 3, 4]
+
+    async def test_decision_cache_disabled(self):
+        """Test that a zero TTL never caches."""
+        manager = AuthenticationManager([WhitelistAuthProvider([1])], decision_ttl=0)
+        await manager.authenticate_user(1)
+
+        assert manager.get_cached_decision(1) is None
+        assert manager.get_decision_stats()["entries"] == 0
@@ -0,0 +1,105 @@
+"""Tests for compiled pattern sets."""
+
+import re
+
+import pytest
+
+from src.security.patterns import ContentScanner, PatternSet
+from src.security.validators import SecurityValidator
+
+
+class TestPatternSet:
+    """Test PatternSet matching."""
+
+    def test_reports_matching_pattern(self):
+        """Test that a hit maps back to its source pattern."""
+        patterns = PatternSet([r"\.\.", r"~", r"\$\("])
+
+        assert patterns.search("src/app.py") is None
+        assert patterns.search("docs/~backup") == r"~"
+        assert patterns.search("echo $(id)") == r"\$\("
+
+    def test_match_is_anchored(self):
+        """Test that match only considers the start of the text."""
+        patterns = PatternSet([r".*\.pem$", r"id_"], re.IGNORECASE)
+
+        assert patterns.match("server.PEM") == r".*\.pem$"
+        assert patterns.match("id_rsa") == "id_"
+        assert patterns.match("my_id_rsa") is None
+
+    def test_same_verdicts_as_pattern_loop(self):
+        """Test the combined scan agrees with checking each pattern."""
+        samples = [
+            "src/main.py",
+            "../etc/passwd",
+            "notes #1.md",
+            "a|b",
+            "a||b",
+            "run &",
+            "$HOME/x",
+            "${x}",
+            "file\x00.txt",
+            "README",
+            "a > b",
+        ]
+        compiled = SecurityValidator._DANGEROUS
+
+        for sample in samples:
+            expected = any(
+                re.search(pattern, sample, re.IGNORECASE)
+                for pattern in SecurityValidator.DANGEROUS_PATTERNS
+            )
+            assert (compiled.search(sample) is not None) == expected, sample
+            assert len(compiled) == len(SecurityValidator.DANGEROUS_PATTERNS)
+
+
+class TestContentScanner:
+    """Test categorised content scanning."""
+
+    @pytest.fixture
+    def scanner(self):
+        return ContentScanner(
+            {
+                "injection": ([r";\s*rm\s+", r"eval\s*\("], re.IGNORECASE),
+                "traversal": ([r"\/etc\/.*"], 0),
+                "recon": ([r"ps\s+", r"id\s*$", r"whoami\s*$"], re.IGNORECASE),
+            }
+        )
+
+    def test_reports_every_match_in_order(self, scanner):
+        """Test that each category lists all its matching patterns."""
+        result = scanner.scan("EVAL(x); RM -rf /etc/x && ps aux; id")
+
+        assert result == {
+            "injection": [r";\s*rm\s+", r"eval\s*\("],
+            "traversal": [r"\/etc\/.*"],
+            "recon": [r"ps\s+", r"id\s*$"],
+        }
+        assert scanner.scan("hello") == {
+            "injection": [],
+            "traversal": [],
+            "recon": [],
+        }
+
+    def test_case_flags_respected(self, scanner):
+        """Test that case-sensitive categories stay case sensitive."""
+        assert scanner.scan("cat /ETC/passwd")["traversal"] == []
+        assert scanner.scan("WHOAMI")["recon"] == [r"whoami\s*$"]
+
+    def test_case_folding_mismatches(self, scanner):
+        """Test characters that str.lower and IGNORECASE fold differently."""
+        for text in ["pſ aux", "İd", "ıd", "Straße; rm x"]:
+            expected = [
+                pattern
+                for pattern in scanner.categories["injection"]
+                + scanner.categories["recon"]
+                if re.search(pattern, text, re.IGNORECASE)
+            ]
+            result = scanner.scan(text)
+            assert result["injection"] + result["recon"] == expected, text
+
+    def test_rejects_upper_case_insensitive_patterns(self):
+        """Test that case-insensitive patterns must be written in lower case."""
+        with pytest.raises(ValueError):
+            ContentScanner({"bad": ([r"Eval\S"], re.IGNORECASE)})
+        ContentScanner({"ok": ([r"eval\S"], re.IGNORECASE)})
@@ -0,0 +1,255 @@
+"""Tests for the shared SQLite rate limit backend."""
+
+import asyncio
+import time
+from datetime import timedelta
+
+import pytest
+
+from src.config import create_test_config
+from src.security.rate_limit_sqlite import SQLiteRateLimitBackend
+from src.security.rate_limiter import RateLimiter
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / "rate_limits.db"
+
+
+@pytest.fixture
+def make_backend(db_path):
+    """Open backends on one file, like separate worker processes would."""
+    backends = []
+
+    def factory(**kwargs):
+        options = dict(capacity=3, refill_rate=0.001, max_cost=1.0, path=db_path)
+        options.update(kwargs)
+        backend = SQLiteRateLimitBackend(**options)
+        backends.append(backend)
+        return backend
+
+    yield factory
+    for backend in backends:
+        backend._conn.close()
+
+
+class FakeClock:
+    """Controllable replacement for the time module."""
+
+    def __init__(self):
+        self.now = time.time()
+
+    def time(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr("src.security.rate_limit_sqlite.time", fake)
+    return fake
+
+
+class TestSQLiteRateLimitBackend:
+    """Test SQLite backend behaviour."""
+
+    async def test_request_limit_shared_between_workers(self, make_backend):
+        """Test that two connections draw from the same bucket."""
+        worker_a, worker_b = make_backend(), make_backend()
+
+        results = [
+            (await worker.acquire(1, 1, 0.0)).allowed
+            for worker in (worker_a, worker_b, worker_a, worker_b)
+        ]
+
+        assert results == [True, True, True, False]
+        decision = await worker_b.acquire(1, 1, 0.0)
+        assert decision.reason == "rate"
+        assert decision.wait_time > 0
+
+    async def test_cost_limit(self, make_backend):
+        """Test that cost rejection keeps tokens and reports usage."""
+        backend = make_backend()
+
+        assert (await backend.acquire(1, 1, 0.75)).allowed
+        decision = await backend.acquire(1, 1, 0.5)
+
+        assert decision.allowed is False
+        assert decision.reason == "cost"
+        assert decision.current_cost == pytest.approx(0.75)
+        assert (await backend.get_usage(1))["tokens"] == pytest.approx(2, abs=0.01)
+
+    async def test_fixed_cost_window_expires(self, make_backend, clock):
+        """Test that cost restarts once a fixed window has passed."""
+        backend = make_backend(
+            cost_window=timedelta(hours=1), sliding_cost_window=False
+        )
+
+        assert (await backend.acquire(1, 1, 1.0)).allowed
+        assert not (await backend.acquire(1, 1, 0.5)).allowed
+
+        clock.advance(3600)
+        decision = await backend.acquire(1, 1, 0.5)
+        assert decision.allowed
+        assert decision.current_cost == pytest.approx(0.5)
+
+    async def test_sliding_cost_window(self, make_backend, clock):
+        """Test that the previous window's spend fades out linearly."""
+        backend = make_backend(capacity=10, cost_window=timedelta(hours=1))
+        assert (await backend.acquire(1, 1, 1.0)).allowed
+
+        # A quarter into the next window, 3/4 of the old spend still counts
+        clock.advance(3600 + 900)
+        assert (await backend.get_usage(1))["cost"] == pytest.approx(0.75)
+        decision = await backend.acquire(1, 1, 0.5)
+        assert decision.reason == "cost"
+        assert decision.current_cost == pytest.approx(0.75)
+        assert (await backend.acquire(1, 1, 0.25)).allowed
+
+        # Two windows later nothing carries over
+        clock.advance(7200)
+        assert (await backend.get_usage(1))["cost"] == 0.0
+        assert (await backend.acquire(1, 1, 1.0)).allowed
+
+    async def test_adjust_cost(self, make_backend):
+        """Test reservation corrections are visible to every worker."""
+        worker_a, worker_b = make_backend(), make_backend()
+        await worker_a.acquire(1, 1, 0.5)
+
+        await worker_a.adjust_cost(1, 0.25)
+        assert (await worker_b.get_usage(1))["cost"] == pytest.approx(0.75)
+        await worker_b.adjust_cost(1, -2.0)
+        assert (await worker_a.get_usage(1))["cost"] == 0.0
+
+    async def test_refill(self, make_backend):
+        """Test that tokens refill with wall time."""
+        backend = make_backend(capacity=1, refill_rate=50.0)
+
+        assert (await backend.acquire(1, 1, 0.0)).allowed
+        assert not (await backend.acquire(1, 1, 0.0)).allowed
+        time.sleep(0.05)
+        assert (await backend.acquire(1, 1, 0.0)).allowed
+
+    async def test_concurrent_checks_never_over_admit(self, make_backend):
+        """Test atomicity under concurrent checks from several connections."""
+        workers = [make_backend(capacity=10) for _ in range(4)]
+
+        decisions = await asyncio.gather(
+            *(workers[i % 4].acquire(7, 1, 0.0) for i in range(40))
+        )
+
+        assert sum(d.allowed for d in decisions) == 10
+
+    async def test_checks_do_not_block_event_loop(self, make_backend):
+        """Test checks and reads waiting on the database leave the loop running."""
+        backend = make_backend()
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(ticker())
+        with backend._lock:  # Stands in for a slow statement
+            check = asyncio.create_task(backend.acquire(1, 1, 0.0))
+            usage = asyncio.create_task(backend.get_usage(1))
+            stats = asyncio.create_task(backend.get_stats())
+            await asyncio.sleep(0.1)
+            assert not (check.done() or usage.done() or stats.done())
+        assert (await check).allowed
+        assert (await usage)["tokens"] == pytest.approx(2, abs=0.01)
+        assert (await stats)["active_users"] == 1
+        task.cancel()
+
+        assert ticks >= 5
+
+    async def test_reset_usage_and_cleanup(self, make_backend):
+        """Test admin reset, usage reporting and idle cleanup."""
+        backend = make_backend()
+        await backend.acquire(1, 2, 0.4)
+        await backend.acquire(2, 1, 0.1)
+
+        stats = await backend.get_stats()
+        assert stats["active_users"] == 2
+        assert stats["total_cost"] == pytest.approx(0.5)
+        assert await backend.reset(1) == pytest.approx(0.4)
+        usage = await backend.get_usage(1)
+        assert usage["cost"] == 0.0
+        assert usage["tokens"] == pytest.approx(3)
+
+        assert (await backend.get_usage(99))["tokens"] == 3
+        # User 2's spend still counts, so only the reset user goes
+        assert await backend.cleanup_inactive(timedelta(seconds=0)) == 1
+        assert (await backend.get_stats())["active_users"] == 1
+
+    @pytest.mark.parametrize("sliding", [False, True])
+    async def test_cleanup_keeps_live_window_cost(self, make_backend, clock, sliding):
+        """Test idle users are only dropped once their spend stops counting."""
+        backend = make_backend(
+            cost_window=timedelta(hours=1), sliding_cost_window=sliding
+        )
+        await backend.acquire(1, 1, 0.75)
+        await backend.acquire(2, 1, 0.0)
+
+        clock.advance(1800)
+        assert await backend.cleanup_inactive(timedelta(seconds=60)) == 1
+        assert (await backend.get_usage(1))["cost"] == pytest.approx(0.75)
+
+        # The window is over; the sliding window still counts it for another
+        clock.advance(1800)
+        expected = 0 if sliding else 1
+        assert await backend.cleanup_inactive(timedelta(seconds=60)) == expected
+
+        clock.advance(3600)
+        assert await backend.cleanup_inactive(timedelta(seconds=60)) == 1 - expected
+        assert (await backend.get_stats())["active_users"] == 0
+
+    def test_rejects_global_and_project_limits(self, db_path):
+        """Test limits the backend can't share are refused, not ignored."""
+        for limit in ("global_capacity", "project_capacity"):
+            with pytest.raises(ValueError, match="not supported"):
+                SQLiteRateLimitBackend(
+                    capacity=3,
+                    refill_rate=1.0,
+                    max_cost=1.0,
+                    path=db_path,
+                    **{limit: 5},
+                )
+
+        with pytest.raises(ValueError, match="not supported"):
+            create_test_config(
+                rate_limit_backend="sqlite", rate_limit_project_requests=5
+            )
+
+    async def test_rate_limiter_with_shared_backend(self, db_path):
+        """Test RateLimiter end to end on the SQLite backend."""
+        config = create_test_config(
+            rate_limit_requests=10,
+            rate_limit_window=60,
+            rate_limit_burst=2,
+            claude_max_cost_per_user=5.0,
+        )
+        limiters = [
+            RateLimiter(
+                config,
+                backend=SQLiteRateLimitBackend.from_settings(config, path=db_path),
+            )
+            for _ in range(2)
+        ]
+
+        assert (await limiters[0].check_rate_limit(1, cost=1.0))[0]
+        assert (await limiters[1].check_rate_limit(1, cost=1.0))[0]
+        allowed, message = await limiters[0].check_rate_limit(1, cost=1.0)
+
+        assert allowed is False
+        assert "Rate limit exceeded" in message
+        assert (await limiters[1].get_user_status(1))["cost_usage"]["current"] == 2.0
+        assert (await limiters[1].get_global_status())["backend"] == "sqlite"
+
+        for limiter in limiters:
+            await limiter.close()
@@ -1,11 +1,19 @@
 """Tests for rate limiting system."""
 
+import asyncio
 from datetime import datetime, timedelta
+from types import SimpleNamespace
 
 import pytest
 
 from src.config import create_test_config
-from src.security.rate_limiter import RateLimitBucket, RateLimiter
+from src.security.rate_limiter import (
+    InMemoryRateLimitBackend,
+    RateLimitBucket,
+    RateLimitCheckpointer,
+    RateLimitCleaner,
+    RateLimiter,
+)
 
 
 class TestRateLimitBucket:
@@ -79,6 +87,23 @@ class TestRateLimitBucket:
         assert abs(status["utilization"] - 0.3) < 0.01  # (10-7)/10
         assert status["refill_rate"] == 2.0
 
+    def test_last_update_roundtrip(self):
+        """Test datetime last_update is mapped onto the monotonic clock."""
+        past_time = datetime.utcnow() - timedelta(seconds=30)
+        bucket = RateLimitBucket(
+            capacity=10, tokens=0, last_update=past_time, refill_rate=0.1
+        )
+
+        assert abs((bucket.last_update - past_time).total_seconds()) < 0.5
+        bucket.refill()
+        assert abs(bucket.tokens - 3) < 0.1
+
+    def test_bucket_uses_slots(self):
+        """Test buckets carry no per-instance __dict__."""
+        bucket = RateLimitBucket(capacity=1, tokens=1)
+
+        assert not hasattr(bucket, "__dict__")
+
 
 class TestRateLimiter:
     """Test rate limiter functionality."""
@@ -135,6 +160,26 @@ class TestRateLimiter:
         assert "Rate limit exceeded" in message
         assert "wait" in message.lower()
 
+    async def test_check_consumes_tokens_once(self, rate_limiter):
+        """Test a passing check consumes exactly the requested tokens."""
+        user_id = 123
+
+        await rate_limiter.check_rate_limit(user_id, cost=0.1, tokens=3)
+
+        bucket = rate_limiter.request_buckets[user_id]
+        assert 16.9 < bucket.tokens < 17.1  # burst of 20 minus 3
+
+    async def test_cost_rejection_keeps_tokens(self, rate_limiter):
+        """Test a request rejected on cost does not spend request tokens."""
+        user_id = 123
+        rate_limiter.cost_tracker[user_id] = 5.0
+        rate_limiter.cost_reset_time[user_id] = datetime.utcnow()
+
+        allowed, _ = await rate_limiter.check_rate_limit(user_id, cost=1.0)
+
+        assert allowed is False
+        assert rate_limiter.request_buckets[user_id].tokens > 19.9
+
     async def test_cost_limit_exceeded(self, rate_limiter):
         """Test cost limit exceeded."""
         user_id = 123
@@ -205,7 +250,7 @@ class TestRateLimiter:
         # Set up some usage
         await rate_limiter.check_rate_limit(user_id, cost=2.0, tokens=3)
 
-        status = rate_limiter.get_user_status(user_id)
+        status = await rate_limiter.get_user_status(user_id)
 
         assert "request_bucket" in status
         assert "cost_usage" in status
@@ -219,7 +264,7 @@ class TestRateLimiter:
         await rate_limiter.check_rate_limit(123, cost=1.0)
         await rate_limiter.check_rate_limit(456, cost=2.0)
 
-        status = rate_limiter.get_global_status()
+        status = await rate_limiter.get_global_status()
 
         assert status["active_users"] == 2
         assert status["total_cost_tracked"] == 3.0
@@ -300,3 +345,488 @@ class TestRateLimiter:
         )
         assert allowed is False
         assert "Rate limit exceeded" in message
+
+
+class TestHierarchicalLimits:
+    """Test global, per-project and sliding cost limits."""
+
+    @pytest.fixture
+    def config(self):
+        return create_test_config(
+            rate_limit_requests=10,
+            rate_limit_window=60,
+            rate_limit_burst=5,
+            rate_limit_global_requests=6,
+            rate_limit_project_requests=4,
+            claude_max_cost_per_user=10.0,
+        )
+
+    @pytest.fixture
+    def rate_limiter(self, config):
+        return RateLimiter(config)
+
+    async def test_global_limit_shared_across_users(self, rate_limiter):
+        """Test that the global bucket caps total throughput."""
+        results = [
+            (await rate_limiter.check_rate_limit(user_id, cost=0.0))[0]
+            for user_id in range(7)
+        ]
+
+        assert results == [True] * 6 + [False]
+        allowed, message = await rate_limiter.check_rate_limit(99, cost=0.0)
+        assert allowed is False
+        assert "too many requests" in message
+
+    async def test_project_limit(self, rate_limiter):
+        """Test that users on one project share its bucket."""
+        for user_id in range(4):
+            assert (
+                await rate_limiter.check_rate_limit(user_id, cost=0.0, project="/a")
+            )[0]
+
+        allowed, message = await rate_limiter.check_rate_limit(
+            5, cost=0.0, project="/a"
+        )
+        assert allowed is False
+        assert "Project rate limit exceeded" in message
+        assert (await rate_limiter.check_rate_limit(5, cost=0.0, project="/b"))[0]
+
+    async def test_rejection_consumes_nothing(self, rate_limiter):
+        """Test that a lower level rejecting leaves upper buckets untouched."""
+        backend = rate_limiter.backend
+        await rate_limiter.check_rate_limit(1, cost=9.0, project="/a")
+        global_tokens = backend.global_bucket.tokens
+        project_tokens = backend.project_buckets["/a"].tokens
+
+        allowed, _ = await rate_limiter.check_rate_limit(1, cost=5.0, project="/a")
+
+        assert allowed is False
+        assert backend.global_bucket.tokens == pytest.approx(global_tokens, abs=0.01)
+        assert backend.project_buckets["/a"].tokens == pytest.approx(
+            project_tokens, abs=0.01
+        )
+
+    async def test_sliding_cost_window(self, rate_limiter):
+        """Test that the previous window's spend fades out linearly."""
+        user_id = 123
+        window = rate_limiter.backend.cost_window
+        rate_limiter.cost_tracker[user_id] = 8.0
+        rate_limiter.cost_reset_time[user_id] = datetime.utcnow() - window * 1.5
+
+        rate_limiter._maybe_reset_cost_tracker(user_id)
+
+        # Half way through the next window, half the old spend still counts
+        assert rate_limiter.cost_tracker[user_id] == 0
+        status = await rate_limiter.get_user_status(user_id)
+        assert status["cost_usage"]["current"] == pytest.approx(4.0, abs=0.01)
+        assert not (await rate_limiter.check_rate_limit(user_id, cost=6.5))[0]
+        assert (await rate_limiter.check_rate_limit(user_id, cost=5.5))[0]
+
+    async def test_global_status_hierarchy(self, rate_limiter):
+        """Test that every level is reported."""
+        hierarchy = (await rate_limiter.get_global_status())["hierarchy"]
+
+        assert hierarchy["global"]["enabled"] is True
+        assert hierarchy["global"]["burst_capacity"] == 6
+        assert hierarchy["project"]["burst_capacity"] == 4
+        assert hierarchy["user"]["burst_capacity"] == 5
+        assert hierarchy["cost"]["sliding"] is True
+
+
+class TestRateLimitReservation:
+    """Test reserve, commit and release."""
+
+    @pytest.fixture
+    def rate_limiter(self):
+        return RateLimiter(
+            create_test_config(
+                rate_limit_requests=10,
+                rate_limit_window=60,
+                rate_limit_burst=5,
+                claude_max_cost_per_user=5.0,
+            )
+        )
+
+    async def test_commit_replaces_estimate(self, rate_limiter):
+        """Test that the actual cost replaces the reserved estimate."""
+        reservation = await rate_limiter.reserve(1, cost=1.0)
+        assert reservation.allowed
+        assert rate_limiter.cost_tracker[1] == 1.0
+
+        await reservation.commit(0.25)
+
+        assert rate_limiter.cost_tracker[1] == pytest.approx(0.25)
+        assert rate_limiter.request_buckets[1].tokens == pytest.approx(4, abs=0.01)
+
+    async def test_release_refunds_cost_only(self, rate_limiter):
+        """Test that release refunds the estimate but not the request token."""
+        reservation = await rate_limiter.reserve(1, cost=1.0)
+
+        await reservation.release()
+        await reservation.commit(3.0)  # already settled
+
+        assert rate_limiter.cost_tracker[1] == 0.0
+        assert rate_limiter.request_buckets[1].tokens == pytest.approx(4, abs=0.01)
+        reservations = (await rate_limiter.get_global_status())["reservations"]
+        assert reservations["made"] == 1
+        assert reservations["released"] == 1
+        assert reservations["committed"] == 0
+
+    async def test_rejected_reservation(self, rate_limiter):
+        """Test that a rejection carries the message and settles to nothing."""
+        reservation = await rate_limiter.reserve(1, cost=6.0)
+
+        assert not reservation.allowed
+        assert "Cost limit exceeded" in reservation.message
+        await reservation.release()
+        assert rate_limiter.cost_tracker[1] == 0.0
+        assert (await rate_limiter.get_global_status())["reservations"]["made"] == 0
+
+    async def test_top_up(self, rate_limiter):
+        """Test topping up holds more cost and a refusal releases the hold."""
+        reservation = await rate_limiter.reserve(1, cost=1.0)
+
+        assert await reservation.top_up(2.0)
+        assert reservation.cost == 3.0
+        assert rate_limiter.cost_tracker[1] == 3.0
+        assert rate_limiter.request_buckets[1].tokens == pytest.approx(4, abs=0.01)
+
+        assert not await reservation.top_up(2.5)
+        assert not reservation.allowed
+        assert "Cost limit exceeded" in reservation.message
+        assert rate_limiter.cost_tracker[1] == 0.0
+
+    async def test_commit_above_estimate(self, rate_limiter):
+        """Test that underestimates are charged in full."""
+        reservation = await rate_limiter.reserve(1, cost=0.1)
+        await reservation.commit(4.5)
+
+        allowed, message = await rate_limiter.check_rate_limit(1, cost=1.0)
+
+        assert allowed is False
+        assert "Current usage: $4.50" in message
+        status = (await rate_limiter.get_global_status())["reservations"]
+        assert status["cost_adjustment"] == pytest.approx(4.4)
+
+
+class TestIdleExpiry:
+    """Test timing wheel expiry of idle users."""
+
+    @pytest.fixture
+    def backend(self):
+        return InMemoryRateLimitBackend(
+            capacity=5,
+            refill_rate=1.0,
+            max_cost=10.0,
+            idle_timeout=timedelta(seconds=0.05),
+            cleanup_interval=0.01,
+        )
+
+    async def test_idle_user_expired(self, backend):
+        """Test that an idle user is freed and the bytes reported."""
+        await backend.acquire(1, 1, 0.0)
+        assert (await backend.get_stats())["scheduled_expiries"] == 1
+
+        assert (await backend.expire_idle()).users == 0
+        await asyncio.sleep(0.07)
+        cleanup = await backend.expire_idle()
+
+        assert cleanup.users == 1
+        assert cleanup.bytes > 0
+        assert 1 not in backend.request_buckets
+        assert 1 not in backend.locks
+        assert (await backend.get_stats())["scheduled_expiries"] == 0
+
+    async def test_active_user_rescheduled(self, backend):
+        """Test that activity after scheduling postpones expiry."""
+        await backend.acquire(1, 1, 0.0)
+        await asyncio.sleep(0.04)
+        await backend.acquire(1, 1, 0.0)
+        await asyncio.sleep(0.03)
+
+        assert (await backend.expire_idle()).users == 0
+        assert 1 in backend.request_buckets
+        await asyncio.sleep(0.05)
+        assert (await backend.expire_idle()).users == 1
+
+    async def test_locked_user_skipped(self, backend):
+        """Test that a user with a check in flight is never freed."""
+        await backend.acquire(1, 1, 0.0)
+        await asyncio.sleep(0.07)
+
+        async with backend.locks[1]:
+            assert (await backend.expire_idle()).users == 0
+            assert await backend.cleanup_inactive(timedelta(0)) == 0
+        assert 1 in backend.request_buckets
+
+        await asyncio.sleep(0.02)
+        assert (await backend.expire_idle()).users == 1
+
+    async def test_user_with_counting_cost_kept(self, backend):
+        """Test that spend still inside the cost window is not forgotten."""
+        await backend.acquire(1, 1, 2.0)
+        await asyncio.sleep(0.07)
+
+        assert (await backend.expire_idle()).users == 0
+        assert await backend.cleanup_inactive(timedelta(0)) == 0
+        assert backend.cost_tracker[1] == 2.0
+
+    async def test_idle_project_expired(self):
+        """Test that idle project buckets are freed too."""
+        backend = InMemoryRateLimitBackend(
+            capacity=5,
+            refill_rate=1.0,
+            max_cost=10.0,
+            project_capacity=5,
+            project_refill_rate=1.0,
+            idle_timeout=timedelta(seconds=0.05),
+            cleanup_interval=0.01,
+        )
+        await backend.acquire(1, 1, 0.0, project="/a")
+        await asyncio.sleep(0.07)
+
+        cleanup = await backend.expire_idle()
+
+        assert cleanup.projects == 1
+        assert backend.project_buckets == {}
+
+    async def test_cleaner_sweeps_in_background(self):
+        """Test the background task collects totals."""
+        backend = InMemoryRateLimitBackend(
+            capacity=5,
+            refill_rate=1.0,
+            max_cost=10.0,
+            idle_timeout=timedelta(seconds=0.01),
+            cleanup_interval=0.01,
+        )
+        rate_limiter = RateLimiter(create_test_config(), backend=backend)
+        await rate_limiter.check_rate_limit(1, cost=0.0)
+        cleaner = RateLimitCleaner(rate_limiter, interval=0.01)
+
+        cleaner.start()
+        await asyncio.sleep(0.05)
+        await cleaner.stop()
+
+        stats = cleaner.get_stats()
+        assert stats["running"] is False
+        assert stats["sweeps"] >= 1
+        assert stats["users_reclaimed"] == 1
+        assert stats["bytes_reclaimed"] > 0
+
+
+class FakeStateRepository:
+    """In-memory stand-in for RateLimitStateRepository."""
+
+    def __init__(self):
+        self.states = {}
+        self.batches = []
+        self.fail = False
+
+    async def save_states(self, states):
+        if self.fail:
+            raise RuntimeError("database is locked")
+        self.batches.append(len(states))
+        for state in states:
+            self.states[state["user_id"]] = SimpleNamespace(
+                saved_at=datetime.utcnow(), **state
+            )
+        return len(states)
+
+    async def load_states(self):
+        return list(self.states.values())
+
+    async def prune_states(self, max_age):
+        cutoff = datetime.utcnow() - max_age
+        stale = [
+            user_id
+            for user_id, state in self.states.items()
+            if getattr(state, "saved_at", None) and state.saved_at < cutoff
+        ]
+        for user_id in stale:
+            del self.states[user_id]
+        return len(stale)
+
+
+class FakeCostRepository:
+    """In-memory stand-in for CostTrackingRepository."""
+
+    def __init__(self, costs):
+        self.costs = costs
+
+    async def get_costs_for_date(self, date=None):
+        return dict(self.costs)
+
+
+class TestRateLimitCheckpointer:
+    """Test rate limiter persistence."""
+
+    @pytest.fixture
+    def config(self):
+        return create_test_config(
+            rate_limit_requests=10,
+            rate_limit_window=60,
+            rate_limit_burst=20,
+            claude_max_cost_per_user=5.0,
+        )
+
+    async def test_checkpoint_saves_only_changed_users(self, config):
+        """Test that only users with passing checks are written, in one batch."""
+        limiter = RateLimiter(config)
+        repo = FakeStateRepository()
+        checkpointer = RateLimitCheckpointer(limiter, repo, interval=0)
+
+        await limiter.check_rate_limit(1, cost=1.0)
+        await limiter.check_rate_limit(2, cost=2.0)
+        await limiter.check_rate_limit(3, cost=10.0)  # rejected by cost
+
+        assert await checkpointer.checkpoint() == 2
+        assert repo.batches == [2]
+        assert set(repo.states) == {1, 2}
+
+        # Nothing changed since the last checkpoint
+        assert await checkpointer.checkpoint() == 0
+        assert repo.batches == [2]
+
+    async def test_failed_checkpoint_is_retried(self, config):
+        """Test that users stay queued when a save fails."""
+        limiter = RateLimiter(config)
+        repo = FakeStateRepository()
+        checkpointer = RateLimitCheckpointer(limiter, repo, interval=0)
+
+        await limiter.check_rate_limit(1, cost=1.0)
+        repo.fail = True
+        assert await checkpointer.checkpoint() == 0
+        assert checkpointer.get_stats()["failures"] == 1
+
+        repo.fail = False
+        assert await checkpointer.checkpoint() == 1
+        assert 1 in repo.states
+
+    async def test_warm_start_restores_state(self, config):
+        """Test that a new limiter picks up checkpointed tokens and cost."""
+        repo = FakeStateRepository()
+        first = RateLimiter(config)
+        for _ in range(5):
+            await first.check_rate_limit(1, cost=1.0)
+        await RateLimitCheckpointer(first, repo, interval=0).stop()
+
+        second = RateLimiter(config)
+        restored = await RateLimitCheckpointer(second, repo).warm_start()
+
+        assert restored == 1
+        assert second.cost_tracker[1] == 5.0
+        assert second.request_buckets[1].tokens < config.rate_limit_burst
+
+        allowed, message = await second.check_rate_limit(1, cost=1.0)
+        assert allowed is False
+        assert "Cost limit exceeded" in message
+
+    async def test_warm_start_ignores_expired_cost(self, config):
+        """Test that costs older than the sliding horizon are dropped."""
+        repo = FakeStateRepository()
+        repo.states[1] = SimpleNamespace(
+            user_id=1,
+            tokens=0.0,
+            bucket_updated_at=datetime.utcnow() - timedelta(hours=50),
+            cost=4.0,
+            cost_reset_at=datetime.utcnow() - timedelta(hours=50),
+            previous_cost=1.0,
+        )
+
+        limiter = RateLimiter(config)
+        await RateLimitCheckpointer(limiter, repo).warm_start()
+
+        assert limiter.cost_tracker.get(1, 0.0) == 0.0
+        # The bucket refilled for the time the bot was down
+        assert limiter.request_buckets[1].get_status()["tokens"] == 20
+
+    async def test_warm_start_keeps_sliding_cost(self, config):
+        """Test that last window's restored spend still partly counts."""
+        repo = FakeStateRepository()
+        repo.states[1] = SimpleNamespace(
+            user_id=1,
+            tokens=20.0,
+            bucket_updated_at=datetime.utcnow(),
+            cost=4.0,
+            cost_reset_at=datetime.utcnow() - timedelta(hours=30),
+            previous_cost=0.0,
+        )
+
+        limiter = RateLimiter(config)
+        await RateLimitCheckpointer(limiter, repo).warm_start()
+
+        # 6h into the next window, 3/4 of the 4.0 spent still counts
+        allowed, message = await limiter.check_rate_limit(1, cost=2.5)
+        assert allowed is False
+        assert "Current usage: $3.00" in message
+        assert (await limiter.check_rate_limit(1, cost=1.5))[0] is True
+
+    async def test_warm_start_prunes_stale_states(self, config):
+        """Test that rows past the retention are deleted, not restored."""
+        repo = FakeStateRepository()
+        for user_id, age in ((1, timedelta(hours=1)), (2, timedelta(hours=49))):
+            repo.states[user_id] = SimpleNamespace(
+                user_id=user_id,
+                tokens=0.0,
+                bucket_updated_at=datetime.utcnow() - age,
+                cost=4.0,
+                cost_reset_at=datetime.utcnow() - age,
+                previous_cost=0.0,
+                saved_at=datetime.utcnow() - age,
+            )
+
+        limiter = RateLimiter(config)
+        checkpointer = RateLimitCheckpointer(limiter, repo)
+
+        # Default 24h sliding window: spend counts for up to 48h
+        assert checkpointer.state_retention() == timedelta(hours=48)
+        assert await checkpointer.warm_start() == 1
+        assert set(repo.states) == {1}
+        assert 2 not in limiter.request_buckets
+        assert checkpointer.get_stats()["states_pruned"] == 1
+
+    async def test_warm_start_uses_recorded_daily_cost(self, config):
+        """Test that today's cost_tracking totals are applied when larger."""
+        repo = FakeStateRepository()
+        repo.states[1] = SimpleNamespace(
+            user_id=1,
+            tokens=20.0,
+            bucket_updated_at=datetime.utcnow(),
+            cost=1.0,
+            cost_reset_at=datetime.utcnow(),
+            previous_cost=0.0,
+        )
+        costs = FakeCostRepository({1: 0.5, 2: 4.5})
+
+        limiter = RateLimiter(config)
+        restored = await RateLimitCheckpointer(limiter, repo, costs).warm_start()
+
+        assert restored == 2
+        assert limiter.cost_tracker[1] == 1.0
+        assert limiter.cost_tracker[2] == 4.5
+        assert limiter.cost_reset_time[2].hour == 0
+
+        allowed, _ = await limiter.check_rate_limit(2, cost=1.0)
+        assert allowed is False
+
+    async def test_start_and_stop(self, config):
+        """Test the periodic loop and the final checkpoint on stop."""
+        limiter = RateLimiter(config)
+        repo = FakeStateRepository()
+        checkpointer = RateLimitCheckpointer(limiter, repo, interval=3600)
+
+        assert checkpointer.start() is not None
+        assert checkpointer.get_stats()["running"] is True
+
+        await limiter.check_rate_limit(7, cost=0.5)
+        await checkpointer.stop()
+
+        assert checkpointer.get_stats()["running"] is False
+        assert repo.states[7].cost == 0.5
+
+    def test_zero_interval_disables_loop(self, config):
+        """Test that interval 0 never schedules a task."""
+        checkpointer = RateLimitCheckpointer(
+            RateLimiter(config), FakeStateRepository(), interval=0
+        )
+        assert checkpointer.start() is None
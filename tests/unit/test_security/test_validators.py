@@ -1,6 +1,7 @@
 """Tests for security validators."""
 
 import tempfile
+import time
 from pathlib import Path
 
 import pytest
@@ -331,3 +332,92 @@ class TestSecurityValidator:
         assert "  " not in sanitized  # No double spaces
         assert not sanitized.startswith(" ")  # No leading space
         assert not sanitized.endswith(" ")  # No trailing space
+
+
+class TestPathResolutionCache:
+    """Test caching of resolved paths in validate_path."""
+
+    @pytest.fixture
+    def approved_dir(self, tmp_path):
+        approved = tmp_path / "approved"
+        (approved / "project").mkdir(parents=True)
+        (approved / "project" / "main.py").write_text("print()")
+        return approved.resolve()
+
+    @pytest.fixture
+    def validator(self, approved_dir):
+        return SecurityValidator(approved_dir, path_cache_size=8, path_cache_ttl=60)
+
+    def test_repeat_lookup_hits_cache(self, validator, approved_dir):
+        """Test that the second lookup skips resolution."""
+        first = validator.validate_path("project/main.py", approved_dir)
+        second = validator.validate_path("project/main.py", approved_dir)
+
+        assert first == second
+        assert second[1] == approved_dir / "project" / "main.py"
+        stats = validator.path_cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+        assert stats["syscalls_saved"] > 0
+        assert validator.get_security_summary()["path_cache"]["entries"] == 1
+
+    def test_rejections_are_cached(self, validator, approved_dir, tmp_path):
+        """Test that a path outside the approved directory stays rejected."""
+        for _ in range(2):
+            valid, _, error = validator.validate_path(str(tmp_path), approved_dir)
+            assert valid is False
+            assert "outside approved directory" in error
+        assert validator.path_cache.hits == 1
+
+    def test_directory_change_invalidates(self, validator, approved_dir):
+        """Test that a change to the parent directory drops the entry."""
+        validator.validate_path("project/new.py", approved_dir)
+        (approved_dir / "project" / "new.py").write_text("")
+
+        validator.validate_path("project/new.py", approved_dir)
+
+        assert validator.path_cache.hits == 0
+        assert validator.path_cache.invalidated == 1
+
+    def test_symlink_swap_detected(self, validator, approved_dir, tmp_path):
+        """Test that replacing a cached directory with a symlink is caught."""
+        outside = tmp_path / "outside"
+        outside.mkdir()
+        assert validator.validate_path("project/main.py", approved_dir)[0]
+
+        (approved_dir / "project").rename(approved_dir / "old")
+        (approved_dir / "project").symlink_to(outside)
+
+        valid, _, error = validator.validate_path("project/main.py", approved_dir)
+        assert valid is False
+        assert "outside approved directory" in error
+        assert validator.path_cache.invalidated == 1
+
+    def test_symlinked_paths_not_cached(self, validator, approved_dir):
+        """Test that paths resolved through a symlink are never cached."""
+        (approved_dir / "link").symlink_to(approved_dir / "project")
+
+        for _ in range(2):
+            assert validator.validate_path("link/main.py", approved_dir)[0]
+
+        stats = validator.path_cache.get_stats()
+        assert stats["hits"] == 0
+        assert stats["uncacheable"] == 2
+
+    def test_ttl_and_size_bound(self, approved_dir):
+        """Test expiry, LRU eviction and disabling the cache."""
+        validator = SecurityValidator(
+            approved_dir, path_cache_size=1, path_cache_ttl=0.01
+        )
+        validator.validate_path("project", approved_dir)
+        validator.validate_path("project/main.py", approved_dir)
+        assert validator.path_cache.get_stats()["entries"] == 1
+
+        time.sleep(0.02)
+        validator.validate_path("project/main.py", approved_dir)
+        assert validator.path_cache.expired == 1
+
+        disabled = SecurityValidator(approved_dir, path_cache_size=0)
+        assert disabled.path_cache is None
+        assert disabled.validate_path("project", approved_dir)[0]
@@ -0,0 +1,123 @@
+"""Tests for the SQLite audit storage."""
+
+import asyncio
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.security.audit import AuditEvent, AuditLogger
+from src.storage.audit_storage import SQLiteAuditStorage
+from src.storage.database import DatabaseManager
+from src.storage.repositories import AuditLogRepository
+
+
+@pytest.fixture
+async def repository():
+    """Audit log repository on a temporary database."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        manager = DatabaseManager(f"sqlite:///{Path(temp_dir) / 'test.db'}")
+        await manager.initialize()
+        yield AuditLogRepository(manager)
+        await manager.close()
+
+
+def make_event(user_id=1, event_type="command", **kwargs):
+    return AuditEvent(
+        timestamp=kwargs.pop("timestamp", datetime.utcnow()),
+        user_id=user_id,
+        event_type=event_type,
+        success=kwargs.pop("success", True),
+        details=kwargs.pop("details", {"command": "ls"}),
+        **kwargs,
+    )
+
+
+class TestSQLiteAuditStorage:
+    """Test batched audit storage."""
+
+    async def test_roundtrip_before_start(self, repository):
+        """Test that events are written at once until the writer starts."""
+        storage = SQLiteAuditStorage(repository)
+        event = make_event(session_id="abc", risk_level="high")
+
+        await storage.store_event(event)
+
+        assert storage.get_stats()["pending"] == 0
+        stored = (await repository.get_events())[0]
+        assert stored.session_id == "abc"
+        assert await storage.get_events() == [event]
+
+    async def test_batches_writes(self, repository):
+        """Test that events are queued and written together."""
+        storage = SQLiteAuditStorage(repository, batch_size=3, flush_interval=60)
+        storage.start()
+        try:
+            for _ in range(2):
+                await storage.store_event(make_event())
+            assert storage.get_stats()["pending"] == 2
+            assert await repository.get_events() == []
+
+            # Reaching the batch size wakes the writer
+            await storage.store_event(make_event())
+            for _ in range(50):
+                if storage.batches:
+                    break
+                await asyncio.sleep(0.01)
+            assert storage.get_stats()["batches"] == 1
+            assert storage.get_stats()["events_written"] == 3
+        finally:
+            await storage.stop()
+
+    async def test_queries_see_queued_events(self, repository):
+        """Test that queries flush first and use every filter."""
+        storage = SQLiteAuditStorage(repository, flush_interval=60)
+        storage.start()
+        now = datetime.utcnow()
+        await storage.store_event(make_event(timestamp=now - timedelta(hours=2)))
+        await storage.store_event(make_event(user_id=2))
+        await storage.store_event(make_event(event_type="security_violation"))
+
+        assert len(await storage.get_events(user_id=1)) == 2
+        assert len(await storage.get_security_violations()) == 1
+        recent = await storage.get_events(start_time=now - timedelta(hours=1))
+        assert len(recent) == 2
+        assert storage.get_stats()["pending"] == 0
+        await storage.stop()
+
+    async def test_failed_write_is_retried(self, repository):
+        """Test that a failed batch stays queued in order."""
+        storage = SQLiteAuditStorage(repository, flush_interval=60, max_pending=3)
+        storage.start()
+        first, second = make_event(user_id=1), make_event(user_id=2)
+        await storage.store_event(first)
+        await storage.store_event(second)
+
+        original = repository.log_events
+        repository.log_events = AsyncMock(side_effect=RuntimeError("locked"))
+        assert await storage.flush() == 0
+        assert list(storage._pending) == [first, second]
+
+        repository.log_events = original
+        await storage.stop()
+        stats = storage.get_stats()
+        assert stats["failures"] == 1
+        assert stats["events_written"] == 2
+        assert stats["running"] is False
+
+    async def test_audit_logger_dashboard(self, repository):
+        """Test the audit logger end to end on database storage."""
+        storage = SQLiteAuditStorage(repository)
+        audit_logger = AuditLogger(storage)
+
+        await audit_logger.log_auth_attempt(99, False, "token", reason="bad token")
+        await audit_logger.log_security_violation(
+            99, "path_traversal", "../etc", severity="high"
+        )
+
+        dashboard = await audit_logger.get_security_dashboard()
+        assert dashboard["total_events"] == 2
+        assert dashboard["authentication_failures"] == 1
+        assert dashboard["top_violation_types"] == {"path_traversal": 1}
@@ -17,10 +17,13 @@ from src.storage.models import (
 from src.storage.repositories import (
     AnalyticsRepository,
     AuditLogRepository,
+    CostTrackingRepository,
     MessageRepository,
+    RateLimitStateRepository,
     SessionRepository,
     ToolUsageRepository,
     UserRepository,
+    UserTokenRepository,
 )
 
 
@@ -71,6 +74,24 @@ async def analytics_repo(db_manager):
     return AnalyticsRepository(db_manager)
 
 
+@pytest.fixture
+async def cost_repo(db_manager):
+    """Create cost tracking repository."""
+    return CostTrackingRepository(db_manager)
+
+
+@pytest.fixture
+async def rate_limit_repo(db_manager):
+    """Create rate limit state repository."""
+    return RateLimitStateRepository(db_manager)
+
+
+@pytest.fixture
+async def token_repo(db_manager):
+    """Create user token repository."""
+    return UserTokenRepository(db_manager)
+
+
 class TestUserRepository:
     """Test user repository."""
 
@@ -427,3 +448,167 @@ class TestAnalyticsRepository:
         assert stats["overall"]["total_sessions"] >= 1
         assert stats["overall"]["total_messages"] >= 3
         assert stats["overall"]["total_cost"] >= 0.3
+
+
+class TestCostTrackingRepository:
+    """Test cost tracking repository."""
+
+    async def test_get_costs_for_date(self, user_repo, cost_repo):
+        """Test per-user totals for a single day."""
+        for user_id in (12360, 12361):
+            await user_repo.create_user(UserModel(user_id=user_id))
+
+        await cost_repo.update_daily_cost(12360, 0.25)
+        await cost_repo.update_daily_cost(12360, 0.5)
+        await cost_repo.update_daily_cost(12361, 1.0)
+        await cost_repo.update_daily_cost(12361, 3.0, date="2000-01-01")
+
+        costs = await cost_repo.get_costs_for_date()
+        assert costs == {12360: 0.75, 12361: 1.0}
+        assert await cost_repo.get_costs_for_date("2000-01-01") == {12361: 3.0}
+
+
+class TestRateLimitStateRepository:
+    """Test rate limit state repository."""
+
+    async def test_save_and_load_states(self, rate_limit_repo):
+        """Test batch upsert and reload of checkpointed state."""
+        now = datetime.utcnow()
+        saved = await rate_limit_repo.save_states(
+            [
+                {
+                    "user_id": 1,
+                    "tokens": 4.5,
+                    "bucket_updated_at": now,
+                    "cost": 1.25,
+                    "cost_reset_at": now - timedelta(hours=2),
+                },
+                {
+                    "user_id": 2,
+                    "tokens": 10.0,
+                    "bucket_updated_at": now,
+                    "cost": 0.0,
+                    "cost_reset_at": None,
+                    "previous_cost": 0.5,
+                },
+            ]
+        )
+        assert saved == 2
+
+        # Second batch overwrites user 1
+        await rate_limit_repo.save_states(
+            [{"user_id": 1, "tokens": 2.0, "bucket_updated_at": now, "cost": 2.0}]
+        )
+
+        states = {state.user_id: state for state in await rate_limit_repo.load_states()}
+        assert set(states) == {1, 2}
+        assert states[1].tokens == 2.0
+        assert states[1].cost == 2.0
+        assert states[1].cost_reset_at is None
+        assert states[1].bucket_updated_at == now
+        assert states[1].previous_cost == 0.0
+        assert states[2].tokens == 10.0
+        assert states[2].previous_cost == 0.5
+
+    async def test_prune_states(self, rate_limit_repo, db_manager):
+        """Test that only states saved before the cutoff are deleted."""
+        now = datetime.utcnow()
+        await rate_limit_repo.save_states(
+            [
+                {"user_id": 1, "tokens": 1.0, "bucket_updated_at": now},
+                {"user_id": 2, "tokens": 1.0, "bucket_updated_at": now},
+            ]
+        )
+        async with db_manager.get_connection() as conn:
+            await conn.execute(
+                "UPDATE rate_limit_state SET saved_at = datetime('now', '-3 days') "
+                "WHERE user_id = 2"
+            )
+            await conn.commit()
+
+        assert await rate_limit_repo.prune_states(timedelta(days=2)) == 1
+        states = await rate_limit_repo.load_states()
+        assert [state.user_id for state in states] == [1]
+
+    async def test_save_empty_batch(self, rate_limit_repo):
+        """Test that an empty batch is a no-op."""
+        assert await rate_limit_repo.save_states([]) == 0
+        assert await rate_limit_repo.load_states() == []
+
+
+class TestAuditLogRepository:
+    """Test audit log repository."""
+
+    async def test_log_events_and_filter(self, audit_repo):
+        """Test batch insert and indexed filtering, newest first."""
+        now = datetime.utcnow()
+        # Unregistered users are audited too (failed auth attempts)
+        written = await audit_repo.log_events(
+            AuditLogModel(
+                user_id=user_id,
+                event_type=event_type,
+                timestamp=now - timedelta(minutes=minutes),
+                event_data={"n": minutes},
+                success=event_type != "auth_attempt",
+                risk_level="high" if event_type == "security_violation" else "low",
+            )
+            for user_id, event_type, minutes in [
+                (1, "auth_attempt", 90),
+                (1, "command", 30),
+                (2, "security_violation", 20),
+                (1, "security_violation", 10),
+            ]
+        )
+        assert written == 4
+
+        events = await audit_repo.get_events(user_id=1)
+        assert [e.event_data["n"] for e in events] == [10, 30, 90]
+        assert events[0].risk_level == "high"
+        assert not events[2].success
+
+        violations = await audit_repo.get_events(event_type="security_violation")
+        assert [e.user_id for e in violations] == [1, 2]
+
+        recent = await audit_repo.get_events(
+            start_time=now - timedelta(minutes=60),
+            end_time=now - timedelta(minutes=15),
+        )
+        assert [e.event_data["n"] for e in recent] == [20, 30]
+        assert len(await audit_repo.get_events(limit=1)) == 1
+        assert await audit_repo.log_events([]) == 0
+
+
+class TestUserTokenRepository:
+    """Test user token repository."""
+
+    async def test_store_replaces_active_token(self, token_repo, user_repo):
+        """Test that a new token deactivates the old one."""
+        expires = datetime.utcnow() + timedelta(days=1)
+        # Token users need no prior row in users
+        await token_repo.store_token(7, "hash-1", expires)
+        await token_repo.store_token(7, "hash-2", expires)
+
+        token = await token_repo.get_active_token(7)
+        assert token.token_hash == "hash-2"
+        assert token.is_active
+        assert await user_repo.get_user(7) is not None
+
+    async def test_expired_and_revoked(self, token_repo):
+        """Test that expired or revoked tokens are not returned."""
+        await token_repo.store_token(1, "old", datetime.utcnow() - timedelta(hours=1))
+        assert await token_repo.get_active_token(1) is None
+
+        await token_repo.store_token(2, "live", datetime.utcnow() + timedelta(hours=1))
+        assert await token_repo.revoke_tokens(2) == 1
+        assert await token_repo.get_active_token(2) is None
+
+    async def test_update_last_used_batch(self, token_repo):
+        """Test batched last_used updates."""
+        expires = datetime.utcnow() + timedelta(days=1)
+        used = datetime.utcnow()
+        for user_id in (1, 2):
+            await token_repo.store_token(user_id, f"hash-{user_id}", expires)
+
+        assert await token_repo.update_last_used({1: used, 2: used}) == 2
+        assert (await token_repo.get_active_token(1)).last_used == used
+        assert await token_repo.update_last_used({}) == 0
@@ -0,0 +1,87 @@
+"""Tests for the SQLite token storage."""
+
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.security.auth import TokenAuthProvider
+from src.storage.database import DatabaseManager
+from src.storage.repositories import UserTokenRepository
+from src.storage.token_storage import SQLiteTokenStorage
+
+
+@pytest.fixture
+async def repository():
+    """User token repository on a temporary database."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        manager = DatabaseManager(f"sqlite:///{Path(temp_dir) / 'test.db'}")
+        await manager.initialize()
+        yield UserTokenRepository(manager)
+        await manager.close()
+
+
+class TestSQLiteTokenStorage:
+    """Test database-backed token storage."""
+
+    async def test_store_get_revoke(self, repository):
+        """Test the TokenStorage contract against the database."""
+        storage = SQLiteTokenStorage(repository)
+        expires = datetime.utcnow() + timedelta(days=1)
+
+        await storage.store_token(5, "abc", expires)
+        token = await storage.get_user_token(5)
+        assert token["hash"] == "abc"
+        assert token["expires_at"] == expires
+        assert token["last_used"] is None
+
+        await storage.revoke_token(5)
+        assert await storage.get_user_token(5) is None
+
+    async def test_last_used_written_in_batches(self, repository):
+        """Test that uses stay in memory until flushed."""
+        storage = SQLiteTokenStorage(repository)
+        await storage.store_token(1, "abc", datetime.utcnow() + timedelta(days=1))
+
+        await storage.record_use(1)
+        await storage.record_use(1)
+        assert storage.get_stats()["pending"] == 1
+        assert (await repository.get_active_token(1)).last_used is None
+        assert (await storage.get_user_token(1))["last_used"] is not None
+
+        assert await storage.flush_last_used() == 1
+        assert (await repository.get_active_token(1)).last_used is not None
+        assert storage.get_stats()["pending"] == 0
+
+    async def test_failed_flush_keeps_pending(self, repository):
+        """Test that a failed batch is retried on the next flush."""
+        storage = SQLiteTokenStorage(repository)
+        await storage.record_use(1)
+        repository.update_last_used = AsyncMock(side_effect=RuntimeError("locked"))
+
+        assert await storage.flush_last_used() == 0
+        assert storage.get_stats()["pending"] == 1
+        assert storage.failures == 1
+
+    async def test_stop_flushes(self, repository):
+        """Test that stopping the loop writes pending uses."""
+        storage = SQLiteTokenStorage(repository, flush_interval=60)
+        await storage.store_token(1, "abc", datetime.utcnow() + timedelta(days=1))
+        assert storage.start() is not None
+
+        await storage.record_use(1)
+        await storage.stop()
+
+        assert storage.get_stats()["running"] is False
+        assert (await repository.get_active_token(1)).last_used is not None
+
+    async def test_provider_roundtrip(self, repository):
+        """Test token auth end to end on the database."""
+        provider = TokenAuthProvider("secret", SQLiteTokenStorage(repository))
+
+        token = await provider.generate_token(9)
+        assert await provider.authenticate(9, {"token": token})
+        await provider.revoke_token(9)
+        assert not await provider.authenticate(9, {"token": token})
@@ -0,0 +1,47 @@
+"""Test the latency histogram."""
+
+import pytest
+
+from src.utils.histogram import LatencyHistogram
+
+
+class TestLatencyHistogram:
+    """Test LatencyHistogram."""
+
+    def test_buckets_and_percentiles(self):
+        """Test samples land in the right buckets."""
+        histogram = LatencyHistogram(bounds=(0.001, 0.01, 0.1))
+        for seconds in [0.0005] * 90 + [0.005] * 9 + [0.05]:
+            histogram.observe(seconds)
+
+        assert histogram.counts == [90, 9, 1, 0]
+        assert histogram.percentile(0.5) == 0.001
+        assert histogram.percentile(0.95) == 0.01
+        assert histogram.percentile(1.0) == 0.05  # Capped at the maximum
+
+    def test_overflow_reports_maximum(self):
+        """Test samples beyond the last bound."""
+        histogram = LatencyHistogram(bounds=(0.001,))
+        histogram.observe(2.0)
+
+        assert histogram.percentile(0.99) == 2.0
+        assert histogram.snapshot()["buckets"] == {">1ms": 1}
+
+    def test_snapshot(self):
+        """Test the millisecond summary."""
+        histogram = LatencyHistogram()
+        assert histogram.snapshot()["count"] == 0
+
+        histogram.observe(0.002)
+        histogram.observe(0.004)
+        snapshot = histogram.snapshot()
+
+        assert snapshot["count"] == 2
+        assert snapshot["mean_ms"] == pytest.approx(3.0)
+        assert snapshot["max_ms"] == pytest.approx(4.0)
+        assert snapshot["buckets"] == {"<=2.5ms": 1, "<=5ms": 1}
+
+    def test_bounds_validated(self):
+        """Test bounds must be ascending."""
+        with pytest.raises(ValueError):
+            LatencyHistogram(bounds=(0.1, 0.01))
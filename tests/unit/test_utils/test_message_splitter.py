@@ -0,0 +1,64 @@
+"""Test code-fence aware message splitting."""
+
+from src.utils.message_splitter import split_message
+
+
+def _fence_lines(chunk: str) -> int:
+    return sum(1 for line in chunk.split("\n") if line.strip().startswith("```"))
+
+
+class TestSplitMessage:
+    """Test split_message."""
+
+    def test_short_text_unchanged(self):
+        """Test text within the limit is returned as-is."""
+        assert split_message("hello\nworld", 100) == ["hello\nworld"]
+
+    def test_empty_text(self):
+        """Test whitespace-only text yields no chunks."""
+        assert split_message("   \n  ", 100) == []
+
+    def test_long_line_hard_split(self):
+        """Test a single long line is split without adding characters."""
+        chunks = split_message("A" * 250, 100)
+
+        assert [len(c) for c in chunks] == [100, 100, 50]
+        assert "".join(chunks) == "A" * 250
+
+    def test_splits_on_line_boundaries(self):
+        """Test chunks break between lines."""
+        text = "\n".join(f"line {i:02d}" for i in range(20))
+
+        chunks = split_message(text, 30)
+
+        assert all(len(c) <= 30 for c in chunks)
+        assert "\n".join(chunks) == text
+
+    def test_code_fences_balanced(self):
+        """Test each chunk closes and reopens code blocks."""
+        code = "\n".join(f"print({i})" for i in range(50))
+        text = f"Intro\n```python\n{code}\n```\nOutro"
+
+        chunks = split_message(text, 80)
+
+        assert len(chunks) > 1
+        for chunk in chunks:
+            assert len(chunk) <= 80
+            assert _fence_lines(chunk) % 2 == 0
+        assert chunks[1].startswith("```python\n")
+        assert chunks[-1].endswith("Outro")
+
+    def test_no_dangling_opening_fence(self):
+        """Test an opening fence is carried to the chunk with its body."""
+        text = "a\n```\n" + "b" * 30 + "\n```\nc"
+
+        chunks = split_message(text, 20)
+
+        assert chunks[0] == "a"
+        assert all(chunk != "```\n```" for chunk in chunks)
+
+    def test_unclosed_fence_is_closed(self):
+        """Test an unterminated code block is closed in the last chunk."""
+        chunks = split_message("```\n" + "z\n" * 30, 20)
+
+        assert all(_fence_lines(chunk) % 2 == 0 for chunk in chunks)
@@ -0,0 +1,71 @@
+"""Test the hashed timing wheel."""
+
+import pytest
+
+from src.utils.timing_wheel import TimingWheel
+
+
+class TestTimingWheel:
+    """Test TimingWheel."""
+
+    def test_keys_fire_at_their_deadline(self):
+        """Test keys are returned once their deadline has passed."""
+        wheel = TimingWheel(tick=1.0, slots=8)
+        wheel.schedule("a", 2.5)
+        wheel.schedule("b", 5.0)
+
+        assert wheel.advance(2.0) == []
+        assert wheel.advance(2.5) == ["a"]
+        assert wheel.advance(4.9) == []
+        assert wheel.advance(7.0) == ["b"]
+        assert len(wheel) == 0
+
+    def test_schedule_keeps_first_deadline(self):
+        """Test scheduling a waiting key is a no-op."""
+        wheel = TimingWheel(tick=1.0, slots=8)
+
+        assert wheel.schedule("a", 3.0) is True
+        assert wheel.schedule("a", 1.0) is False
+        assert wheel.advance(2.0) == []
+        assert wheel.advance(3.0) == ["a"]
+
+    def test_deadline_beyond_one_rotation(self):
+        """Test a deadline further out than the wheel span waits its round."""
+        wheel = TimingWheel(tick=1.0, slots=4)
+        wheel.schedule("far", 10.0)
+
+        for now in range(10):
+            assert wheel.advance(float(now)) == []
+        assert wheel.advance(10.0) == ["far"]
+
+    def test_large_jump_visits_every_slot(self):
+        """Test advancing past several rotations returns everything due."""
+        wheel = TimingWheel(tick=1.0, slots=4)
+        for key in range(10):
+            wheel.schedule(key, float(key))
+
+        assert sorted(wheel.advance(100.0)) == list(range(10))
+
+    def test_past_deadline_fires_on_next_advance(self):
+        """Test scheduling behind the cursor is not lost."""
+        wheel = TimingWheel(tick=1.0, slots=4, now=20.0)
+        wheel.schedule("late", 3.0)
+
+        assert wheel.advance(20.0) == ["late"]
+
+    def test_cancel(self):
+        """Test cancelled keys never fire."""
+        wheel = TimingWheel(tick=1.0, slots=4)
+        wheel.schedule("a", 1.0)
+
+        assert "a" in wheel
+        assert wheel.cancel("a") is True
+        assert wheel.cancel("a") is False
+        assert wheel.advance(5.0) == []
+
+    def test_invalid_arguments(self):
+        """Test tick and slot validation."""
+        with pytest.raises(ValueError):
+            TimingWheel(tick=0, slots=4)
+        with pytest.raises(ValueError):
+            TimingWheel(tick=1.0, slots=0)